@@ -13,9 +13,9 @@ import sys
 import json
 import random
 import subprocess
-import threading
 import urllib.request
 from collections import deque
+from contextlib import closing
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -44,20 +44,22 @@ from PyQt6.QtCore import Qt, QTimer, QByteArray, QRectF, QBuffer, QIODevice, QMi
 from PyQt6.QtGui import QPixmap, QFont, QFontMetrics, QPainter, QPainterPath, QPen, QBrush, QColor, QImage, QShortcut, QKeySequence, QIcon
 from math import pi, cos, sin, log, exp
 
-try:
-    import numpy as np
-    _NUMPY_AVAILABLE = True
-except ImportError:
-    _NUMPY_AVAILABLE = False
-
 # GStreamer-Player (Version 2.0)
 try:
     from . import gst_player
 except ImportError:
     import gst_player
 
+# Gemeinsamer Netz-Worker (Keep-Alive, Prioritäten, Logo-Cache)
+try:
+    from . import net_worker
+except ImportError:
+    import net_worker
+
 BACKEND_BASE = os.environ.get("PI_INSTALLER_BACKEND", "http://127.0.0.1:8000")
 METADATA_INTERVAL_MS = 15000  # 15 Sekunden (reduziert Last auf Backend)
+SPECTRUM_NUM_BANDS = 24  # Bänder der Frequenzanzeige (log. verteilt, Zuordnung in gst_player.LogBandMap)
+SPECTRUM_FALL_DECAY = 0.7  # Abklingen je Spektrum-Update (steigen sofort)
 CLOCK_INTERVAL_MS = 1000
 WINDOW_TITLE = "Sabrina Tuner"
 # Konfigurationsverzeichnis: absolut, damit es immer korrekt ist
@@ -758,24 +760,24 @@ def _button_label(name: str, max_chars: int = 12) -> str:
 def _fetch_metadata(url: str) -> dict:
     """Holt Metadaten vom Backend. Pfad für Logs: CONFIG_DIR (~/.config/pi-installer-dsi-radio)."""
     try:
-        req = urllib.request.Request(
+        resp = net_worker.http_pool().get(
             f"{BACKEND_BASE}/api/radio/stream-metadata?url={urllib.request.quote(url, safe='')}",
             headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"},
+            timeout=4,
         )
-        with urllib.request.urlopen(req, timeout=4) as resp:
-            data = json.load(resp)
-            if isinstance(data, dict):
-                if "status" in data:
-                    del data["status"]
-                if os.environ.get("PI_INSTALLER_DSI_DEBUG"):
-                    try:
-                        os.makedirs(CONFIG_DIR, exist_ok=True)
-                        p = os.path.join(CONFIG_DIR, "metadata_debug.json")
-                        with open(p, "w", encoding="utf-8") as f:
-                            json.dump({"url": url, "metadata": data, "timestamp": datetime.now().isoformat()}, f, indent=2, ensure_ascii=False)
-                    except Exception:
-                        pass
-                return data
+        data = json.loads(resp.body)
+        if isinstance(data, dict):
+            if "status" in data:
+                del data["status"]
+            if os.environ.get("PI_INSTALLER_DSI_DEBUG"):
+                try:
+                    os.makedirs(CONFIG_DIR, exist_ok=True)
+                    p = os.path.join(CONFIG_DIR, "metadata_debug.json")
+                    with open(p, "w", encoding="utf-8") as f:
+                        json.dump({"url": url, "metadata": data, "timestamp": datetime.now().isoformat()}, f, indent=2, ensure_ascii=False)
+                except Exception:
+                    pass
+            return data
     except Exception as e:
         try:
             os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -821,14 +823,17 @@ def _fetch_icy_metadata_direct(url: str) -> dict:
 
     try:
         timeout = 10 if ("ndr" in url.lower() or "rsa-sachsen" in url.lower() or "radiosaw" in url.lower()) else 5
-        req = urllib.request.Request(url, headers={"User-Agent": "PI-Installer-DSI-Radio/1.0", "Icy-MetaData": "1"})
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            meta_int = resp.headers.get("icy-metaint")
+        # Endlos-Stream: eigene Verbindung (nicht im Pool), nach dem Lesen schließen
+        conn, resp = net_worker.http_pool().open_stream(
+            url, headers={"User-Agent": "PI-Installer-DSI-Radio/1.0", "Icy-MetaData": "1"}, timeout=timeout
+        )
+        with closing(conn):
+            meta_int = resp.getheader("icy-metaint")
             if not meta_int:
                 return {}
             bitrate = None
             try:
-                br = resp.headers.get("icy-br")
+                br = resp.getheader("icy-br")
                 if br:
                     bitrate = int(str(br).strip())
             except (ValueError, TypeError):
@@ -865,7 +870,13 @@ def _fetch_icy_metadata_direct(url: str) -> dict:
 
 
 def _fetch_logo(url: str, name: Optional[str] = None) -> Optional[bytes]:
-    """Logo laden: zuerst Backend (DB → extern → Wikipedia), sonst Direktabruf."""
+    """Logo laden: Plattencache, dann Backend (DB → extern → Wikipedia), sonst Direktabruf."""
+    cache = net_worker.logo_cache()
+    cache_key = f"logo:{(url or '').strip()}|{(name or '').strip()}"
+    cached = cache.get(cache_key)
+    if cached:
+        return cached
+    pool = net_worker.http_pool()
     params: List[str] = []
     if (url or "").strip():
         params.append("url=" + urllib.request.quote(url.strip(), safe=""))
@@ -874,20 +885,39 @@ def _fetch_logo(url: str, name: Optional[str] = None) -> Optional[bytes]:
     if params:
         try:
             proxy_url = f"{BACKEND_BASE}/api/radio/logo?{'&'.join(params)}"
-            req = urllib.request.Request(proxy_url, headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"})
-            with urllib.request.urlopen(req, timeout=5) as resp:
-                return resp.read()
+            data = pool.get(proxy_url, headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"}, timeout=5).body
+            if data:
+                cache.put(cache_key, data)
+                return data
         except Exception:
             pass
     if not url:
         return None
+    data = _fetch_favicon(url, timeout=3)
+    if data:
+        cache.put(cache_key, data)
+    return data
+
+
+def _fetch_favicon(url: str, timeout: float = 3) -> Optional[bytes]:
+    """Favicon/Logo direkt von der Quelle – über Plattencache und Keep-Alive-Pool."""
+    url = (url or "").strip()
+    if not url:
+        return None
+    cache = net_worker.logo_cache()
+    cached = cache.get("url:" + url)
+    if cached:
+        return cached
     try:
         ua = "PI-Installer/1.0 (Radio logo; +https://github.com)" if ("wikipedia.org" in url or "wikimedia.org" in url) else "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
-        req = urllib.request.Request(url, headers={"User-Agent": ua, "Accept": "image/webp,image/apng,image/*,*/*;q=0.8"})
-        with urllib.request.urlopen(req, timeout=3) as resp:
-            return resp.read()
+        data = net_worker.http_pool().get(
+            url, headers={"User-Agent": ua, "Accept": "image/webp,image/apng,image/*,*/*;q=0.8"}, timeout=timeout
+        ).body
     except Exception:
         return None
+    if data:
+        cache.put("url:" + url, data)
+    return data or None
 
 
 # Radio-Browser-API direkt (Fallback wenn Backend nicht erreichbar)
@@ -906,9 +936,8 @@ def _fetch_stations_from_radio_browser_direct(name: str = "", limit: int = 200)
     for base in RADIO_BROWSER_API_MIRRORS:
         try:
             url = f"{base}/json/stations/search?{'&'.join(params)}"
-            req = urllib.request.Request(url, headers={"User-Agent": "DSI-Radio/1.0 (radio-browser.info)"})
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode())
+            resp = net_worker.http_pool().get(url, headers={"User-Agent": "DSI-Radio/1.0 (radio-browser.info)"}, timeout=15)
+            data = json.loads(resp.body.decode())
             if not isinstance(data, list):
                 continue
             out = []
@@ -940,21 +969,20 @@ def _fetch_stations_search(name: str = "") -> List[Dict[str, Any]]:
         url = f"{BACKEND_BASE}/api/radio/stations/search?country=Germany&limit=200"
         if name.strip():
             url += "&name=" + urllib.request.quote(name.strip())
-        req = urllib.request.Request(url, headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"})
-        with urllib.request.urlopen(req, timeout=12) as resp:
-            data = json.load(resp)
-            stations = []
-            if isinstance(data, dict) and "stations" in data:
-                stations = data["stations"] if isinstance(data["stations"], list) else []
-            elif isinstance(data, list):
-                stations = data
-            if stations:
-                try:
-                    with open(RADIO_STATIONS_CACHE_FILE, "w", encoding="utf-8") as f:
-                        json.dump({"stations": stations, "query": name.strip()}, f, ensure_ascii=False)
-                except Exception:
-                    pass
-                return stations
+        resp = net_worker.http_pool().get(url, headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"}, timeout=12)
+        data = json.loads(resp.body)
+        stations = []
+        if isinstance(data, dict) and "stations" in data:
+            stations = data["stations"] if isinstance(data["stations"], list) else []
+        elif isinstance(data, list):
+            stations = data
+        if stations:
+            try:
+                with open(RADIO_STATIONS_CACHE_FILE, "w", encoding="utf-8") as f:
+                    json.dump({"stations": stations, "query": name.strip()}, f, ensure_ascii=False)
+            except Exception:
+                pass
+            return stations
     except Exception:
         pass
     # 2) Direkt radio-browser.info
@@ -1107,25 +1135,6 @@ class AnalogGaugeWidget(QWidget):
         painter.end()
 
 
-def _fft_to_log_bands(magnitudes: "np.ndarray", num_bands: int) -> List[float]:
-    """Mappt FFT-Magnituden (linear) auf logarithmisch verteilte Bänder (realistisch wie bei Kurzwellen/Spektrum)."""
-    n = len(magnitudes)
-    if n < 2 or num_bands < 1:
-        return [0.0] * num_bands
-    out = []
-    for i in range(num_bands):
-        start = int(n ** (i / num_bands))
-        end = min(n, int(n ** ((i + 1) / num_bands)) + 1)
-        if start >= end:
-            start = max(0, end - 1)
-        band_max = float(np.max(magnitudes[start:end]))
-        out.append(band_max)
-    if out:
-        peak = max(out) or 1.0
-        return [min(100.0, 100.0 * (v / peak) ** 0.6) for v in out]
-    return [0.0] * num_bands
-
-
 class SpectrumBandWidget(QWidget):
     """Frequenzbandanzeige: unten Grün, darüber Gelb, oben Rot; mit Peak Hold."""
 
@@ -1283,6 +1292,15 @@ class StationListDialog(QDialog):
         self._list.setIconSize(QSize(28, 28))
         self._list.itemChanged.connect(self._on_item_check_changed)
         layout.addWidget(self._list)
+        # Icons: nur sichtbare Zeilen laden, beim Scrollen neu priorisieren
+        self._icon_cache: Dict[str, QIcon] = {}
+        self._icon_jobs: set = set()
+        self._closed = False
+        self._icon_scroll_timer = QTimer(self)
+        self._icon_scroll_timer.setSingleShot(True)
+        self._icon_scroll_timer.setInterval(150)
+        self._icon_scroll_timer.timeout.connect(self._load_station_icons)
+        self._list.verticalScrollBar().valueChanged.connect(self._schedule_icon_load)
         layout.addWidget(QLabel("☑ = Favorit (max. 64). Keine URL-Anzeige."))
         close_btn = QPushButton("Schließen")
         close_btn.setMinimumHeight(48)
@@ -1496,8 +1514,12 @@ class StationListDialog(QDialog):
                 # Icons (Favicons) asynchron nachladen
                 QTimer.singleShot(100, self._load_station_icons)
 
-            QTimer.singleShot(0, apply)
-        threading.Thread(target=do, daemon=True).start()
+            return apply
+
+        # Netz-Worker: Ergebnis (apply) läuft per Signal im Hauptthread
+        net_worker.io_worker().submit(
+            do, priority=net_worker.PRIO_UI, callback=lambda apply: apply and apply(), group=self._icon_group()
+        )
 
     def _sort_list_favorites_first(self):
         """Liste so sortieren: zuerst Favoriten (alphabetisch), dann Rest (alphabetisch)."""
@@ -1527,42 +1549,92 @@ class StationListDialog(QDialog):
             self._list.itemChanged.connect(self._on_item_check_changed)
         except Exception:
             pass
-
-    def _set_icon_for_row(self, row: int, data: bytes):
-        """Hauptthread: Icon für eine Zeile setzen (von Favicon-Daten)."""
-        if row < 0 or row >= self._list.count():
-            return
-        item = self._list.item(row)
-        if not item:
+        # Neu angelegte Zeilen: vorhandene Icons wieder setzen, sichtbare nachladen
+        self._schedule_icon_load()
+
+    def _icon_group(self) -> str:
+        return f"station-icons:{id(self)}"
+
+    def _visible_row_range(self) -> tuple:
+        """Erste/letzte sichtbare Zeile der Liste (inklusive)."""
+        count = self._list.count()
+        if count == 0:
+            return 0, -1
+        vp = self._list.viewport().rect()
+        first = self._list.indexAt(vp.topLeft()).row()
+        last = self._list.indexAt(vp.bottomLeft()).row()
+        first = 0 if first < 0 else first
+        last = count - 1 if last < 0 else last
+        return first, last
+
+    def _set_icon_for_favicon(self, favicon: str, data: Optional[bytes]):
+        """Hauptthread: Icon für alle Zeilen mit diesem Favicon setzen (Zeilen können inzwischen umsortiert sein)."""
+        if not data:
             return
         pix = QPixmap()
-        if pix.loadFromData(data) and not pix.isNull():
-            item.setIcon(QIcon(pix.scaled(28, 28, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)))
+        if not pix.loadFromData(data) or pix.isNull():
+            return
+        icon = QIcon(pix.scaled(28, 28, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        self._icon_cache[favicon] = icon
+        for row in range(self._list.count()):
+            item = self._list.item(row)
+            s = item.data(Qt.ItemDataRole.UserRole) if item else None
+            if isinstance(s, dict) and (s.get("favicon") or s.get("logo_url") or "").strip() == favicon:
+                item.setIcon(icon)
+
+    def _schedule_icon_load(self, *_args):
+        """Beim Scrollen gebündelt nachladen (nicht bei jedem Scroll-Schritt)."""
+        self._icon_scroll_timer.start()
 
     def _load_station_icons(self):
-        """Favicons für alle Sender in der Liste asynchron laden (Worker-Thread, UI-Updates im Hauptthread)."""
-        for row in range(self._list.count()):
+        """Favicons der sichtbaren Zeilen (plus ein Stück voraus) über den gemeinsamen Netz-Worker laden.
+        Aufträge für Zeilen, die aus dem Bild gescrollt sind, werden verworfen."""
+        worker = net_worker.io_worker()
+        first, last = self._visible_row_range()
+        ahead = max(8, last - first + 1)
+        wanted: Dict[str, int] = {}
+        for row in range(max(0, first - ahead // 2), min(self._list.count(), last + ahead + 1)):
             item = self._list.item(row)
-            if not item:
-                continue
-            s = item.data(Qt.ItemDataRole.UserRole)
-            if not s or not isinstance(s, dict):
+            s = item.data(Qt.ItemDataRole.UserRole) if item else None
+            if not isinstance(s, dict):
                 continue
             favicon = (s.get("favicon") or s.get("logo_url") or "").strip()
             if not favicon:
                 continue
-            r = row
+            icon = self._icon_cache.get(favicon)
+            if icon is not None:
+                item.setIcon(icon)
+                continue
+            prio = net_worker.PRIO_ICON_VISIBLE if first <= row <= last else net_worker.PRIO_ICON_AHEAD
+            wanted[favicon] = min(prio, wanted.get(favicon, prio))
+        stale = [k for k in self._icon_jobs if k not in wanted]
+        worker.cancel(self._icon_job_key(k) for k in stale)
+        for k in stale:
+            self._icon_jobs.discard(k)
+        for favicon, prio in wanted.items():
+            self._icon_jobs.add(favicon)
+            worker.submit(
+                lambda u=favicon: _fetch_favicon(u, timeout=3),
+                priority=prio,
+                callback=lambda data, u=favicon: self._on_icon_loaded(u, data),
+                group=self._icon_group(),
+                key=self._icon_job_key(favicon),
+            )
 
-            def fetch_and_set(url: str, row_index: int):
-                try:
-                    req = urllib.request.Request(url, headers={"User-Agent": "DSI-Radio/1.0"})
-                    with urllib.request.urlopen(req, timeout=3) as resp:
-                        data = resp.read()
-                    if data:
-                        QTimer.singleShot(0, lambda: self._set_icon_for_row(row_index, data))
-                except Exception:
-                    pass
-            threading.Thread(target=fetch_and_set, args=(favicon, r), daemon=True).start()
+    def _icon_job_key(self, favicon: str) -> str:
+        return f"{self._icon_group()}:{favicon}"
+
+    def _on_icon_loaded(self, favicon: str, data: Optional[bytes]):
+        self._icon_jobs.discard(favicon)
+        if self._closed:
+            return
+        self._set_icon_for_favicon(favicon, data)
+
+    def done(self, result):
+        # Offene Icon-Abrufe dieser Liste verwerfen
+        self._closed = True
+        net_worker.io_worker().cancel_group(self._icon_group())
+        super().done(result)
 
     def get_added_station(self):
         return getattr(self, "_add_station", None)
@@ -1598,6 +1670,8 @@ class DsiRadioWindow(QMainWindow):
     _backendStatusChanged = pyqtSignal(bool)
     # Metadaten aus Worker-Thread anwenden (Slot läuft garantiert im Hauptthread)
     _metadataApplyRequested = pyqtSignal()
+    # Spektrum-Bänder aus dem GStreamer-Streaming-Thread (queued in den GUI-Thread, ca. 20×/s)
+    _spectrumBandsReady = pyqtSignal(list)
 
     def __init__(self):
         super().__init__()
@@ -1605,10 +1679,14 @@ class DsiRadioWindow(QMainWindow):
         self._startStreamTimersRequested.connect(self.startStreamTimersSlot)
         self._backendStatusChanged.connect(self._set_backend_led)
         self._metadataApplyRequested.connect(self._apply_pending_metadata_slot)
+        self._spectrumBandsReady.connect(self._apply_spectrum_bands)
         self.setWindowTitle(WINDOW_TITLE)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self._gst_player = gst_player.GstPlayer() if gst_player.is_available() else None
+        # Netz-Worker im GUI-Thread anlegen (Ergebnis-Signale landen hier); alten Logo-Cache kürzen
+        self._io = net_worker.io_worker()
+        self._io.submit(net_worker.logo_cache().prune, priority=net_worker.PRIO_ICON_AHEAD + 10, group="startup")
         self._gst_bus_timer = QTimer(self)
         self._gst_bus_timer.timeout.connect(self._gst_poll_bus)
         # Favorites und Theme lazy laden (nur wenn benötigt)
@@ -1675,7 +1753,9 @@ class DsiRadioWindow(QMainWindow):
         if hasattr(self, "_vu_mode_slider"):
             self._vu_mode_slider.setValue(1 if disp.get("vu_mode") == "analog" else 0)
             self._on_vu_slider(self._vu_mode_slider.value())
-        QTimer.singleShot(2000, lambda: threading.Thread(target=self._background_station_update, daemon=True).start())
+        QTimer.singleShot(2000, lambda: net_worker.io_worker().submit(
+            self._background_station_update, priority=net_worker.PRIO_ICON_AHEAD + 10, group="startup", key="station-update"
+        ))
 
     def _reload_favorites(self):
         self._favorites = load_favorites()
@@ -1698,21 +1778,12 @@ class DsiRadioWindow(QMainWindow):
                 base = url.rstrip("/")
                 if not base.startswith("http"):
                     base = "http://" + base
-                req = urllib.request.Request(
+                resp = net_worker.http_pool().get(
                     base + "/api/version",
                     headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"},
+                    timeout=timeout,
                 )
-                with urllib.request.urlopen(req, timeout=timeout) as resp:
-                    code = getattr(resp, "status", getattr(resp, "code", 0))
-                    if 200 <= code < 300:
-                        try:
-                            data = json.loads(resp.read().decode())
-                            if isinstance(data, dict) and data.get("status") == "success":
-                                return True
-                        except Exception:
-                            pass
-                        return True  # 2xx reicht
-                    return False
+                return 200 <= resp.status < 300  # 2xx reicht
             except Exception as e:
                 _log(f"Versuch {url!r}: {type(e).__name__}: {e}")
                 return False
@@ -1730,7 +1801,8 @@ class DsiRadioWindow(QMainWindow):
             # Signal-Emission aus Thread: Slot _set_backend_led läuft im Hauptthread (LED-Update)
             self._backendStatusChanged.emit(ok)
 
-        threading.Thread(target=do, daemon=True).start()
+        # Gemeinsamer Netz-Worker; läuft noch ein Check, wird kein zweiter eingereiht
+        net_worker.io_worker().submit(do, priority=net_worker.PRIO_UI, group="backend", key="backend-led")
 
     def _set_backend_led(self, ok: bool):
         """Setzt die runde Backend-LED: grün = erreichbar, rot = nicht erreichbar (läuft im Hauptthread)."""
@@ -1773,11 +1845,11 @@ class DsiRadioWindow(QMainWindow):
             QTimer.singleShot(0, apply)
         # Radio-Browser-API einmal anfragen (Aktualität, Cache für Senderliste/Suche)
         try:
-            req = urllib.request.Request(
+            net_worker.http_pool().get(
                 f"{BACKEND_BASE}/api/radio/stations/search?country=Germany&limit=50",
-                headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"}
+                headers={"User-Agent": "PI-Installer-DSI-Radio/1.0"},
+                timeout=8,
             )
-            urllib.request.urlopen(req, timeout=8)
         except Exception:
             pass
 
@@ -2215,7 +2287,7 @@ class DsiRadioWindow(QMainWindow):
             bottom_row_layout = QHBoxLayout(bottom_row)
             bottom_row_layout.setContentsMargins(0, 0, 0, 0)
             bottom_row_layout.setSpacing(6)
-            self._spectrum_widget = SpectrumBandWidget(self, num_bands=24)
+            self._spectrum_widget = SpectrumBandWidget(self, num_bands=SPECTRUM_NUM_BANDS)
             self._spectrum_widget.setMinimumHeight(94)
             self._spectrum_widget.setToolTip("Frequenzbandanzeige (klassisch)")
             self._waveform_widget = WaveformWidget(self, max_points=80)
@@ -2225,13 +2297,11 @@ class DsiRadioWindow(QMainWindow):
             bottom_row_layout.addWidget(self._waveform_widget, 1)
             ds_layout.addWidget(bottom_row)
             main_v.addWidget(display_section)
-            self._spectrum_bands = [0.0] * 24
-            self._fft_buffer: deque = deque(maxlen=128)
+            self._spectrum_bands = [0.0] * SPECTRUM_NUM_BANDS
         else:
             self._spectrum_widget = None
             self._waveform_widget = None
-            self._spectrum_bands = [0.0] * 24
-            self._fft_buffer = deque(maxlen=1)
+            self._spectrum_bands = [0.0] * SPECTRUM_NUM_BANDS
         if not is_desktop:
             main_v.addWidget(card)
             layout.addWidget(vu_frame)
@@ -2706,6 +2776,11 @@ class DsiRadioWindow(QMainWindow):
                     self._apply_metadata(applied, force_show=True)
 
             self._gst_player.set_callbacks(on_error=on_gst_error, on_tag=on_gst_tag)
+            # Echtes Spektrum nur, wenn die Bandanzeige existiert (Desktop-Layout)
+            if getattr(self, "_spectrum_widget", None) is not None:
+                self._gst_player.enable_spectrum(SPECTRUM_NUM_BANDS, self._spectrumBandsReady.emit)
+            else:
+                self._gst_player.enable_spectrum(0)
             # Auf dem Laptop: kein Sink übergeben → GStreamer nutzt Standard-Ausgabe. Nur auf Freenove Sink erzwingen.
             self._gst_player.set_uri(url, pulse_sink_name=audio_sink if (has_pulseaudio and force_sink_for_gstreamer) else None)
             self._gst_player.play()
@@ -3133,34 +3208,35 @@ class DsiRadioWindow(QMainWindow):
         level = (getattr(self, "_vu_val_0", 0) + getattr(self, "_vu_val_1", 0)) / 2.0
         if getattr(self, "_waveform_widget", None) is not None:
             self._waveform_widget.append(level)
-        if getattr(self, "_spectrum_widget", None) is not None:
-            n_bands = 24
-            fft_buf = getattr(self, "_fft_buffer", None)
-            if _NUMPY_AVAILABLE and fft_buf is not None and len(fft_buf) >= 128:
-                arr = np.array(list(fft_buf)[-128:], dtype=np.float64)
-                arr = arr - np.mean(arr)
-                window = np.hanning(128)
-                arr = arr * window
-                fft = np.fft.rfft(arr)
-                mag = np.abs(fft)
-                bands = _fft_to_log_bands(mag, n_bands)
-                prev = getattr(self, "_spectrum_bands", [0.0] * n_bands)
-                decay = 0.85
-                bands = [prev[i] * decay + bands[i] * (1 - decay) for i in range(n_bands)]
-                self._spectrum_bands = bands
-                self._spectrum_widget.set_bands(bands)
-            else:
-                prev = getattr(self, "_spectrum_bands", [0.0] * n_bands)
-                if len(prev) != n_bands:
-                    prev = (prev + [0.0] * n_bands)[:n_bands]
-                decay = 0.88
-                bands = [0.0] * n_bands
-                for i in range(n_bands):
-                    bands[i] = prev[i] * decay + level * (0.25 + 0.75 * (1 + sin(i * 0.8)) / 2) * (1 - decay)
-                self._spectrum_bands = bands
-                self._spectrum_widget.set_bands(bands)
-            if fft_buf is not None:
-                fft_buf.append(level)
+        if getattr(self, "_spectrum_widget", None) is not None and not (
+            self._gst_player is not None and self._gst_player.has_spectrum
+        ):
+            # Ohne GStreamer-spectrum: angedeutete Bänder aus dem Pegel
+            n_bands = SPECTRUM_NUM_BANDS
+            prev = getattr(self, "_spectrum_bands", [0.0] * n_bands)
+            if len(prev) != n_bands:
+                prev = (prev + [0.0] * n_bands)[:n_bands]
+            decay = 0.88
+            bands = [0.0] * n_bands
+            for i in range(n_bands):
+                bands[i] = prev[i] * decay + level * (0.25 + 0.75 * (1 + sin(i * 0.8)) / 2) * (1 - decay)
+            self._spectrum_bands = bands
+            self._spectrum_widget.set_bands(bands)
+
+    @pyqtSlot(list)
+    def _apply_spectrum_bands(self, bands: list):
+        """Spektrum aus gst_player (Signal): schnell steigen, langsam fallen."""
+        if not self._playing or getattr(self, "_spectrum_widget", None) is None:
+            return
+        prev = self._spectrum_bands
+        if len(prev) != len(bands):
+            # Bandzahl gewechselt (neue Pipeline/Widget-Breite): Abklingen neu ab 0 starten
+            prev = [0.0] * len(bands)
+        decay = SPECTRUM_FALL_DECAY
+        self._spectrum_bands = [
+            v if v >= p else p * decay + v * (1 - decay) for p, v in zip(prev, bands, strict=True)
+        ]
+        self._spectrum_widget.set_bands(self._spectrum_bands)
 
     def _poll_metadata(self):
         url = (self._current_station.get("stream_url") or self._current_station.get("url") or "").strip()
@@ -3234,7 +3310,8 @@ class DsiRadioWindow(QMainWindow):
                 self._pending_metadata_force_show = playing_state
                 self._pending_metadata_url = ""
                 self._metadataApplyRequested.emit()
-        threading.Thread(target=do, daemon=True).start()
+        # Ein Abruf je Sender gleichzeitig; weitere Timer-Ticks während eines langsamen ICY-Abrufs entfallen
+        net_worker.io_worker().submit(do, priority=net_worker.PRIO_METADATA, group="metadata", key="metadata:" + url)
 
 
     def _position_close_button(self):
@@ -1,9 +1,14 @@
 # PI-Installer DSI Radio – GStreamer-Player (ab Version 2.0)
 # In-Process-Wiedergabe statt VLC/mpv-Subprocess. Nutzt playbin → PulseAudio/ALSA.
 
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, List
 import threading
 
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
 _GST_AVAILABLE = False
 _Gst = None
 _GST_IMPORT_ERROR: Optional[str] = None
@@ -40,6 +45,67 @@ def init() -> bool:
     return True
 
 
+# Spektrum: GStreamer-„spectrum“-Element im Audio-Filter (echtes Audiosignal statt VU-Verlauf)
+SPECTRUM_FFT_BANDS = 128  # lineare Bänder 0 … Nyquist
+SPECTRUM_INTERVAL_NS = 50 * 10**6  # 20 Ergebnisse/s → feste Rate für die Anzeige
+SPECTRUM_THRESHOLD_DB = -80.0
+SPECTRUM_MIN_HZ = 40.0
+SPECTRUM_MAX_HZ = 16000.0
+
+
+class LogBandMap:
+    """Vorberechnete Zuordnung lineare FFT-Bänder → logarithmisch verteilte Anzeigebänder.
+    Wird einmal je (Samplerate, Bandzahl) gebaut; pro Nachricht nur noch max() über feste Indexbereiche."""
+
+    def __init__(self, n_bins: int, rate: int, num_bands: int,
+                 fmin: float = SPECTRUM_MIN_HZ, fmax: float = SPECTRUM_MAX_HZ):
+        nyq = max(1.0, rate / 2.0)
+        fmax = min(fmax, nyq)
+        fmin = max(1.0, min(fmin, fmax / 2.0))
+        bin_hz = nyq / n_bins
+        starts: List[int] = []
+        for i in range(num_bands):
+            f = fmin * (fmax / fmin) ** (i / num_bands)
+            idx = min(n_bins - 1, int(f / bin_hz))
+            if starts and idx <= starts[-1]:
+                idx = min(n_bins - 1, starts[-1] + 1)
+            starts.append(idx)
+        self.num_bands = num_bands
+        self.end = max(starts[-1] + 1, min(n_bins, int(fmax / bin_hz) + 1))
+        self.ranges = [
+            (a, max(a + 1, starts[i + 1] if i + 1 < num_bands else self.end))
+            for i, a in enumerate(starts)
+        ]
+        self._starts = _np.asarray(starts, dtype=_np.intp) if _np is not None else None
+
+    def apply(self, mags_db: Any, out: Any) -> None:
+        """mags_db (dB, Länge n_bins) → out (0–100 je Band), ohne neue Arrays pro Aufruf."""
+        if _np is not None and self._starts is not None:
+            _np.maximum.reduceat(mags_db[: self.end], self._starts, out=out)
+            _np.subtract(out, SPECTRUM_THRESHOLD_DB, out=out)
+            _np.multiply(out, 100.0 / -SPECTRUM_THRESHOLD_DB, out=out)
+            _np.clip(out, 0.0, 100.0, out=out)
+            return
+        for i, (a, b) in enumerate(self.ranges):
+            v = max(mags_db[a:b]) if b > a else SPECTRUM_THRESHOLD_DB
+            out[i] = max(0.0, min(100.0, (v - SPECTRUM_THRESHOLD_DB) * 100.0 / -SPECTRUM_THRESHOLD_DB))
+
+
+def _value_seq(val: Any):
+    """(Größe, Getter) für GValueArray/GValueList – je nach GStreamer-Version unterschiedlich."""
+    if isinstance(val, (list, tuple)):
+        return len(val), lambda v, i: v[i]
+    if hasattr(_Gst, "value_holds_array") and _Gst.value_holds_array(val):
+        return _Gst.ValueArray.get_size(val), _Gst.ValueArray.get_value
+    if hasattr(_Gst, "value_holds_list") and _Gst.value_holds_list(val):
+        return _Gst.ValueList.get_size(val), _Gst.ValueList.get_value
+    return 0, None
+
+
+def _as_float(v: Any) -> float:
+    return v.get_double() if hasattr(v, "get_double") else (v.get_float() if hasattr(v, "get_float") else float(v))
+
+
 def _db_to_linear_0_100(db: float) -> int:
     """Peak in dB (-60 … 0) auf Anzeige 0–100 abbilden."""
     if db <= -60:
@@ -60,6 +126,117 @@ class GstPlayer:
         self._peak_r: float = -60.0
         self._on_error: Optional[Callable[[str], None]] = None
         self._on_tag: Optional[Callable[[dict], None]] = None
+        # Spektrum (optional): Puffer einmal anlegen, im Streaming-Thread befüllen
+        self._spectrum: Any = None
+        self._spectrum_bands = 0
+        self._on_spectrum: Optional[Callable[[list], None]] = None
+        self._band_map: Optional[LogBandMap] = None
+        self._band_map_rate = 0
+        self._spec_db: Any = None
+        self._spec_out: Any = None
+        self._spec_lock = threading.Lock()
+
+    def enable_spectrum(self, num_bands: int, on_spectrum: Optional[Callable[[list], None]] = None) -> None:
+        """Spektrum-Analyse für den nächsten set_uri() einschalten (num_bands <= 0: aus).
+        on_spectrum(bands) wird im GStreamer-Streaming-Thread aufgerufen (ca. 20×/s);
+        in Qt daher an ein Signal übergeben (queued zum GUI-Thread)."""
+        self._spectrum_bands = max(0, int(num_bands))
+        self._on_spectrum = on_spectrum
+        if self._spectrum_bands:
+            if _np is not None:
+                self._spec_db = _np.full(SPECTRUM_FFT_BANDS, SPECTRUM_THRESHOLD_DB, dtype=_np.float64)
+                self._spec_out = _np.zeros(self._spectrum_bands, dtype=_np.float64)
+            else:
+                self._spec_db = [SPECTRUM_THRESHOLD_DB] * SPECTRUM_FFT_BANDS
+                self._spec_out = [0.0] * self._spectrum_bands
+        self._band_map = None
+        self._band_map_rate = 0
+
+    def _build_audio_filter(self) -> Any:
+        """level (VU) und optional spectrum als Audio-Filter-Bin; None wenn nichts verfügbar."""
+        self._level = _Gst.ElementFactory.make("level", "level")
+        if self._level:
+            self._level.set_property("message", True)
+            self._level.set_property("interval", 50 * 10**6)  # 50 ms
+        else:
+            self._level = None
+        spectrum = _Gst.ElementFactory.make("spectrum", "spectrum") if self._spectrum_bands else None
+        if spectrum is None:
+            return self._level
+        spectrum.set_property("bands", SPECTRUM_FFT_BANDS)
+        spectrum.set_property("threshold", int(SPECTRUM_THRESHOLD_DB))
+        spectrum.set_property("interval", SPECTRUM_INTERVAL_NS)
+        spectrum.set_property("post-messages", True)
+        spectrum.set_property("message-magnitude", True)
+        spectrum.set_property("message-phase", False)
+        elements = [e for e in (self._level, spectrum) if e is not None]
+        try:
+            vis = _Gst.Bin.new("vis")
+            for e in elements:
+                vis.add(e)
+            if len(elements) == 2 and not elements[0].link(elements[1]):
+                raise RuntimeError("level ! spectrum nicht verknüpfbar")
+            vis.add_pad(_Gst.GhostPad.new("sink", elements[0].get_static_pad("sink")))
+            vis.add_pad(_Gst.GhostPad.new("src", elements[-1].get_static_pad("src")))
+        except Exception:
+            # Ohne Spektrum weiter – VU-Pegel bleiben erhalten
+            self._level = _Gst.ElementFactory.make("level", "level") if self._level is not None else None
+            if self._level:
+                self._level.set_property("message", True)
+                self._level.set_property("interval", 50 * 10**6)
+            return self._level
+        self._spectrum = spectrum
+        return vis
+
+    def _on_sync_element(self, _bus: Any, msg: Any) -> None:
+        """Streaming-Thread: Spektrum-Nachricht in den vorab angelegten Puffer übernehmen."""
+        spectrum = self._spectrum
+        if spectrum is None or msg.src != spectrum:
+            return
+        struct = msg.get_structure()
+        if not struct or struct.get_name() != "spectrum":
+            return
+        try:
+            mags = struct.get_value("magnitude")
+            n, get_value = _value_seq(mags)
+            if not n or get_value is None:
+                return
+            rate = self._spectrum_rate(spectrum)
+            with self._spec_lock:
+                if self._band_map is None or rate != self._band_map_rate:
+                    self._band_map = LogBandMap(SPECTRUM_FFT_BANDS, rate, self._spectrum_bands)
+                    self._band_map_rate = rate
+                buf = self._spec_db
+                for i in range(min(n, SPECTRUM_FFT_BANDS)):
+                    buf[i] = _as_float(get_value(mags, i))
+                self._band_map.apply(buf, self._spec_out)
+                bands = list(self._spec_out) if _np is None else self._spec_out.tolist()
+            if self._on_spectrum:
+                self._on_spectrum(bands)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _spectrum_rate(spectrum: Any) -> int:
+        try:
+            caps = spectrum.get_static_pad("sink").get_current_caps()
+            ok, rate = caps.get_structure(0).get_int("rate")
+            if ok and rate > 0:
+                return rate
+        except Exception:
+            pass
+        return 44100
+
+    def get_spectrum_bands(self) -> Optional[list]:
+        """Letzte Spektrum-Bänder (0–100) oder None ohne Spektrum-Element."""
+        if self._spectrum is None or self._spec_out is None:
+            return None
+        with self._spec_lock:
+            return list(self._spec_out) if _np is None else self._spec_out.tolist()
+
+    @property
+    def has_spectrum(self) -> bool:
+        return self._spectrum is not None
 
     def set_uri(self, url: str, pulse_sink_name: Optional[str] = None) -> None:
         if not _GST_AVAILABLE or _Gst is None:
@@ -101,14 +278,10 @@ class GstPlayer:
             pass
         self._playbin.set_property("uri", url)
         self._playbin.set_property("volume", 1.0)
-        # Level-Element für echte VU-Pegel (L/R) als Audio-Filter
-        self._level = _Gst.ElementFactory.make("level", "level")
-        if self._level:
-            self._level.set_property("message", True)
-            self._level.set_property("interval", 50 * 10**6)  # 50 ms
-            self._playbin.set_property("audio-filter", self._level)
-        else:
-            self._level = None
+        # Level-Element für echte VU-Pegel (L/R), optional Spektrum dahinter, als Audio-Filter
+        audio_filter = self._build_audio_filter()
+        if audio_filter is not None:
+            self._playbin.set_property("audio-filter", audio_filter)
         self._peak_l = -60.0
         self._peak_r = -60.0
         # Expliziten PulseAudio-Sink setzen, damit Ausgabe auf dem gewählten Gerät landet (z. B. Gehäuse-Lautsprecher)
@@ -119,6 +292,10 @@ class GstPlayer:
                 self._playbin.set_property("audio-sink", sink)
         self._bus = self._playbin.get_bus()
         self._bus.add_signal_watch()
+        if self._spectrum is not None:
+            # Spektrum direkt im Streaming-Thread auswerten – unabhängig vom Bus-Poll-Intervall der UI
+            self._bus.enable_sync_message_emission()
+            self._bus.connect("sync-message::element", self._on_sync_element)
 
     def play(self) -> None:
         if self._playbin is None:
@@ -142,6 +319,7 @@ class GstPlayer:
         self._playbin = None
         self._bus = None
         self._level = None
+        self._spectrum = None
         self._peak_l = -60.0
         self._peak_r = -60.0
 
@@ -162,20 +340,13 @@ class GstPlayer:
             peak_val = struct.get_value("peak")
             if peak_val is None:
                 return
-            get_size, get_value = None, None
-            if hasattr(_Gst, "value_holds_array") and _Gst.value_holds_array(peak_val):
-                get_size, get_value = _Gst.ValueArray.get_size, _Gst.ValueArray.get_value
-            elif hasattr(_Gst, "value_holds_list") and _Gst.value_holds_list(peak_val):
-                get_size, get_value = _Gst.ValueList.get_size, _Gst.ValueList.get_value
-            if get_size is None or get_value is None:
+            n, get_value = _value_seq(peak_val)
+            if get_value is None:
                 return
-            n = get_size(peak_val)
             if n >= 1:
-                v0 = get_value(peak_val, 0)
-                self._peak_l = v0.get_double() if hasattr(v0, "get_double") else float(v0)
+                self._peak_l = _as_float(get_value(peak_val, 0))
             if n >= 2:
-                v1 = get_value(peak_val, 1)
-                self._peak_r = v1.get_double() if hasattr(v1, "get_double") else float(v1)
+                self._peak_r = _as_float(get_value(peak_val, 1))
             else:
                 self._peak_r = self._peak_l  # Mono
         except Exception:
@@ -207,7 +378,9 @@ class GstPlayer:
             if msg is None:
                 break
             if msg.type == _Gst.MessageType.ELEMENT:
-                self._parse_level_message(msg)
+                # Spektrum-Nachrichten sind bereits im Sync-Handler verarbeitet
+                if self._spectrum is None or msg.src != self._spectrum:
+                    self._parse_level_message(msg)
                 continue
             if msg.type == _Gst.MessageType.EOS:
                 self.stop()
@@ -0,0 +1,360 @@
+# PI-Installer DSI Radio – gemeinsamer Netz-Worker
+# Ein begrenzter Thread-Pool statt Ad-hoc-Threads je Sender/Abruf, Keep-Alive-Verbindungen je Host,
+# Prioritäten (sichtbare Zeilen zuerst) und Abbruch ganzer Gruppen (z. B. Icons einer geschlossenen Liste).
+# Logos/Favicons landen zusätzlich in einem Plattencache, damit Senderliste und Anzeige sie nur einmal laden.
+
+from typing import Optional, Callable, Any, Dict, List, Tuple
+import hashlib
+import heapq
+import http.client
+import itertools
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+IO_WORKERS = 4  # genug für Icons + Metadaten parallel, ohne den Pi mit Threads zu fluten
+MAX_IDLE_PER_HOST = 2
+MAX_REDIRECTS = 5
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# Prioritäten: kleiner = früher
+PRIO_UI = 0  # Backend-LED, aktuelles Logo
+PRIO_METADATA = 10
+PRIO_ICON_VISIBLE = 20
+PRIO_ICON_AHEAD = 40
+
+_CACHE_BASE = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+LOGO_CACHE_DIR = os.path.join(_CACHE_BASE, "pi-installer-dsi-radio", "logos")
+LOGO_CACHE_TTL_SEC = 7 * 24 * 3600
+LOGO_CACHE_MAX_FILES = 1000
+
+
+class HttpStatusError(OSError):
+    """HTTP-Antwort >= 400 (entspricht urllib HTTPError für die Aufrufer)."""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+
+
+class HttpResult:
+    __slots__ = ("status", "headers", "body", "url")
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, url: str):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+
+def _split_url(url: str) -> Tuple[Tuple[str, str, int], str]:
+    p = urllib.parse.urlsplit(url)
+    scheme = (p.scheme or "http").lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Nicht unterstütztes Schema: {scheme}")
+    port = p.port or (443 if scheme == "https" else 80)
+    path = p.path or "/"
+    if p.query:
+        path += "?" + p.query
+    return (scheme, p.hostname or "", port), path
+
+
+class HttpPool:
+    """Kleiner Keep-Alive-Pool auf Basis von http.client (je Host wenige Leerlauf-Verbindungen)."""
+
+    def __init__(self, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self._max_idle = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl = ssl.create_default_context()
+
+    def _new_conn(self, key: Tuple[str, str, int], timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _take(self, key: Tuple[str, str, int], timeout: float):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._new_conn(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _give(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for lst in self._idle.values() for c in lst]
+            self._idle.clear()
+        for c in conns:
+            c.close()
+
+    def _send(self, url: str, headers: Dict[str, str], timeout: float, pooled: bool):
+        key, path = _split_url(url)
+        conn, reused = self._take(key, timeout) if pooled else (self._new_conn(key, timeout), False)
+        try:
+            conn.request("GET", path, headers=headers)
+            return key, conn, conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+        # Wiederverwendete Verbindung war vom Server schon geschlossen → einmal frisch versuchen
+        conn = self._new_conn(key, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            return key, conn, conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0,
+            max_bytes: int = MAX_BODY_BYTES) -> HttpResult:
+        """GET mit Redirects; Verbindung geht danach zurück in den Pool. Wirft HttpStatusError ab 400."""
+        hdrs = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            key, conn, resp = self._send(url, hdrs, timeout, pooled=True)
+            location = resp.getheader("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                resp.read()
+                self._release(key, conn, resp)
+                url = urllib.parse.urljoin(url, location)
+                continue
+            try:
+                body = resp.read(max_bytes + 1)
+            except Exception:
+                conn.close()
+                raise
+            if len(body) > max_bytes:
+                conn.close()
+                raise OSError(f"Antwort zu groß: {url}")
+            self._release(key, conn, resp)
+            if resp.status >= 400:
+                raise HttpStatusError(resp.status, url)
+            return HttpResult(resp.status, {k.lower(): v for k, v in resp.getheaders()}, body, url)
+        raise OSError(f"Zu viele Weiterleitungen: {url}")
+
+    def open_stream(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0):
+        """Eigene Verbindung für Endlos-Streams (ICY); Aufrufer schließt sie mit conn.close()."""
+        hdrs = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            _key, conn, resp = self._send(url, hdrs, timeout, pooled=False)
+            location = resp.getheader("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                conn.close()
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                conn.close()
+                raise HttpStatusError(resp.status, url)
+            return conn, resp
+        raise OSError(f"Zu viele Weiterleitungen: {url}")
+
+    def _release(self, key, conn, resp) -> None:
+        if resp.will_close or not resp.isclosed():
+            conn.close()
+        else:
+            self._give(key, conn)
+
+
+class LogoCache:
+    """Plattencache für Logos/Favicons (Schlüssel = Quelle, Ablauf nach TTL)."""
+
+    def __init__(self, directory: str = LOGO_CACHE_DIR, ttl_sec: int = LOGO_CACHE_TTL_SEC):
+        self._dir = directory
+        self._ttl = ttl_sec
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, key: str) -> Optional[bytes]:
+        p = self._path(key)
+        try:
+            if time.time() - os.stat(p).st_mtime > self._ttl:
+                return None
+            with open(p, "rb") as f:
+                return f.read() or None
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        if not data:
+            return
+        p = self._path(key)
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            tmp = f"{p}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, p)
+        except OSError:
+            pass
+
+    def prune(self, max_files: int = LOGO_CACHE_MAX_FILES) -> None:
+        """Abgelaufene Einträge (TTL) löschen, danach die ältesten über max_files hinaus."""
+        try:
+            entries = [e for e in os.scandir(self._dir) if e.is_file(follow_symlinks=False)]
+        except OSError:
+            return
+        cutoff = time.time() - self._ttl
+        stamped = []
+        for e in entries:
+            try:
+                stamped.append((e.stat(follow_symlinks=False).st_mtime, e.path))
+            except OSError:
+                continue
+        stamped.sort()
+        keep = [item for item in stamped if item[0] >= cutoff]
+        drop = [path for mtime, path in stamped if mtime < cutoff]
+        drop += [path for _mtime, path in keep[: max(0, len(keep) - max_files)]]
+        for path in drop:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class _Job:
+    __slots__ = ("fn", "callback", "group", "key", "priority", "cancelled", "running")
+
+    def __init__(self, fn: Callable[[], Any], callback: Optional[Callable[[Any], None]], group: str,
+                 key: Optional[str], priority: int):
+        self.fn = fn
+        self.callback = callback
+        self.group = group
+        self.key = key
+        self.priority = priority
+        self.cancelled = False
+        self.running = False
+
+
+class IoWorker(QObject):
+    """Begrenzter Worker-Pool mit Prioritätswarteschlange.
+    Ergebnisse gehen per Signal in den Thread dieses Objekts (GUI-Thread) und dort an callback(result)."""
+
+    _finished = pyqtSignal(object, object)
+
+    def __init__(self, workers: int = IO_WORKERS, parent=None):
+        super().__init__(parent)
+        self._heap: List[Tuple[int, int, _Job]] = []
+        self._by_key: Dict[str, _Job] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._finished.connect(self._deliver)
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._run, name=f"dsi-radio-io-{i}", daemon=True).start()
+
+    def submit(self, fn: Callable[[], Any], *, priority: int = PRIO_METADATA,
+               callback: Optional[Callable[[Any], None]] = None, group: str = "", key: Optional[str] = None) -> bool:
+        """Auftrag einreihen; False, wenn derselbe key schon läuft oder wartet.
+        Wartet er mit niedrigerer Priorität, wird er mit der neuen Priorität neu eingereiht."""
+        with self._cond:
+            if key is not None:
+                old = self._by_key.get(key)
+                if old is not None and not old.cancelled:
+                    if not old.running and priority < old.priority:
+                        old.cancelled = True
+                        job = _Job(old.fn, old.callback, group or old.group, key, priority)
+                        self._by_key[key] = job
+                        heapq.heappush(self._heap, (priority, next(self._seq), job))
+                        self._cond.notify()
+                    return False
+            job = _Job(fn, callback, group, key, priority)
+            if key is not None:
+                self._by_key[key] = job
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._cond.notify()
+        return True
+
+    def is_pending(self, key: str) -> bool:
+        with self._cond:
+            return key in self._by_key
+
+    def cancel(self, keys) -> None:
+        with self._cond:
+            for k in keys:
+                job = self._by_key.pop(k, None)
+                if job is not None:
+                    job.cancelled = True
+
+    def cancel_group(self, group: str) -> None:
+        """Wartende Aufträge der Gruppe verwerfen; laufende liefern kein Ergebnis mehr."""
+        with self._cond:
+            for job in [j for _p, _s, j in self._heap] + list(self._by_key.values()):
+                if job.group == group and not job.cancelled:
+                    job.cancelled = True
+                    if job.key is not None and self._by_key.get(job.key) is job:
+                        del self._by_key[job.key]
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                _p, _s, job = heapq.heappop(self._heap)
+                if job.cancelled:
+                    continue
+                job.running = True
+            try:
+                result = job.fn()
+            except Exception:
+                result = None
+            with self._cond:
+                if job.key is not None and self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+            if job.callback is not None and not job.cancelled:
+                self._finished.emit(job.callback, result)
+
+    @pyqtSlot(object, object)
+    def _deliver(self, callback: Callable[[Any], None], result: Any) -> None:
+        try:
+            callback(result)
+        except Exception:
+            pass
+
+
+_pool: Optional[HttpPool] = None
+_worker: Optional[IoWorker] = None
+_logo_cache: Optional[LogoCache] = None
+_init_lock = threading.Lock()
+
+
+def http_pool() -> HttpPool:
+    global _pool
+    with _init_lock:
+        if _pool is None:
+            _pool = HttpPool()
+        return _pool
+
+
+def logo_cache() -> LogoCache:
+    global _logo_cache
+    with _init_lock:
+        if _logo_cache is None:
+            _logo_cache = LogoCache()
+        return _logo_cache
+
+
+def io_worker() -> IoWorker:
+    """Gemeinsamer Worker; erster Aufruf muss im GUI-Thread erfolgen (Signal-Zustellung)."""
+    global _worker
+    with _init_lock:
+        if _worker is None:
+            _worker = IoWorker()
+        return _worker
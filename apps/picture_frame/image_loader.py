@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Bildlader für den PI-Installer Bilderrahmen.
+Dekodiert Bilder im Hintergrund (QThreadPool) direkt in reduzierter Auflösung
+(QImageReader.setScaledSize), setzt den weißen Rahmen schon im Worker und legt
+das fertige Rahmenbild als Vorschaubild auf der Platte ab. Schlüssel ist
+(Pfad, mtime, Dateigröße, Zielgröße) – geänderte Bilder werden neu dekodiert.
+Im Speicher bleiben nur wenige fertige Bilder (LRU, Schlüssel (Pfad, mtime,
+Dateigröße)), damit der Pi nicht vollläuft.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QImageReader, QPainter
+
+CACHE_BASE = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+THUMB_CACHE_DIR = os.path.join(CACHE_BASE, "pi-installer-picture-frame", "frames")
+THUMB_CACHE_MAX_FILES = 500  # ältere Vorschaubilder werden beim Aufräumen entfernt
+THUMB_JPEG_QUALITY = 92
+MEMORY_CACHE_ITEMS = 6  # ca. 1,5 MB je 480×800-Bild
+PREFETCH_COUNT = 2
+
+
+def _file_key(path: str, width: int, height: int, border: int):
+    """Schlüssel (Pfad, mtime, Größe, Zielgröße) oder None, wenn die Datei fehlt."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}|{border}"
+
+
+def _memory_key(path: str):
+    """Schlüssel (Pfad, mtime_ns, Größe) für den Speicher-LRU oder None, wenn die Datei fehlt."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _cache_file(key: str) -> str:
+    return os.path.join(THUMB_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg")
+
+
+def _decode_scaled(path: str, inner_w: int, inner_h: int) -> QImage:
+    """Dekodiert passend zur Zielgröße; JPEG wird dabei schon im Decoder verkleinert."""
+    reader = QImageReader(path)
+    src = reader.size()
+    if src.isValid() and src.width() > 0 and src.height() > 0:
+        target = src.scaled(inner_w, inner_h, Qt.AspectRatioMode.KeepAspectRatio)
+        if target.width() < src.width() or target.height() < src.height():
+            reader.setScaledSize(QSize(max(1, target.width()), max(1, target.height())))
+    img = reader.read()
+    if img.isNull():
+        return img
+    if img.width() > inner_w or img.height() > inner_h or (img.width() < inner_w and img.height() < inner_h):
+        img = img.scaled(
+            inner_w, inner_h,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+    return img
+
+
+def render_frame(path: str, width: int, height: int, border: int) -> QImage:
+    """Liefert das fertige Rahmenbild (weißer Rand, Bild zentriert); nutzt den Plattencache."""
+    key = _file_key(path, width, height, border)
+    if key is None:
+        return QImage()
+    cached = _cache_file(key)
+    if os.path.isfile(cached):
+        img = QImage(cached)
+        if not img.isNull() and img.width() == width and img.height() == height:
+            return img
+    inner_w = width - 2 * border
+    inner_h = height - 2 * border
+    scaled = _decode_scaled(path, inner_w, inner_h)
+    if scaled.isNull():
+        return scaled
+    out = QImage(width, height, QImage.Format.Format_RGB32)
+    out.fill(QColor(255, 255, 255))
+    painter = QPainter(out)
+    painter.drawImage(border + (inner_w - scaled.width()) // 2, border + (inner_h - scaled.height()) // 2, scaled)
+    painter.end()
+    try:
+        os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+        tmp = cached + ".tmp"
+        if out.save(tmp, "JPEG", THUMB_JPEG_QUALITY):
+            os.replace(tmp, cached)
+    except OSError:
+        pass
+    return out
+
+
+def prune_thumb_cache(max_files: int = THUMB_CACHE_MAX_FILES) -> None:
+    """Hält den Plattencache klein: älteste Dateien (nach Zugriff) zuerst löschen."""
+    try:
+        entries = [e for e in os.scandir(THUMB_CACHE_DIR) if e.is_file(follow_symlinks=False)]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_atime)
+    for e in entries[: len(entries) - max_files]:
+        try:
+            os.unlink(e.path)
+        except OSError:
+            pass
+
+
+class _Signals(QObject):
+    done = pyqtSignal(int, str, QImage)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, generation: int, path: str, size: tuple, signals: _Signals):
+        super().__init__()
+        self._generation = generation
+        self._path = path
+        self._size = size
+        self._signals = signals
+
+    def run(self):
+        try:
+            img = render_frame(self._path, *self._size)
+        except Exception:
+            img = QImage()
+        self._signals.done.emit(self._generation, self._path, img)
+
+
+class FrameLoader(QObject):
+    """
+    Asynchroner Lader mit kleinem LRU-Speichercache.
+    loaded(path, QImage) bzw. failed(path) kommen im GUI-Thread an.
+    """
+    loaded = pyqtSignal(str, QImage)
+    failed = pyqtSignal(str)
+
+    def __init__(self, width: int, height: int, border: int, parent=None, max_items: int = MEMORY_CACHE_ITEMS):
+        super().__init__(parent)
+        self._size = (width, height, border)
+        self._max_items = max(2, max_items)
+        self._cache: "OrderedDict[tuple, QImage]" = OrderedDict()
+        self._pending: dict = {}  # Pfad -> Speicherschlüssel beim Anfordern
+        self._generation = 0
+        self._pool = QThreadPool(self)
+        # Ein Decoder für die Anzeige, einer für Prefetch – mehr bremst den Pi nur aus
+        self._pool.setMaxThreadCount(2)
+        self._signals = _Signals()
+        self._signals.done.connect(self._on_done)
+
+    def get(self, path: str):
+        """Fertiges Bild aus dem Speicher oder None (auch wenn sich die Datei inzwischen geändert hat)."""
+        key = _memory_key(path)
+        img = self._cache.get(key) if key is not None else None
+        if img is not None:
+            self._cache.move_to_end(key)
+        return img
+
+    def request(self, path: str, priority: int = 1) -> None:
+        key = _memory_key(path)
+        if (key is not None and key in self._cache) or path in self._pending:
+            return
+        self._pending[path] = key
+        self._pool.start(_DecodeTask(self._generation, path, self._size, self._signals), priority)
+
+    def prefetch(self, paths: list) -> None:
+        for p in paths:
+            self.request(p, priority=0)
+
+    def reset(self) -> None:
+        """Ordnerwechsel: Warteschlange leeren, laufende Ergebnisse verwerfen."""
+        self._generation += 1
+        self._pool.clear()
+        self._pending.clear()
+        self._cache.clear()
+
+    def forget(self, paths) -> None:
+        paths = set(paths)
+        for key in [k for k in self._cache if k[0] in paths]:
+            del self._cache[key]
+
+    def _on_done(self, generation: int, path: str, img: QImage):
+        if generation != self._generation:
+            return
+        key = self._pending.pop(path, None)
+        if img.isNull():
+            self.failed.emit(path)
+            return
+        if key is not None:
+            # Ältere Fassungen desselben Bildes belegen keinen LRU-Platz mehr
+            self.forget([path])
+            self._cache[key] = img
+            while len(self._cache) > self._max_items:
+                self._cache.popitem(last=False)
+        self.loaded.emit(path, img)
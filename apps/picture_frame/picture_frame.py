@@ -33,7 +33,7 @@ from PyQt6.QtWidgets import (
     QFrame,
     QScrollArea,
 )
-from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, QPropertyAnimation, QEasingCurve, QRect
+from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, QPropertyAnimation, QEasingCurve, QRect, QFileSystemWatcher
 from PyQt6.QtGui import (
     QPixmap,
     QImage,
@@ -59,6 +59,12 @@ try:
 except ImportError:
     import themes
 
+# Hintergrund-Decoder mit Vorschau-Cache
+try:
+    from . import image_loader
+except ImportError:
+    import image_loader
+
 APP_VERSION = "1.0.0"
 WINDOW_TITLE = "PI-Installer Bilderrahmen"
 _APP_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -81,6 +87,12 @@ FRAME_WIDTH = 480
 FRAME_HEIGHT = 800
 WHITE_FRAME_PX = 4  # weißer Rahmen um jedes Bild (oben, unten, links, rechts)
 
+# Symbol-Animation: Bildraten-Obergrenze; Bewegung bezieht sich auf 20 fps (50 ms je Schritt)
+SYMBOL_FPS_DEFAULT = 20
+SYMBOL_FPS_RANGE = (5, 30)
+_SYMBOL_BASE_TICK_MS = 50
+OVERLAY_CACHE_ITEMS = 32  # vorgerenderte Texte/Symbole je Cache
+
 
 def load_config():
     import json
@@ -94,6 +106,7 @@ def load_config():
         "show_clock": False,
         "symbol_size": 32,
         "symbol_speed": 1.0,
+        "symbol_fps": SYMBOL_FPS_DEFAULT,
     }
     try:
         if os.path.isfile(CONFIG_FILE):
@@ -121,10 +134,14 @@ def list_images(folder: str) -> list:
     if not folder or not os.path.isdir(folder):
         return []
     out = []
-    for name in os.listdir(folder):
-        p = os.path.join(folder, name)
-        if os.path.isfile(p) and Path(p).suffix.lower() in IMAGE_EXTENSIONS:
-            out.append(p)
+    try:
+        # scandir liefert den Dateityp aus dem Verzeichniseintrag – kein stat() je Datei
+        with os.scandir(folder) as it:
+            for entry in it:
+                if Path(entry.name).suffix.lower() in IMAGE_EXTENSIONS and entry.is_file():
+                    out.append(entry.path)
+    except OSError:
+        return []
     return sorted(out)
 
 
@@ -180,6 +197,93 @@ def _load_symbol_pixmaps(theme_id: str, size: int) -> list:
     return pixmaps
 
 
+# ---- Overlay-Cache: Text mit Kontur und Symbol-Hintergründe nur einmal rendern ----
+
+_TEXT_CACHE: dict = {}
+_SPRITE_CACHE: dict = {}
+
+
+def _cache_put(cache: dict, key, value):
+    if len(cache) >= OVERLAY_CACHE_ITEMS:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+    return value
+
+
+def _outlined_text(text: str, point_size: int, outline_px: int, fill: QColor):
+    """Text mit schwarzer Kontur als transparentes Pixmap.
+    Liefert (pixmap, dx, dy, advance): gezeichnet wird bei (x + dx, y + dy), y = Grundlinie.
+    """
+    key = (text, point_size, outline_px, fill.rgba())
+    hit = _TEXT_CACHE.get(key)
+    if hit is not None:
+        return hit
+    font = QFont()
+    font.setPointSize(point_size)
+    path = QPainterPath()
+    path.addText(0, 0, font, text)
+    r = path.boundingRect().adjusted(-outline_px, -outline_px, outline_px, outline_px).toAlignedRect()
+    pix = QPixmap(max(1, r.width()), max(1, r.height()))
+    pix.fill(Qt.GlobalColor.transparent)
+    p = QPainter(pix)
+    p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    p.translate(-r.x(), -r.y())
+    p.setPen(QPen(QColor(0, 0, 0), outline_px))
+    p.setBrush(Qt.BrushStyle.NoBrush)
+    p.drawPath(path)
+    p.setPen(Qt.PenStyle.NoPen)
+    p.setBrush(fill)
+    p.drawPath(path)
+    p.end()
+    return _cache_put(_TEXT_CACHE, key, (pix, r.x(), r.y(), QFontMetrics(font).horizontalAdvance(text)))
+
+
+def _emoji_font(point_size: int) -> QFont:
+    font = QFont()
+    font.setPointSize(point_size)
+    for name in ("Noto Color Emoji", "Apple Color Emoji", "Segoe UI Emoji", "Sans"):
+        font.setFamily(name)
+        if font.exactMatch() or name == "Sans":
+            break
+    return font
+
+
+def _sprite_base(symbol: str, size: int) -> QPixmap:
+    """Hintergrund (heller Kreis, roter Punkt) und ggf. Emoji eines Symbols, Box 2×size."""
+    key = (symbol, size)
+    hit = _SPRITE_CACHE.get(key)
+    if hit is not None:
+        return hit
+    pix = QPixmap(size * 2, size * 2)
+    pix.fill(Qt.GlobalColor.transparent)
+    p = QPainter(pix)
+    p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    p.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+    p.setPen(Qt.PenStyle.NoPen)
+    p.setBrush(QColor(255, 255, 255, 200))
+    p.drawEllipse(2, 2, size - 4, size - 4)
+    r = max(10, size // 3)
+    p.setPen(QPen(QColor(180, 0, 50), 2))
+    p.setBrush(QColor(220, 50, 80))
+    p.drawEllipse(size // 2 - r, size // 2 - r, r * 2, r * 2)
+    if symbol:
+        p.setFont(_emoji_font(max(20, min(size, 40))))
+        p.setPen(QColor(255, 255, 255))
+        p.setBrush(Qt.BrushStyle.NoBrush)
+        p.drawText(QRect(0, 0, size * 2, size * 2), Qt.AlignmentFlag.AlignCenter, symbol)
+    p.end()
+    return _cache_put(_SPRITE_CACHE, key, pix)
+
+
+def _fps_interval_ms(fps) -> int:
+    try:
+        fps = int(fps)
+    except (TypeError, ValueError):
+        fps = SYMBOL_FPS_DEFAULT
+    fps = max(SYMBOL_FPS_RANGE[0], min(SYMBOL_FPS_RANGE[1], fps))
+    return max(1, 1000 // fps)
+
+
 # ---- Overlay-Widget: Datum, Text, animierte Symbole ----
 
 class SymbolSprite:
@@ -195,9 +299,16 @@ class SymbolSprite:
         self.dy = 1.5 + random.random() * 2.0 if animation_type == "rain" else (random.random() - 0.5) * 0.8
         self.alpha = 180 + int(75 * random.random())
 
-    def step(self, width: int, height: int):
-        self.x += self.dx
-        self.y += self.dy
+    def rect(self, margin: int = 1) -> QRect:
+        """Bildschirmbereich des Symbols (Box 2×size plus Rand) – für Teil-Neuzeichnen."""
+        return QRect(
+            int(self.x) - margin, int(self.y) - margin,
+            self.size * 2 + 2 * margin, self.size * 2 + 2 * margin,
+        )
+
+    def step(self, width: int, height: int, factor: float = 1.0):
+        self.x += self.dx * factor
+        self.y += self.dy * factor
         if self.animation_type == "rain":
             if self.y > height + self.size:
                 self.y = -self.size
@@ -223,15 +334,24 @@ class OverlayWidget(QWidget):
         self.symbol_size = 32
         self.theme_animation = "none"
         self.black_symbols = False  # nur bei Halloween
+        self._interval_ms = _SYMBOL_BASE_TICK_MS
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._on_tick)
-        self._timer.start(50)
+        self._timer.start(self._interval_ms)
+
+    def set_frame_rate(self, fps):
+        self._interval_ms = _fps_interval_ms(fps)
+        self._timer.start(self._interval_ms)
 
     def set_date_text(self, text: str):
-        self.date_text = text
+        if text != self.date_text:
+            self.date_text = text
+            self.update()
 
     def set_theme_text(self, text: str):
-        self.theme_text = text
+        if text != self.theme_text:
+            self.theme_text = text
+            self.update()
 
     def set_symbols_from_theme(self, theme_id: str, theme_symbols: list, animation: str, size: int, black_symbols: bool = False):
         self.symbol_size = size
@@ -273,9 +393,13 @@ class OverlayWidget(QWidget):
             w = max(w, p.width())
             h = max(h, p.height())
         w, h = max(w, 1), max(h, 1)
+        factor = self._interval_ms / _SYMBOL_BASE_TICK_MS
         for s in self.symbols:
-            s.step(w, h)
-        self.update()
+            # Nur alte und neue Position neu zeichnen, nicht das ganze Overlay;
+            # Emoji-Glyphen ragen über die Grundlinie hinaus → großzügiger Rand
+            before = s.rect(s.size)
+            s.step(w, h, factor)
+            self.update(before.united(s.rect(s.size)))
 
     def paintEvent(self, event):
         super().paintEvent(event)
@@ -283,48 +407,24 @@ class OverlayWidget(QWidget):
         p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         p.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
 
-        # Datum (oben rechts)
+        # Datum (oben rechts) und Themen-Text (unten Mitte) aus dem Text-Cache
         if self.date_text:
-            font = QFont()
-            font.setPointSize(max(10, min(24, self.width() // 30)))
-            p.setFont(font)
-            fm = QFontMetrics(font)
-            rect = fm.boundingRect(self.date_text)
-            x = self.width() - rect.width() - 20
-            y = 30
-            path = QPainterPath()
-            path.addText(0, 0, font, self.date_text)
-            p.setPen(QPen(QColor(0, 0, 0), 3))
-            p.setBrush(Qt.BrushStyle.NoBrush)
-            p.translate(x, y)
-            p.drawPath(path)
-            p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QColor(255, 255, 255))
-            p.drawPath(path)
-            p.translate(-x, -y)
-
-        # Themen-Text (unten Mitte)
+            pix, dx, dy, adv = _outlined_text(
+                self.date_text, max(10, min(24, self.width() // 30)), 3, QColor(255, 255, 255)
+            )
+            p.drawPixmap(self.width() - adv - 20 + dx, 30 + dy, pix)
         if self.theme_text:
-            font = QFont()
-            font.setPointSize(max(12, min(28, self.width() // 25)))
-            p.setFont(font)
-            fm = QFontMetrics(font)
-            tw = fm.horizontalAdvance(self.theme_text)
-            x = (self.width() - tw) // 2
-            y = self.height() - 40
-            path = QPainterPath()
-            path.addText(0, 0, font, self.theme_text)
-            p.setPen(QPen(QColor(0, 0, 0), 4))
-            p.setBrush(Qt.BrushStyle.NoBrush)
-            p.translate(x, y)
-            p.drawPath(path)
-            p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QColor(255, 255, 220))
-            p.drawPath(path)
-            p.translate(-x, -y)
+            pix, dx, dy, adv = _outlined_text(
+                self.theme_text, max(12, min(28, self.width() // 25)), 4, QColor(255, 255, 220)
+            )
+            p.drawPixmap((self.width() - adv) // 2 + dx, self.height() - 40 + dy, pix)
 
         # Symbole: Bild-Icons (rechtefrei) oder Emoji (schwarz nur bei Halloween)
+        emoji_font = QFont()
+        emoji_font.setPointSize(self.symbol_size)
         for s in self.symbols:
+            if not event.rect().intersects(s.rect(s.size)):
+                continue
             if s.pixmap and not s.pixmap.isNull():
                 if self.black_symbols:
                     p.setCompositionMode(QPainter.CompositionMode.CompositionMode_Multiply)
@@ -335,9 +435,7 @@ class OverlayWidget(QWidget):
                 p.setOpacity(1.0)
                 p.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
             else:
-                font = QFont()
-                font.setPointSize(s.size)
-                p.setFont(font)
+                p.setFont(emoji_font)
                 if self.black_symbols:
                     p.setPen(Qt.PenStyle.NoPen)
                     p.setBrush(QColor(0, 0, 0))
@@ -350,37 +448,63 @@ class OverlayWidget(QWidget):
 # ---- Kombinierter Anzeige-Widget (Bild + Overlay in einem paintEvent → Symbole garantiert sichtbar) ----
 
 class PictureDisplayWidget(QWidget):
-    """Zeichnet Bild (mit weißem Rahmen), Datum, Thema-Text und Symbole in einem paintEvent."""
+    """Zeichnet Bild (mit weißem Rahmen), Datum, Thema-Text und Symbole in einem paintEvent.
+    Bild, Texte und Fallback-Herzen liegen vorgerendert in einem Basis-Pixmap, das nur bei
+    Änderung von Bild/Text/Thema/Größe neu entsteht. Pro Animationsschritt werden nur die
+    Bereiche alter und neuer Symbolpositionen neu gezeichnet.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(FRAME_WIDTH, FRAME_HEIGHT)
         self.setStyleSheet("background: #000000;")
+        # paintEvent deckt jede Fläche selbst ab → kein Löschen des Hintergrunds nötig
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
         self._pixmap = None
         self._no_images_msg = ""
+        self._base = None
         self.date_text = ""
         self.theme_text = ""
         self.symbols: list[SymbolSprite] = []
         self.symbol_size = 32
         self.black_symbols = False
+        self._interval_ms = _SYMBOL_BASE_TICK_MS
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._on_tick)
-        self._timer.start(50)
+
+    def _invalidate_base(self):
+        self._base = None
+        self.update()
+
+    def _sync_timer(self):
+        # Ohne Symbole oder unsichtbar: keine Ticks
+        if self.symbols and self.isVisible():
+            self._timer.start(self._interval_ms)
+        else:
+            self._timer.stop()
+
+    def set_frame_rate(self, fps):
+        self._interval_ms = _fps_interval_ms(fps)
+        self._sync_timer()
 
     def set_pixmap(self, pix: QPixmap):
         self._pixmap = pix
         self._no_images_msg = ""
-        self.update()
+        self._invalidate_base()
 
     def set_no_images_message(self, msg: str):
         self._no_images_msg = msg
         self._pixmap = None
-        self.update()
+        self._invalidate_base()
 
     def set_date_text(self, text: str):
-        self.date_text = text
+        if text != self.date_text:
+            self.date_text = text
+            self._invalidate_base()
 
     def set_theme_text(self, text: str):
-        self.theme_text = text
+        if text != self.theme_text:
+            self.theme_text = text
+            self._invalidate_base()
 
     def set_symbols_from_theme(self, theme_id: str, theme_symbols: list, animation: str, size: int, black_symbols: bool = False):
         self.symbol_size = size
@@ -408,113 +532,96 @@ class PictureDisplayWidget(QWidget):
             for s in self.symbols:
                 s.y = random.randint(-h * 2, h)
                 s.x = random.randint(0, max(0, w - size))
-        self.update()
+        # Fallback-Herzen hängen davon ab, ob Symbole da sind
+        self._invalidate_base()
+        self._sync_timer()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._sync_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._sync_timer()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._base = None
 
     def _on_tick(self):
         w, h = max(self.width(), 1), max(self.height(), 1)
+        factor = self._interval_ms / _SYMBOL_BASE_TICK_MS
+        bounds = self.rect()
         for s in self.symbols:
-            s.step(w, h)
-        self.update()
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        p = QPainter(self)
+            before = s.rect()
+            s.step(w, h, factor)
+            dirty = before.united(s.rect()).intersected(bounds)
+            if not dirty.isEmpty():
+                self.update(dirty)
+
+    def _render_base(self) -> QPixmap:
+        """Statische Ebene: Hintergrund, Bild, Hinweis, Datum, Themen-Text, Fallback."""
+        base = QPixmap(max(1, self.width()), max(1, self.height()))
+        base.fill(QColor(0, 0, 0))
+        p = QPainter(base)
         p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         p.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
-        # 1) Hintergrund + Bild
-        p.fillRect(self.rect(), QColor(0, 0, 0))
+        # 1) Bild
         if self._pixmap and not self._pixmap.isNull():
             p.drawPixmap(0, 0, self._pixmap)
         elif self._no_images_msg:
             p.setPen(QColor(200, 200, 200))
             p.setFont(QFont("Sans", 12))
-            p.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self._no_images_msg)
+            p.drawText(base.rect(), Qt.AlignmentFlag.AlignCenter, self._no_images_msg)
         # 2) Datum
         if self.date_text:
-            font = QFont()
-            font.setPointSize(max(10, min(24, self.width() // 30)))
-            p.setFont(font)
-            fm = QFontMetrics(font)
-            x = self.width() - fm.horizontalAdvance(self.date_text) - 20
-            y = 30
-            path = QPainterPath()
-            path.addText(0, 0, font, self.date_text)
-            p.setPen(QPen(QColor(0, 0, 0), 3))
-            p.setBrush(Qt.BrushStyle.NoBrush)
-            p.translate(x, y)
-            p.drawPath(path)
-            p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QColor(255, 255, 255))
-            p.drawPath(path)
-            p.translate(-x, -y)
+            pix, dx, dy, adv = _outlined_text(
+                self.date_text, max(10, min(24, self.width() // 30)), 3, QColor(255, 255, 255)
+            )
+            p.drawPixmap(self.width() - adv - 20 + dx, 30 + dy, pix)
         # 3) Themen-Text
         if self.theme_text:
-            font = QFont()
-            font.setPointSize(max(12, min(28, self.width() // 25)))
-            p.setFont(font)
-            fm = QFontMetrics(font)
-            tw = fm.horizontalAdvance(self.theme_text)
-            x = (self.width() - tw) // 2
-            y = self.height() - 40
-            path = QPainterPath()
-            path.addText(0, 0, font, self.theme_text)
-            p.setPen(QPen(QColor(0, 0, 0), 4))
-            p.setBrush(Qt.BrushStyle.NoBrush)
-            p.translate(x, y)
-            p.drawPath(path)
-            p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QColor(255, 255, 220))
-            p.drawPath(path)
-            p.translate(-x, -y)
-        # 4) Symbole (Icons oder Emoji) – dezent hinterlegt, dann Symbol gut sichtbar
-        p.setOpacity(1.0)
-        p.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
-        for s in self.symbols:
-            rx, ry = int(s.x), int(s.y)
-            box = QRect(rx, ry, s.size * 2, s.size * 2)
-            # Leichter Hintergrund, damit Symbol auf jedem Foto lesbar ist
-            p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QColor(255, 255, 255, 200))
-            p.drawEllipse(rx + 2, ry + 2, s.size - 4, s.size - 4)
-            # Immer sichtbares Symbol: roter Kreis in der Mitte (Herz-Ersatz)
-            r = max(10, s.size // 3)
-            cx = rx + s.size // 2
-            cy = ry + s.size // 2
-            p.setPen(QPen(QColor(180, 0, 50), 2))
-            p.setBrush(QColor(220, 50, 80))
-            p.drawEllipse(int(cx - r), int(cy - r), r * 2, r * 2)
-            # Optional: Icon oder Emoji darüber (falls sichtbar)
-            if s.pixmap and not s.pixmap.isNull():
-                p.setOpacity(max(0.95, s.alpha / 255.0))
-                if self.black_symbols:
-                    p.setCompositionMode(QPainter.CompositionMode.CompositionMode_Multiply)
-                p.drawPixmap(rx, ry, s.size, s.size, s.pixmap)
-                p.setOpacity(1.0)
-                p.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
-            else:
-                pts = max(20, min(s.size, 40))
-                font = QFont()
-                font.setPointSize(pts)
-                for name in ("Noto Color Emoji", "Apple Color Emoji", "Segoe UI Emoji", "Sans"):
-                    font.setFamily(name)
-                    if font.exactMatch() or name == "Sans":
-                        break
-                p.setFont(font)
-                p.setPen(QColor(255, 255, 255))
-                p.setBrush(Qt.BrushStyle.NoBrush)
-                p.drawText(box, Qt.AlignmentFlag.AlignCenter, s.symbol)
+            pix, dx, dy, adv = _outlined_text(
+                self.theme_text, max(12, min(28, self.width() // 25)), 4, QColor(255, 255, 220)
+            )
+            p.drawPixmap((self.width() - adv) // 2 + dx, self.height() - 40 + dy, pix)
         # 5) Fallback wenn keine Symbole (z. B. Thema „Kein Thema“)
         if not self.symbols:
+            p.setPen(Qt.PenStyle.NoPen)
             p.setBrush(QColor(220, 80, 80))
             for (px, py) in [(80, 120), (200, 350), (320, 580)]:
                 p.drawEllipse(px, py, 50, 50)
-            p.setBrush(QColor(255, 255, 255))
+            p.setPen(QColor(255, 255, 255))
             font = QFont()
             font.setPointSize(36)
             p.setFont(font)
             p.drawText(70, 160, "❤")
             p.drawText(190, 390, "❤")
             p.drawText(310, 620, "❤")
+        p.end()
+        return base
+
+    def paintEvent(self, event):
+        if self._base is None or self._base.size() != self.size():
+            self._base = self._render_base()
+        dirty = event.rect()
+        p = QPainter(self)
+        # Basis nur im neu zu zeichnenden Bereich kopieren
+        p.drawPixmap(dirty, self._base, dirty)
+        # 4) Symbole (Icons oder Emoji) – Hintergrund/Emoji vorgerendert, Icon darüber
+        for s in self.symbols:
+            rx, ry = int(s.x), int(s.y)
+            if not dirty.intersects(s.rect()):
+                continue
+            p.drawPixmap(rx, ry, _sprite_base("" if s.pixmap else s.symbol, s.size))
+            if s.pixmap and not s.pixmap.isNull():
+                p.setOpacity(max(0.95, s.alpha / 255.0))
+                if self.black_symbols:
+                    p.setCompositionMode(QPainter.CompositionMode.CompositionMode_Multiply)
+                p.drawPixmap(rx, ry, s.size, s.size, s.pixmap)
+                p.setOpacity(1.0)
+                p.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        p.end()
 
 
 # ---- Hauptfenster ----
@@ -526,6 +633,21 @@ class PictureFrameWindow(QMainWindow):
         self.config = load_config()
         self.image_list = []
         self.current_index = 0
+        self._failed_in_row = 0
+
+        # Dekodieren im Hintergrund; fertige Rahmenbilder kommen per Signal zurück
+        self.loader = image_loader.FrameLoader(FRAME_WIDTH, FRAME_HEIGHT, WHITE_FRAME_PX, self)
+        self.loader.loaded.connect(self._on_frame_loaded)
+        self.loader.failed.connect(self._on_frame_failed)
+        image_loader.prune_thumb_cache()
+
+        # Ordner beobachten statt bei jedem Laden neu aufzulisten; Änderungen gebündelt übernehmen
+        self.folder_watcher = QFileSystemWatcher(self)
+        self.folder_watcher.directoryChanged.connect(self._on_folder_changed)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(1000)
+        self._rescan_timer.timeout.connect(self._rescan_folder)
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -598,12 +720,56 @@ class PictureFrameWindow(QMainWindow):
 
     def load_folder(self):
         folder = self.config.get("picture_folder") or PICTURES_DEFAULT
+        dirs = self.folder_watcher.directories()
+        if dirs:
+            self.folder_watcher.removePaths(dirs)
+        if os.path.isdir(folder):
+            self.folder_watcher.addPath(folder)
+        self.loader.reset()
         self.image_list = list_images(folder)
         if self.config.get("random_order"):
             random.shuffle(self.image_list)
         self.current_index = 0
+        self._failed_in_row = 0
         self.show_current_image()
 
+    def _on_folder_changed(self, _path: str):
+        self._rescan_timer.start()
+
+    def _rescan_folder(self):
+        """Neue Bilder aufnehmen, gelöschte entfernen – Reihenfolge und aktuelles Bild bleiben."""
+        folder = self.config.get("picture_folder") or PICTURES_DEFAULT
+        found = list_images(folder)
+        found_set = set(found)
+        current = self.image_list[self.current_index] if self.image_list else None
+        known = set(self.image_list)
+        removed = known - found_set
+        kept = [p for p in self.image_list if p in found_set]
+        added = [p for p in found if p not in known]
+        if not removed and not added:
+            return
+        self.loader.forget(removed)
+        if self.config.get("random_order"):
+            for p in added:
+                kept.insert(random.randint(0, len(kept)), p)
+        else:
+            kept = sorted(kept + added)
+        self.image_list = kept
+        if current in found_set:
+            self.current_index = kept.index(current)
+            self._prefetch_next()
+        else:
+            self.current_index = min(self.current_index, max(0, len(kept) - 1))
+            self.show_current_image()
+
+    def _upcoming(self, count: int) -> list:
+        n = len(self.image_list)
+        return [self.image_list[(self.current_index + k) % n] for k in range(1, min(count, n - 1) + 1)]
+
+    def _prefetch_next(self):
+        if self.image_list:
+            self.loader.prefetch(self._upcoming(image_loader.PREFETCH_COUNT))
+
     def show_current_image(self):
         if not self.image_list:
             self.display.set_no_images_message(
@@ -611,27 +777,29 @@ class PictureFrameWindow(QMainWindow):
             )
             return
         path = self.image_list[self.current_index]
-        pix = QPixmap(path)
-        if pix.isNull():
-            self.next_image()
+        img = self.loader.get(path)
+        if img is None:
+            # Bisheriges Bild bleibt stehen, bis der Decoder fertig ist
+            self.loader.request(path, priority=2)
             return
-        # Weißer Rahmen 3–4 px; Bild in der Mitte
-        w, h = FRAME_WIDTH, FRAME_HEIGHT
-        inner_w = w - 2 * WHITE_FRAME_PX
-        inner_h = h - 2 * WHITE_FRAME_PX
-        scaled = pix.scaled(
-            inner_w, inner_h,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
-        out = QPixmap(w, h)
-        out.fill(QColor(255, 255, 255))
-        dx = (inner_w - scaled.width()) // 2
-        dy = (inner_h - scaled.height()) // 2
-        painter = QPainter(out)
-        painter.drawPixmap(WHITE_FRAME_PX + dx, WHITE_FRAME_PX + dy, scaled)
-        painter.end()
-        self.display.set_pixmap(out)
+        self._failed_in_row = 0
+        self.display.set_pixmap(QPixmap.fromImage(img))
+        self._prefetch_next()
+
+    def _on_frame_loaded(self, path: str, img: QImage):
+        if self.image_list and self.image_list[self.current_index] == path:
+            self._failed_in_row = 0
+            self.display.set_pixmap(QPixmap.fromImage(img))
+            self._prefetch_next()
+
+    def _on_frame_failed(self, path: str):
+        if not self.image_list or self.image_list[self.current_index] != path:
+            return
+        self._failed_in_row += 1
+        if self._failed_in_row >= len(self.image_list):
+            self.display.set_no_images_message("Keine lesbaren Bilder in diesem Ordner.")
+            return
+        self.next_image()
 
     def next_image(self):
         if not self.image_list:
@@ -653,6 +821,7 @@ class PictureFrameWindow(QMainWindow):
         anim = th.get("animation", "none")
         size = self.config.get("symbol_size", 32)
         black_sym = th.get("black_symbols", False)
+        self.display.set_frame_rate(self.config.get("symbol_fps", SYMBOL_FPS_DEFAULT))
         self.display.set_symbols_from_theme(theme_id, th.get("symbols", []), anim, size, black_symbols=black_sym)
 
     def start_slideshow(self):
@@ -736,6 +905,13 @@ class SettingsDialog(QDialog):
         self.symbol_size_spin.setValue(self.config.get("symbol_size", 32))
         form.addRow("Symbolgröße:", self.symbol_size_spin)
 
+        # Obergrenze für die Symbol-Animation (weniger = weniger CPU-Last)
+        self.symbol_fps_spin = QSpinBox()
+        self.symbol_fps_spin.setRange(*SYMBOL_FPS_RANGE)
+        self.symbol_fps_spin.setSuffix(" fps")
+        self.symbol_fps_spin.setValue(int(self.config.get("symbol_fps", SYMBOL_FPS_DEFAULT)))
+        form.addRow("Animations-Bildrate:", self.symbol_fps_spin)
+
         layout.addLayout(form)
         buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
@@ -759,6 +935,7 @@ class SettingsDialog(QDialog):
         self.config["show_date"] = self.show_date_check.isChecked()
         self.config["show_clock"] = self.show_clock_check.isChecked()
         self.config["symbol_size"] = self.symbol_size_spin.value()
+        self.config["symbol_fps"] = self.symbol_fps_spin.value()
         return self.config
 
 
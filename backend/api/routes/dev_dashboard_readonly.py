@@ -7,7 +7,7 @@ Delegates to core.dev_dashboard* / core.dcc_status_facade — no new file scanne
 from __future__ import annotations
 
 from fastapi import APIRouter, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 router = APIRouter(tags=["dev-dashboard-readonly"])
 
@@ -98,13 +98,17 @@ async def dev_dashboard_status(
         description="Optional: dev | build | unknown — steuert frontend_version_matches_backend.",
     ),
 ):
-    """Read-only: Development Cockpit Gesamtstatus (kein Backup/Restore)."""
+    """Read-only: Development Cockpit Gesamtstatus (kein Backup/Restore).
+
+    Unveränderter Snapshot → ``304`` bei passendem ``If-None-Match``, sonst gecachtes JSON mit ``ETag``.
+    """
     from app import logger
-    from core.dcc_status_facade import build_dcc_dashboard_status_api
+    from core.dcc_status_facade import build_dcc_dashboard_status_api_with_snapshot
+    from core.dev_dashboard_snapshot import if_none_match_matches
 
     headers = {k: v for k, v in request.headers.items()}
     try:
-        return await build_dcc_dashboard_status_api(
+        payload, snapshot = await build_dcc_dashboard_status_api_with_snapshot(
             request_headers=headers,
             frontend_build_version=frontend_build_version,
             frontend_runtime_source=frontend_runtime_source,
@@ -112,6 +116,12 @@ async def dev_dashboard_status(
     except Exception:
         logger.exception("dev_dashboard_status failed")
         raise
+    if snapshot is None:
+        return payload
+    etag_headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if if_none_match_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=etag_headers)
+    return Response(content=snapshot.json_bytes(), media_type="application/json", headers=etag_headers)
 
 
 @router.get("/api/dev-dashboard/notifications/status")
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 
 from core.diagnostics.runner import (
     catalog,
+    classify_batch,
     diagnosis_by_id,
     get_evidence_sample,
     get_evidence_schema,
@@ -12,6 +13,8 @@ from core.diagnostics.runner import (
 from core.diagnostics.models import (
     DiagnosticsAnalyzeRequest,
     DiagnosticsAnalyzeResponse,
+    DiagnosticsBatchRequest,
+    DiagnosticsBatchResponse,
     EvidenceSampleResponse,
 )
 
@@ -23,6 +26,12 @@ async def post_diagnostics_analyze(body: DiagnosticsAnalyzeRequest) -> Diagnosti
     return run_diagnostics(body)
 
 
+@router.post("/analyze/batch", response_model=DiagnosticsBatchResponse)
+async def post_diagnostics_analyze_batch(body: DiagnosticsBatchRequest) -> DiagnosticsBatchResponse:
+    # Zu große Batches lehnt die Validierung von DiagnosticsBatchRequest mit 422 ab
+    return classify_batch(body)
+
+
 @router.get("/catalog")
 async def get_diagnostics_catalog() -> dict:
     return {"items": catalog(), "count": len(catalog())}
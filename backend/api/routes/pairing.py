@@ -13,6 +13,7 @@ from typing import Any
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
 
+from core.auth import invalidate_session_cache
 from core.settings import get_remote_settings
 from core.qr import build_pairing_payload, iso_expires_at
 from models.pairing import PairingClaimRequest, PairingCreateResponse, PairingClaimResponse
@@ -136,6 +137,8 @@ async def pairing_claim(body: PairingClaimRequest, request: Request):
         conn.commit()
     finally:
         conn.close()
+    # Geräteprofil (Rolle) neu geschrieben: gecachte Sessions des Geräts verwerfen
+    invalidate_session_cache(device_id=device_id)
 
     try:
         audit_log_insert("session_created", device_id=device_id, details=f"ticket_id={ticket_id}")
@@ -10,7 +10,7 @@ from datetime import datetime, timezone, timedelta
 
 from fastapi import APIRouter, Request, Depends
 
-from core.auth import SessionContext, get_current_session
+from core.auth import SessionContext, get_current_session, invalidate_session_cache
 from core.settings import get_remote_settings
 from models.session import SessionInfo
 from storage.db import get_connection, audit_log_insert
@@ -67,6 +67,7 @@ async def sessions_refresh(
         conn.commit()
     finally:
         conn.close()
+    invalidate_session_cache(session_id=session.session_id)
 
     try:
         audit_log_insert("session_refreshed", device_id=session.device_id, details=session.session_id)
@@ -89,6 +90,7 @@ async def sessions_revoke(session: SessionContext = Depends(get_current_session)
         conn.commit()
     finally:
         conn.close()
+    invalidate_session_cache(session_id=session.session_id)
 
     try:
         audit_log_insert("session_revoked", device_id=session.device_id, details=session.session_id)
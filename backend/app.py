@@ -83,10 +83,11 @@ except ImportError:
 # Remote-Companion: Settings + DB (Phase 1)
 try:
     from core.settings import get_remote_defaults
-    from storage.db import init_remote_db
+    from storage.db import close_connection_pools, init_remote_db
 except ImportError:
     get_remote_defaults = None
     init_remote_db = None
+    close_connection_pools = None
 
 # Debug/Observability (RUN_START/RUN_END, run_id, request_id Middleware)
 try:
@@ -183,6 +184,12 @@ async def _app_lifespan(app: FastAPI):
         run_start()
         get_logger("backend", "startup").step_start("Backend startup")
         _load_or_init_config()
+        try:
+            recovered = _backup_job_scheduler().recover(BACKUP_JOBS)
+            if recovered:
+                logger.info("Backup-Jobs aus Ledger wiederhergestellt: %s", ", ".join(recovered))
+        except Exception as e:
+            logger.warning("Backup-Job-Ledger konnte nicht geladen werden: %s", e)
         try:
             app.state.app_settings = APP_SETTINGS
             app.state.device_id = _device_id()
@@ -210,6 +217,23 @@ async def _app_lifespan(app: FastAPI):
         sudo_store.clear()
     except Exception:
         pass
+    if close_connection_pools is not None:
+        try:
+            close_connection_pools()
+        except Exception:
+            pass
+    try:
+        from core.fleet_session_store import close_stores
+
+        close_stores()  # gepufferte Fleet-Audit-Zeilen schreiben, SQLite schließen
+    except Exception:
+        pass
+    dev_storage = sys.modules.get("devserver.storage")
+    if dev_storage is not None:
+        try:
+            dev_storage.flush_pending_nodes_summaries()
+        except Exception:
+            pass
     try:
         duration_ms = None
         if _debug_startup_time is not None:
@@ -580,20 +604,41 @@ def _sync_stale_runner_job_from_systemd(job_id: str) -> None:
     j["finished_at"] = _now_iso()
 
 
-def _has_active_long_running_job() -> bool:
-    """True, wenn ein Backup- oder Klon-Job noch nicht im Endzustand ist (Phase 2C: ein aktiver Job)."""
+def _long_running_job_active(job_id: str, job: dict) -> bool:
+    if job.get("status") not in ("queued", "running", "cancel_requested"):
+        return False
+    rs = _read_backup_runner_status(job_id)
+    terminal_runner = frozenset({"success", "error", "cancelled", "failed"})
+    return not (rs and str(rs.get("status") or "").strip().lower() in terminal_runner)
+
+
+def _find_conflicting_long_running_job(claims: Optional[list] = None) -> Optional[str]:
+    """
+    Job-ID eines aktiven Jobs, der mit ``claims`` (Ressourcen, siehe core.backup_job_scheduler)
+    kollidiert. Ohne ``claims`` zählt jeder aktive Job (bisheriges Verhalten).
+    """
+    from core.backup_job_scheduler import find_conflicting_job
+
     for jid in list(BACKUP_JOBS.keys()):
         _sync_stale_runner_job_from_systemd(jid)
-    terminal_runner = frozenset({"success", "error", "cancelled", "failed"})
-    for jid, j in BACKUP_JOBS.items():
-        st = j.get("status")
-        if st not in ("queued", "running", "cancel_requested"):
-            continue
-        rs = _read_backup_runner_status(jid)
-        if rs and str(rs.get("status") or "").strip().lower() in terminal_runner:
-            continue
-        return True
-    return False
+    return find_conflicting_job(BACKUP_JOBS, claims, is_active=_long_running_job_active)
+
+
+def _has_active_long_running_job(claims: Optional[list] = None) -> bool:
+    """True, wenn ein aktiver Backup-/Klon-Job dieselben Geräte/Ziele schreibend berührt."""
+    return _find_conflicting_long_running_job(claims) is not None
+
+
+_BACKUP_JOB_SCHEDULER = None
+
+
+def _backup_job_scheduler():
+    global _BACKUP_JOB_SCHEDULER
+    if _BACKUP_JOB_SCHEDULER is None:
+        from core.backup_job_scheduler import JobScheduler
+
+        _BACKUP_JOB_SCHEDULER = JobScheduler(_backup_runner_status_dir)
+    return _BACKUP_JOB_SCHEDULER
 
 
 def _job_snapshot(job: dict) -> dict:
@@ -8366,31 +8411,94 @@ def _do_clone_logic(
             )
         _add("Ziel gemountet")
 
-        # rsync
+        # rsync (Delta-Sync bei wiedererkanntem Ziel, Live-Fortschritt, abbrechbar)
+        from core.backup_progress import merge_progress_optional
+        from modules.clone_engine import (
+            CLONE_MARKER_REL,
+            is_incremental_target,
+            plan_clone_trees,
+            read_clone_marker,
+            read_machine_id,
+            run_clone_sync,
+            write_clone_marker,
+        )
+
         excludes = [
             "/boot", "/boot/firmware",
             "/proc", "/sys", "/dev", "/tmp", "/run", "/mnt", "/lost+found",
             mountpoint.rstrip("/"),
+            "/" + CLONE_MARKER_REL,
         ]
-        excl_args = " ".join(f"--exclude={shlex.quote(x)}" for x in excludes)
-        rsync_cmd = (
-            f"rsync -axHAWXS --numeric-ids --info=progress2 {excl_args} / {shlex.quote(mountpoint)}/"
+        source_machine_id = read_machine_id("/")
+        incremental = is_incremental_target(read_clone_marker(mountpoint), source_machine_id)
+        clone_mode = "incremental" if incremental else "full"
+        trees = plan_clone_trees(mountpoint, excludes)
+        bytes_total_estimate = None
+        if not incremental:
+            try:
+                st = os.statvfs("/")
+                bytes_total_estimate = int((st.f_blocks - st.f_bfree) * st.f_frsize)
+            except OSError:
+                pass
+        sync_started = time.monotonic()
+        throughput_state: dict = {}
+        if job is not None:
+            job["clone_mode"] = clone_mode
+
+        def _on_progress(total_bytes: int, workers: list) -> None:
+            if job is None:
+                return
+            po = merge_progress_optional(
+                job.get("progress_optional"),
+                phase="cloning",
+                bytes_current=total_bytes,
+                bytes_total_estimate=bytes_total_estimate,
+                start_monotonic=sync_started,
+                compression_method="rsync",
+                current_operation=", ".join(w["tree"] for w in workers if not w["done"]) or "rsync",
+                target_mount=mountpoint,
+                target_free_bytes=None,
+                warning_codes=None,
+                health_flags=None,
+                throughput_state=throughput_state,
+            )
+            po["clone_mode"] = clone_mode
+            po["workers"] = workers
+            job["progress_optional"] = po
+
+        def _on_spawn(pgids: list) -> None:
+            if job is not None:
+                job["pgid"] = int(pgids[0])
+                job["pgids"] = [int(x) for x in pgids]
+
+        if incremental:
+            _add(f"Ziel wiedererkannt – Delta-Sync ({len(trees)} rsync-Lauf/Läufe)…")
+        else:
+            _add(f"Rsync läuft (kann einige Minuten dauern, {len(trees)} rsync-Lauf/Läufe)…")
+        sync = run_clone_sync(
+            trees,
+            delete=incremental,
+            sudo_password=sudo_password,
+            cancel_event=cancel_event,
+            on_progress=_on_progress,
+            on_spawn=_on_spawn,
         )
-        _add("Rsync läuft (kann einige Minuten dauern)…")
-        r = run_command(rsync_cmd, sudo=True, sudo_password=sudo_password, timeout=7200)
-        if cancel_event and cancel_event.is_set():
+        if job is not None:
+            job.pop("pgid", None)
+            job.pop("pgids", None)
+        if sync.status == "cancelled" or (cancel_event and cancel_event.is_set()):
             run_command(f"umount {shlex.quote(mountpoint)} 2>/dev/null", sudo=True, sudo_password=sudo_password, timeout=30)
             return with_backup_contract(
                 {"status": "cancelled", "message": "Abgebrochen", "results": results},
                 "backup.clone_cancelled",
                 "info",
             )
-        if not r.get("success"):
+        if sync.status != "success":
             run_command(f"umount {shlex.quote(mountpoint)} 2>/dev/null", sudo=True, sudo_password=sudo_password, timeout=30)
             return with_backup_contract(
                 {
                     "status": "error",
-                    "message": f"Rsync fehlgeschlagen: {(r.get('stderr') or r.get('stdout') or '')[:300]}",
+                    "message": f"Rsync fehlgeschlagen: {sync.detail[:300]}",
                     "results": results,
                 },
                 "backup.clone_rsync_failed",
@@ -8437,12 +8545,34 @@ def _do_clone_logic(
         else:
             _add("cmdline.txt nicht gefunden unter " + boot_mount)
 
+        # Herkunftsmarker für den nächsten (inkrementellen) Klon – Ziel gehört root, daher sudo
+        marker = write_clone_marker(
+            mountpoint,
+            source_machine_id=source_machine_id,
+            source_device=source.get("device"),
+            target_device=target_device,
+            mode=clone_mode,
+            sudo_password=sudo_password,
+        )
+        marker_info = {"written": marker.written, "path": marker.path, "detail": marker.detail}
+        if job is not None:
+            job["clone_marker"] = marker_info
+        if not marker.written:
+            _add(f"Warnung: Klon-Marker konnte nicht geschrieben werden (nächster Klon wird ein Vollklon): {marker.detail}")
+
         # Unmount
         run_command(f"umount {shlex.quote(mountpoint)} 2>/dev/null", sudo=True, sudo_password=sudo_password, timeout=30)
         _add("Ziel ausgehängt – Klon fertig. Bitte neu starten (sudo reboot), damit von " + target_device + " gebootet wird.")
 
+        if not marker.written:
+            return with_backup_contract(
+                {"status": "success", "message": "Klon erfolgreich", "results": results, "clone_marker": marker_info},
+                "backup.clone_success_marker_failed",
+                "warning",
+                {"clone_marker_detail": marker.detail},
+            )
         return with_backup_contract(
-            {"status": "success", "message": "Klon erfolgreich", "results": results},
+            {"status": "success", "message": "Klon erfolgreich", "results": results, "clone_marker": marker_info},
             "backup.clone_success",
             "success",
         )
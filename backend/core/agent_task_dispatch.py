@@ -0,0 +1,213 @@
+"""
+In-Memory-Dispatch für Agent-Tasks mit Long-Poll.
+
+Je Ziel (``boot_id`` o. ä.) eine Warteschlange im Speicher; ``"*"``/``""`` adressiert alle Agents.
+Ein Poll fragt nur die eigene und die Broadcast-Queue ab (kein Dateiscan), wartende Long-Polls
+werden beim Einstellen eines passenden Tasks sofort geweckt. Die Task-Dateien bleiben die
+persistente Ablage; eingelesen werden sie beim ersten Zugriff und erneut, sobald sich die mtime
+des Ablageverzeichnisses ändert (Dateien von anderen Prozessen oder von Hand abgelegt). Ein Poll
+kostet dafür nur ein ``stat`` des Verzeichnisses; wartende Long-Polls prüfen es alle
+``DIR_RECHECK_SECONDS``.
+
+Ein Task bleibt zustellbar, bis ``remove`` ihn entfernt (Ergebnis gemeldet) – wie bisher
+liefern wiederholte Polls denselben Task.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+BROADCAST_TARGETS = frozenset({"*", ""})
+DIR_RECHECK_SECONDS = 1.0
+
+Validator = Callable[[dict[str, Any]], "tuple[bool, str | None]"]
+
+
+class TaskDispatcher:
+    def __init__(self, pending_dir: Path, *, validate: Validator, target_field: str = "boot_id") -> None:
+        self.pending_dir = pending_dir
+        self._validate = validate
+        self._target_field = target_field
+        self._lock = threading.Lock()
+        self._order = itertools.count()
+        # Ziel -> task_id -> (Reihenfolge, Task); dict behält die Einfüge-Reihenfolge
+        self._queues: dict[str, dict[str, tuple[int, dict[str, Any]]]] = {}
+        self._paths: dict[str, Path] = {}
+        self._waiters: list[tuple[str, asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+        self._dir_stamp: tuple[int, int, int] | None = None
+        self.rehydrate()
+
+    def _target(self, task: dict[str, Any]) -> str:
+        target = str(task.get(self._target_field) or "*")
+        return "*" if target in BROADCAST_TARGETS else target
+
+    def _stat_dir(self) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(self.pending_dir)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def refresh(self) -> bool:
+        """Neu einlesen, wenn sich ``pending/`` seit dem letzten Einlesen geändert hat."""
+        if self._stat_dir() == self._dir_stamp:
+            return False
+        self.rehydrate()
+        return True
+
+    def rehydrate(self) -> int:
+        """
+        Task-Dateien einlesen (Start / geänderte Ablage); liefert die Anzahl Tasks.
+
+        Bekannte Tasks behalten ihre Reihenfolge, Tasks ohne Datei (nur ``push``) bleiben erhalten;
+        Tasks, deren Datei verschwunden ist, werden nicht mehr zugestellt.
+        """
+        self._dir_stamp = self._stat_dir()  # vor dem Scan: spätere Änderungen lösen erneut aus
+        loaded: list[tuple[dict[str, Any], Path]] = []
+        if self.pending_dir.is_dir():
+            for path in sorted(self.pending_dir.glob("*.json")):
+                try:
+                    task = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, json.JSONDecodeError):
+                    continue
+                if isinstance(task, dict) and task.get("task_id"):
+                    loaded.append((task, path))
+        with self._lock:
+            known = {tid: entry for queue in self._queues.values() for tid, entry in queue.items()}
+            memory_only = [entry for tid, entry in known.items() if tid not in self._paths]
+            self._queues.clear()
+            self._paths.clear()
+            for order, task in memory_only:
+                self._add_locked(task, None, order=order)
+            for task, path in loaded:
+                entry = known.get(str(task["task_id"]))
+                self._add_locked(task, path, order=entry[0] if entry else None)
+            for queue in self._queues.values():
+                ordered = sorted(queue.items(), key=lambda item: item[1][0])
+                queue.clear()
+                queue.update(ordered)
+        self._wake(None)
+        return len(loaded)
+
+    def _add_locked(self, task: dict[str, Any], path: Path | None, *, order: int | None = None) -> None:
+        task_id = str(task["task_id"])
+        self._remove_locked(task_id)
+        self._queues.setdefault(self._target(task), {})[task_id] = (next(self._order) if order is None else order, task)
+        if path is not None:
+            self._paths[task_id] = path
+
+    def _remove_locked(self, task_id: str) -> Path | None:
+        for queue in self._queues.values():
+            if queue.pop(task_id, None) is not None:
+                break
+        return self._paths.pop(task_id, None)
+
+    def push(self, task: dict[str, Any], *, path: Path | None = None) -> None:
+        with self._lock:
+            self._add_locked(task, path)
+        self._wake(self._target(task))
+
+    def remove(self, task_id: str) -> Path | None:
+        """Task aus der Zustellung nehmen; liefert den Dateipfad, falls bekannt."""
+        with self._lock:
+            return self._remove_locked(task_id)
+
+    def _first_valid_locked(self, target: str) -> tuple[int, dict[str, Any]] | None:
+        queue = self._queues.get(target)
+        if not queue:
+            return None
+        for task_id, entry in list(queue.items()):
+            ok, _reason = self._validate(entry[1])
+            if ok:
+                return entry
+            del queue[task_id]  # abgelaufen/ungültig: nicht erneut prüfen, Datei bleibt liegen
+        return None
+
+    def _peek_locked(self, target: str) -> dict[str, Any] | None:
+        target = "*" if target in BROADCAST_TARGETS else target
+        candidates = [e for e in (self._first_valid_locked(target), self._first_valid_locked("*")) if e]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda e: e[0])[1]
+
+    def peek(self, target: str) -> dict[str, Any] | None:
+        self.refresh()
+        with self._lock:
+            return self._peek_locked(target)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+    def waiter_count(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    def _wake(self, target: str | None) -> None:
+        """Long-Polls für ``target`` wecken (Broadcast/None: alle)."""
+        with self._lock:
+            hit = [
+                w for w in self._waiters
+                if target is None or target == "*" or w[0] == target
+            ]
+        for _target, loop, fut in hit:
+            try:
+                loop.call_soon_threadsafe(_resolve, fut)
+            except RuntimeError:
+                pass  # Event-Loop bereits beendet
+
+    async def wait_next(self, target: str, *, timeout: float) -> dict[str, Any] | None:
+        """Nächsten Task liefern; ohne Task bis ``timeout`` Sekunden auf ein ``push`` warten."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, timeout)
+        key = "*" if target in BROADCAST_TARGETS else target
+        while True:
+            self.refresh()
+            fut: asyncio.Future[None] = loop.create_future()
+            waiter = (key, loop, fut)
+            with self._lock:
+                task = self._peek_locked(key)
+                if task is not None:
+                    return task
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                self._waiters.append(waiter)
+            try:
+                # Dateien anderer Prozesse wecken niemanden: Verzeichnis regelmäßig erneut prüfen
+                await asyncio.wait_for(fut, min(remaining, DIR_RECHECK_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+
+def _resolve(fut: asyncio.Future[None]) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+_dispatchers: dict[Path, TaskDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def dispatcher_for(pending_dir: Path, *, validate: Validator) -> TaskDispatcher:
+    """Ein Dispatcher je Ablageverzeichnis; die Dateien werden beim ersten Zugriff gelesen."""
+    with _dispatchers_lock:
+        disp = _dispatchers.get(pending_dir)
+        if disp is None:
+            disp = _dispatchers[pending_dir] = TaskDispatcher(pending_dir, validate=validate)
+        return disp
+
+
+def reset_dispatchers() -> None:
+    with _dispatchers_lock:
+        _dispatchers.clear()
@@ -4,13 +4,16 @@ Extrahiert Session-Token (Bearer oder query), validiert gegen DB (Hash, Ablauf),
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import Request, HTTPException, status
 
-from storage.db import get_connection, hash_token
+from storage.db import get_connection, get_remote_db_path, hash_token
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +26,53 @@ class SessionContext:
     role: str  # viewer | controller | admin | sync
 
 
-def validate_session_token(token: str) -> Optional[SessionContext]:
-    """
-    Validiert einen Session-Token (z. B. aus WebSocket query) und liefert SessionContext oder None.
-    Für WebSocket: Token aus query ?session= übergeben; bei None/ungültig Verbindung ablehnen.
-    """
-    if not token or not token.strip():
-        return None
-    token_hash = hash_token(token.strip())
-    now_iso = datetime.now(timezone.utc).isoformat()
+# Validierte Sessions werden kurz im Prozess gehalten; Refresh/Logout/Revoke invalidieren explizit.
+SESSION_CACHE_TTL_SECONDS = 30.0
+SESSION_CACHE_MAX_ENTRIES = 4096
+
+
+@dataclass(frozen=True)
+class _CachedSession:
+    context: SessionContext
+    expires_at: str
+    cached_until: float
+
+
+_session_cache: "OrderedDict[tuple[str, str], _CachedSession]" = OrderedDict()
+_session_cache_lock = threading.Lock()
+
+
+def invalidate_session_cache(*, session_id: Optional[str] = None, device_id: Optional[str] = None) -> int:
+    """Gecachte Sessions verwerfen (ohne Filter: alle). Liefert die Anzahl entfernter Einträge."""
+    with _session_cache_lock:
+        if session_id is None and device_id is None:
+            removed = len(_session_cache)
+            _session_cache.clear()
+            return removed
+        keys = [
+            key for key, entry in _session_cache.items()
+            if (session_id is not None and entry.context.session_id == session_id)
+            or (device_id is not None and entry.context.device_id == device_id)
+        ]
+        for key in keys:
+            del _session_cache[key]
+        return len(keys)
+
+
+def _lookup_session(token_hash: str, now_iso: str) -> tuple[Optional[SessionContext], Optional[str]]:
+    """Session zum Token-Hash: ``(Kontext, None)``, ``(None, "unknown")`` oder ``(Kontext, "expired")``."""
+    key = (str(get_remote_db_path()), token_hash)
+    now = time.monotonic()
+    with _session_cache_lock:
+        entry = _session_cache.get(key)
+        if entry is not None and entry.cached_until < now:
+            del _session_cache[key]
+            entry = None
+    if entry is not None:
+        if entry.expires_at < now_iso:
+            return entry.context, "expired"
+        return entry.context, None
+
     conn = get_connection()
     try:
         cur = conn.execute(
@@ -42,14 +83,30 @@ def validate_session_token(token: str) -> Optional[SessionContext]:
             (token_hash,),
         )
         row = cur.fetchone()
-        if not row:
-            return None
-        session_id, device_id, expires_at, role = row
-        if expires_at < now_iso:
-            return None
-        return SessionContext(session_id=session_id, device_id=device_id, role=role or "viewer")
     finally:
         conn.close()
+    if not row:
+        return None, "unknown"
+    session_id, device_id, expires_at, role = row
+    ctx = SessionContext(session_id=session_id, device_id=device_id, role=role or "viewer")
+    if expires_at < now_iso:
+        return ctx, "expired"
+    with _session_cache_lock:
+        _session_cache[key] = _CachedSession(ctx, expires_at, now + SESSION_CACHE_TTL_SECONDS)
+        while len(_session_cache) > SESSION_CACHE_MAX_ENTRIES:
+            _session_cache.popitem(last=False)
+    return ctx, None
+
+
+def validate_session_token(token: str) -> Optional[SessionContext]:
+    """
+    Validiert einen Session-Token (z. B. aus WebSocket query) und liefert SessionContext oder None.
+    Für WebSocket: Token aus query ?session= übergeben; bei None/ungültig Verbindung ablehnen.
+    """
+    if not token or not token.strip():
+        return None
+    ctx, reason = _lookup_session(hash_token(token.strip()), datetime.now(timezone.utc).isoformat())
+    return ctx if reason is None else None
 
 
 def _get_token_from_request(request: Request) -> Optional[str]:
@@ -74,30 +131,14 @@ async def get_current_session(request: Request) -> SessionContext:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session-Token fehlt (Authorization: Bearer oder ?session=)",
         )
-    token_hash = hash_token(token)
-    now_iso = datetime.now(timezone.utc).isoformat()
-
-    conn = get_connection()
-    try:
-        cur = conn.execute(
-            """SELECT s.id, s.device_id, s.expires_at, p.role
-               FROM sessions s
-               LEFT JOIN remote_device_profiles p ON p.device_id = s.device_id
-               WHERE s.session_token_hash = ?""",
-            (token_hash,),
-        )
-        row = cur.fetchone()
-        if not row:
-            logger.warning("Session validation: unbekannter oder ungültiger Token")
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültige Session")
-        session_id, device_id, expires_at, role = row
-        if expires_at < now_iso:
-            logger.info("Session abgelaufen session_id=%s", session_id)
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session abgelaufen")
-        role = role or "viewer"
-        return SessionContext(session_id=session_id, device_id=device_id, role=role)
-    finally:
-        conn.close()
+    ctx, reason = _lookup_session(hash_token(token), datetime.now(timezone.utc).isoformat())
+    if reason == "unknown":
+        logger.warning("Session validation: unbekannter oder ungültiger Token")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültige Session")
+    if reason == "expired" or ctx is None:
+        logger.info("Session abgelaufen session_id=%s", ctx.session_id if ctx else None)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session abgelaufen")
+    return ctx
 
 
 async def get_optional_session(request: Request) -> Optional[SessionContext]:
@@ -105,19 +146,5 @@ async def get_optional_session(request: Request) -> Optional[SessionContext]:
     token = _get_token_from_request(request)
     if not token:
         return None
-    token_hash = hash_token(token)
-    now_iso = datetime.now(timezone.utc).isoformat()
-    conn = get_connection()
-    try:
-        cur = conn.execute(
-            """SELECT s.id, s.device_id, p.role FROM sessions s
-               LEFT JOIN remote_device_profiles p ON p.device_id = s.device_id
-               WHERE s.session_token_hash = ? AND s.expires_at >= ?""",
-            (token_hash, now_iso),
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        return SessionContext(session_id=row[0], device_id=row[1], role=row[2] or "viewer")
-    finally:
-        conn.close()
+    ctx, reason = _lookup_session(hash_token(token), datetime.now(timezone.utc).isoformat())
+    return ctx if reason is None else None
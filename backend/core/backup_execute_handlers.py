@@ -19,6 +19,7 @@ from typing import Any, Optional
 from fastapi import Request
 
 from core import backup_readonly_runtime as rt
+from core.backup_job_scheduler import backup_claims, clone_claims, serialize_claims
 from core.backup_profiles import (
     build_profile_preview,
     normalize_backup_profile,
@@ -26,6 +27,23 @@ from core.backup_profiles import (
 )
 
 
+def _job_conflict_response(claims: list[dict[str, str]]):
+    """Ablehnung, weil ein aktiver Job dieselben Geräte/Ziele schreibend nutzt."""
+    other = rt.find_conflicting_long_running_job(claims)
+    return rt.json_response(
+        status_code=200,
+        content=rt.with_backup_contract(
+            {
+                "status": "error",
+                "message": "Es läuft bereits ein Backup- oder Klon-Auftrag auf denselben Laufwerken/Zielen.",
+            },
+            "backup.job_conflict",
+            "error",
+            {"conflicting_job_id": other, "resource_claims": claims},
+        ),
+    )
+
+
 async def backup_job_cancel(job_id: str):
     job_id = (job_id or "").strip()
     runner_status = rt.read_backup_runner_status(job_id)
@@ -100,12 +118,14 @@ async def backup_job_cancel(job_id: str):
     job["code"] = "backup.cancel_requested"
     job["severity"] = "info"
 
-    try:
-        pgid = job.get("pgid")
-        if isinstance(pgid, int) and pgid > 1:
-            os.killpg(pgid, signal.SIGTERM)
-    except Exception:
-        pass
+    # Klon-Jobs laufen ggf. mit mehreren rsync-Prozessgruppen (``pgids``).
+    pgids = job.get("pgids") if isinstance(job.get("pgids"), list) else [job.get("pgid")]
+    for pgid in pgids:
+        try:
+            if isinstance(pgid, int) and pgid > 1:
+                os.killpg(pgid, signal.SIGTERM)
+        except Exception:
+            pass
 
     return rt.with_backup_contract({"status": "success", "message": "Abbruch angefordert"}, "backup.cancel_requested", "success")
 
@@ -1447,18 +1467,9 @@ async def clone_disk(request: Request):
                     ),
                 )
 
-        if rt.has_active_long_running_job():
-            return rt.json_response(
-                status_code=200,
-                content=rt.with_backup_contract(
-                    {
-                        "status": "error",
-                        "message": "Es läuft bereits ein Backup- oder Klon-Auftrag.",
-                    },
-                    "backup.job_conflict",
-                    "error",
-                ),
-            )
+        claims = serialize_claims(clone_claims(target_device))
+        if rt.has_active_long_running_job(claims):
+            return _job_conflict_response(claims)
 
         job_id = rt.new_job_id()
         rt.get_backup_jobs()[job_id] = {
@@ -1466,6 +1477,7 @@ async def clone_disk(request: Request):
             "status": "queued",
             "type": "clone",
             "target_device": target_device,
+            "resource_claims": claims,
             "started_at": rt.now_iso(),
             "finished_at": None,
             "message": "Wartet…",
@@ -1503,8 +1515,7 @@ async def clone_disk(request: Request):
             finally:
                 rt.get_backup_job_cancel().pop(job_id, None)
 
-        t = threading.Thread(target=_runner, daemon=True)
-        t.start()
+        rt.backup_job_scheduler().start_thread(rt.get_backup_jobs(), job_id, _runner, kind="clone")
 
         return rt.json_response(
             status_code=200,
@@ -1867,18 +1878,9 @@ async def create_backup(request: Request):
             return False, f"Remote Verifizierung fehlgeschlagen (HTTP {code or '—'})"
 
         if use_data_template_runner:
-            if rt.has_active_long_running_job():
-                return rt.json_response(
-                    status_code=200,
-                    content=rt.with_backup_contract(
-                        {
-                            "status": "error",
-                            "message": "Es läuft bereits ein Backup- oder Klon-Auftrag.",
-                        },
-                        "backup.job_conflict",
-                        "error",
-                    ),
-                )
+            claims = serialize_claims(backup_claims(backup_dir))
+            if rt.has_active_long_running_job(claims):
+                return _job_conflict_response(claims)
 
             data_sources, skipped_optional, unreadable_required = rt.plan_data_backup_sources()
             required_sources = [str(p) for p in rt.data_required_source_candidates()]
@@ -1958,6 +1960,7 @@ async def create_backup(request: Request):
                 "backup_dir": backup_dir,
                 "backup_file": bf,
                 "target": target,
+                "resource_claims": claims,
                 "started_at": rt.now_iso(),
                 "finished_at": None,
                 "message": "Wartet…",
@@ -2063,6 +2066,9 @@ async def create_backup(request: Request):
                     ),
                 )
 
+            rt.backup_job_scheduler().register_unit(
+                rt.get_backup_jobs(), job_id, kind="backup", systemctl=rt.systemctl_run_argv
+            )
             return rt.with_backup_contract(
                 {
                     "status": "accepted",
@@ -2082,18 +2088,9 @@ async def create_backup(request: Request):
             )
 
         elif use_full_template_runner:
-            if rt.has_active_long_running_job():
-                return rt.json_response(
-                    status_code=200,
-                    content=rt.with_backup_contract(
-                        {
-                            "status": "error",
-                            "message": "Es läuft bereits ein Backup- oder Klon-Auftrag.",
-                        },
-                        "backup.job_conflict",
-                        "error",
-                    ),
-                )
+            claims = serialize_claims(backup_claims(backup_dir))
+            if rt.has_active_long_running_job(claims):
+                return _job_conflict_response(claims)
 
             job_id = rt.new_job_id()
             unit_name = f"setuphelfer-backup@{job_id}.service"
@@ -2140,6 +2137,7 @@ async def create_backup(request: Request):
                 "backup_dir": backup_dir,
                 "backup_file": bf,
                 "target": target,
+                "resource_claims": claims,
                 "started_at": rt.now_iso(),
                 "finished_at": None,
                 "message": "Wartet…",
@@ -2245,6 +2243,9 @@ async def create_backup(request: Request):
                     ),
                 )
 
+            rt.backup_job_scheduler().register_unit(
+                rt.get_backup_jobs(), job_id, kind="backup", systemctl=rt.systemctl_run_argv
+            )
             return rt.with_backup_contract(
                 {
                     "status": "accepted",
@@ -2264,18 +2265,9 @@ async def create_backup(request: Request):
             )
 
         if run_async:
-            if rt.has_active_long_running_job():
-                return rt.json_response(
-                    status_code=200,
-                    content=rt.with_backup_contract(
-                        {
-                            "status": "error",
-                            "message": "Es läuft bereits ein Backup- oder Klon-Auftrag.",
-                        },
-                        "backup.job_conflict",
-                        "error",
-                    ),
-                )
+            claims = serialize_claims(backup_claims(backup_dir))
+            if rt.has_active_long_running_job(claims):
+                return _job_conflict_response(claims)
             job_id = rt.new_job_id()
             rt.get_backup_jobs()[job_id] = {
                 "job_id": job_id,
@@ -2284,6 +2276,7 @@ async def create_backup(request: Request):
                 "backup_dir": backup_dir,
                 "backup_file": bf,
                 "target": target,
+                "resource_claims": claims,
                 "started_at": rt.now_iso(),
                 "finished_at": None,
                 "message": "Wartet…",
@@ -2543,7 +2536,7 @@ async def create_backup(request: Request):
                     except Exception:
                         pass
 
-            threading.Thread(target=_runner_thread, daemon=True).start()
+            rt.backup_job_scheduler().start_thread(rt.get_backup_jobs(), job_id, _runner_thread, kind="backup")
             return rt.with_backup_contract(
                 {"status": "accepted", "job_id": job_id, "backup_file": bf, "message": "Backup gestartet"},
                 "backup.job_started",
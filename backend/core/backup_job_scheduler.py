@@ -0,0 +1,423 @@
+"""
+Ressourcenbewusster Job-Scheduler für Backup- und Klon-Jobs.
+
+Statt einer globalen Sperre ("ein langer Job systemweit") deklariert jeder Job, welche
+Ressourcen er berührt:
+
+- ``dev:<disk>`` – Blockgerät (Partitionen werden auf die Disk normalisiert),
+- ``path:<pfad>`` – Ziel-/Quellpfad (Überlappung über Präfix),
+
+jeweils lesend (``r``) oder schreibend (``w``). Zwei Jobs kollidieren, wenn sie eine
+Ressource teilen und mindestens einer schreibt. Jobs ohne deklarierte Ressourcen
+(Altbestand, unbekannte Runner) belegen konservativ alles.
+
+Jobklassen (``io_heavy``/``cpu_heavy``/``light``) bestimmen Priorität: im Thread-Modus
+``nice`` + ``ionice`` für den Job-Thread (Kindprozesse erben beides), bei systemd-Runnern
+``IOWeight``/``CPUWeight``/``CPUQuota`` per ``systemctl set-property --runtime``.
+
+Der Job-Ledger (``scheduler-jobs.json`` im Backup-Statusverzeichnis) überlebt einen
+Backend-Neustart: systemd-Runner-Jobs werden wieder aufgenommen, Thread-Jobs als
+abgebrochen markiert.
+
+Nicht im Scheduler: Restore und Verify (``/api/backup/restore``, ``/api/backup/verify``) laufen
+synchron im Request und liefern ihr Ergebnis in der HTTP-Antwort. Sie deklarieren keine
+Ressourcen, bekommen keine Jobklasse und tauchen nicht im Ledger auf; ein Umzug wäre ein
+Wechsel auf asynchrone Jobs samt neuem API-Vertrag.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+LEDGER_NAME = "scheduler-jobs.json"
+LEDGER_MAX_FINISHED = 50
+ACTIVE_STATES = frozenset({"queued", "running", "cancel_requested"})
+_LEDGER_KEYS = (
+    "job_id",
+    "type",
+    "status",
+    "code",
+    "severity",
+    "message",
+    "started_at",
+    "finished_at",
+    "target_device",
+    "backup_dir",
+    "backup_file",
+    "unit_name",
+    "unit_scope",
+    "executor",
+    "job_class",
+    "resource_claims",
+)
+
+
+@dataclass(frozen=True)
+class ResourceClaim:
+    key: str
+    mode: str = "w"
+
+    def as_dict(self) -> dict[str, str]:
+        return {"key": self.key, "mode": self.mode}
+
+
+@dataclass(frozen=True)
+class JobClassPolicy:
+    name: str
+    nice: int = 0
+    ionice_class: int | None = None  # 2 = best-effort, 3 = idle
+    ionice_level: int | None = None
+    io_weight: int | None = None
+    cpu_weight: int | None = None
+    cpu_quota_pct: int | None = None
+
+    def systemd_properties(self) -> list[str]:
+        props = []
+        if self.io_weight is not None:
+            props.append(f"IOWeight={self.io_weight}")
+        if self.cpu_weight is not None:
+            props.append(f"CPUWeight={self.cpu_weight}")
+        if self.cpu_quota_pct is not None:
+            props.append(f"CPUQuota={self.cpu_quota_pct}%")
+        return props
+
+
+def _cpu_quota_leave_one_core() -> int:
+    return max(100, ((os.cpu_count() or 1) - 1) * 100)
+
+
+JOB_CLASSES: dict[str, JobClassPolicy] = {
+    "io_heavy": JobClassPolicy("io_heavy", nice=10, ionice_class=2, ionice_level=7, io_weight=50, cpu_weight=50),
+    "cpu_heavy": JobClassPolicy(
+        "cpu_heavy",
+        nice=15,
+        ionice_class=2,
+        ionice_level=5,
+        io_weight=80,
+        cpu_weight=30,
+        cpu_quota_pct=_cpu_quota_leave_one_core(),
+    ),
+    "light": JobClassPolicy("light"),
+}
+
+# Klon ist schreiblastig, Backup (tar + Kompression) rechenlastig (Restore/Verify: siehe Moduldoku).
+KIND_CLASSES: dict[str, str] = {
+    "clone": "io_heavy",
+    "backup": "cpu_heavy",
+}
+
+
+def job_class_for(kind: str) -> JobClassPolicy:
+    return JOB_CLASSES[KIND_CLASSES.get(kind, "light")]
+
+
+# --- Ressourcen ---------------------------------------------------------------
+
+_PART_RE = re.compile(r"^(?P<disk>(?:mmcblk|nvme\d+n|loop)\d+)p\d+$|^(?P<sd>(?:sd|vd|hd|xvd)[a-z]+)\d+$")
+
+
+def normalize_block_device(device: str) -> str | None:
+    """``/dev/sda2`` → ``sda``, ``/dev/mmcblk0p2`` → ``mmcblk0``; ``None`` bei Nicht-Gerät."""
+    name = (device or "").strip()
+    if not name.startswith("/dev/"):
+        return None
+    name = os.path.basename(os.path.realpath(name))
+    sys_part = Path("/sys/class/block") / name / "partition"
+    if sys_part.exists():
+        parent = os.path.basename(os.path.realpath(Path("/sys/class/block") / name / ".."))
+        if parent:
+            return parent
+    m = _PART_RE.match(name)
+    if m:
+        return m.group("disk") or m.group("sd")
+    return name
+
+
+def device_of_path(path: str | Path) -> str | None:
+    """Disk, auf der ``path`` liegt (über ``st_dev`` und ``/sys/dev/block``); Netz-FS → ``None``."""
+    p = Path(path)
+    while True:
+        try:
+            st = os.stat(p)
+            break
+        except OSError:
+            if p.parent == p:
+                return None
+            p = p.parent
+    sys_dev = Path("/sys/dev/block") / f"{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+    try:
+        name = os.path.basename(os.path.realpath(sys_dev))
+    except OSError:
+        return None
+    if not sys_dev.exists() or not name:
+        return None
+    return normalize_block_device(f"/dev/{name}")
+
+
+def device_claim(device: str, mode: str) -> list[ResourceClaim]:
+    disk = normalize_block_device(device)
+    return [ResourceClaim(f"dev:{disk}", mode)] if disk else []
+
+
+def path_claims(path: str | Path, mode: str) -> list[ResourceClaim]:
+    """Pfad-Claim plus Claim auf die darunterliegende Disk (sofern lokal)."""
+    raw = str(path or "").strip()
+    if not raw:
+        return []
+    out = [ResourceClaim(f"path:{os.path.normpath(os.path.abspath(raw))}", mode)]
+    disk = device_of_path(raw)
+    if disk:
+        out.append(ResourceClaim(f"dev:{disk}", mode))
+    return out
+
+
+def clone_claims(target_device: str) -> list[ResourceClaim]:
+    return device_claim(target_device, "w") + [c for c in path_claims("/", "r") if c.key.startswith("dev:")]
+
+
+def backup_claims(backup_dir: str, sources: Iterable[str] = ("/",)) -> list[ResourceClaim]:
+    claims = path_claims(backup_dir, "w")
+    for src in sources:
+        claims.extend(c for c in path_claims(src, "r") if c.key.startswith("dev:"))
+    return claims
+
+
+def serialize_claims(claims: Iterable[ResourceClaim]) -> list[dict[str, str]]:
+    seen: dict[str, str] = {}
+    for c in claims:
+        # "w" gewinnt gegenüber "r" für denselben Schlüssel.
+        if seen.get(c.key) != "w":
+            seen[c.key] = c.mode
+    return [{"key": k, "mode": m} for k, m in seen.items()]
+
+
+def _keys_overlap(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    if a.startswith("path:") and b.startswith("path:"):
+        pa, pb = a[5:].rstrip("/") + "/", b[5:].rstrip("/") + "/"
+        return pa.startswith(pb) or pb.startswith(pa)
+    return False
+
+
+def claims_conflict(a: Iterable[Mapping[str, str]] | None, b: Iterable[Mapping[str, str]] | None) -> bool:
+    """Konflikt, wenn eine Ressource geteilt wird und mindestens eine Seite schreibt; ``None`` = alles."""
+    if a is None or b is None:
+        return True
+    b_list = list(b)
+    for ca in a:
+        for cb in b_list:
+            if ca.get("mode") == "r" and cb.get("mode") == "r":
+                continue
+            if _keys_overlap(str(ca.get("key") or ""), str(cb.get("key") or "")):
+                return True
+    return False
+
+
+def find_conflicting_job(
+    jobs: Mapping[str, Mapping[str, Any]],
+    claims: Iterable[Mapping[str, str]] | None,
+    *,
+    is_active: Callable[[str, Mapping[str, Any]], bool],
+) -> str | None:
+    wanted = list(claims) if claims is not None else None
+    for jid, job in list(jobs.items()):
+        if not is_active(jid, job):
+            continue
+        held = job.get("resource_claims")
+        if claims_conflict(wanted, held if isinstance(held, list) else None):
+            return jid
+    return None
+
+
+# --- Priorität ------------------------------------------------------------------
+
+
+def apply_thread_policy(policy: JobClassPolicy) -> dict[str, Any]:
+    """``nice``/``ionice`` für den aktuellen Thread (Linux: pro TID); Kindprozesse erben beides."""
+    applied: dict[str, Any] = {"job_class": policy.name}
+    tid = threading.get_native_id()
+    if policy.nice:
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, policy.nice)
+            applied["nice"] = policy.nice
+        except (AttributeError, OSError) as e:
+            applied["nice_error"] = str(e)
+    if policy.ionice_class is not None:
+        ionice = shutil.which("ionice")
+        if ionice:
+            argv = [ionice, "-c", str(policy.ionice_class)]
+            if policy.ionice_level is not None:
+                argv += ["-n", str(policy.ionice_level)]
+            try:
+                r = subprocess.run(argv + ["-p", str(tid)], capture_output=True, text=True, timeout=5, check=False)
+                if r.returncode == 0:
+                    applied["ionice"] = f"{policy.ionice_class}:{policy.ionice_level}"
+                else:
+                    applied["ionice_error"] = (r.stderr or "").strip()[:200]
+            except (OSError, subprocess.SubprocessError) as e:
+                applied["ionice_error"] = str(e)
+    return applied
+
+
+def apply_unit_policy(
+    unit_name: str,
+    policy: JobClassPolicy,
+    systemctl: Callable[..., Mapping[str, Any]],
+) -> dict[str, Any]:
+    """cgroup-Gewichte/Quota für eine laufende Runner-Unit (best effort)."""
+    props = policy.systemd_properties()
+    if not props or not unit_name:
+        return {"job_class": policy.name}
+    res = systemctl(["systemctl", "set-property", "--runtime", unit_name, *props], timeout=15)
+    out: dict[str, Any] = {"job_class": policy.name, "systemd_properties": props}
+    if not res.get("success"):
+        out["systemd_properties_error"] = str(res.get("stderr") or res.get("error") or "")[:200]
+    return out
+
+
+# --- Ledger / Scheduler -------------------------------------------------------------
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobScheduler:
+    """Startet Job-Threads mit Klassenpriorität und hält den persistenten Job-Ledger."""
+
+    def __init__(self, ledger_dir: Callable[[], Path]) -> None:
+        self._ledger_dir = ledger_dir
+        self._lock = threading.Lock()
+
+    @property
+    def ledger_path(self) -> Path:
+        return self._ledger_dir() / LEDGER_NAME
+
+    def persist(self, jobs: Mapping[str, Mapping[str, Any]]) -> bool:
+        """Schreibt alle Jobs mit Scheduler-Metadaten (aktive + die letzten beendeten) atomar."""
+        records = [
+            {k: job.get(k) for k in _LEDGER_KEYS if k in job}
+            for job in list(jobs.values())
+            if job.get("executor")
+        ]
+        active = [r for r in records if r.get("status") in ACTIVE_STATES]
+        finished = [r for r in records if r.get("status") not in ACTIVE_STATES]
+        finished.sort(key=lambda r: str(r.get("finished_at") or r.get("started_at") or ""))
+        payload = {"version": 1, "updated_at": _now_iso(), "jobs": active + finished[-LEDGER_MAX_FINISHED:]}
+        path = self.ledger_path
+        with self._lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+                os.replace(tmp, path)
+                return True
+            except OSError:
+                return False
+
+    def recover(self, jobs: dict[str, dict[str, Any]]) -> list[str]:
+        """
+        Lädt den Ledger nach einem Neustart in ``jobs``. systemd-Runner-Jobs bleiben aktiv
+        (Status kommt weiter aus ``status.json``), Thread-Jobs sind mit dem Prozess verloren.
+        """
+        try:
+            data = json.loads(self.ledger_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        recovered = []
+        for rec in data.get("jobs") or []:
+            if not isinstance(rec, dict):
+                continue
+            jid = str(rec.get("job_id") or "")
+            if not jid or jid in jobs:
+                continue
+            job = dict(rec)
+            job.setdefault("results", [])
+            if job.get("status") in ACTIVE_STATES and job.get("executor") != "systemd":
+                job["status"] = "error"
+                job["code"] = "backup.job_interrupted_by_restart"
+                job["severity"] = "error"
+                job["message"] = "Job durch Neustart des Backends abgebrochen"
+                job["finished_at"] = job.get("finished_at") or _now_iso()
+            job["recovered"] = True
+            jobs[jid] = job
+            recovered.append(jid)
+        if recovered:
+            self.persist(jobs)
+        return recovered
+
+    def start_thread(
+        self,
+        jobs: dict[str, dict[str, Any]],
+        job_id: str,
+        target: Callable[[], None],
+        *,
+        kind: str,
+    ) -> threading.Thread:
+        policy = job_class_for(kind)
+        job = jobs[job_id]
+        job["executor"] = "thread"
+        job["job_class"] = policy.name
+
+        def _run() -> None:
+            try:
+                job["resource_policy"] = apply_thread_policy(policy)
+            except Exception:  # noqa: BLE001 – Priorität ist nie Grund für Abbruch
+                pass
+            try:
+                target()
+            finally:
+                self.persist(jobs)
+
+        self.persist(jobs)
+        t = threading.Thread(target=_run, daemon=True, name=f"setuphelfer-job-{job_id}")
+        t.start()
+        return t
+
+    def register_unit(
+        self,
+        jobs: dict[str, dict[str, Any]],
+        job_id: str,
+        *,
+        kind: str,
+        systemctl: Callable[..., Mapping[str, Any]] | None = None,
+    ) -> None:
+        """systemd-Runner-Job im Ledger vermerken und (nach Start) Klassen-Properties setzen."""
+        policy = job_class_for(kind)
+        job = jobs[job_id]
+        job["executor"] = "systemd"
+        job["job_class"] = policy.name
+        if systemctl is not None:
+            job["resource_policy"] = apply_unit_policy(str(job.get("unit_name") or ""), policy, systemctl)
+        self.persist(jobs)
+
+
+__all__ = [
+    "ACTIVE_STATES",
+    "JOB_CLASSES",
+    "JobClassPolicy",
+    "JobScheduler",
+    "ResourceClaim",
+    "apply_thread_policy",
+    "apply_unit_policy",
+    "backup_claims",
+    "claims_conflict",
+    "clone_claims",
+    "device_claim",
+    "device_of_path",
+    "find_conflicting_job",
+    "job_class_for",
+    "normalize_block_device",
+    "path_claims",
+    "serialize_claims",
+]
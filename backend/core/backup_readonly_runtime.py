@@ -185,8 +185,16 @@ def invalidate_clone_disk_info_cache() -> None:
     _app()._clone_disk_info_cache_ts = 0
 
 
-def has_active_long_running_job() -> bool:
-    return _app()._has_active_long_running_job()
+def has_active_long_running_job(claims: list[dict[str, str]] | None = None) -> bool:
+    return _app()._has_active_long_running_job(claims)
+
+
+def find_conflicting_long_running_job(claims: list[dict[str, str]] | None = None) -> str | None:
+    return _app()._find_conflicting_long_running_job(claims)
+
+
+def backup_job_scheduler():
+    return _app()._backup_job_scheduler()
 
 
 def new_job_id() -> str:
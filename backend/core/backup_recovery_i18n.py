@@ -26,6 +26,7 @@ K_MOUNT_FAILED = "backup_recovery.error.mount_failed"
 K_LOOP_FAILED = "backup_recovery.error.loop_setup_failed"
 K_RESTORE_PT_FAILED = "backup_recovery.error.restore_partition_table_failed"
 K_RESTORE_IMAGE_FAILED = "backup_recovery.error.restore_image_failed"
+K_RESTORE_IMAGE_CANCELLED = "backup_recovery.error.restore_image_cancelled"
 K_RESTORE_FILES_FAILED = "backup_recovery.error.restore_files_failed"
 K_BOOTLOADER_FAILED = "backup_recovery.error.bootloader_failed"
 K_CRYPTO_KEY_MISSING = "backup_recovery.error.crypto_key_missing"
@@ -84,6 +85,7 @@ DEFAULT_CATALOG: dict[str, str] = {
     K_LOOP_FAILED: "Loop device setup failed.",
     K_RESTORE_PT_FAILED: "Restoring partition table failed.",
     K_RESTORE_IMAGE_FAILED: "Restoring disk image failed.",
+    K_RESTORE_IMAGE_CANCELLED: "Restoring disk image was cancelled; the target is incomplete.",
     K_RESTORE_FILES_FAILED: "Restoring files failed.",
     K_BOOTLOADER_FAILED: "Bootloader installation failed.",
     K_CRYPTO_KEY_MISSING: "Encryption key not provided.",
@@ -133,6 +135,7 @@ DEFAULT_CATALOG_DE: dict[str, str] = {
     K_LOOP_FAILED: "Einrichten des Loop-Devices ist fehlgeschlagen.",
     K_RESTORE_PT_FAILED: "Wiederherstellen der Partitionstabelle ist fehlgeschlagen.",
     K_RESTORE_IMAGE_FAILED: "Wiederherstellen des Datenträgerabbilds ist fehlgeschlagen.",
+    K_RESTORE_IMAGE_CANCELLED: "Wiederherstellen des Datenträgerabbilds wurde abgebrochen; das Ziel ist unvollständig.",
     K_RESTORE_FILES_FAILED: "Wiederherstellen der Dateien ist fehlgeschlagen.",
     K_BOOTLOADER_FAILED: "Installation des Bootloaders ist fehlgeschlagen.",
     K_CRYPTO_KEY_MISSING: "Verschlüsselungsschlüssel fehlt.",
@@ -3,17 +3,24 @@ GNU tar stderr/exit-code classification for Setuphelfer backups (BR-001 forensic
 
 Design: tar exit 1 is not automatically success or failure. Downgrade from hard
 failure requires volatile-only warnings AND a final archive with SHA256 + verify_deep.
+
+``TarStderrClassifier`` consumes stderr incrementally (line by line while tar runs)
+and keeps only counters, capped samples and capped path lists, so the final
+classification does not depend on the stderr volume.
 """
 
 from __future__ import annotations
 
 import re
+import threading
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import StrEnum
 from pathlib import Path
 from typing import Any
 
 __all__ = [
+    "TarStderrClassifier",
     "TarWarningClassification",
     "classify_tar_run",
     "classification_to_job_status_fields",
@@ -74,6 +81,11 @@ _RE_EOF = re.compile(r"unexpected eof|Unerwartetes Dateiende", re.IGNORECASE)
 _RE_PERM = re.compile(r"permission denied|Keine Berechtigung", re.IGNORECASE)
 _RE_TAR_PATH = re.compile(r"^tar:\s+([^:]+):")
 
+# Streaming-Grenzen: Beispiele je Ereignisart und eindeutige Pfade je Liste.
+STREAM_SAMPLES_PER_KIND = 20
+STREAM_PATHS_MAX = 200
+STREAM_LINE_MAX_CHARS = 4096
+
 
 @dataclass(frozen=True)
 class TarStderrEvent:
@@ -95,6 +107,7 @@ class TarClassificationResult:
     operational_success_allowed: bool = False
     no_archive_created: bool = True
     downgrade_blockers: list[str] = field(default_factory=list)
+    event_counts: dict[str, int] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -108,6 +121,7 @@ class TarClassificationResult:
             "operational_success_allowed": self.operational_success_allowed,
             "no_archive_created": self.no_archive_created,
             "downgrade_blockers": list(self.downgrade_blockers),
+            "event_counts": dict(self.event_counts),
             "events": [{"kind": e.kind, "path": e.path, "line": e.line} for e in self.events],
         }
 
@@ -132,43 +146,216 @@ def path_is_volatile_for_tar_warning(path: str) -> bool:
     return any(rx.match(p) for rx in _VOLATILE_GLOBS)
 
 
+def _parse_tar_stderr_line(raw: str) -> TarStderrEvent | None:
+    line = raw.strip()
+    if not line or not line.startswith("tar:"):
+        return None
+    m = _RE_TAR_PATH.match(line)
+    path = m.group(1).strip() if m else None
+    if _RE_IO.search(line):
+        return TarStderrEvent("io_error", path, line)
+    if _RE_NO_SPACE.search(line):
+        return TarStderrEvent("no_space", path, line)
+    if _RE_EOF.search(line):
+        return TarStderrEvent("unexpected_eof", path, line)
+    if _RE_PERM.search(line):
+        return TarStderrEvent("permission_denied", path, line)
+    if _RE_FILE_CHANGED.search(line):
+        return TarStderrEvent("file_changed", path, line)
+    if _RE_SOCKET_IGNORED.search(line):
+        return TarStderrEvent("socket_ignored", path, line)
+    if path:
+        return TarStderrEvent("other", path, line)
+    return None
+
+
 def parse_tar_stderr_lines(stderr_text: str) -> list[TarStderrEvent]:
     events: list[TarStderrEvent] = []
     for raw in (stderr_text or "").splitlines():
-        line = raw.strip()
-        if not line or not line.startswith("tar:"):
-            continue
-        m = _RE_TAR_PATH.match(line)
-        path = m.group(1).strip() if m else None
-        if _RE_IO.search(line):
-            events.append(TarStderrEvent("io_error", path, line))
-        elif _RE_NO_SPACE.search(line):
-            events.append(TarStderrEvent("no_space", path, line))
-        elif _RE_EOF.search(line):
-            events.append(TarStderrEvent("unexpected_eof", path, line))
-        elif _RE_PERM.search(line):
-            events.append(TarStderrEvent("permission_denied", path, line))
-        elif _RE_FILE_CHANGED.search(line):
-            events.append(TarStderrEvent("file_changed", path, line))
-        elif _RE_SOCKET_IGNORED.search(line):
-            events.append(TarStderrEvent("socket_ignored", path, line))
-        elif path:
-            events.append(TarStderrEvent("other", path, line))
+        ev = _parse_tar_stderr_line(raw)
+        if ev is not None:
+            events.append(ev)
     return events
 
 
+class _CappedPaths:
+    """Eindeutige Pfade in Eingangsreihenfolge, höchstens ``cap`` Stück; Gesamtzahl bleibt erhalten."""
+
+    def __init__(self, cap: int) -> None:
+        self.cap = cap
+        self._seen: dict[str, None] = {}
+        self.total = 0
+
+    def add(self, path: str) -> None:
+        self.total += 1
+        if path not in self._seen and len(self._seen) < self.cap:
+            self._seen[path] = None
+
+    def __bool__(self) -> bool:
+        return self.total > 0
+
+    def as_list(self) -> list[str]:
+        return list(self._seen)
+
+
+class TarStderrClassifier:
+    """
+    Inkrementelle Klassifikation von tar-stderr (thread-safe ``feed``/``snapshot``).
+
+    Speichert pro Ereignisart nur Zähler und bis zu ``samples_per_kind`` Beispiele;
+    ``classify_tar_run(stream=...)`` liefert dasselbe Ergebnis wie der Blob-Pfad.
+    """
+
+    def __init__(
+        self,
+        *,
+        samples_per_kind: int = STREAM_SAMPLES_PER_KIND,
+        paths_max: int = STREAM_PATHS_MAX,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._buf = ""
+        self._samples_per_kind = samples_per_kind
+        self.lines_seen = 0
+        self.counts: Counter[str] = Counter()
+        self.samples: dict[str, list[TarStderrEvent]] = {}
+        self.volatile_paths = _CappedPaths(paths_max)
+        self.critical_paths = _CappedPaths(paths_max)
+        # Rohtext-Treffer wie früher im Gesamt-Blob (auch außerhalb von ``tar:``-Zeilen).
+        self.blob_io = False
+        self.blob_no_space = False
+        self.blob_eof = False
+        self.blob_wrote_only = False
+        self.blob_byte = False
+        self.has_non_volatile_warning = False
+        self.file_changed_critical = False
+        self.file_changed_count = 0
+        self.file_changed_not_volatile = 0
+        self.socket_count = 0
+        self.socket_not_volatile = 0
+        self.first_terminal: tuple[str, list[str]] | None = None
+
+    def feed(self, chunk: str) -> None:
+        """Beliebige Textstücke (z. B. 4 KiB aus der Pipe); vollständige Zeilen werden sofort ausgewertet."""
+        if not chunk:
+            return
+        with self._lock:
+            self._buf += chunk
+            while "\n" in self._buf:
+                line, self._buf = self._buf.split("\n", 1)
+                self._feed_line_locked(line)
+            if len(self._buf) > STREAM_LINE_MAX_CHARS:
+                self._feed_line_locked(self._buf)
+                self._buf = ""
+
+    def feed_text(self, text: str) -> None:
+        self.feed(text)
+        self.close()
+
+    def close(self) -> None:
+        """Restzeile ohne abschließendes Newline auswerten."""
+        with self._lock:
+            if self._buf:
+                self._feed_line_locked(self._buf)
+                self._buf = ""
+
+    def _feed_line_locked(self, raw: str) -> None:
+        self.lines_seen += 1
+        low = raw.lower()
+        if "input/output error" in low or "ein-/ausgabefehler" in low:
+            self.blob_io = True
+        if "no space left on device" in low or "kein speicherplatz" in low:
+            self.blob_no_space = True
+        if "unexpected eof" in low or "unerwartetes dateiende" in low:
+            self.blob_eof = True
+        if "wrote only" in low:
+            self.blob_wrote_only = True
+        if "byte" in low:
+            self.blob_byte = True
+        ev = _parse_tar_stderr_line(raw)
+        if ev is None:
+            return
+        self.counts[ev.kind] += 1
+        bucket = self.samples.setdefault(ev.kind, [])
+        if len(bucket) < self._samples_per_kind:
+            bucket.append(ev)
+        self._aggregate_locked(ev)
+
+    def _aggregate_locked(self, ev: TarStderrEvent) -> None:
+        if ev.kind in {"no_space", "unexpected_eof"}:
+            if self.first_terminal is None:
+                self.first_terminal = (ev.kind, [])
+            return
+        if ev.kind == "permission_denied" and ev.path:
+            if path_is_critical_for_tar_warning(ev.path):
+                if self.first_terminal is None:
+                    paths = self.critical_paths.as_list()
+                    if ev.path not in paths:
+                        paths.append(ev.path)
+                    self.first_terminal = (ev.kind, paths)
+                self.critical_paths.add(ev.path)
+                return
+            self.has_non_volatile_warning = True
+        if ev.kind == "file_changed":
+            self.file_changed_count += 1
+            if not ev.path or not path_is_volatile_for_tar_warning(ev.path):
+                self.file_changed_not_volatile += 1
+            if ev.path:
+                if path_is_critical_for_tar_warning(ev.path):
+                    self.critical_paths.add(ev.path)
+                    self.file_changed_critical = True
+                elif path_is_volatile_for_tar_warning(ev.path):
+                    self.volatile_paths.add(ev.path)
+                else:
+                    self.has_non_volatile_warning = True
+                    self.critical_paths.add(ev.path)
+                    self.file_changed_critical = True
+        if ev.kind == "socket_ignored":
+            self.socket_count += 1
+            if not ev.path or not path_is_volatile_for_tar_warning(ev.path):
+                self.socket_not_volatile += 1
+            if ev.path:
+                if path_is_volatile_for_tar_warning(ev.path) or not path_is_critical_for_tar_warning(ev.path):
+                    self.volatile_paths.add(ev.path)
+                else:
+                    self.critical_paths.add(ev.path)
+        if ev.kind == "other" and ev.path:
+            self.has_non_volatile_warning = True
+
+    def fatal_flags(self) -> tuple[bool, bool]:
+        io = self.blob_io
+        if io:
+            return True, True
+        if self.blob_no_space or self.blob_eof:
+            return True, False
+        if self.blob_wrote_only and self.blob_byte:
+            return True, True
+        return False, io
+
+    def sample_events(self) -> list[TarStderrEvent]:
+        out: list[TarStderrEvent] = []
+        for bucket in self.samples.values():
+            out.extend(bucket)
+        return out
+
+    def snapshot(self) -> dict[str, Any]:
+        """Kompakte Live-Zähler für progress/status.json (O(Anzahl Ereignisarten))."""
+        with self._lock:
+            fatal, io = self.fatal_flags()
+            return {
+                "lines_seen": self.lines_seen,
+                "event_counts": dict(self.counts),
+                "volatile_paths_count": self.volatile_paths.total,
+                "critical_paths_count": self.critical_paths.total,
+                "critical_paths_sample": self.critical_paths.as_list()[:10],
+                "fatal_patterns_found": fatal,
+                "io_errors_found": io,
+            }
+
+
 def _has_fatal_blob(stderr_text: str) -> tuple[bool, bool]:
-    blob = (stderr_text or "").lower()
-    io = "input/output error" in blob or "ein-/ausgabefehler" in blob
-    if io:
-        return True, True
-    if "no space left on device" in blob or "kein speicherplatz" in blob:
-        return True, False
-    if "unexpected eof" in blob or "unerwartetes dateiende" in blob:
-        return True, False
-    if "wrote only" in blob and "byte" in blob:
-        return True, True
-    return False, io
+    clf = TarStderrClassifier()
+    clf.feed_text(stderr_text or "")
+    return clf.fatal_flags()
 
 
 def classify_tar_run(
@@ -179,20 +366,41 @@ def classify_tar_run(
     final_archive_exists: bool | None = None,
     sha256_verified: bool | None = None,
     verify_deep_ok: bool | None = None,
+    stream: TarStderrClassifier | None = None,
 ) -> TarClassificationResult:
-    events = parse_tar_stderr_lines(stderr_text)
-    volatile_paths: list[str] = []
-    critical_paths: list[str] = []
-    has_file_changed = False
-    has_socket_only = True
-    has_non_volatile_warning = False
-
-    fatal, io_found = _has_fatal_blob(stderr_text)
+    """Klassifiziert einen tar-Lauf; mit ``stream`` ohne erneutes Parsen des stderr-Texts."""
+    clf = stream
+    if clf is None:
+        clf = TarStderrClassifier()
+        clf.feed_text(stderr_text)
+    else:
+        clf.close()
+    return _classify_from_stream(
+        clf,
+        tar_exit_code=tar_exit_code,
+        final_archive_path=final_archive_path,
+        final_archive_exists=final_archive_exists,
+        sha256_verified=sha256_verified,
+        verify_deep_ok=verify_deep_ok,
+    )
+
+
+def _classify_from_stream(
+    clf: TarStderrClassifier,
+    *,
+    tar_exit_code: int,
+    final_archive_path: str | Path | None,
+    final_archive_exists: bool | None,
+    sha256_verified: bool | None,
+    verify_deep_ok: bool | None,
+) -> TarClassificationResult:
+    fatal, io_found = clf.fatal_flags()
     res = TarClassificationResult(
         classification=TarWarningClassification.TAR_FATAL,
         tar_exit_code=tar_exit_code,
-        events=events,
+        events=clf.sample_events(),
         io_errors_found=io_found,
+        event_counts=dict(clf.counts),
     )
 
     archive_exists = False
@@ -205,7 +413,6 @@ def classify_tar_run(
 
     if tar_exit_code == 0 and not fatal:
         res.classification = TarWarningClassification.TAR_OK
-        res.no_archive_created = not archive_exists if final_archive_path is not None else res.no_archive_created
         _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
         return res
 
@@ -217,78 +424,46 @@ def classify_tar_run(
         _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
         return res
 
-    for ev in events:
-        if ev.kind in {"no_space", "unexpected_eof"}:
+    if clf.first_terminal is not None:
+        kind, paths = clf.first_terminal
+        if kind == "permission_denied":
+            res.classification = TarWarningClassification.TAR_PERMISSION_CRITICAL
+            res.critical_paths = list(paths)
+        else:
             res.classification = TarWarningClassification.TAR_FATAL
-            res.critical_errors_found = True
-            _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
-            return res
-        if ev.kind == "permission_denied" and ev.path:
-            if path_is_critical_for_tar_warning(ev.path):
-                critical_paths.append(ev.path)
-                res.classification = TarWarningClassification.TAR_PERMISSION_CRITICAL
-                res.critical_errors_found = True
-                res.critical_paths = list(dict.fromkeys(critical_paths))
-                _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
-                return res
-            has_non_volatile_warning = True
-        if ev.kind == "file_changed" and ev.path:
-            has_file_changed = True
-            if path_is_critical_for_tar_warning(ev.path):
-                critical_paths.append(ev.path)
-            elif path_is_volatile_for_tar_warning(ev.path):
-                volatile_paths.append(ev.path)
-            else:
-                has_non_volatile_warning = True
-                critical_paths.append(ev.path)
-        if ev.kind == "socket_ignored" and ev.path:
-            if path_is_volatile_for_tar_warning(ev.path) or path_is_critical_for_tar_warning(ev.path) is False:
-                volatile_paths.append(ev.path)
-            else:
-                has_socket_only = False
-                critical_paths.append(ev.path)
-        if ev.kind == "other" and ev.path:
-            has_non_volatile_warning = True
+        res.critical_errors_found = True
+        _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
+        return res
 
-    res.volatile_paths = list(dict.fromkeys(volatile_paths))
-    res.critical_paths = list(dict.fromkeys(critical_paths))
+    res.volatile_paths = clf.volatile_paths.as_list()
+    res.critical_paths = clf.critical_paths.as_list()
 
-    if critical_paths and any(
-        ev.kind == "file_changed" and ev.path in critical_paths for ev in events
-    ):
+    if clf.file_changed_critical:
         res.classification = TarWarningClassification.TAR_CRITICAL_WARNING
         res.critical_errors_found = True
         _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
         return res
 
-    if has_non_volatile_warning or any(ev.kind == "other" for ev in events):
+    if clf.has_non_volatile_warning or clf.counts.get("other"):
         res.classification = TarWarningClassification.TAR_FATAL
         res.critical_errors_found = True
         _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
         return res
 
-    socket_events = [e for e in events if e.kind == "socket_ignored"]
-    file_events = [e for e in events if e.kind == "file_changed"]
-
-    if file_events and not socket_events and not critical_paths:
-        all_volatile_fc = all(e.path and path_is_volatile_for_tar_warning(e.path) for e in file_events)
-        if all_volatile_fc:
+    has_critical = bool(clf.critical_paths)
+    if clf.file_changed_count and not clf.socket_count and not has_critical:
+        if clf.file_changed_not_volatile == 0:
             res.classification = TarWarningClassification.TAR_LIVE_FILE_CHANGED_ONLY
         else:
             res.classification = TarWarningClassification.TAR_FATAL
             res.critical_errors_found = True
-    elif socket_events and not file_events and not critical_paths:
-        all_volatile_sk = all(e.path and path_is_volatile_for_tar_warning(e.path) for e in socket_events)
-        if all_volatile_sk:
+    elif clf.socket_count and not clf.file_changed_count and not has_critical:
+        if clf.socket_not_volatile == 0:
             res.classification = TarWarningClassification.TAR_SOCKET_IGNORED_ONLY
         else:
             res.classification = TarWarningClassification.TAR_FATAL
-    elif (socket_events or file_events) and not critical_paths:
-        only_volatile = True
-        for e in socket_events + file_events:
-            if not e.path or not path_is_volatile_for_tar_warning(e.path):
-                only_volatile = False
-                break
+    elif (clf.socket_count or clf.file_changed_count) and not has_critical:
+        only_volatile = clf.socket_not_volatile == 0 and clf.file_changed_not_volatile == 0
         res.classification = (
             TarWarningClassification.TAR_VOLATILE_WARNINGS_ONLY
             if only_volatile
@@ -298,7 +473,7 @@ def classify_tar_run(
             res.critical_errors_found = True
     elif tar_exit_code != 0:
         res.classification = TarWarningClassification.TAR_FATAL
-        if tar_exit_code != 0 and not events:
+        if not clf.counts:
             res.critical_errors_found = True
 
     _apply_post_verify(res, archive_exists, sha256_verified, verify_deep_ok)
@@ -344,13 +519,14 @@ def classification_to_job_status_fields(result: TarClassificationResult) -> dict
         "volatile_warning_paths": list(result.volatile_paths),
         "fatal_patterns_found": bool(result.critical_errors_found or result.io_errors_found),
         "tar_downgrade_blockers": list(result.downgrade_blockers),
+        "tar_stderr_event_counts": dict(result.event_counts),
     }
 
 
 def decide_tar_nonzero_job_outcome(
     *,
     tar_exit_code: int,
-    stderr_text: str,
+    stderr_text: str = "",
     partial_exists: bool,
     partial_bytes: int,
     final_archive_exists: bool,
@@ -358,15 +534,18 @@ def decide_tar_nonzero_job_outcome(
     finalize_ok: bool,
     sha256_verified: bool,
     verify_deep_ok: bool,
+    stream: TarStderrClassifier | None = None,
 ) -> dict[str, Any]:
     """
     Pure decision for runner integration (unit-tested without live tar).
 
     Never returns plain success without integrity chain when tar_exit_code != 0.
+    ``stream``: bereits während des Laufs befüllter Klassifikator statt ``stderr_text``.
     """
     cls = classify_tar_run(
         tar_exit_code=tar_exit_code,
         stderr_text=stderr_text,
+        stream=stream,
         final_archive_exists=final_archive_exists,
         sha256_verified=sha256_verified if final_archive_exists else None,
         verify_deep_ok=verify_deep_ok if final_archive_exists else None,
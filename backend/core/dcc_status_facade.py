@@ -504,14 +504,33 @@ async def build_dcc_dashboard_status_api(
     frontend_runtime_source: str | None = None,
 ) -> dict[str, Any]:
     """Canonical async entry for ``GET /api/dev-dashboard/status`` (Phase E.11)."""
+    payload, _snapshot = await build_dcc_dashboard_status_api_with_snapshot(
+        request_headers=request_headers,
+        frontend_build_version=frontend_build_version,
+        frontend_runtime_source=frontend_runtime_source,
+    )
+    return payload
+
+
+async def build_dcc_dashboard_status_api_with_snapshot(
+    *,
+    request_headers: dict[str, str] | None = None,
+    frontend_build_version: str | None = None,
+    frontend_runtime_source: str | None = None,
+) -> tuple[dict[str, Any], Any]:
+    """Wie ``build_dcc_dashboard_status_api``, zusätzlich mit memoisiertem Snapshot (JSON + ETag).
+
+    ``snapshot`` ist ``None`` bei Block-/Timeout-Antworten. Der Payload ist immer eine Kopie des
+    memoisierten Snapshots.
+    """
     from core.dcc_status_runtime import get_dashboard_status_runtime_adapters
-    from core.dev_dashboard_status_service import build_dev_dashboard_status
+    from core.dev_dashboard_status_service import build_dev_dashboard_status_snapshot
 
-    jobs, sync, snapshot, pkg = get_dashboard_status_runtime_adapters()
-    return await build_dev_dashboard_status(
+    jobs, sync, snapshot_fn, pkg = get_dashboard_status_runtime_adapters()
+    return await build_dev_dashboard_status_snapshot(
         backup_jobs=jobs,
         sync_stale_runner_job_from_systemd=sync,
-        job_snapshot=snapshot,
+        job_snapshot=snapshot_fn,
         detect_active_package_operations=pkg,
         frontend_build_version=frontend_build_version,
         frontend_runtime_source=frontend_runtime_source,
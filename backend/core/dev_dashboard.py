@@ -21,6 +21,8 @@ _T = TypeVar("_T")
 _DASHBOARD_SECTION_TIMEOUT_SEC = float(os.environ.get("SETUPHELFER_DASHBOARD_SECTION_TIMEOUT_SEC", "12"))
 _DEPLOY_DRIFT_TIMEOUT_SEC = float(os.environ.get("SETUPHELFER_DEPLOY_DRIFT_TIMEOUT_SEC", "8"))
 _COCKPIT_ENRICH_TIMEOUT_SEC = float(os.environ.get("SETUPHELFER_COCKPIT_ENRICH_TIMEOUT_SEC", "10"))
+_GIT_DETAIL_TTL_SEC = float(os.environ.get("SETUPHELFER_DASHBOARD_GIT_TTL_SEC", "30"))
+_DEPLOY_DRIFT_TTL_SEC = float(os.environ.get("SETUPHELFER_DASHBOARD_DRIFT_TTL_SEC", "300"))
 
 
 def _bounded_section(
@@ -33,7 +35,7 @@ def _bounded_section(
 ) -> _T:
     """Isoliert langsame Dashboard-Abschnitte; bei Timeout degraded statt Worker-Blockade."""
     with ThreadPoolExecutor(max_workers=1) as pool:
-        fut = pool.submit(fn)
+        fut = submit_with_context(pool, fn)
         try:
             return fut.result(timeout=timeout_sec)
         except FuturesTimeoutError:
@@ -46,10 +48,15 @@ UTC = timezone.utc
 from core.deploy_manifest import (
     DEPLOY_MANIFEST_REL_PATHS,
     manifest_drift_for_roots,
+    runtime_manifest_candidates,
     safe_path_is_dir,
     safe_path_is_file,
+    workspace_manifest_path,
 )
 
+from core.dev_dashboard_evidence_index import get_evidence_index
+from core.dev_dashboard_snapshot import SectionInputs, memo_section, submit_with_context
+
 DEPLOY_DRIFT_REL_PATHS = DEPLOY_MANIFEST_REL_PATHS
 
 # Read-only Deploy-Drift: nur kleine/mittlere Text-Dateien hashen; groessere per Groesse+mtime.
@@ -80,41 +87,35 @@ def _safe_is_dir(path: Path) -> bool:
 
 
 def _walk_files_under(base: Path, *, rel_root: Path | None, max_files: int = 400) -> list[dict[str, Any]]:
+    """Dateiliste aus dem inkrementellen Evidence-Index (kein Voll-Walk pro Request)."""
     out: list[dict[str, Any]] = []
     if not base.exists():
         return out
-    try:
-        for root, _dirs, files in os.walk(base):
-            for fn in files:
-                if len(out) >= max_files:
-                    return out
-                fp = Path(root) / fn
-                rel_s: str
-                if rel_root is not None:
-                    try:
-                        rel_s = str(fp.relative_to(rel_root)).replace("\\", "/")
-                    except ValueError:
-                        rel_s = str(fp)
-                else:
-                    rel_s = str(fp)
-                try:
-                    st = fp.stat()
-                    out.append(
-                        {
-                            "path": rel_s,
-                            "abs_path": str(fp),
-                            "size": int(st.st_size),
-                            "mtime_iso": datetime.fromtimestamp(st.st_mtime, tz=UTC).isoformat(),
-                        }
-                    )
-                except OSError:
-                    out.append({"path": rel_s, "abs_path": str(fp), "size": None, "mtime_iso": None})
-    except OSError:
-        return out
+    persist = rel_root is None or rel_root == _repo_root()
+    idx = get_evidence_index(base, rel_root=rel_root, kind="evidence_files", persist=persist)
+    for key, entry in idx.entries()[: max(0, int(max_files))]:
+        mtime_ns = entry.get("mtime_ns")
+        out.append(
+            {
+                "path": key,
+                "abs_path": entry.get("abs_path"),
+                "size": entry.get("size"),
+                "mtime_iso": datetime.fromtimestamp(mtime_ns / 1e9, tz=UTC).isoformat() if mtime_ns is not None else None,
+            }
+        )
     return out
 
 
 def _git_summary(repo: Path) -> dict[str, Any] | None:
+    """HEAD-Kurzinfo; neu ermittelt nur bei geändertem Git-Zustand (siehe dev_dashboard_snapshot)."""
+    return memo_section(
+        "git_summary",
+        SectionInputs(git_repos=(repo,), key=str(repo)),
+        lambda: _git_summary_uncached(repo),
+    )
+
+
+def _git_summary_uncached(repo: Path) -> dict[str, Any] | None:
     try:
         proc = subprocess.run(
             ["git", "-C", str(repo), "rev-parse", "--short", "HEAD"],
@@ -376,7 +377,32 @@ def _merge_manifest_into_deploy_drift(
     return out
 
 
+def _deploy_drift_inputs(workspace_root: Path, runtime_root: Path) -> SectionInputs:
+    """Alle Dateien, die der Drift-Vergleich liest (Manifest-Liste in beiden Bäumen + Manifeste)."""
+    paths: list[Path] = [workspace_root, runtime_root, workspace_manifest_path(workspace_root)]
+    paths.extend(runtime_manifest_candidates(runtime_root))
+    for rel in DEPLOY_DRIFT_REL_PATHS:
+        rel_n = rel.replace("\\", "/").strip().lstrip("/")
+        paths.append(workspace_root / rel_n)
+        paths.append(runtime_root / rel_n)
+    return SectionInputs(
+        paths=tuple(paths),
+        git_repos=(workspace_root,),
+        ttl_sec=_DEPLOY_DRIFT_TTL_SEC,
+        key=(str(workspace_root), str(runtime_root)),
+    )
+
+
 def _compute_deploy_drift(*, workspace_root: Path, runtime_root: Path) -> dict[str, Any]:
+    """Deploy-Drift; nur neu berechnet, wenn sich eine verglichene Datei oder HEAD ändert."""
+    return memo_section(
+        "deploy_drift",
+        _deploy_drift_inputs(workspace_root, runtime_root),
+        lambda: _compute_deploy_drift_uncached(workspace_root=workspace_root, runtime_root=runtime_root),
+    )
+
+
+def _compute_deploy_drift_uncached(*, workspace_root: Path, runtime_root: Path) -> dict[str, Any]:
     """
     Read-only: Workspace-Checkout vs. produktiver Runtime-Baum (typ. /opt/setuphelfer).
     Drift → status yellow/gray; rot nur fuer globale Konsistenz, nicht hier.
@@ -667,6 +693,18 @@ def _read_workspace_version_info(ws_root: Path) -> tuple[str | None, str | None,
 
 
 def _git_workspace_detail(repo: Path) -> dict[str, Any]:
+    """
+    Git-Metadaten; gecacht bis HEAD/Ref/Index sich ändern. Unversionierte Worktree-Edits
+    (Dirty-Count) und Upstream-Stand ändern keinen Fingerabdruck → TTL.
+    """
+    return memo_section(
+        "git_workspace_detail",
+        SectionInputs(git_repos=(repo,), ttl_sec=_GIT_DETAIL_TTL_SEC, key=str(repo)),
+        lambda: _git_workspace_detail_uncached(repo),
+    )
+
+
+def _git_workspace_detail_uncached(repo: Path) -> dict[str, Any]:
     """Git-Metadaten; fehlendes Git oder fehlende Upstream-Refs → null-Felder, kein Raise."""
     out: dict[str, Any] = {
         "git_head": None,
@@ -6,18 +6,26 @@ Read-only. Keine Service-Restarts, keine Deployments, kein apt.
 
 from __future__ import annotations
 
-import json
 import re
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from core.dev_dashboard_evidence_index import read_json_cached
+from core.dev_dashboard_snapshot import SectionInputs, memo_section
+
 UTC = timezone.utc
 
 EXPECTED_OPT_BACKEND = "/opt/setuphelfer/backend"
 GATES_DIR = "docs/evidence/release-gates"
 MATRIX_PATH = "docs/roadmap/STATUS_MATRIX.md"
+DPKG_STATUS_PATH = Path("/var/lib/dpkg/status")
+
+# systemctl liefert keinen billigen Fingerabdruck → kurze TTL; dpkg über /var/lib/dpkg/status.
+_UNIT_STATE_TTL_SEC = 10.0
+_DPKG_TTL_SEC = 600.0
+_GIT_HYGIENE_TTL_SEC = 30.0
 
 FORBIDDEN_ARTIFACT_PATTERNS = (
     "__pycache__",
@@ -44,15 +52,19 @@ def _repo_root() -> Path:
 
 
 def _safe_read_json(path: Path) -> tuple[dict[str, Any] | None, str | None]:
-    try:
-        if not path.is_file():
-            return None, f"missing:{path}"
-        return json.loads(path.read_text(encoding="utf-8", errors="replace")), None
-    except Exception as exc:  # noqa: BLE001
-        return None, f"read_error:{path}:{exc}"
+    """Gate-/State-JSON lesen; geparste Daten per (Größe, mtime) gecacht — Ergebnis nicht mutieren."""
+    return read_json_cached(path)
 
 
 def _systemd_unit_state(unit: str) -> dict[str, Any]:
+    return memo_section(
+        "systemd_unit_state",
+        SectionInputs(ttl_sec=_UNIT_STATE_TTL_SEC, key=unit),
+        lambda: _systemd_unit_state_uncached(unit),
+    )
+
+
+def _systemd_unit_state_uncached(unit: str) -> dict[str, Any]:
     out: dict[str, Any] = {"unit": unit, "is_active": None, "load_state": None, "error": None}
     try:
         proc = subprocess.run(
@@ -83,6 +95,14 @@ def _systemd_unit_state(unit: str) -> dict[str, Any]:
 
 
 def _dpkg_setuphelfer_installed() -> dict[str, Any]:
+    return memo_section(
+        "dpkg_setuphelfer_installed",
+        SectionInputs(paths=(DPKG_STATUS_PATH,), ttl_sec=_DPKG_TTL_SEC),
+        _dpkg_setuphelfer_installed_uncached,
+    )
+
+
+def _dpkg_setuphelfer_installed_uncached() -> dict[str, Any]:
     info: dict[str, Any] = {"checked": True, "installed": False, "packages": [], "error": None}
     try:
         proc = subprocess.run(
@@ -330,6 +350,14 @@ def build_tests_evidence(repo: Path) -> dict[str, Any]:
 
 
 def _parse_status_matrix(repo: Path) -> tuple[list[dict[str, Any]], list[str]]:
+    return memo_section(
+        "status_matrix",
+        SectionInputs(paths=(repo / MATRIX_PATH,), key=str(repo)),
+        lambda: _parse_status_matrix_uncached(repo),
+    )
+
+
+def _parse_status_matrix_uncached(repo: Path) -> tuple[list[dict[str, Any]], list[str]]:
     path = repo / MATRIX_PATH
     warns: list[str] = []
     items: list[dict[str, Any]] = []
@@ -399,6 +427,14 @@ def build_roadmap(repo: Path, *, dashboard_context: dict[str, Any] | None = None
 
 
 def _git_hygiene(repo: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    return memo_section(
+        "git_hygiene",
+        SectionInputs(git_repos=(repo,), ttl_sec=_GIT_HYGIENE_TTL_SEC, key=str(repo)),
+        lambda: _git_hygiene_uncached(repo),
+    )
+
+
+def _git_hygiene_uncached(repo: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
     findings: list[dict[str, Any]] = []
     detail: dict[str, Any] = {
         "dirty_count": None,
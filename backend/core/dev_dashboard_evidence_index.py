@@ -0,0 +1,387 @@
+"""
+Inkrementeller Evidence-Index für das Development Control Center (read-only Quellen).
+
+Statt bei jedem Request ``rglob`` über alle Evidence-Bäume zu laufen und Snippets
+jeder Datei neu zu lesen, hält der Index pro Wurzel:
+
+- je Verzeichnis ``st_mtime_ns`` + Dateiliste (unverändertes Verzeichnis → kein ``scandir``),
+- je Datei Größe/``mtime_ns`` und das Ergebnis eines optionalen Parsers
+  (Status/Zeitstempel/Kategorie), das nur bei geänderter Datei neu berechnet wird.
+
+In-place-Änderungen ohne Verzeichnis-mtime-Wechsel werden durch einen periodischen
+Voll-Abgleich (nur ``stat``) erfasst. Der Index wird als mtime-keyed JSON-Cache
+persistiert (Cache-Verzeichnis, nicht im Repo); Schreibfehler sind nicht fatal.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+INDEX_FORMAT_VERSION = 1
+
+_MAX_INDEXED_FILES = 20_000
+_REFRESH_MIN_INTERVAL_SEC = float(os.environ.get("SETUPHELFER_EVIDENCE_INDEX_REFRESH_SEC", "2"))
+_FULL_VERIFY_INTERVAL_SEC = float(os.environ.get("SETUPHELFER_EVIDENCE_INDEX_VERIFY_SEC", "60"))
+_JSON_CACHE_MAX_ENTRIES = 256
+# Zeitstempel-Granularität (Kernel-Ticks): Einträge jünger als das gelten als "racy" und
+# werden beim nächsten Abgleich erneut geprüft (gleiches Prinzip wie der Git-Index).
+_RACY_WINDOW_NS = 2_000_000_000
+
+ParseFn = Callable[[Path, str], Any]
+
+
+def default_cache_dir() -> Path:
+    raw = (os.environ.get("SETUPHELFER_EVIDENCE_INDEX_DIR") or "").strip()
+    if raw:
+        return Path(raw)
+    xdg = (os.environ.get("XDG_CACHE_HOME") or "").strip()
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "setuphelfer" / "evidence-index"
+
+
+class EvidenceIndex:
+    """
+    Dateiindex unterhalb von ``base``. Pfadschlüssel sind relativ zu ``rel_root``
+    (``None`` → absolute Pfade). ``parse(path, rel)`` liefert JSON-serialisierbare
+    Metadaten oder ``None``; ``parser_version`` invalidiert persistierte Ergebnisse.
+    """
+
+    def __init__(
+        self,
+        base: Path,
+        *,
+        rel_root: Path | None,
+        parse: ParseFn | None = None,
+        kind: str = "files",
+        parser_version: str = "",
+        cache_dir: Path | None = None,
+        persist: bool = True,
+        max_files: int = _MAX_INDEXED_FILES,
+    ) -> None:
+        self.base = Path(base)
+        self.rel_root = Path(rel_root) if rel_root is not None else None
+        self.kind = kind
+        self.parser_version = parser_version
+        self.max_files = max(1, int(max_files))
+        self._parse = parse
+        self._cache_dir = cache_dir
+        self._persist = persist
+        self._lock = threading.Lock()
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._files: dict[str, dict[str, Any]] = {}
+        self._generation = 0
+        self._last_refresh = 0.0
+        self._last_full_verify = 0.0
+        self._truncated = False
+        self._load()
+
+    # -- Persistenz -------------------------------------------------------
+
+    def _identity(self) -> dict[str, Any]:
+        return {
+            "format": INDEX_FORMAT_VERSION,
+            "kind": self.kind,
+            "parser_version": self.parser_version,
+            "base": str(self.base),
+            "rel_root": str(self.rel_root) if self.rel_root is not None else None,
+        }
+
+    def cache_path(self) -> Path | None:
+        if not self._persist:
+            return None
+        cache_dir = self._cache_dir if self._cache_dir is not None else default_cache_dir()
+        if not cache_dir:
+            return None
+        key = hashlib.sha256(json.dumps(self._identity(), sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        return Path(cache_dir) / f"{self.kind}-{key}.json"
+
+    def _load(self) -> None:
+        path = self.cache_path()
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("identity") != self._identity():
+            return
+        dirs = data.get("dirs")
+        files = data.get("files")
+        if isinstance(dirs, dict) and isinstance(files, dict):
+            self._dirs = dirs
+            self._files = files
+
+    def _save(self) -> None:
+        path = self.cache_path()
+        if path is None:
+            return
+        payload = {"identity": self._identity(), "dirs": self._dirs, "files": self._files}
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    # -- Abgleich ---------------------------------------------------------
+
+    def _key_prefix(self, d: Path) -> str:
+        """Schlüssel-Präfix für Dateien in ``d`` (einmal je Verzeichnis statt je Datei)."""
+        if self.rel_root is not None:
+            try:
+                rel = str(d.relative_to(self.rel_root)).replace("\\", "/")
+            except ValueError:
+                return f"{d}/"
+            return "" if rel == "." else f"{rel}/"
+        return f"{d}/"
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """
+        Gleicht den Index mit dem Dateisystem ab. Liefert ``True`` bei Änderungen.
+        Innerhalb von ``_REFRESH_MIN_INTERVAL_SEC`` wird ohne ``force`` nicht erneut geprüft.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_refresh and now - self._last_refresh < _REFRESH_MIN_INTERVAL_SEC:
+                return False
+            full = force or not self._last_full_verify or now - self._last_full_verify >= _FULL_VERIFY_INTERVAL_SEC
+            changed = self._refresh_locked(full=full)
+            self._last_refresh = time.monotonic()
+            if full:
+                self._last_full_verify = self._last_refresh
+            if changed:
+                self._generation += 1
+                self._save()
+            return changed
+
+    def _refresh_locked(self, *, full: bool) -> bool:
+        changed = False
+        seen_dirs: set[str] = set()
+        seen_files: set[str] = set()
+        truncated = False
+        stack = [self.base]
+        while stack:
+            d = stack.pop()
+            d_key = str(d)
+            try:
+                st = os.stat(d)
+            except OSError:
+                continue
+            seen_dirs.add(d_key)
+            cached = self._dirs.get(d_key)
+            prefix = self._key_prefix(d)
+            if cached is not None and cached.get("m") == st.st_mtime_ns and not cached.get("racy") and not full:
+                for name in cached.get("files") or []:
+                    if len(seen_files) >= self.max_files:
+                        truncated = True
+                        break
+                    key = prefix + name
+                    known = self._files.get(key)
+                    if known is not None and not known.get("racy"):
+                        seen_files.add(key)
+                        continue
+                    changed |= self._update_file(d / name, key, None)
+                    seen_files.add(key)
+                stack.extend(d / name for name in sorted(cached.get("dirs") or [], reverse=True))
+                continue
+
+            file_names: list[str] = []
+            dir_names: list[str] = []
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                dir_names.append(entry.name)
+                            elif entry.is_file():
+                                file_names.append(entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            file_names.sort()
+            dir_names.sort()
+            if cached is None or cached.get("files") != file_names or cached.get("dirs") != dir_names:
+                changed = True
+            self._dirs[d_key] = {
+                "m": st.st_mtime_ns,
+                "racy": time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS,
+                "files": file_names,
+                "dirs": dir_names,
+            }
+            for name in file_names:
+                if len(seen_files) >= self.max_files:
+                    truncated = True
+                    break
+                fp = d / name
+                key = prefix + name
+                changed |= self._update_file(fp, key, None)
+                seen_files.add(key)
+            stack.extend(d / name for name in reversed(dir_names))
+
+        for key in [k for k in self._dirs if k not in seen_dirs]:
+            del self._dirs[key]
+            changed = True
+        for key in [k for k in self._files if k not in seen_files]:
+            del self._files[key]
+            changed = True
+        self._truncated = truncated
+        return changed
+
+    def _update_file(self, fp: Path, key: str, st: os.stat_result | None) -> bool:
+        try:
+            st = st or fp.stat()
+        except OSError:
+            self._files.pop(key, None)
+            return False
+        prev = self._files.get(key)
+        if (
+            prev is not None
+            and not prev.get("racy")
+            and prev.get("size") == st.st_size
+            and prev.get("mtime_ns") == st.st_mtime_ns
+        ):
+            return False
+        meta: Any = None
+        if self._parse is not None:
+            try:
+                meta = self._parse(fp, key)
+            except Exception:  # noqa: BLE001 — defekte Einzeldatei darf den Index nicht blockieren
+                meta = None
+        self._files[key] = {
+            "abs_path": str(fp),
+            "size": int(st.st_size),
+            "mtime_ns": int(st.st_mtime_ns),
+            "racy": time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS,
+            "meta": meta,
+        }
+        return prev is None or prev.get("meta") != meta or prev.get("size") != st.st_size
+
+    # -- Abfragen ---------------------------------------------------------
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def truncated(self) -> bool:
+        return self._truncated
+
+    def entries(self) -> list[tuple[str, dict[str, Any]]]:
+        """Momentaufnahme ``(key, entry)`` sortiert nach Pfad (Einträge nicht mutieren)."""
+        with self._lock:
+            return sorted(self._files.items())
+
+    def metas(self) -> list[Any]:
+        """Alle nicht-leeren Parser-Ergebnisse (Reihenfolge nach Pfad)."""
+        return [e["meta"] for _k, e in self.entries() if e.get("meta") is not None]
+
+
+_REGISTRY_LOCK = threading.Lock()
+_REGISTRY: dict[tuple[str, str, str], EvidenceIndex] = {}
+
+
+def get_evidence_index(
+    base: Path,
+    *,
+    rel_root: Path | None,
+    parse: ParseFn | None = None,
+    kind: str = "files",
+    parser_version: str = "",
+    persist: bool = True,
+    refresh: bool = True,
+) -> EvidenceIndex:
+    """
+    Prozessweiter Index je (Wurzel, Art); optional vor Rückgabe abgeglichen.
+    ``persist=False`` hält den Index nur im Prozess (z. B. temporäre Repo-Wurzeln).
+    """
+    key = (str(Path(base)), kind, parser_version)
+    with _REGISTRY_LOCK:
+        idx = _REGISTRY.get(key)
+        if idx is None:
+            idx = EvidenceIndex(
+                base,
+                rel_root=rel_root,
+                parse=parse,
+                kind=kind,
+                parser_version=parser_version,
+                persist=persist,
+            )
+            _REGISTRY[key] = idx
+    if refresh:
+        idx.refresh()
+    return idx
+
+
+_RESET_HOOKS: list[Callable[[], None]] = []
+
+
+def register_reset_hook(hook: Callable[[], None]) -> None:
+    """Abgeleitete Caches (z. B. über Index-Generationen) beim Reset mitleeren."""
+    with _REGISTRY_LOCK:
+        if hook not in _RESET_HOOKS:
+            _RESET_HOOKS.append(hook)
+
+
+def reset_evidence_indexes() -> None:
+    """Verwirft alle In-Process-Indizes samt abgeleiteter Caches (Tests, Konfigurationswechsel)."""
+    with _REGISTRY_LOCK:
+        _REGISTRY.clear()
+        hooks = list(_RESET_HOOKS)
+    with _JSON_CACHE_LOCK:
+        _JSON_CACHE.clear()
+    for hook in hooks:
+        hook()
+
+
+_JSON_CACHE_LOCK = threading.Lock()
+_JSON_CACHE: dict[str, tuple[int, int, Any]] = {}
+
+
+def read_json_cached(path: Path) -> tuple[Any, str | None]:
+    """
+    JSON-Datei lesen, geparstes Ergebnis per (Größe, ``mtime_ns``) cachen.
+    Rückgabe wie ``_safe_read_json``: ``(data, None)`` oder ``(None, "missing:…"/"read_error:…")``.
+    Das gelieferte Objekt wird geteilt und darf nicht verändert werden.
+    """
+    key = str(path)
+    try:
+        st = path.stat()
+    except OSError:
+        return None, f"missing:{path}"
+    if not path.is_file():
+        return None, f"missing:{path}"
+    with _JSON_CACHE_LOCK:
+        hit = _JSON_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        return hit[2], None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8", errors="replace"))
+    except Exception as exc:  # noqa: BLE001
+        return None, f"read_error:{path}:{exc}"
+    with _JSON_CACHE_LOCK:
+        if len(_JSON_CACHE) >= _JSON_CACHE_MAX_ENTRIES:
+            _JSON_CACHE.pop(next(iter(_JSON_CACHE)))
+        _JSON_CACHE[key] = (int(st.st_size), int(st.st_mtime_ns), data)
+    return data, None
+
+
+__all__ = [
+    "EvidenceIndex",
+    "INDEX_FORMAT_VERSION",
+    "default_cache_dir",
+    "get_evidence_index",
+    "read_json_cached",
+    "register_reset_hook",
+    "reset_evidence_indexes",
+]
@@ -1,6 +1,9 @@
 """
 Read-only scan of repo evidence for Development Control Center report/test feeds.
 
+Report-Metadaten kommen aus dem inkrementellen Evidence-Index
+(``core.dev_dashboard_evidence_index``); nur geänderte Dateien werden neu gelesen.
+
 No shell, no writes, no full large-file payloads.
 """
 
@@ -8,14 +11,18 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from core.dev_dashboard_evidence_index import get_evidence_index, register_reset_hook
+
 UTC = timezone.utc
 
 _DEFAULT_LIMIT = 5
-_MAX_SCAN_FILES = 800
+# Erhöhen, wenn sich die Ableitung von Status/Zeitstempel/Summary ändert (invalidiert den Index-Cache).
+_REPORT_PARSER_VERSION = "1"
 _MAX_READ_BYTES = 8192
 _MAX_SUMMARY_CHARS = 280
 
@@ -235,79 +242,104 @@ def _read_snippet(path: Path) -> tuple[str, dict[str, Any] | None]:
     return raw, None
 
 
-def _scan_report_candidates(repo: Path) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
-    scanned = 0
-    for rel_root in _EVIDENCE_ROOTS:
-        base = repo / rel_root
-        if not base.is_dir():
-            continue
-        try:
-            for fp in base.rglob("*"):
-                if scanned >= _MAX_SCAN_FILES:
-                    break
-                if not fp.is_file() or not _should_include_file(fp):
-                    continue
-                scanned += 1
-                try:
-                    rel = str(fp.relative_to(repo)).replace("\\", "/")
-                except ValueError:
-                    continue
-                mtime = _mtime_dt(fp)
-                snippet, jdata = _read_snippet(fp)
-                ts = _extract_timestamp_from_text(snippet, mtime=mtime)
-                status = _status_from_json(jdata) if jdata else _infer_status_from_name(fp.name)
-                head = None
-                if jdata:
-                    head = jdata.get("head") or jdata.get("git_head")
-                summary = ""
-                if jdata:
-                    for key in ("task", "next_recommended_action", "root_cause_classification", "run_id"):
-                        if jdata.get(key):
-                            summary = f"{key}={jdata.get(key)}"
-                            break
-                elif snippet:
-                    for line in snippet.splitlines()[:12]:
-                        if line.strip().startswith("##") or "**" in line:
-                            summary = line.strip()[:_MAX_SUMMARY_CHARS]
-                            break
-                try:
-                    size_bytes = int(fp.stat().st_size)
-                except OSError:
-                    size_bytes = None
-                items.append(
-                    {
-                        "title": _title_from_path(rel),
-                        "path": rel,
-                        "category": _infer_category(rel),
-                        "status": status,
-                        "timestamp": ts.isoformat() if ts else (mtime.isoformat() if mtime else None),
-                        "timestamp_source": "embedded" if ts and mtime and ts != mtime else ("mtime" if mtime else "unknown"),
-                        "source": "repo_evidence",
-                        "summary": summary[:_MAX_SUMMARY_CHARS] if summary else None,
-                        "head": str(head) if head else None,
-                        "size_bytes": size_bytes,
-                        "is_latest": False,
-                    }
-                )
-        except OSError:
-            continue
-    return items
+def _parse_report_file(fp: Path, rel: str) -> dict[str, Any] | None:
+    """Index-Parser: Report-Metadaten einer Datei (``None`` = kein Report-Kandidat)."""
+    if not _should_include_file(fp):
+        return None
+    mtime = _mtime_dt(fp)
+    snippet, jdata = _read_snippet(fp)
+    ts = _extract_timestamp_from_text(snippet, mtime=mtime)
+    status = _status_from_json(jdata) if jdata else _infer_status_from_name(fp.name)
+    head = None
+    if jdata:
+        head = jdata.get("head") or jdata.get("git_head")
+    summary = ""
+    if jdata:
+        for key in ("task", "next_recommended_action", "root_cause_classification", "run_id"):
+            if jdata.get(key):
+                summary = f"{key}={jdata.get(key)}"
+                break
+    elif snippet:
+        for line in snippet.splitlines()[:12]:
+            if line.strip().startswith("##") or "**" in line:
+                summary = line.strip()[:_MAX_SUMMARY_CHARS]
+                break
+    try:
+        size_bytes = int(fp.stat().st_size)
+    except OSError:
+        size_bytes = None
+    effective = ts or mtime
+    return {
+        "item": {
+            "title": _title_from_path(rel),
+            "path": rel,
+            "category": _infer_category(rel),
+            "status": status,
+            "timestamp": effective.isoformat() if effective else None,
+            "timestamp_source": "embedded" if ts and mtime and ts != mtime else ("mtime" if mtime else "unknown"),
+            "source": "repo_evidence",
+            "summary": summary[:_MAX_SUMMARY_CHARS] if summary else None,
+            "head": str(head) if head else None,
+            "size_bytes": size_bytes,
+            "is_latest": False,
+        },
+        "ts_epoch": effective.timestamp() if effective else None,
+    }
+
+
+_CANDIDATES_LOCK = threading.Lock()
+_CANDIDATES_CACHE: dict[str, tuple[tuple[int, ...], list[dict[str, Any]]]] = {}
+
+
+def _clear_candidates_cache() -> None:
+    # neue Indizes beginnen wieder bei Generation 0 – alte Einträge sähen sonst aktuell aus
+    with _CANDIDATES_LOCK:
+        _CANDIDATES_CACHE.clear()
+
+
+register_reset_hook(_clear_candidates_cache)
+
+
+def _indexed_report_candidates(repo: Path) -> list[dict[str, Any]]:
+    """Report-Metadaten aller Evidence-Wurzeln, neueste zuerst (aus dem inkrementellen Index)."""
+    indexes = [
+        get_evidence_index(
+            repo / rel_root,
+            rel_root=repo,
+            parse=_parse_report_file,
+            kind="recent_reports",
+            parser_version=_REPORT_PARSER_VERSION,
+            persist=repo == _repo_root(),
+        )
+        for rel_root in _EVIDENCE_ROOTS
+        if (repo / rel_root).is_dir()
+    ]
+    generations = tuple(idx.generation for idx in indexes)
+    cache_key = str(repo)
+    with _CANDIDATES_LOCK:
+        hit = _CANDIDATES_CACHE.get(cache_key)
+    if hit is not None and hit[0] == generations:
+        return hit[1]
+    metas = [m for idx in indexes for m in idx.metas()]
+    metas.sort(key=lambda m: str(m["item"].get("timestamp") or ""), reverse=True)
+    with _CANDIDATES_LOCK:
+        _CANDIDATES_CACHE[cache_key] = (generations, metas)
+    return metas
 
 
 def _sort_key(item: dict[str, Any]) -> str:
     return str(item.get("timestamp") or "")
 
 
-def _apply_filters(
-    items: list[dict[str, Any]],
+def _filter_metas(
+    metas: list[dict[str, Any]],
     *,
     category: str | None,
     status: str | None,
     search: str | None,
     time_range: str | None,
 ) -> list[dict[str, Any]]:
-    out = list(items)
+    out = metas
     now = datetime.now(tz=UTC)
     tr = (time_range or "all").strip().lower()
     if tr not in _VALID_TIME_RANGES:
@@ -319,29 +351,33 @@ def _apply_filters(
             cutoff = now - timedelta(hours=24)
         else:
             cutoff = now - timedelta(days=7)
+        cutoff_epoch = cutoff.timestamp()
         filtered: list[dict[str, Any]] = []
-        for it in out:
-            dt = _parse_timestamp(str(it.get("timestamp") or ""))
-            if dt and dt >= cutoff:
-                filtered.append(it)
+        for m in out:
+            epoch = m.get("ts_epoch")
+            if epoch is None:
+                dt = _parse_timestamp(str(m["item"].get("timestamp") or ""))
+                epoch = dt.timestamp() if dt else None
+            if epoch is not None and epoch >= cutoff_epoch:
+                filtered.append(m)
         out = filtered
 
     cat = (category or "").strip().lower()
     if cat and cat != "all" and cat in _VALID_CATEGORIES:
-        out = [it for it in out if str(it.get("category") or "") == cat]
+        out = [m for m in out if str(m["item"].get("category") or "") == cat]
 
     st = (status or "").strip().lower()
     if st and st != "all" and st in _VALID_STATUSES:
-        out = [it for it in out if str(it.get("status") or "unknown") == st]
+        out = [m for m in out if str(m["item"].get("status") or "unknown") == st]
 
     q = (search or "").strip().lower()
     if q:
         out = [
-            it
-            for it in out
-            if q in str(it.get("title") or "").lower()
-            or q in str(it.get("path") or "").lower()
-            or q in str(it.get("summary") or "").lower()
+            m
+            for m in out
+            if q in str(m["item"].get("title") or "").lower()
+            or q in str(m["item"].get("path") or "").lower()
+            or q in str(m["item"].get("summary") or "").lower()
         ]
     return out
 
@@ -409,12 +445,10 @@ def build_recent_evidence_feed(
     lim = max(1, min(int(limit or _DEFAULT_LIMIT), 50))
     warnings: list[str] = []
 
-    candidates = _scan_report_candidates(repo)
-    candidates.sort(key=_sort_key, reverse=True)
-    if candidates:
-        candidates[0]["is_latest"] = True
+    candidates = _indexed_report_candidates(repo)
+    latest = candidates[0] if candidates else None
 
-    filtered_reports = _apply_filters(
+    filtered_reports = _filter_metas(
         candidates,
         category=category,
         status=status,
@@ -422,7 +456,11 @@ def build_recent_evidence_feed(
         time_range=time_range,
     )
     total_reports = len(filtered_reports)
-    recent_reports = filtered_reports[:lim]
+    recent_reports = []
+    for meta in filtered_reports[:lim]:
+        item = dict(meta["item"])
+        item["is_latest"] = meta is latest
+        recent_reports.append(item)
 
     recent_tests = _build_recent_tests(repo, limit=lim)
 
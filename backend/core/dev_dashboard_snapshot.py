@@ -0,0 +1,293 @@
+"""
+Memoisierter Snapshot-Builder für DCC-/Cockpit-Endpunkte.
+
+Jeder teure Abschnitt (git-Aufrufe, systemctl, dpkg, Deploy-Drift-Hashes,
+Markdown-Parsing) deklariert seine Eingaben:
+
+- ``paths``: Dateien/Verzeichnisse, verglichen über (``mtime_ns``, Größe, Inode),
+- ``git_repos``: Checkouts, verglichen über HEAD, aktuelle Ref, ``packed-refs`` und Index,
+- ``ttl_sec``: Obergrenze für Eingaben ohne billigen Fingerabdruck (Unit-Zustand, Dirty-Count).
+
+Ein Abschnitt wird nur neu berechnet, wenn sich der Fingerabdruck ändert oder die TTL
+abläuft. Während eines Snapshot-Builds werden die benutzten Eingaben mitgeschrieben;
+der Gesamt-Snapshot (inkl. serialisiertem JSON und ETag) bleibt gültig, solange keine
+dieser Eingaben sich ändert und ``max_age_sec`` nicht überschritten ist.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Hashable, TypeVar
+
+_T = TypeVar("_T")
+
+DEFAULT_SNAPSHOT_MAX_AGE_SEC = float(os.environ.get("SETUPHELFER_DASHBOARD_SNAPSHOT_MAX_AGE_SEC", "15"))
+
+
+@dataclass(frozen=True)
+class SectionInputs:
+    """Deklarierte Eingaben eines Dashboard-Abschnitts."""
+
+    paths: tuple[Path, ...] = ()
+    git_repos: tuple[Path, ...] = ()
+    ttl_sec: float | None = None
+    key: Hashable = ()
+
+
+def _path_fingerprint(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _git_dir(repo: Path) -> Path | None:
+    dot = repo / ".git"
+    try:
+        if dot.is_dir():
+            return dot
+        if dot.is_file():
+            raw = dot.read_text(encoding="utf-8", errors="replace").strip()
+            if raw.startswith("gitdir:"):
+                gd = Path(raw[len("gitdir:") :].strip())
+                return gd if gd.is_absolute() else (repo / gd)
+    except OSError:
+        return None
+    return None
+
+
+def git_fingerprint(repo: Path) -> tuple[Any, ...] | None:
+    """Billiger Git-Zustand ohne Subprozess: HEAD-Inhalt, Ref-Datei, packed-refs, Index."""
+    gd = _git_dir(repo)
+    if gd is None:
+        return None
+    try:
+        head = (gd / "HEAD").read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+    ref_fp = None
+    if head.startswith("ref:"):
+        ref_fp = _path_fingerprint(gd / head[4:].strip())
+    return (
+        head,
+        ref_fp,
+        _path_fingerprint(gd / "packed-refs"),
+        _path_fingerprint(gd / "index"),
+    )
+
+
+def fingerprint_inputs(inputs: SectionInputs) -> tuple[Any, ...]:
+    return (
+        inputs.key,
+        tuple(_path_fingerprint(p) for p in inputs.paths),
+        tuple(git_fingerprint(r) for r in inputs.git_repos),
+    )
+
+
+@dataclass
+class _SectionEntry:
+    fingerprint: tuple[Any, ...]
+    value: Any
+    built_at: float
+    ttl_sec: float | None
+
+
+@dataclass
+class DashboardSnapshot:
+    """Fertiger Snapshot inkl. Abhängigkeiten, serialisiertem JSON und ETag."""
+
+    payload: Any
+    key: Hashable
+    deps: list[tuple[SectionInputs, tuple[Any, ...]]]
+    expires_at: float
+    _json: bytes | None = field(default=None, repr=False)
+    _etag: str | None = field(default=None, repr=False)
+
+    def json_bytes(self) -> bytes:
+        if self._json is None:
+            self._json = json.dumps(self.payload, ensure_ascii=False, separators=(",", ":"), default=str).encode(
+                "utf-8"
+            )
+        return self._json
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = f'"{hashlib.sha256(self.json_bytes()).hexdigest()[:32]}"'
+        return self._etag
+
+
+@dataclass
+class _DepRecorder:
+    deps: list[tuple[SectionInputs, tuple[Any, ...]]] = field(default_factory=list)
+    expires_at: float = float("inf")
+
+    def add(self, inputs: SectionInputs, fp: tuple[Any, ...], entry: _SectionEntry) -> None:
+        self.deps.append((inputs, fp))
+        if entry.ttl_sec is not None:
+            self.expires_at = min(self.expires_at, entry.built_at + entry.ttl_sec)
+
+
+_CURRENT_DEPS: contextvars.ContextVar[_DepRecorder | None] = contextvars.ContextVar(
+    "setuphelfer_dashboard_snapshot_deps", default=None
+)
+
+
+class SnapshotEngine:
+    """Prozessweiter Cache für Abschnitte und Gesamt-Snapshots (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sections: dict[tuple[str, Hashable], _SectionEntry] = {}
+        self._snapshots: dict[str, DashboardSnapshot] = {}
+        self._build_locks: dict[tuple[str, Hashable], threading.Lock] = {}
+        self.stats: dict[str, int] = {"section_hits": 0, "section_misses": 0, "snapshot_hits": 0, "snapshot_misses": 0}
+
+    def _build_lock(self, key: tuple[str, Hashable]) -> threading.Lock:
+        with self._lock:
+            lock = self._build_locks.get(key)
+            if lock is None:
+                lock = self._build_locks[key] = threading.Lock()
+            return lock
+
+    def section(self, name: str, inputs: SectionInputs, build: Callable[[], _T]) -> _T:
+        """
+        Liefert den (kopierten) Abschnittswert; baut nur bei geänderten Eingaben/abgelaufener TTL neu.
+        Die Eingaben werden im laufenden Snapshot-Build als Abhängigkeit vermerkt.
+        """
+        key = (name, inputs.key)
+        fp = fingerprint_inputs(inputs)
+        if any(g is None for g in fp[2]):
+            # Kein Git-Checkout → Zustand nicht billig prüfbar, daher ungecacht.
+            return build()
+        recorder = _CURRENT_DEPS.get()
+        with self._build_lock(key):
+            with self._lock:
+                entry = self._sections.get(key)
+            if entry is not None and entry.fingerprint == fp and not _expired(entry.built_at, entry.ttl_sec):
+                with self._lock:
+                    self.stats["section_hits"] += 1
+            else:
+                entry = _SectionEntry(fp, build(), time.monotonic(), inputs.ttl_sec)
+                with self._lock:
+                    self.stats["section_misses"] += 1
+                    self._sections[key] = entry
+        if recorder is not None:
+            recorder.add(inputs, fp, entry)
+        return copy.deepcopy(entry.value)
+
+    def snapshot(
+        self,
+        name: str,
+        key: Hashable,
+        build: Callable[[], Any],
+        *,
+        max_age_sec: float = DEFAULT_SNAPSHOT_MAX_AGE_SEC,
+    ) -> DashboardSnapshot:
+        """
+        Gesamt-Snapshot: gültig solange ``key`` gleich ist, alle im letzten Build benutzten
+        Abschnittseingaben unverändert sind und weder ``max_age_sec`` noch eine Abschnitts-TTL
+        abgelaufen ist. Je ``name`` wird nur der letzte Snapshot gehalten.
+        """
+        with self._build_lock((name, "__snapshot__")):
+            with self._lock:
+                snap = self._snapshots.get(name)
+            if snap is not None and snap.key == key and self._snapshot_valid(snap):
+                with self._lock:
+                    self.stats["snapshot_hits"] += 1
+                return snap
+            recorder = _DepRecorder()
+            started = time.monotonic()
+            token = _CURRENT_DEPS.set(recorder)
+            try:
+                payload = build()
+            finally:
+                _CURRENT_DEPS.reset(token)
+            snap = DashboardSnapshot(
+                payload=payload,
+                key=key,
+                deps=recorder.deps,
+                expires_at=min(started + max_age_sec, recorder.expires_at),
+            )
+            with self._lock:
+                self.stats["snapshot_misses"] += 1
+                self._snapshots[name] = snap
+            return snap
+
+    @staticmethod
+    def _snapshot_valid(snap: DashboardSnapshot) -> bool:
+        if time.monotonic() >= snap.expires_at:
+            return False
+        return all(fingerprint_inputs(inputs) == fp for inputs, fp in snap.deps)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sections.clear()
+            self._snapshots.clear()
+            for k in self.stats:
+                self.stats[k] = 0
+
+
+def _expired(built_at: float, ttl_sec: float | None) -> bool:
+    return ttl_sec is not None and (time.monotonic() - built_at) >= ttl_sec
+
+
+_ENGINE = SnapshotEngine()
+
+
+def get_snapshot_engine() -> SnapshotEngine:
+    return _ENGINE
+
+
+def memo_section(name: str, inputs: SectionInputs, build: Callable[[], _T]) -> _T:
+    """Kurzform für ``get_snapshot_engine().section(...)``."""
+    return _ENGINE.section(name, inputs, build)
+
+
+def reset_snapshot_cache() -> None:
+    """Leert alle Abschnitts- und Snapshot-Caches (Tests, Konfigurationswechsel)."""
+    _ENGINE.clear()
+
+
+def submit_with_context(pool: Any, fn: Callable[[], _T]) -> Any:
+    """``pool.submit`` mit kopiertem Kontext, damit Worker-Abschnitte als Abhängigkeit zählen."""
+    return pool.submit(contextvars.copy_context().run, fn)
+
+
+def if_none_match_matches(header_value: str | None, etag: str) -> bool:
+    """RFC 9110 If-None-Match (schwache Vergleiche, ``*``)."""
+    if not header_value:
+        return False
+    for raw in header_value.split(","):
+        tag = raw.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+__all__ = [
+    "DEFAULT_SNAPSHOT_MAX_AGE_SEC",
+    "DashboardSnapshot",
+    "SectionInputs",
+    "SnapshotEngine",
+    "fingerprint_inputs",
+    "get_snapshot_engine",
+    "git_fingerprint",
+    "if_none_match_matches",
+    "memo_section",
+    "reset_snapshot_cache",
+    "submit_with_context",
+]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+import json
 import os
 from datetime import datetime, timezone
 from typing import Any, Callable, Mapping
 
+from core.dev_dashboard_snapshot import DashboardSnapshot, get_snapshot_engine
 from core.install_profile import get_install_profile_state
 
 
@@ -56,11 +59,38 @@ async def build_dev_dashboard_status(
     frontend_runtime_source: str | None,
     request_headers: Mapping[str, str] | None = None,
 ) -> dict[str, Any]:
+    payload, _snapshot = await build_dev_dashboard_status_snapshot(
+        backup_jobs=backup_jobs,
+        sync_stale_runner_job_from_systemd=sync_stale_runner_job_from_systemd,
+        job_snapshot=job_snapshot,
+        detect_active_package_operations=detect_active_package_operations,
+        frontend_build_version=frontend_build_version,
+        frontend_runtime_source=frontend_runtime_source,
+        request_headers=request_headers,
+    )
+    return payload
+
+
+async def build_dev_dashboard_status_snapshot(
+    *,
+    backup_jobs: dict[str, dict[str, Any]],
+    sync_stale_runner_job_from_systemd: Callable[[str], None],
+    job_snapshot: Callable[[dict[str, Any]], dict[str, Any]],
+    detect_active_package_operations: Callable[[], dict[str, Any]],
+    frontend_build_version: str | None,
+    frontend_runtime_source: str | None,
+    request_headers: Mapping[str, str] | None = None,
+) -> tuple[dict[str, Any], DashboardSnapshot | None]:
+    """
+    Wie ``build_dev_dashboard_status``, liefert zusätzlich den memoisierten Snapshot
+    (serialisiertes JSON + ETag) für erfolgreiche Antworten; sonst ``None``. Der Payload ist eine
+    Kopie – Aufrufer dürfen ihn verändern, ohne den Snapshot (und damit ETag/JSON) zu verfälschen.
+    """
     blocked = build_dcc_profile_block_response(request_headers=request_headers)
     if blocked:
-        return blocked
+        return blocked, None
 
-    def _build_sync() -> dict[str, Any]:
+    def _build_sync() -> DashboardSnapshot:
         for jid in list(backup_jobs.keys())[:32]:
             sync_stale_runner_job_from_systemd(jid)
         running: list[dict[str, Any]] = []
@@ -72,17 +102,22 @@ async def build_dev_dashboard_status(
         fe_ver = (frontend_build_version or "").strip() or None
         from core.dcc_status_facade import build_dashboard_status_body
 
-        return build_dashboard_status_body(
-            running_jobs=running,
-            package_activity=pkg,
-            frontend_build_version=fe_ver,
-            frontend_runtime_source=frontend_runtime_source,
-        )
+        def _build_payload() -> dict[str, Any]:
+            body = build_dashboard_status_body(
+                running_jobs=running,
+                package_activity=pkg,
+                frontend_build_version=fe_ver,
+                frontend_runtime_source=frontend_runtime_source,
+            )
+            return {"status": "success", "dashboard": body}
+
+        key = json.dumps([running, pkg, fe_ver, frontend_runtime_source], sort_keys=True, default=str)
+        return get_snapshot_engine().snapshot("dev_dashboard_status", key, _build_payload)
 
     total_timeout = float(os.environ.get("SETUPHELFER_DASHBOARD_STATUS_TIMEOUT_SEC", "50"))
     try:
-        body = await asyncio.wait_for(asyncio.to_thread(_build_sync), timeout=total_timeout)
-        return {"status": "success", "dashboard": body}
+        snapshot = await asyncio.wait_for(asyncio.to_thread(_build_sync), timeout=total_timeout)
+        return copy.deepcopy(snapshot.payload), snapshot
     except asyncio.TimeoutError:
         now = datetime.now(timezone.utc).isoformat()
         degraded = {
@@ -94,4 +129,4 @@ async def build_dev_dashboard_status(
             "deploy_drift": {"status": "gray", "warnings": ["dashboard_status_timeout"]},
             "runtime_gate": {"passed": False, "status": "gray", "warnings": ["dashboard_status_timeout"]},
         }
-        return {"status": "degraded", "warning": "dashboard_status_timeout", "dashboard": degraded}
+        return {"status": "degraded", "warning": "dashboard_status_timeout", "dashboard": degraded}, None
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -15,10 +17,24 @@ EVIDENCE_DIR = Path(__file__).resolve().parents[3] / "data" / "diagnostics" / "e
 PROFILES_DIR = Path(__file__).resolve().parents[3] / "data" / "diagnostics" / "profiles"
 
 
-def _json_files(path: Path) -> list[Path]:
-    if not path.is_dir():
-        return []
-    return sorted(path.glob("*.json"))
+def _json_file_stats(path: Path) -> dict[Path, tuple[int, int]]:
+    """``*.json`` im Verzeichnis (ohne versteckte Dateien, wie ``glob``) → (mtime_ns, size), nach Name sortiert."""
+    out: dict[Path, tuple[int, int]] = {}
+    try:
+        entries = sorted(os.scandir(path), key=lambda e: e.name)
+    except OSError:
+        return out
+    for e in entries:
+        if e.name.startswith(".") or not e.name.endswith(".json"):
+            continue
+        try:
+            if not e.is_file():
+                continue
+            st = e.stat()
+        except OSError:
+            continue
+        out[Path(e.path)] = (st.st_mtime_ns, st.st_size)
+    return out
 
 
 _ALLOWED_EVIDENCE_KEYS = frozenset(EvidenceRecord.model_fields.keys())
@@ -75,22 +91,19 @@ def _coerce_evidence_dict(raw: dict[str, Any]) -> dict[str, Any]:
     return data
 
 
-def load_evidence_records() -> list[EvidenceRecord]:
-    records: list[EvidenceRecord] = []
-    for fp in _json_files(EVIDENCE_DIR):
-        try:
-            raw = json.loads(fp.read_text(encoding="utf-8"))
-            data = _coerce_evidence_dict(raw)
-            records.append(EvidenceRecord.model_validate(data))
-        except (json.JSONDecodeError, ValidationError, TypeError, ValueError) as e:
-            logger.warning("diagnostics evidence skipped %s: %s", fp.name, e)
-            continue
-    return records
+def _parse_evidence_file(fp: Path) -> EvidenceRecord | None:
+    try:
+        raw = json.loads(fp.read_text(encoding="utf-8"))
+        data = _coerce_evidence_dict(raw)
+        return EvidenceRecord.model_validate(data)
+    except (OSError, json.JSONDecodeError, ValidationError, TypeError, ValueError) as e:
+        logger.warning("diagnostics evidence skipped %s: %s", fp.name, e)
+        return None
 
 
-def evidence_summary_map() -> dict[str, EvidenceSummary]:
+def _build_summary_map(records: list[EvidenceRecord]) -> dict[str, EvidenceSummary]:
     summary: dict[str, EvidenceSummary] = {}
-    for rec in load_evidence_records():
+    for rec in records:
         links = rec.diagnosis_links or []
         if not links and rec.matched_diagnosis_ids:
             links = [{"diagnosis_id": x, "status": "suspected"} for x in rec.matched_diagnosis_ids]
@@ -121,6 +134,79 @@ def evidence_summary_map() -> dict[str, EvidenceSummary]:
     return summary
 
 
+class _EvidenceCache:
+    """
+    Evidence-Records eines Verzeichnisses im Speicher.
+
+    Pro Aufruf nur ein ``scandir``; neu geparst werden ausschließlich Dateien mit geänderter
+    mtime/Größe, gelöschte fallen heraus. Die Summary je diagnosis_id wird nur nach Änderungen
+    neu berechnet. Ungültige Dateien bleiben (als ``None``) gemerkt, bis sie sich ändern.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._files: dict[Path, tuple[tuple[int, int], EvidenceRecord | None]] = {}
+        self._records: list[EvidenceRecord] = []
+        self._summary: dict[str, EvidenceSummary] | None = None
+
+    def _refresh(self) -> None:
+        stats = _json_file_stats(self.directory)
+        changed = stats.keys() != self._files.keys()
+        files: dict[Path, tuple[tuple[int, int], EvidenceRecord | None]] = {}
+        for fp, stat in stats.items():
+            cached = self._files.get(fp)
+            if cached is not None and cached[0] == stat:
+                files[fp] = cached
+                continue
+            files[fp] = (stat, _parse_evidence_file(fp))
+            changed = True
+        if changed:
+            self._files = files
+            self._records = [rec for _stat, rec in files.values() if rec is not None]
+            self._summary = None
+
+    def records(self) -> list[EvidenceRecord]:
+        with self._lock:
+            self._refresh()
+            return list(self._records)
+
+    def summary(self) -> dict[str, EvidenceSummary]:
+        with self._lock:
+            self._refresh()
+            if self._summary is None:
+                self._summary = _build_summary_map(self._records)
+            return dict(self._summary)
+
+
+_caches: dict[Path, _EvidenceCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_for(directory: Path) -> _EvidenceCache:
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = _EvidenceCache(directory)
+        return cache
+
+
+def clear_evidence_cache() -> None:
+    """Verwirft alle zwischengespeicherten Records (Tests, manuelles Neuladen)."""
+    with _caches_lock:
+        _caches.clear()
+
+
+def load_evidence_records() -> list[EvidenceRecord]:
+    """Alle gültigen Records aus ``EVIDENCE_DIR`` (gecacht; Objekte nur lesen, nicht verändern)."""
+    return _cache_for(EVIDENCE_DIR).records()
+
+
+def evidence_summary_map() -> dict[str, EvidenceSummary]:
+    """Summary je diagnosis_id (gecacht; ``EvidenceSummary``-Objekte nur lesen)."""
+    return _cache_for(EVIDENCE_DIR).summary()
+
+
 def evidence_schema() -> dict:
     return EvidenceRecord.model_json_schema()
 
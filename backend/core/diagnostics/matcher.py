@@ -1,279 +1,241 @@
 from __future__ import annotations
 
+from typing import Mapping
+
 from core.diagnostics.models import DiagnosticCase, DiagnosticsAnalyzeRequest
 from core.diagnostics.registry import get_case_by_id
+from core.diagnostics.rule_engine import all_of, asks, compile_rules, eq, has, pred, rule
 from core.diagnostics.sources import normalized_question, normalized_signals
 from core.install_paths import path_text_suggests_legacy_pi_tree
 
+# Signal-Ketten: erster nicht-leerer Wert gewinnt (wie ``a or b``).
+_DIAG = ("details.diagnosis_id", "diagnosis_id")
+_EMAIL = ("email.status", "email_status")
+_OWNER = ("mount_owner_mode", "owner_mode")
+_ARCH = ("requested_architecture", "target_architecture")
+_ARCH_STATUS = ("architecture_track_status", "target_architecture_status")
 
-def _hard_signal_matches(signals: dict[str, str]) -> list[str]:
-    hits: list[str] = []
-    # normalized_signals lowercases Werte
-    sp = (signals.get("storage_protection") or "").strip().lower()
-    code = (signals.get("code") or "").strip().lower()
-    details_diag = (signals.get("details.diagnosis_id") or signals.get("diagnosis_id") or "").strip().upper()
-    stderr = (signals.get("stderr") or "").strip().lower()
-    summary = (signals.get("summary") or "").strip().lower()
-    classification = (signals.get("classification") or "").strip().lower()
-    email_status = (signals.get("email.status") or signals.get("email_status") or "").strip().lower()
-    unreadable_sources = (signals.get("unreadable_sources") or "").strip().lower()
-    owner_mode = (signals.get("mount_owner_mode") or signals.get("owner_mode") or "").strip().lower()
-    probe_err = (signals.get("target_probe_error") or "").strip().lower()
-    if sp == "storage-protection-001":
-        hits.append("STORAGE-PROTECTION-001")
-    if sp == "storage-protection-002":
-        hits.append("STORAGE-PROTECTION-002")
-    if sp == "storage-protection-003":
-        hits.append("STORAGE-PROTECTION-003")
-    if sp == "storage-protection-004":
-        hits.append("STORAGE-PROTECTION-004")
-    if sp == "storage-protection-005":
-        hits.append("STORAGE-PROTECTION-005")
-    if sp == "storage-protection-006":
-        hits.append("STORAGE-PROTECTION-006")
-    if signals.get("manifest_present") == "false":
-        hits.append("BACKUP-MANIFEST-001")
-    if signals.get("archive_corrupted") == "true":
-        hits.append("BACKUP-ARCHIVE-002")
-    if signals.get("verify_status") in {"hash_mismatch", "checksum_mismatch"}:
-        hits.append("BACKUP-HASH-003")
-    if signals.get("restore_path_safe") == "false":
-        hits.append("RESTORE-PATH-004")
-    if signals.get("restore_status") == "partial":
-        hits.append("RESTORE-PARTIAL-005")
-    if signals.get("backend_service_active") == "false" and signals.get("frontend_service_active") == "true":
-        hits.append("UI-NO-BACKEND-015")
-        hits.append("RESTORE-RUNTIME-006")
-    if signals.get("node_options_present") == "false":
-        hits.append("NODE-OPTIONS-012")
-    if signals.get("systemd_restrictive") == "true":
-        hits.append("SYSTEMD-RESTRICT-013")
-    if signals.get("address_family_restricted") == "true":
-        hits.append("SYSTEMD-AF-014")
-    if signals.get("sudo_no_new_privileges") == "true":
-        hits.append("SYSTEMD-NNP-031")
-    if code == "backup.sudo_blocked_by_nnp" or details_diag == "SYSTEMD-NNP-031":
-        hits.append("SYSTEMD-NNP-031")
-    if code == "backup.source_permission_denied" or details_diag == "BACKUP-SOURCE-PERM-032":
-        hits.append("BACKUP-SOURCE-PERM-032")
-    if code == "backup.verify_integrity_failed":
-        hits.append("VERIFY-STAGING-038")
-    if code == "backup.restore_failed" and ("enospc" in stderr or "no space left on device" in stderr):
-        hits.append("RESTORE-TMPFS-007")
-    if ("permission denied" in stderr or "keine berechtigung" in stderr) and unreadable_sources not in {"", "null", "[]"}:
-        hits.append("BACKUP-SOURCE-PERM-032")
-    if signals.get("ssh_enabled") == "false":
-        hits.append("SSH-DISABLED-017")
-    if signals.get("port_22_open") == "false":
-        hits.append("SSH-PORT-016")
-    if signals.get("dns_ok") == "false":
-        hits.append("DNS-018")
-    if signals.get("firewall_blocks_access") == "true":
-        hits.append("FIREWALL-020")
-    if signals.get("filesystem_readonly") == "true":
-        hits.append("FS-RO-021")
-    if signals.get("storage_full") == "true":
-        hits.append("FS-FULL-022")
-    if signals.get("setuphelfer_group_present") == "false":
-        hits.append("PERM-GROUP-008")
-    if "permission denied" in probe_err or "keine berechtigung" in probe_err:
-        hits.append("PERM-GROUP-008")
-    if signals.get("owner_mode_valid") == "false":
-        hits.append("OWNER-MODE-023")
-    if "root:root" in owner_mode and ("755" in owner_mode or "drwxr-xr-x" in owner_mode):
-        hits.append("OWNER-MODE-023")
-    if signals.get("raspi_boot_ok") == "false":
-        hits.append("PI-BOOT-024")
-    if code == "blocked_requires_operator_sudo_policy" or details_diag == "RESCUE-BUILD-ROOT-001":
-        hits.append("RESCUE-BUILD-ROOT-001")
-    if (
-        "sudo: ein terminal ist erforderlich" in stderr
-        or "sudo: ein passwort ist notwendig" in stderr
-        or "sudo: a terminal is required" in stderr
-        or "sudo: a password is required" in stderr
-        or "blocked_requires_operator_sudo_policy" in summary
-    ):
-        hits.append("RESCUE-BUILD-ROOT-001")
-    if code == "blocked_controlled_build_gate_required" or details_diag == "RESCUE-BUILD-GATE-001":
-        hits.append("RESCUE-BUILD-GATE-001")
-    if "use controlled gate before running lb build" in stderr or "use controlled gate before running lb build" in summary:
-        hits.append("RESCUE-BUILD-GATE-001")
-    if code == "blocked_build_tools_missing" or details_diag == "RESCUE-BUILD-TOOL-001":
-        hits.append("RESCUE-BUILD-TOOL-001")
-    if (
-        "rsvg-convert fehlt" in stderr
-        or "rsvg-convert fehlt" in summary
-        or "librsvg2-bin fehlt" in stderr
-        or "librsvg2-bin fehlt" in summary
-    ):
-        hits.append("RESCUE-BUILD-TOOL-001")
-    if code == "blocked_legacy_rsvg_command_missing" or details_diag == "RESCUE-BUILD-RSVG-001":
-        hits.append("RESCUE-BUILD-RSVG-001")
-    if (
-        "live-build erwartet /usr/bin/rsvg" in stderr
-        or "live-build erwartet /usr/bin/rsvg" in summary
-        or "rsvg-convert vorhanden, aber rsvg fehlt" in stderr
-        or "rsvg-convert vorhanden, aber rsvg fehlt" in summary
-    ):
-        hits.append("RESCUE-BUILD-RSVG-001")
-    if (
-        code == "RESCUE-BUILD-ISOHYBRID-001"
-        or details_diag == "RESCUE-BUILD-ISOHYBRID-001"
-        or "isohybrid: not found" in stderr
-        or "isohybrid: not found" in summary
-    ):
-        hits.append("RESCUE-BUILD-ISOHYBRID-001")
-    if (
-        code == "RESCUE-BUILD-ZSYNC-STALE-001"
-        or details_diag == "RESCUE-BUILD-ZSYNC-STALE-001"
-        or "binary.hybrid.iso.zsync.xz" in stderr
-        or "binary.hybrid.iso.zsync.xz" in summary
-    ):
-        hits.append("RESCUE-BUILD-ZSYNC-STALE-001")
-    if (
-        code == "RESCUE-BUILD-CHROOT-CLEANUP-001"
-        or details_diag == "RESCUE-BUILD-CHROOT-CLEANUP-001"
-        or "chroot/proc" in stderr
-        or "chroot/proc" in summary
-        or "Vorgang nicht zulässig" in stderr
-        or "Operation not permitted" in stderr
-        or (
-            "chroot: failed to run command" in stderr
-            and "/usr/bin/env" in stderr
-        )
-        or (
-            "chroot: failed to run command" in summary
-            and "/usr/bin/env" in summary
-        )
-    ):
-        hits.append("RESCUE-BUILD-CHROOT-CLEANUP-001")
-    requested_architecture = (signals.get("requested_architecture") or signals.get("target_architecture") or "").strip().lower()
-    architecture_track_status = (signals.get("architecture_track_status") or signals.get("target_architecture_status") or "").strip().lower()
-    if requested_architecture == "amd64" and (
-        signals.get("i386_covered") == "false"
-        or signals.get("arm64_covered") == "false"
-        or signals.get("armhf_covered") == "false"
-        or architecture_track_status == "review_required"
-    ):
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if requested_architecture == "i386" and architecture_track_status == "review_required":
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if requested_architecture in {"arm64", "armhf"} and architecture_track_status == "deferred":
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if "i386 requested but status review_required" in summary or "i386 requested but status review_required" in stderr:
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if "arm64 requested but deferred" in summary or "arm64 requested but deferred" in stderr:
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if "armhf requested but deferred" in summary or "armhf requested but deferred" in stderr:
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if (
-        code == "notification.email.provider_limit_exceeded"
-        or classification == "notification.email.provider_limit_exceeded"
-        or details_diag == "NOTIFICATION-EMAIL-PROVIDER-001"
-        or email_status == "provider_limit"
-    ):
-        hits.append("NOTIFICATION-EMAIL-PROVIDER-001")
-    if "554 5.7.0 outgoing message limit exceeded" in stderr or "554 5.7.0 outgoing message limit exceeded" in summary:
-        hits.append("NOTIFICATION-EMAIL-PROVIDER-001")
 
-    sc_ids = (signals.get("service_conflict_ids") or "").upper()
-    for token in (
-        "SERVICE-CONFLICT-033",
-        "SERVICE-CONFLICT-034",
-        "SERVICE-CONFLICT-035",
-        "SERVICE-CONFLICT-036",
-    ):
-        if token in sc_ids:
-            hits.append(token)
-    if signals.get("systemd_pi_installer_service") == "active" or signals.get("systemd_pi_installer_backend_service") == "active":
-        hits.append("SERVICE-CONFLICT-033")
-    pot = (signals.get("port_8000_owner_text") or "").strip().lower()
-    if path_text_suggests_legacy_pi_tree(pot):
-        hits.append("SERVICE-CONFLICT-034")
-    if signals.get("mixed_opt_install") == "true" and signals.get("legacy_systemd_still_enabled") == "true":
-        hits.append("SERVICE-CONFLICT-035")
-    if signals.get("legacy_must_not_overwrite_new") == "true":
-        hits.append("SERVICE-CONFLICT-036")
-    return hits
+def _logs(*literals: str):
+    """Teilstring in stderr oder summary (je eine Klausel)."""
+    return has("stderr", any_of=literals), has("summary", any_of=literals)
 
 
-def _pattern_matches(question: str) -> list[str]:
-    hits: list[str] = []
-    if "manifest" in question:
-        hits.append("BACKUP-MANIFEST-001")
-    if "hash" in question or "checksum" in question:
-        hits.append("BACKUP-HASH-003")
-    if "tmp" in question or "tmpfs" in question:
-        hits.append("RESTORE-TMPFS-007")
-    if "memorymax" in question or ("cgroup" in question and "memory" in question) or ("oom" in question and ("verify" in question or "preview" in question)):
-        hits.append("SYSTEMD-MEMORYMAX-037")
-    if "verify_integrity" in question or ("deep" in question and "integrit" in question):
-        hits.append("VERIFY-STAGING-038")
-    if "startet nicht" in question or "does not start" in question:
-        hits.extend(["SYSTEMD-START-009", "RUNTIME-PORT-011"])
-    if "crash" in question:
-        hits.append("SYSTEMD-CRASH-010")
-    if "node_options" in question:
-        hits.append("NODE-OPTIONS-012")
-    if "addressfamily" in question:
-        hits.append("SYSTEMD-AF-014")
-    if "no new privileges" in question or "nonewprivileges" in question or "keine neuen privilegien" in question:
-        hits.append("SYSTEMD-NNP-031")
-    if "ssh" in question:
-        hits.extend(["SSH-DISABLED-017", "SSH-PORT-016"])
-    if "dns" in question:
-        hits.append("DNS-018")
-    if "firewall" in question:
-        hits.append("FIREWALL-020")
-    if "read-only" in question or "readonly" in question:
-        hits.append("FS-RO-021")
-    if "voll" in question or "full" in question:
-        hits.append("FS-FULL-022")
-    if "gruppe" in question or "group" in question:
-        hits.append("PERM-GROUP-008")
-    if "nvme" in question or "usb boot" in question:
-        hits.append("PI-NVME-025")
-    if "docker" in question:
-        hits.append("DOCKER-028")
-    if "laufwerk blockiert" in question or "drive blocked" in question or "write protection" in question:
-        hits.extend(
-            [
-                "STORAGE-PROTECTION-001",
-                "STORAGE-PROTECTION-004",
-                "STORAGE-PROTECTION-005",
-            ]
-        )
-    if "windows" in question and ("laufwerk" in question or "disk" in question or "partition" in question):
-        hits.append("STORAGE-PROTECTION-003")
-    if "rescue" in question and "sudo" in question:
-        hits.append("RESCUE-BUILD-ROOT-001")
-    if "lb build" in question and "gate" in question:
-        hits.append("RESCUE-BUILD-GATE-001")
-    if "rsvg" in question and ("fehlt" in question or "missing" in question):
-        hits.extend(["RESCUE-BUILD-TOOL-001", "RESCUE-BUILD-RSVG-001"])
-    if "rescue" in question and "architektur" in question:
-        hits.append("RESCUE-BUILD-ARCH-001")
-    if "provider limit" in question or "554 5.7.0" in question:
-        hits.append("NOTIFICATION-EMAIL-PROVIDER-001")
-    return hits
+def _unreadable_sources_listed(signals: Mapping[str, str], _question: str) -> bool:
+    return (signals.get("unreadable_sources") or "") not in {"", "null", "[]"}
 
 
-def match_diagnoses(req: DiagnosticsAnalyzeRequest) -> list[DiagnosticCase]:
-    signals = normalized_signals(req)
-    question = normalized_question(req)
+def _port_owner_is_legacy(signals: Mapping[str, str], _question: str) -> bool:
+    return path_text_suggests_legacy_pi_tree(signals.get("port_8000_owner_text") or "")
 
-    ordered_ids: list[str] = []
-    for diag_id in _hard_signal_matches(signals) + _pattern_matches(question):
-        if diag_id not in ordered_ids:
-            ordered_ids.append(diag_id)
 
-    if not ordered_ids and question:
-        ordered_ids.append("LOGS-029")
+# Reihenfolge = Priorität: harte Signale vor Freitext-Mustern. Alle Literale in Kleinbuchstaben,
+# weil ``normalized_signals``/``normalized_question`` bereits normalisieren.
+DIAGNOSTIC_RULES = (
+    # --- harte Signale ---
+    rule("STORAGE-PROTECTION-001", eq("storage_protection", value="storage-protection-001")),
+    rule("STORAGE-PROTECTION-002", eq("storage_protection", value="storage-protection-002")),
+    rule("STORAGE-PROTECTION-003", eq("storage_protection", value="storage-protection-003")),
+    rule("STORAGE-PROTECTION-004", eq("storage_protection", value="storage-protection-004")),
+    rule("STORAGE-PROTECTION-005", eq("storage_protection", value="storage-protection-005")),
+    rule("STORAGE-PROTECTION-006", eq("storage_protection", value="storage-protection-006")),
+    rule("BACKUP-MANIFEST-001", eq("manifest_present", value="false")),
+    rule("BACKUP-ARCHIVE-002", eq("archive_corrupted", value="true")),
+    rule("BACKUP-HASH-003", eq("verify_status", values={"hash_mismatch", "checksum_mismatch"})),
+    rule("RESTORE-PATH-004", eq("restore_path_safe", value="false")),
+    rule("RESTORE-PARTIAL-005", eq("restore_status", value="partial")),
+    rule(
+        ("UI-NO-BACKEND-015", "RESTORE-RUNTIME-006"),
+        all_of(eq("backend_service_active", value="false"), eq("frontend_service_active", value="true")),
+    ),
+    rule("NODE-OPTIONS-012", eq("node_options_present", value="false")),
+    rule("SYSTEMD-RESTRICT-013", eq("systemd_restrictive", value="true")),
+    rule("SYSTEMD-AF-014", eq("address_family_restricted", value="true")),
+    rule(
+        "SYSTEMD-NNP-031",
+        eq("sudo_no_new_privileges", value="true"),
+        eq("code", value="backup.sudo_blocked_by_nnp"),
+        eq(*_DIAG, value="systemd-nnp-031"),
+    ),
+    rule(
+        "BACKUP-SOURCE-PERM-032",
+        eq("code", value="backup.source_permission_denied"),
+        eq(*_DIAG, value="backup-source-perm-032"),
+    ),
+    rule("VERIFY-STAGING-038", eq("code", value="backup.verify_integrity_failed")),
+    rule(
+        "RESTORE-TMPFS-007",
+        all_of(eq("code", value="backup.restore_failed"), has("stderr", any_of=("enospc", "no space left on device"))),
+    ),
+    rule(
+        "BACKUP-SOURCE-PERM-032",
+        all_of(
+            has("stderr", any_of=("permission denied", "keine berechtigung")),
+            pred("unreadable_sources_listed", _unreadable_sources_listed),
+        ),
+    ),
+    rule("SSH-DISABLED-017", eq("ssh_enabled", value="false")),
+    rule("SSH-PORT-016", eq("port_22_open", value="false")),
+    rule("DNS-018", eq("dns_ok", value="false")),
+    rule("FIREWALL-020", eq("firewall_blocks_access", value="true")),
+    rule("FS-RO-021", eq("filesystem_readonly", value="true")),
+    rule("FS-FULL-022", eq("storage_full", value="true")),
+    rule(
+        "PERM-GROUP-008",
+        eq("setuphelfer_group_present", value="false"),
+        has("target_probe_error", any_of=("permission denied", "keine berechtigung")),
+    ),
+    rule(
+        "OWNER-MODE-023",
+        eq("owner_mode_valid", value="false"),
+        all_of(has(*_OWNER, any_of=("root:root",)), has(*_OWNER, any_of=("755", "drwxr-xr-x"))),
+    ),
+    rule("PI-BOOT-024", eq("raspi_boot_ok", value="false")),
+    rule(
+        "RESCUE-BUILD-ROOT-001",
+        eq("code", value="blocked_requires_operator_sudo_policy"),
+        eq(*_DIAG, value="rescue-build-root-001"),
+        has(
+            "stderr",
+            any_of=(
+                "sudo: ein terminal ist erforderlich",
+                "sudo: ein passwort ist notwendig",
+                "sudo: a terminal is required",
+                "sudo: a password is required",
+            ),
+        ),
+        has("summary", any_of=("blocked_requires_operator_sudo_policy",)),
+    ),
+    rule(
+        "RESCUE-BUILD-GATE-001",
+        eq("code", value="blocked_controlled_build_gate_required"),
+        eq(*_DIAG, value="rescue-build-gate-001"),
+        *_logs("use controlled gate before running lb build"),
+    ),
+    rule(
+        "RESCUE-BUILD-TOOL-001",
+        eq("code", value="blocked_build_tools_missing"),
+        eq(*_DIAG, value="rescue-build-tool-001"),
+        *_logs("rsvg-convert fehlt", "librsvg2-bin fehlt"),
+    ),
+    rule(
+        "RESCUE-BUILD-RSVG-001",
+        eq("code", value="blocked_legacy_rsvg_command_missing"),
+        eq(*_DIAG, value="rescue-build-rsvg-001"),
+        *_logs("live-build erwartet /usr/bin/rsvg", "rsvg-convert vorhanden, aber rsvg fehlt"),
+    ),
+    rule(
+        "RESCUE-BUILD-ISOHYBRID-001",
+        eq("code", value="rescue-build-isohybrid-001"),
+        eq(*_DIAG, value="rescue-build-isohybrid-001"),
+        *_logs("isohybrid: not found"),
+    ),
+    rule(
+        "RESCUE-BUILD-ZSYNC-STALE-001",
+        eq("code", value="rescue-build-zsync-stale-001"),
+        eq(*_DIAG, value="rescue-build-zsync-stale-001"),
+        *_logs("binary.hybrid.iso.zsync.xz"),
+    ),
+    rule(
+        "RESCUE-BUILD-CHROOT-CLEANUP-001",
+        eq("code", value="rescue-build-chroot-cleanup-001"),
+        eq(*_DIAG, value="rescue-build-chroot-cleanup-001"),
+        *_logs("chroot/proc"),
+        all_of(has("stderr", any_of=("chroot: failed to run command",)), has("stderr", any_of=("/usr/bin/env",))),
+        all_of(has("summary", any_of=("chroot: failed to run command",)), has("summary", any_of=("/usr/bin/env",))),
+    ),
+    rule(
+        "RESCUE-BUILD-ARCH-001",
+        all_of(eq(*_ARCH, value="amd64"), eq("i386_covered", value="false")),
+        all_of(eq(*_ARCH, value="amd64"), eq("arm64_covered", value="false")),
+        all_of(eq(*_ARCH, value="amd64"), eq("armhf_covered", value="false")),
+        all_of(eq(*_ARCH, values={"amd64", "i386"}), eq(*_ARCH_STATUS, value="review_required")),
+        all_of(eq(*_ARCH, values={"arm64", "armhf"}), eq(*_ARCH_STATUS, value="deferred")),
+        *_logs(
+            "i386 requested but status review_required",
+            "arm64 requested but deferred",
+            "armhf requested but deferred",
+        ),
+    ),
+    rule(
+        "NOTIFICATION-EMAIL-PROVIDER-001",
+        eq("code", value="notification.email.provider_limit_exceeded"),
+        eq("classification", value="notification.email.provider_limit_exceeded"),
+        eq(*_DIAG, value="notification-email-provider-001"),
+        eq(*_EMAIL, value="provider_limit"),
+        *_logs("554 5.7.0 outgoing message limit exceeded"),
+    ),
+    rule("SERVICE-CONFLICT-033", has("service_conflict_ids", any_of=("service-conflict-033",))),
+    rule("SERVICE-CONFLICT-034", has("service_conflict_ids", any_of=("service-conflict-034",))),
+    rule("SERVICE-CONFLICT-035", has("service_conflict_ids", any_of=("service-conflict-035",))),
+    rule("SERVICE-CONFLICT-036", has("service_conflict_ids", any_of=("service-conflict-036",))),
+    rule(
+        "SERVICE-CONFLICT-033",
+        eq("systemd_pi_installer_service", value="active"),
+        eq("systemd_pi_installer_backend_service", value="active"),
+    ),
+    rule("SERVICE-CONFLICT-034", pred("port_8000_owner_is_legacy", _port_owner_is_legacy)),
+    rule(
+        "SERVICE-CONFLICT-035",
+        all_of(eq("mixed_opt_install", value="true"), eq("legacy_systemd_still_enabled", value="true")),
+    ),
+    rule("SERVICE-CONFLICT-036", eq("legacy_must_not_overwrite_new", value="true")),
+    # --- Freitext-Muster (Frage) ---
+    rule("BACKUP-MANIFEST-001", asks("manifest")),
+    rule("BACKUP-HASH-003", asks("hash", "checksum")),
+    rule("RESTORE-TMPFS-007", asks("tmp")),
+    rule(
+        "SYSTEMD-MEMORYMAX-037",
+        asks("memorymax"),
+        all_of(asks("cgroup"), asks("memory")),
+        all_of(asks("oom"), asks("verify", "preview")),
+    ),
+    rule("VERIFY-STAGING-038", asks("verify_integrity"), all_of(asks("deep"), asks("integrit"))),
+    rule(("SYSTEMD-START-009", "RUNTIME-PORT-011"), asks("startet nicht", "does not start")),
+    rule("SYSTEMD-CRASH-010", asks("crash")),
+    rule("NODE-OPTIONS-012", asks("node_options")),
+    rule("SYSTEMD-AF-014", asks("addressfamily")),
+    rule("SYSTEMD-NNP-031", asks("no new privileges", "nonewprivileges", "keine neuen privilegien")),
+    rule(("SSH-DISABLED-017", "SSH-PORT-016"), asks("ssh")),
+    rule("DNS-018", asks("dns")),
+    rule("FIREWALL-020", asks("firewall")),
+    rule("FS-RO-021", asks("read-only", "readonly")),
+    rule("FS-FULL-022", asks("voll", "full")),
+    rule("PERM-GROUP-008", asks("gruppe", "group")),
+    rule("PI-NVME-025", asks("nvme", "usb boot")),
+    rule("DOCKER-028", asks("docker")),
+    rule(
+        ("STORAGE-PROTECTION-001", "STORAGE-PROTECTION-004", "STORAGE-PROTECTION-005"),
+        asks("laufwerk blockiert", "drive blocked", "write protection"),
+    ),
+    rule("STORAGE-PROTECTION-003", all_of(asks("windows"), asks("laufwerk", "disk", "partition"))),
+    rule("RESCUE-BUILD-ROOT-001", all_of(asks("rescue"), asks("sudo"))),
+    rule("RESCUE-BUILD-GATE-001", all_of(asks("lb build"), asks("gate"))),
+    rule(("RESCUE-BUILD-TOOL-001", "RESCUE-BUILD-RSVG-001"), all_of(asks("rsvg"), asks("fehlt", "missing"))),
+    rule("RESCUE-BUILD-ARCH-001", all_of(asks("rescue"), asks("architektur"))),
+    rule("NOTIFICATION-EMAIL-PROVIDER-001", asks("provider limit", "554 5.7.0")),
+)
+
+COMPILED_RULES = compile_rules(DIAGNOSTIC_RULES)
+
+
+def match_ids(signals: Mapping[str, str], question: str = "") -> list[str]:
+    """Diagnose-IDs für bereits normalisierte Signale/Frage (inkl. Fallback LOGS-029/APP-030)."""
+    ordered_ids = COMPILED_RULES.match(signals, question)
     if not ordered_ids:
-        ordered_ids.append("APP-030")
+        ordered_ids.append("LOGS-029" if question else "APP-030")
+    return ordered_ids
+
 
+def match_diagnoses(
+    req: DiagnosticsAnalyzeRequest,
+    *,
+    signals: Mapping[str, str] | None = None,
+) -> list[DiagnosticCase]:
+    if signals is None:
+        signals = normalized_signals(req)
     out: list[DiagnosticCase] = []
-    for diag_id in ordered_ids:
+    for diag_id in match_ids(signals, normalized_question(req)):
         item = get_case_by_id(diag_id)
         if item is not None:
             out.append(item)
@@ -22,8 +22,9 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for stripped test env
         default_factory: Any = None,
         ge: Any = None,
         le: Any = None,
+        max_length: Any = None,
     ) -> Any:
-        del ge, le
+        del ge, le, max_length
         return _FieldSpec(default=default, default_factory=default_factory)
 
     class BaseModel:
@@ -252,6 +253,29 @@ class DiagnosticsAnalyzeResponse(BaseModel):
     requires_confirmation: bool = False
 
 
+# Obergrenze je Batch-Aufruf (Speicher/Antwortgröße); größere Historien in Blöcken senden
+BATCH_MAX_EVENTS = 10000
+
+
+class DiagnosticsBatchRequest(BaseModel):
+    # Pydantic lehnt zu große Batches schon bei der Validierung ab (HTTP 422, vor jeder Klassifikation)
+    events: list[DiagnosticsAnalyzeRequest] = Field(default_factory=list, max_length=BATCH_MAX_EVENTS)
+
+
+class DiagnosticsBatchItem(BaseModel):
+    index: int
+    primary: str
+    secondary: list[str] = Field(default_factory=list)
+    severity: Severity = "info"
+    confidence: ConfidenceLevel = "low"
+
+
+class DiagnosticsBatchResponse(BaseModel):
+    count: int = 0
+    items: list[DiagnosticsBatchItem] = Field(default_factory=list)
+    primary_counts: dict[str, int] = Field(default_factory=dict)
+
+
 class EvidenceSampleResponse(BaseModel):
     sample: EvidenceRecord
     total_records: int = 0
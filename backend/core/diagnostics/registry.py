@@ -497,8 +497,13 @@ def get_catalog() -> list[DiagnosticCase]:
     return DIAGNOSTIC_CATALOG
 
 
+_CASE_INDEX: dict[str, DiagnosticCase] = {}
+
+
 def get_case_by_id(diagnosis_id: str) -> DiagnosticCase | None:
-    for item in DIAGNOSTIC_CATALOG:
-        if item.id == diagnosis_id:
-            return item
-    return None
+    # Index wird neu aufgebaut, wenn der Katalog (z. B. in Tests) erweitert wurde
+    if len(_CASE_INDEX) != len(DIAGNOSTIC_CATALOG):
+        _CASE_INDEX.clear()
+        for item in reversed(DIAGNOSTIC_CATALOG):
+            _CASE_INDEX[item.id] = item
+    return _CASE_INDEX.get(diagnosis_id)
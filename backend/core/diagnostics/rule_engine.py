@@ -0,0 +1,254 @@
+"""
+Kompilierte Regel-Engine für das Diagnose-Matching.
+
+Regeln werden deklarativ als Tabelle beschrieben (``rule(...)`` mit ``eq``/``has``/``pred``) und beim
+Start einmal kompiliert:
+
+- ``eq``-Bedingungen landen in einem Index ``(Signal, Wert) → Bedingungen``; pro Ereignis wird nur
+  für vorhandene Signale nachgeschlagen.
+- ``has``-Teilstrings werden je Feld zu **einem** vorkompilierten Trie-Regex zusammengefasst
+  (ein Durchlauf über den Text statt ``in``-Prüfung je Regel).
+- Jede Klausel hängt nur an ihrer selektivsten Bedingung (der mit den wenigsten Klauseln); erst wenn
+  diese erfüllt ist, werden die übrigen Bedingungen der Klausel geprüft. Häufige Bedingungen wie
+  „Frage enthält *fehler*“ ziehen so nicht alle Klauseln nach sich, in denen sie vorkommen.
+
+Die Reihenfolge der Tabelle bleibt die Priorität: Treffer werden nach Regelposition sortiert,
+Diagnose-IDs in Reihenfolge des ersten Auftretens geliefert. Aufwand je Ereignis hängt damit von
+Signalanzahl und Textlänge ab, nicht von der Größe des Katalogs.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping, Sequence, Union
+
+QUESTION = "?question"  # Pseudo-Signal: normalisierte Freitext-Frage
+
+
+@dataclass(frozen=True)
+class Eq:
+    """Erster nicht-leere Wert der Signal-Kette ``ref`` ist einer von ``values``."""
+
+    ref: tuple[str, ...]
+    values: frozenset[str]
+
+
+@dataclass(frozen=True)
+class Has:
+    """Einer der Teilstrings ``literals`` kommt im Wert der Signal-Kette ``ref`` vor."""
+
+    ref: tuple[str, ...]
+    literals: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Pred:
+    """Freie Bedingung (nicht indizierbar, wird je Ereignis ausgewertet – sparsam einsetzen)."""
+
+    name: str
+    fn: Callable[[Mapping[str, str], str], bool]
+
+
+Atom = Union[Eq, Has, Pred]
+
+
+@dataclass(frozen=True)
+class Rule:
+    ids: tuple[str, ...]
+    clauses: tuple[tuple[Atom, ...], ...]  # ODER über Klauseln, UND innerhalb einer Klausel
+
+
+def _ref(keys: Sequence[str]) -> tuple[str, ...]:
+    if not keys:
+        raise ValueError("signal key required")
+    return tuple(keys)
+
+
+def eq(*keys: str, value: str | None = None, values: Iterable[str] | None = None) -> Eq:
+    vals = set(values or ())
+    if value is not None:
+        vals.add(value)
+    if not vals:
+        raise ValueError("eq() needs value or values")
+    return Eq(_ref(keys), frozenset(v.strip().lower() for v in vals))
+
+
+def has(*keys: str, any_of: Iterable[str]) -> Has:
+    lits = tuple(dict.fromkeys(s.lower() for s in any_of if s))
+    if not lits:
+        raise ValueError("has() needs at least one literal")
+    return Has(_ref(keys), lits)
+
+
+def asks(*literals: str) -> Has:
+    """Teilstring in der Freitext-Frage."""
+    return has(QUESTION, any_of=literals)
+
+
+def pred(name: str, fn: Callable[[Mapping[str, str], str], bool]) -> Pred:
+    return Pred(name, fn)
+
+
+def all_of(*atoms: Atom) -> tuple[Atom, ...]:
+    return tuple(atoms)
+
+
+def rule(ids: str | Sequence[str], *clauses: Atom | tuple[Atom, ...]) -> Rule:
+    id_tuple = (ids,) if isinstance(ids, str) else tuple(ids)
+    if not clauses:
+        raise ValueError(f"rule {id_tuple} has no conditions")
+    return Rule(id_tuple, tuple(c if isinstance(c, tuple) else (c,) for c in clauses))
+
+
+def _trie_regex(literals: Iterable[str]) -> str:
+    """Präfix-faktorisierter Regex für eine Literal-Menge (längster Treffer zuerst)."""
+    trie: dict = {}
+    for word in literals:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        alt = "(?:" + "|".join(branches) + ")"
+        return alt + "?" if end else alt
+
+    return build(trie)
+
+
+class _TextMatcher:
+    """Alle Literale eines Feldes in einem Regex; liefert die getroffenen Literale."""
+
+    __slots__ = ("_regex", "_implied")
+
+    def __init__(self, literals: Iterable[str]):
+        lits = set(literals)
+        # Lookahead: an jeder Position der längste Treffer, auch überlappend
+        self._regex = re.compile("(?=(" + _trie_regex(lits) + "))")
+        # Der längste Treffer verdeckt kürzere Literale an derselben Position (seine Präfixe)
+        self._implied = {w: tuple(w[:i] for i in range(1, len(w) + 1) if w[:i] in lits) for w in lits}
+
+    def found(self, text: str) -> set[str]:
+        out: set[str] = set()
+        for m in self._regex.finditer(text):
+            hit = m.group(1)
+            if hit not in out:
+                out.update(self._implied[hit])
+        return out
+
+
+class CompiledRules:
+    """Kompilierter Regelsatz; ``match`` ist threadsicher (keine veränderlichen Zustände)."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = tuple(rules)
+        atom_ids: dict[Atom, int] = {}
+        uses: list[int] = []
+        self._clause_atoms: list[tuple[int, ...]] = []
+        self._clause_rule: list[int] = []
+        for r_idx, r in enumerate(self.rules):
+            for clause in r.clauses:
+                members: list[int] = []
+                for atom in dict.fromkeys(clause):
+                    a_idx = atom_ids.get(atom)
+                    if a_idx is None:
+                        a_idx = atom_ids[atom] = len(uses)
+                        uses.append(0)
+                    uses[a_idx] += 1
+                    members.append(a_idx)
+                self._clause_atoms.append(tuple(members))
+                self._clause_rule.append(r_idx)
+        self._trigger_clauses: list[list[int]] = [[] for _ in uses]
+        for c_idx, members in enumerate(self._clause_atoms):
+            self._trigger_clauses[min(members, key=uses.__getitem__)].append(c_idx)
+
+        refs: dict[tuple[str, ...], None] = {}
+        self._eq_index: dict[tuple[tuple[str, ...], str], list[int]] = {}
+        has_literals: dict[tuple[str, ...], dict[str, list[int]]] = {}
+        self._preds: list[tuple[int, Pred]] = []
+        for atom, a_idx in atom_ids.items():
+            if isinstance(atom, Eq):
+                refs[atom.ref] = None
+                for v in atom.values:
+                    self._eq_index.setdefault((atom.ref, v), []).append(a_idx)
+            elif isinstance(atom, Has):
+                refs[atom.ref] = None
+                lit_map = has_literals.setdefault(atom.ref, {})
+                for lit in atom.literals:
+                    lit_map.setdefault(lit, []).append(a_idx)
+            else:
+                self._preds.append((a_idx, atom))
+        self._text: dict[tuple[str, ...], tuple[_TextMatcher, dict[str, list[int]]]] = {
+            ref: (_TextMatcher(lits), lits) for ref, lits in has_literals.items()
+        }
+        self._refs_by_key: dict[str, list[tuple[str, ...]]] = {}
+        for ref in refs:
+            for key in ref:
+                self._refs_by_key.setdefault(key, []).append(ref)
+        self.atom_count = len(uses)
+        self.clause_count = len(self._clause_atoms)
+
+    @staticmethod
+    def _resolve(ref: tuple[str, ...], signals: Mapping[str, str], question: str) -> str:
+        for key in ref:
+            v = question if key == QUESTION else signals.get(key)
+            if v:
+                return v
+        return ""
+
+    def _satisfied_atoms(self, signals: Mapping[str, str], question: str) -> set[int]:
+        hit: set[int] = set()
+        refs: dict[tuple[str, ...], None] = {}
+        for key in signals:
+            for ref in self._refs_by_key.get(key, ()):
+                refs[ref] = None
+        if question:
+            for ref in self._refs_by_key.get(QUESTION, ()):
+                refs[ref] = None
+        for ref in refs:
+            value = self._resolve(ref, signals, question)
+            if not value:
+                continue
+            eq_atoms = self._eq_index.get((ref, value))
+            if eq_atoms:
+                hit.update(eq_atoms)
+            text = self._text.get(ref)
+            if text is not None:
+                matcher, lit_atoms = text
+                for lit in matcher.found(value):
+                    hit.update(lit_atoms[lit])
+        for a_idx, p in self._preds:
+            if p.fn(signals, question):
+                hit.add(a_idx)
+        return hit
+
+    def match(self, signals: Mapping[str, str], question: str = "") -> list[str]:
+        """Diagnose-IDs in Prioritätsreihenfolge (ohne Duplikate)."""
+        hit = self._satisfied_atoms(signals, question)
+        fired: set[int] = set()
+        for a_idx in hit:
+            for c_idx in self._trigger_clauses[a_idx]:
+                if self._clause_rule[c_idx] in fired:
+                    continue
+                members = self._clause_atoms[c_idx]
+                if len(members) == 1 or all(m in hit for m in members):
+                    fired.add(self._clause_rule[c_idx])
+        out: list[str] = []
+        seen: set[str] = set()
+        for r_idx in sorted(fired):
+            for diag_id in self.rules[r_idx].ids:
+                if diag_id not in seen:
+                    seen.add(diag_id)
+                    out.append(diag_id)
+        return out
+
+
+def compile_rules(rules: Sequence[Rule]) -> CompiledRules:
+    return CompiledRules(rules)
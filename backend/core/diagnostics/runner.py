@@ -2,17 +2,20 @@ from __future__ import annotations
 
 from core.diagnostics.evidence_store import evidence_sample, evidence_schema, evidence_summary_map
 from core.diagnostics.formatters import message_by_level, technical_summary
-from core.diagnostics.matcher import match_diagnoses
+from core.diagnostics.matcher import match_diagnoses, match_ids
 from core.diagnostics.models import (
     DiagnosticCase,
     DiagnosticsAnalyzeRequest,
     DiagnosticsAnalyzeResponse,
+    DiagnosticsBatchItem,
+    DiagnosticsBatchRequest,
+    DiagnosticsBatchResponse,
     DiagnosticsEvidence,
     EvidenceSampleResponse,
 )
 from core.diagnostics.registry import get_case_by_id, get_catalog
 from core.diagnostics.severity import max_confidence, max_severity
-from core.diagnostics.sources import normalized_signals
+from core.diagnostics.sources import normalized_question, normalized_signals
 
 
 def _to_ref(item: DiagnosticCase) -> dict[str, str]:
@@ -25,7 +28,8 @@ def _to_ref(item: DiagnosticCase) -> dict[str, str]:
 
 
 def run_diagnostics(req: DiagnosticsAnalyzeRequest) -> DiagnosticsAnalyzeResponse:
-    hits = match_diagnoses(req)
+    signals = normalized_signals(req)
+    hits = match_diagnoses(req, signals=signals)
     primary = hits[0]
     secondary = hits[1:4]
     messages = message_by_level(primary)
@@ -33,7 +37,7 @@ def run_diagnostics(req: DiagnosticsAnalyzeRequest) -> DiagnosticsAnalyzeRespons
 
     evidence = [
         DiagnosticsEvidence(source="signals", key=k, value=v)
-        for k, v in normalized_signals(req).items()
+        for k, v in signals.items()
     ]
     if req.question:
         evidence.append(DiagnosticsEvidence(source="question", key="question", value=req.question))
@@ -55,6 +59,37 @@ def run_diagnostics(req: DiagnosticsAnalyzeRequest) -> DiagnosticsAnalyzeRespons
     )
 
 
+def classify_batch(req: DiagnosticsBatchRequest) -> DiagnosticsBatchResponse:
+    """
+    Kompakte Klassifikation vieler Ereignisse (Job-Historien, Flotten-Telemetrie) in einem Aufruf.
+
+    Pro Ereignis nur IDs plus aggregierte Schwere/Konfidenz – ohne Texte, Aktionen und Evidenz wie
+    bei ``run_diagnostics``. Die Obergrenze ``BATCH_MAX_EVENTS`` prüft bereits das Request-Modell.
+    """
+    events = list(req.events or [])
+    items: list[DiagnosticsBatchItem] = []
+    primary_counts: dict[str, int] = {}
+    for index, ev in enumerate(events):
+        if isinstance(ev, dict):
+            ev = DiagnosticsAnalyzeRequest(**ev)
+        cases = [
+            c for c in (get_case_by_id(i) for i in match_ids(normalized_signals(ev), normalized_question(ev))) if c
+        ]
+        primary, secondary = cases[0], cases[1:4]
+        top = [primary] + secondary
+        items.append(
+            DiagnosticsBatchItem(
+                index=index,
+                primary=primary.id,
+                secondary=[x.id for x in secondary],
+                severity=max_severity([x.severity for x in top]),
+                confidence=max_confidence([x.confidence for x in top]),
+            )
+        )
+        primary_counts[primary.id] = primary_counts.get(primary.id, 0) + 1
+    return DiagnosticsBatchResponse(count=len(items), items=items, primary_counts=primary_counts)
+
+
 def catalog() -> list[dict]:
     smap = evidence_summary_map()
     out: list[dict] = []
@@ -67,9 +102,9 @@ def catalog() -> list[dict]:
                 "confirmed": ev.confirmed,
                 "refuted": ev.refuted,
             }
-            m.seen_in_platforms = ev.seen_in_platforms
-            m.common_storage_contexts = ev.common_storage_contexts
-            m.common_boot_contexts = ev.common_boot_contexts
+            m.seen_in_platforms = list(ev.seen_in_platforms)
+            m.common_storage_contexts = list(ev.common_storage_contexts)
+            m.common_boot_contexts = list(ev.common_boot_contexts)
         out.append(m.model_dump())
     return out
 
@@ -86,9 +121,9 @@ def diagnosis_by_id(diagnosis_id: str) -> dict | None:
             "confirmed": ev.confirmed,
             "refuted": ev.refuted,
         }
-        m.seen_in_platforms = ev.seen_in_platforms
-        m.common_storage_contexts = ev.common_storage_contexts
-        m.common_boot_contexts = ev.common_boot_contexts
+        m.seen_in_platforms = list(ev.seen_in_platforms)
+        m.common_storage_contexts = list(ev.common_storage_contexts)
+        m.common_boot_contexts = list(ev.common_boot_contexts)
     return m.model_dump()
 
 
@@ -1,20 +1,31 @@
-"""Host-seitige Fleet-Session-State für lokale Lab-/QEMU-Smokes (Phase 1, read-only UI)."""
+"""
+Host-seitige Fleet-Session-State für lokale Lab-/QEMU-Smokes (Phase 1, read-only UI).
+
+Ablage: SQLite (``fleet_sessions.db``, siehe ``core.fleet_session_store``) plus gepuffertes
+JSONL-Audit-Log. Stale-Regeln laufen als Sweep über aktive Sessions, höchstens alle
+``STALE_SWEEP_INTERVAL_SECONDS`` aus Liste/Summary heraus.
+"""
 
 from __future__ import annotations
 
 import json
 import os
 import socket
+import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from core.fleet_session_store import DB_NAME, FleetSessionStore, get_audit_buffer, get_store
+
 UTC = timezone.utc
 
 FLEET_SESSIONS_REL = Path("docs/evidence/runtime-results/dev-dashboard")
 JSONL_NAME = "fleet_sessions.jsonl"
-LATEST_NAME = "fleet_sessions_latest.json"
+LATEST_NAME = "fleet_sessions_latest.json"  # Altformat, wird beim ersten Öffnen übernommen
+STALE_SWEEP_INTERVAL_SECONDS = 5.0
+HEARTBEAT_DELAYED_SECONDS = 60
 
 SESSION_TYPES = frozenset({"local_qemu_smoke", "local_agent_smoke", "local_manual_lab"})
 STATUSES = frozenset(
@@ -78,6 +89,23 @@ def _latest_path(repo_root: Path | None = None) -> Path:
     return fleet_sessions_storage_dir(repo_root) / LATEST_NAME
 
 
+def _guard_storage(repo_root: Path | None = None) -> None:
+    """Wie früher beim atomaren Index-Schreiben: keine Ablage über Symlinks (Verzeichnis, DB, Audit-Log)."""
+    storage = fleet_sessions_storage_dir(repo_root)
+    for path in (storage, storage / DB_NAME, storage / JSONL_NAME):
+        if path.is_symlink():
+            raise FleetSessionError("FLEET_SESSION_BLOCKED_INVALID_PAYLOAD", ["symlink_blocked"])
+
+
+def _store(repo_root: Path | None = None) -> FleetSessionStore:
+    _guard_storage(repo_root)
+    return get_store(
+        fleet_sessions_storage_dir(repo_root) / DB_NAME,
+        legacy_latest=_latest_path(repo_root),
+        is_terminal=lambda status: status in TERMINAL_STATUSES,
+    )
+
+
 def utc_now_iso() -> str:
     return datetime.now(tz=UTC).replace(microsecond=0).isoformat()
 
@@ -119,25 +147,6 @@ def _ensure_under_repo(path: Path, repo: Path) -> Path:
     return resolved
 
 
-def _atomic_write_json(path: Path, data: dict[str, Any] | list[Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.parent.is_symlink():
-        raise FleetSessionError("FLEET_SESSION_BLOCKED_INVALID_PAYLOAD", ["symlink_blocked"])
-    tmp = path.with_name(path.name + ".tmp")
-    if tmp.exists() and tmp.is_symlink():
-        raise FleetSessionError("FLEET_SESSION_BLOCKED_INVALID_PAYLOAD", ["symlink_blocked"])
-    content = json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
-    tmp.write_text(content, encoding="utf-8")
-    os.replace(tmp, path)
-
-
-def _append_jsonl(path: Path, record: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n"
-    with path.open("a", encoding="utf-8") as fh:
-        fh.write(line)
-
-
 def _default_host_block() -> dict[str, Any]:
     return {
         "hostname": socket.gethostname(),
@@ -289,36 +298,31 @@ def _validate_payload(payload: dict[str, Any], repo: Path, *, partial: bool = Fa
 
 
 def _load_latest_index(repo_root: Path | None = None) -> dict[str, dict[str, Any]]:
-    path = _latest_path(repo_root)
-    if not path.is_file() or path.is_symlink():
-        return {}
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return {}
-    sessions = data.get("sessions") if isinstance(data, dict) else None
-    if not isinstance(sessions, dict):
-        return {}
-    return {str(k): v for k, v in sessions.items() if isinstance(v, dict)}
+    """Alle Sessions als ``{session_id: session}`` (Anlage-Reihenfolge)."""
+    return {str(s.get("session_id")): s for s in _store(repo_root).all()}
 
 
 def _save_latest_index(sessions: dict[str, dict[str, Any]], repo_root: Path | None = None) -> None:
-    payload = {
-        "updated_at": utc_now_iso(),
-        "sessions": sessions,
-    }
-    _atomic_write_json(_latest_path(repo_root), payload)
+    """Schreibt die übergebenen Sessions unverändert (ohne ``updated_at`` zu setzen)."""
+    _store(repo_root).upsert_many(dict(v, session_id=str(k)) for k, v in sessions.items())
 
 
-def _persist_session(session: dict[str, Any], repo_root: Path | None = None) -> None:
-    repo = _repo_root(repo_root)
+def _load_session(sid: str, repo_root: Path | None = None) -> dict[str, Any] | None:
+    return _store(repo_root).get(sid)
+
+
+def _persist_session(
+    session: dict[str, Any],
+    repo_root: Path | None = None,
+    *,
+    audit_now: bool = True,
+) -> None:
+    """Eine Zeile schreiben; Audit-Zeile sofort (``audit_now``) oder gepuffert (Heartbeats, Sweeps)."""
     sid = _validate_id(str(session.get("session_id") or ""), "session_id")
     session["session_id"] = sid
     session["updated_at"] = utc_now_iso()
-    _append_jsonl(_jsonl_path(repo_root), session)
-    index = _load_latest_index(repo_root)
-    index[sid] = session
-    _save_latest_index(index, repo_root)
+    _store(repo_root).upsert(session)
+    get_audit_buffer(_jsonl_path(repo_root)).append(session, force=audit_now)
 
 
 def _compute_heartbeat_age(session: dict[str, Any], now: datetime | None = None) -> int:
@@ -380,7 +384,7 @@ def _apply_stale_rules(session: dict[str, Any], now: datetime | None = None) ->
     timeout_s = int((session.get("qemu") or {}).get("timeout_seconds") or 900)
 
     findings = list(session.get("findings") or [])
-    if age > 60:
+    if age > HEARTBEAT_DELAYED_SECONDS:
         hb["healthy"] = False
         hb["stalled"] = age > 180
         if "heartbeat_delayed" not in findings:
@@ -434,8 +438,7 @@ def create_fleet_session(payload: dict[str, Any], *, repo_root: Path | None = No
 def update_fleet_session(session_id: str, patch: dict[str, Any], *, repo_root: Path | None = None) -> dict[str, Any]:
     repo = _repo_root(repo_root)
     sid = _validate_id(session_id, "session_id")
-    index = _load_latest_index(repo_root)
-    session = index.get(sid)
+    session = _load_session(sid, repo_root)
     if not session:
         raise FleetSessionError("FLEET_SESSION_NOT_FOUND", ["session_not_found"])
     cleaned = _validate_payload(patch, repo, partial=True)
@@ -459,8 +462,7 @@ def heartbeat_fleet_session(
 ) -> dict[str, Any]:
     repo = _repo_root(repo_root)
     sid = _validate_id(session_id, "session_id")
-    index = _load_latest_index(repo_root)
-    session = index.get(sid)
+    session = _load_session(sid, repo_root)
     if not session:
         raise FleetSessionError("FLEET_SESSION_NOT_FOUND", ["session_not_found"])
     if session.get("status") in TERMINAL_STATUSES:
@@ -479,7 +481,7 @@ def heartbeat_fleet_session(
         session = _deep_merge(session, cleaned)
     _apply_serial_observation(session)
     _apply_stale_rules(session)
-    _persist_session(session, repo_root)
+    _persist_session(session, repo_root, audit_now=session.get("status") in TERMINAL_STATUSES)
     return {"code": "FLEET_SESSION_HEARTBEAT_OK", "session": session}
 
 
@@ -496,8 +498,7 @@ def finish_fleet_session(
     if st not in STATUSES:
         raise FleetSessionError("FLEET_SESSION_BLOCKED_INVALID_PAYLOAD", ["invalid_status"])
 
-    index = _load_latest_index(repo_root)
-    session = index.get(sid)
+    session = _load_session(sid, repo_root)
     if not session:
         raise FleetSessionError("FLEET_SESSION_NOT_FOUND", ["session_not_found"])
 
@@ -549,8 +550,7 @@ def finish_fleet_session(
 
 def get_fleet_session(session_id: str, *, repo_root: Path | None = None) -> dict[str, Any]:
     sid = _validate_id(session_id, "session_id")
-    index = _load_latest_index(repo_root)
-    session = index.get(sid)
+    session = _load_session(sid, repo_root)
     if not session:
         raise FleetSessionError("FLEET_SESSION_NOT_FOUND", ["session_not_found"])
     _apply_serial_observation(session)
@@ -558,6 +558,26 @@ def get_fleet_session(session_id: str, *, repo_root: Path | None = None) -> dict
     return {"code": "FLEET_SESSION_OK", "session": session}
 
 
+def _sweep_if_due(repo_root: Path | None = None) -> None:
+    store = _store(repo_root)
+    if time.monotonic() - store.last_sweep >= STALE_SWEEP_INTERVAL_SECONDS:
+        _sweep_stale(store, datetime.now(tz=UTC), repo_root)
+
+
+def _sweep_stale(store: FleetSessionStore, now: datetime, repo_root: Path | None) -> list[str]:
+    """Stale-/Serial-Regeln nur für aktive Sessions mit altem Heartbeat oder Serial-Log."""
+    store.last_sweep = time.monotonic()
+    updated: list[str] = []
+    for session in store.sweep_candidates(heartbeat_before=now.timestamp() - HEARTBEAT_DELAYED_SECONDS):
+        before = session.get("status")
+        _apply_serial_observation(session, now)
+        _apply_stale_rules(session, now)
+        if session.get("status") != before:
+            _persist_session(session, repo_root, audit_now=False)
+            updated.append(str(session.get("session_id")))
+    return updated
+
+
 def list_fleet_sessions(
     *,
     limit: int = 50,
@@ -565,57 +585,40 @@ def list_fleet_sessions(
     repo_root: Path | None = None,
 ) -> dict[str, Any]:
     limit = max(1, min(int(limit), 200))
-    index = _load_latest_index(repo_root)
-    sessions = list(index.values())
-
-    def sort_key(s: dict[str, Any]) -> tuple[str, str]:
-        return (str(s.get("updated_at") or s.get("created_at") or ""), str(s.get("session_id") or ""))
-
-    sessions.sort(key=sort_key, reverse=True)
-    if not include_finished:
-        sessions = [s for s in sessions if s.get("status") not in TERMINAL_STATUSES]
-
-    stale = detect_stale_sessions(repo_root=repo_root)
+    _sweep_if_due(repo_root)
+    sessions = _store(repo_root).newest(limit=limit, active_only=not include_finished)
     return {
         "code": "FLEET_SESSION_LIST_OK",
-        "sessions": sessions[:limit],
-        "count": len(sessions[:limit]),
-        "stale_summary": stale.get("summary", {}),
+        "sessions": sessions,
+        "count": len(sessions),
+        "stale_summary": _summary(repo_root),
     }
 
 
-def build_fleet_session_summary(*, repo_root: Path | None = None) -> dict[str, Any]:
-    index = _load_latest_index(repo_root)
-    sessions = list(index.values())
-    active = [s for s in sessions if s.get("status") not in TERMINAL_STATUSES]
-    terminal = [s for s in sessions if s.get("status") in TERMINAL_STATUSES]
-    warnings = sum(1 for s in sessions if s.get("severity") == "warning")
-    errors = sum(1 for s in sessions if s.get("severity") == "error")
+def _summary(repo_root: Path | None = None) -> dict[str, Any]:
+    store = _store(repo_root)
+    counts = store.counts()
     return {
         "code": "FLEET_SESSION_SUMMARY_OK",
-        "total": len(sessions),
-        "active_count": len(active),
-        "finished_count": len(terminal),
-        "warning_count": warnings,
-        "error_count": errors,
-        "latest_active": active[:5],
+        "total": counts["total"],
+        "active_count": counts["active"],
+        "finished_count": counts["finished"],
+        "warning_count": counts["warnings"],
+        "error_count": counts["errors"],
+        "latest_active": store.active(limit=5),
         "generated_at": utc_now_iso(),
     }
 
 
+def build_fleet_session_summary(*, repo_root: Path | None = None) -> dict[str, Any]:
+    _sweep_if_due(repo_root)
+    return _summary(repo_root)
+
+
 def detect_stale_sessions(*, now: datetime | None = None, repo_root: Path | None = None) -> dict[str, Any]:
     now = now or datetime.now(tz=UTC)
-    index = _load_latest_index(repo_root)
-    updated: list[str] = []
-    for sid, session in list(index.items()):
-        before = session.get("status")
-        _apply_serial_observation(session, now)
-        _apply_stale_rules(session, now)
-        if session.get("status") != before:
-            _persist_session(session, repo_root)
-            updated.append(sid)
-    summary = build_fleet_session_summary(repo_root=repo_root)
-    return {"summary": summary, "updated_session_ids": updated}
+    updated = _sweep_stale(_store(repo_root), now, repo_root)
+    return {"summary": _summary(repo_root), "updated_session_ids": updated}
 
 
 def fleet_sessions_enabled() -> bool:
@@ -0,0 +1,275 @@
+"""
+SQLite-Speicher für Fleet-Sessions (WAL, eine Zeile je Session).
+
+Heartbeats/Updates schreiben genau eine Zeile statt den kompletten Latest-Index neu; Status,
+Terminal-Flag, Heartbeat-Zeit und ``updated_at`` liegen als indizierte Spalten neben dem
+JSON-Dokument, damit Listen, Summary und Stale-Erkennung als Abfragen laufen. Das JSONL-Audit-Log
+wird gepuffert und blockweise angehängt (``AuditLogBuffer``).
+
+Ein vorhandenes ``fleet_sessions_latest.json`` wird beim ersten Öffnen einmalig übernommen.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from core.sqlite_registry import ConnectionRegistry, iso_epoch, open_wal_connection
+
+DB_NAME = "fleet_sessions.db"
+AUDIT_BATCH_SIZE = 64
+AUDIT_FLUSH_SECONDS = 5.0
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS fleet_sessions (
+    session_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    terminal INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    heartbeat_ts REAL NOT NULL,
+    has_serial INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fleet_sessions_active_hb ON fleet_sessions(terminal, heartbeat_ts);
+CREATE INDEX IF NOT EXISTS idx_fleet_sessions_updated ON fleet_sessions(updated_at, session_id);
+CREATE INDEX IF NOT EXISTS idx_fleet_sessions_status ON fleet_sessions(status);
+"""
+
+
+def _epoch(ts: str | None) -> float:
+    return iso_epoch(ts) or 0.0
+
+
+class AuditLogBuffer:
+    """Hängt JSONL-Zeilen gesammelt an: ab ``batch_size`` Zeilen, spätestens ``flush_seconds`` nach
+    der ersten gepufferten Zeile (Timer-Thread, auch ohne weiteres ``append``) oder bei ``flush()``."""
+
+    def __init__(self, path: Path, *, batch_size: int = AUDIT_BATCH_SIZE, flush_seconds: float = AUDIT_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._lines: list[str] = []
+        self._first_at = 0.0
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+
+    def append(self, record: dict[str, Any], *, force: bool = False) -> None:
+        line = json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n"
+        with self._lock:
+            if not self._lines:
+                self._first_at = time.monotonic()
+            self._lines.append(line)
+            due = (
+                force
+                or len(self._lines) >= self.batch_size
+                or time.monotonic() - self._first_at >= self.flush_seconds
+            )
+            if due:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self, *, create_dirs: bool = True) -> None:
+        with self._lock:
+            self._flush_locked(create_dirs=create_dirs)
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush(create_dirs=False)
+        except OSError:
+            pass  # nächster append/flush versucht es erneut
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._lines)
+
+    def _flush_locked(self, *, create_dirs: bool = True) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._lines:
+            return
+        if create_dirs:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        elif not self.path.parent.is_dir():
+            self._lines.clear()  # Ablageverzeichnis inzwischen entfernt
+            return
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write("".join(self._lines))
+        self._lines.clear()
+
+
+class FleetSessionStore:
+    """Eine Verbindung je Datenbank, serialisiert über ein Lock (Schreiblast: wenige Zeilen/s)."""
+
+    def __init__(self, db_path: Path, *, legacy_latest: Path | None = None, is_terminal: Callable[[str], bool]):
+        self.db_path = db_path
+        self._is_terminal = is_terminal
+        self._lock = threading.Lock()
+        self._conn = open_wal_connection(db_path, isolation_level=None)
+        self._conn.executescript(_SCHEMA_SQL)
+        self.last_sweep = 0.0
+        if legacy_latest is not None:
+            self._import_legacy(legacy_latest)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _row(self, session: dict[str, Any]) -> tuple[Any, ...]:
+        hb = session.get("heartbeat") if isinstance(session.get("heartbeat"), dict) else {}
+        serial = session.get("serial") if isinstance(session.get("serial"), dict) else {}
+        status = str(session.get("status") or "unknown")
+        return (
+            str(session["session_id"]),
+            status,
+            str(session.get("severity") or "info"),
+            1 if self._is_terminal(status) else 0,
+            str(session.get("created_at") or ""),
+            str(session.get("updated_at") or ""),
+            _epoch(str(hb.get("last_heartbeat_at") or session.get("updated_at") or "")),
+            1 if serial.get("path") else 0,
+            json.dumps(session, ensure_ascii=False, sort_keys=True),
+        )
+
+    def upsert_many(self, sessions: Iterable[dict[str, Any]]) -> None:
+        rows = [self._row(s) for s in sessions]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO fleet_sessions (session_id, status, severity, terminal, created_at, updated_at,"
+                    " heartbeat_ts, has_serial, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(session_id) DO UPDATE SET status=excluded.status, severity=excluded.severity,"
+                    " terminal=excluded.terminal, created_at=excluded.created_at, updated_at=excluded.updated_at,"
+                    " heartbeat_ts=excluded.heartbeat_ts, has_serial=excluded.has_serial, data=excluded.data",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def upsert(self, session: dict[str, Any]) -> None:
+        self.upsert_many([session])
+
+    def _select(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        out: list[dict[str, Any]] = []
+        for (data,) in rows:
+            try:
+                doc = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(doc, dict):
+                out.append(doc)
+        return out
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        got = self._select("SELECT data FROM fleet_sessions WHERE session_id = ?", (session_id,))
+        return got[0] if got else None
+
+    def all(self) -> list[dict[str, Any]]:
+        """Alle Sessions in Anlage-Reihenfolge (wie der frühere Latest-Index)."""
+        return self._select("SELECT data FROM fleet_sessions ORDER BY rowid")
+
+    def newest(self, *, limit: int, active_only: bool) -> list[dict[str, Any]]:
+        where = "WHERE terminal = 0 " if active_only else ""
+        return self._select(
+            f"SELECT data FROM fleet_sessions {where}ORDER BY updated_at DESC, session_id DESC LIMIT ?",
+            (int(limit),),
+        )
+
+    def active(self, *, limit: int | None = None) -> list[dict[str, Any]]:
+        sql = "SELECT data FROM fleet_sessions WHERE terminal = 0 ORDER BY rowid"
+        if limit is not None:
+            return self._select(sql + " LIMIT ?", (int(limit),))
+        return self._select(sql)
+
+    def sweep_candidates(self, *, heartbeat_before: float) -> list[dict[str, Any]]:
+        """Aktive Sessions, deren Status sich durch Heartbeat-Alter oder Serial-Log ändern kann."""
+        return self._select(
+            "SELECT data FROM fleet_sessions WHERE terminal = 0 AND (heartbeat_ts <= ? OR has_serial = 1) ORDER BY rowid",
+            (float(heartbeat_before),),
+        )
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(terminal = 0), 0), COALESCE(SUM(terminal = 1), 0),"
+                " COALESCE(SUM(severity = 'warning'), 0), COALESCE(SUM(severity = 'error'), 0) FROM fleet_sessions"
+            ).fetchone()
+        total, active, finished, warnings, errors = (int(x) for x in row)
+        return {"total": total, "active": active, "finished": finished, "warnings": warnings, "errors": errors}
+
+    def _import_legacy(self, latest: Path) -> None:
+        if not latest.is_file() or latest.is_symlink():
+            return
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM fleet_sessions").fetchone()
+        if n:
+            return
+        try:
+            data = json.loads(latest.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return
+        sessions = data.get("sessions") if isinstance(data, dict) else None
+        if not isinstance(sessions, dict):
+            return
+        self.upsert_many(
+            dict(v, session_id=str(k)) for k, v in sessions.items() if isinstance(v, dict)
+        )
+
+
+_stores: ConnectionRegistry[FleetSessionStore] = ConnectionRegistry()
+_audit: dict[Path, AuditLogBuffer] = {}
+_registry_lock = threading.Lock()
+
+
+def get_store(db_path: Path, *, legacy_latest: Path | None, is_terminal: Callable[[str], bool]) -> FleetSessionStore:
+    store, _fresh = _stores.get(
+        db_path, lambda: FleetSessionStore(db_path, legacy_latest=legacy_latest, is_terminal=is_terminal)
+    )
+    return store
+
+
+def get_audit_buffer(path: Path) -> AuditLogBuffer:
+    with _registry_lock:
+        buf = _audit.get(path)
+        if buf is None:
+            buf = _audit[path] = AuditLogBuffer(path)
+        return buf
+
+
+def flush_audit_logs(*, create_dirs: bool = True) -> None:
+    with _registry_lock:
+        buffers = list(_audit.values())
+    for buf in buffers:
+        try:
+            buf.flush(create_dirs=create_dirs)
+        except OSError:
+            pass
+
+
+def _flush_at_exit() -> None:
+    flush_audit_logs(create_dirs=False)
+
+
+def close_stores() -> None:
+    """Audit-Puffer schreiben und Verbindungen schließen (Shutdown, Tests)."""
+    flush_audit_logs()
+    _stores.close_all()
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,66 @@
+"""
+Lazy Handler-Imports für Route-Module (Kaltstart auf Raspberry Pi).
+
+Route-Module definieren Modelle und Endpunkte sofort, laden die eigentliche
+Fachlogik aber erst beim ersten Aufruf. ``loaded_lazy_modules()`` zeigt, welche
+Module bereits nachgeladen wurden (Diagnose/Benchmark).
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+_LOCK = threading.Lock()
+_LOADED: dict[str, float] = {}
+
+
+def lazy_callable(module: str, attr: str) -> Callable[..., Any]:
+    """
+    Platzhalter für ``from module import attr``: importiert beim ersten Aufruf.
+
+    Der Zielname wird bei jedem Aufruf über das Modul aufgelöst, damit Tests
+    ``module.attr`` weiterhin per ``patch`` ersetzen können.
+    """
+
+    def _call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(_import(module), attr)(*args, **kwargs)
+
+    _call.__name__ = attr
+    _call.__qualname__ = attr
+    _call.__module__ = module
+    _call.__doc__ = f"Lazy proxy for {module}.{attr}"
+    _call.__wrapped_lazy__ = (module, attr)  # type: ignore[attr-defined]
+    return _call
+
+
+def _import(module: str) -> Any:
+    mod = sys.modules.get(module)
+    if mod is not None and module in _LOADED:
+        return mod
+    t0 = time.perf_counter()
+    mod = importlib.import_module(module)
+    with _LOCK:
+        _LOADED.setdefault(module, round((time.perf_counter() - t0) * 1000, 3))
+    return mod
+
+
+def resolve_lazy(obj: Callable[..., Any]) -> Callable[..., Any]:
+    """Liefert das echte Ziel eines ``lazy_callable`` (sonst ``obj`` selbst)."""
+    target = getattr(obj, "__wrapped_lazy__", None)
+    if not target:
+        return obj
+    module, attr = target
+    return getattr(_import(module), attr)
+
+
+def loaded_lazy_modules() -> dict[str, float]:
+    """Bereits nachgeladene Module mit Importdauer in ms (erster Aufruf)."""
+    with _LOCK:
+        return dict(_LOADED)
+
+
+__all__ = ["lazy_callable", "loaded_lazy_modules", "resolve_lazy"]
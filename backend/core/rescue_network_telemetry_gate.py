@@ -6,7 +6,7 @@ import json
 from pathlib import Path
 from typing import Any
 
-from core.rescue_telemetry_ingest import build_health_payload, load_rescue_telemetry_ingest_config
+from core.rescue_telemetry_ingest import build_health_payload, ingest_ack_present
 from core.rescue_telemetry_lan_proxy import build_compact_telemetry_lan_proxy_status
 from core.rescue_telemetry_tasks import build_compact_task_pull_status
 
@@ -27,12 +27,8 @@ def load_gate_file() -> dict[str, Any]:
 
 
 def _ingest_ack_present() -> bool:
-    cfg = load_rescue_telemetry_ingest_config()
-    ack_dir = cfg.ack_dir
-    if ack_dir.is_dir():
-        for path in ack_dir.glob("*.json"):
-            if path.is_file():
-                return True
+    if ingest_ack_present():
+        return True
     status_path = _repo_root() / "docs/evidence/runtime-results/rescue/rescue_telemetry_ingest_runtime_status.json"
     if status_path.is_file():
         try:
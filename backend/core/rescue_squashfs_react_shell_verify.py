@@ -1,4 +1,9 @@
-"""Read-only SquashFS checks for React rescue shell payload."""
+"""Read-only SquashFS checks for React rescue shell payload.
+
+Listing und Dateien kommen bevorzugt aus dem gecachten nativen Reader (``core.squashfs_reader``):
+alle Prüfungen eines Images kosten damit einen Tabellen-Parse. ``unsquashfs`` bleibt Fallback für
+nicht unterstützte Kompression (lzo/lz4/zstd) oder unlesbare Images.
+"""
 
 from __future__ import annotations
 
@@ -6,8 +11,21 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from core.squashfs_reader import SquashfsError, SquashfsImage, open_squashfs
+
+
+def _native_image(squashfs_path: Path) -> SquashfsImage | None:
+    try:
+        return open_squashfs(squashfs_path)
+    except (OSError, SquashfsError):
+        return None
+
 
 def _unsquashfs_listing(squashfs_path: Path) -> tuple[bool, str]:
+    image = _native_image(squashfs_path)
+    if image is not None:
+        with image:
+            return True, image.listing_text()
     proc = subprocess.run(
         ["unsquashfs", "-ll", str(squashfs_path)],
         capture_output=True,
@@ -20,6 +38,13 @@ def _unsquashfs_listing(squashfs_path: Path) -> tuple[bool, str]:
 
 
 def _unsquashfs_cat(squashfs_path: Path, member: str) -> str:
+    image = _native_image(squashfs_path)
+    if image is not None:
+        with image:
+            try:
+                return image.read_text(member)
+            except (OSError, SquashfsError):
+                return ""
     proc = subprocess.run(
         ["unsquashfs", "-force", "-no-xattrs", "-cat", str(squashfs_path), member],
         capture_output=True,
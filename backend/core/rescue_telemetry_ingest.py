@@ -1,4 +1,10 @@
-"""Rescue / Windows inspect telemetry ingest (not DCC, not dev-server)."""
+"""Rescue / Windows inspect telemetry ingest (not DCC, not dev-server).
+
+Angenommene Envelopes landen als Records im Segment-Log unter ``received/`` (inkl. ACK), die
+Ausweich-Queue unter ``queue/`` ebenso – keine Datei je Payload, keine Verzeichnis-Scans für
+Zähler. Eine nachgelagerte Verarbeitung gibt es noch nicht; die Records bleiben als Evidenz im Log
+(``received_pending`` zählt sie als unverarbeitet).
+"""
 
 from __future__ import annotations
 
@@ -13,6 +19,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from core.telemetry_segment_log import SegmentLog, SegmentLogError, open_segment_log
 from core.windows_rescue_inspect import privacy_guard_blocks, sha256_canonical_json
 
 TELEMETRY_ERROR_CODES = {
@@ -126,7 +133,43 @@ def _write_runtime_status(cfg: RescueTelemetryIngestConfig, patch: dict[str, Any
     _write_json_atomic(_runtime_status_path(cfg), current)
 
 
-def _scan_latest_ack(cfg: RescueTelemetryIngestConfig) -> tuple[str | None, str | None]:
+def _record_error(cfg: RescueTelemetryIngestConfig, code: str | None) -> None:
+    """Fehler merken; gilt als aktuell, bis danach ein Envelope im Log landet (``last_error_after_seq``)."""
+    after_seq = _log_counters(cfg, cfg.ingest_dir)["last_seq"]
+    _write_runtime_status(cfg, {"last_error_code": code, "last_error_after_seq": after_seq})
+
+
+def _current_error(runtime: dict[str, Any], last_seq: int) -> str | None:
+    code = runtime.get("last_error_code")
+    after_seq = runtime.get("last_error_after_seq")
+    if code and isinstance(after_seq, int) and last_seq > after_seq:
+        return None
+    return code
+
+
+def _received_log(cfg: RescueTelemetryIngestConfig) -> SegmentLog:
+    return open_segment_log(cfg.ingest_dir)
+
+
+def _queue_log(cfg: RescueTelemetryIngestConfig) -> SegmentLog:
+    return open_segment_log(cfg.queue_dir)
+
+
+def _latest_logged_ack(cfg: RescueTelemetryIngestConfig) -> tuple[str | None, str | None]:
+    """Letzter ACK aus dem Log-Ende (O(1)); Altbestand ``acks/*.json`` nur, solange das Log leer ist."""
+    if cfg.ingest_dir.is_dir():
+        seq, payload = _received_log(cfg).last_record()
+        if seq and payload:
+            try:
+                rec = json.loads(payload)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                rec = None
+            if isinstance(rec, dict):
+                return str(rec.get("ack_id") or "") or None, str(rec.get("received_at") or "") or None
+    return _scan_legacy_ack(cfg)
+
+
+def _scan_legacy_ack(cfg: RescueTelemetryIngestConfig) -> tuple[str | None, str | None]:
     if not cfg.ack_dir.is_dir():
         return None, None
     latest_path: Path | None = None
@@ -149,21 +192,31 @@ def _scan_latest_ack(cfg: RescueTelemetryIngestConfig) -> tuple[str | None, str
     return latest_path.stem, None
 
 
+def ingest_ack_present(*, config: RescueTelemetryIngestConfig | None = None) -> bool:
+    cfg = config or load_rescue_telemetry_ingest_config()
+    return _latest_logged_ack(cfg)[0] is not None
+
+
+def _log_counters(cfg: RescueTelemetryIngestConfig, log_dir: Path) -> dict[str, int]:
+    if not log_dir.is_dir():
+        return {"last_seq": 0, "pending": 0, "processed": 0, "segments": 0}
+    return open_segment_log(log_dir).counters()
+
+
 def build_health_payload(*, config: RescueTelemetryIngestConfig | None = None) -> dict[str, Any]:
     cfg = config or load_rescue_telemetry_ingest_config()
     storage_ok = False
-    queue_depth = 0
     queue_available = False
     if cfg.storage_root.exists() or _ensure_storage_dirs(cfg):
         storage_ok = cfg.storage_root.is_dir()
         queue_available = cfg.queue_dir.is_dir() or storage_ok
-        if cfg.queue_dir.is_dir():
-            queue_depth = sum(1 for p in cfg.queue_dir.glob("*.json") if p.is_file())
+    queue = _log_counters(cfg, cfg.queue_dir)
+    received = _log_counters(cfg, cfg.ingest_dir)
     runtime = _read_runtime_status(cfg)
-    last_ack_id, scanned_at = _scan_latest_ack(cfg)
-    last_ingest_at = runtime.get("last_ingest_at") or scanned_at
-    last_ack_id = runtime.get("last_ack_id") or last_ack_id
-    last_error_code = runtime.get("last_error_code")
+    last_ack_id, scanned_at = _latest_logged_ack(cfg)
+    last_ingest_at = scanned_at or runtime.get("last_ingest_at")
+    last_ack_id = last_ack_id or runtime.get("last_ack_id")
+    last_error_code = _current_error(runtime, received["last_seq"])
     if not cfg.enabled and not last_error_code:
         last_error_code = TELEMETRY_ERROR_CODES["disabled"]
     warnings: list[str] = []
@@ -184,7 +237,10 @@ def build_health_payload(*, config: RescueTelemetryIngestConfig | None = None) -
         "storage_ok": storage_ok,
         "queue_available": queue_available,
         "queue_path_configured": bool(str(cfg.queue_dir)),
-        "queue_depth": queue_depth,
+        "queue_depth": queue["pending"],
+        "received_count": received["last_seq"],
+        "received_pending": received["pending"],
+        "received_processed": received["processed"],
         "last_ingest_at": last_ingest_at,
         "last_ack_id": last_ack_id,
         "last_error_code": last_error_code,
@@ -314,12 +370,16 @@ def enqueue_payload(
         "payload_hash_sha256": compute_payload_hash(payload),
         "retry_plan": "operator_or_rescue_agent_resend",
     }
-    name = f"{run_id}_{uuid.uuid4().hex[:8]}.json"
-    ok = _write_json_atomic(cfg.queue_dir / name, entry)
+    try:
+        seq = _queue_log(cfg).append_json(entry)
+        name: str | None = f"{run_id}#{seq}"
+    except (OSError, SegmentLogError):
+        name = None
+    ok = name is not None
     return {
         "status": "queued_local" if ok else "queue_write_failed",
         "code": TELEMETRY_ERROR_CODES["queue_local"] if ok else "TELEMETRY-QUEUE-002",
-        "queue_entry": name if ok else None,
+        "queue_entry": name,
     }
 
 
@@ -332,7 +392,7 @@ def process_telemetry_ingest(
 ) -> dict[str, Any]:
     cfg = config or load_rescue_telemetry_ingest_config()
     if not cfg.enabled:
-        _write_runtime_status(cfg, {"last_error_code": TELEMETRY_ERROR_CODES["disabled"]})
+        _record_error(cfg, TELEMETRY_ERROR_CODES["disabled"])
         return {
             "http_status": 503,
             "body": {
@@ -344,7 +404,7 @@ def process_telemetry_ingest(
 
     ok_auth, auth_code = verify_ingest_auth(headers=headers, body_bytes=body_bytes, config=cfg)
     if not ok_auth:
-        _write_runtime_status(cfg, {"last_error_code": auth_code})
+        _record_error(cfg, auth_code)
         return {
             "http_status": 401,
             "body": {"status": "error", "code": auth_code, "message": "Telemetry ingest authentication failed."},
@@ -352,7 +412,7 @@ def process_telemetry_ingest(
 
     valid, schema_code = validate_envelope(payload)
     if not valid:
-        _write_runtime_status(cfg, {"last_error_code": schema_code})
+        _record_error(cfg, schema_code)
         return {
             "http_status": 422,
             "body": {"status": "error", "code": schema_code, "message": "Invalid telemetry envelope."},
@@ -364,7 +424,7 @@ def process_telemetry_ingest(
         headers.get("x-setuphelfer-payload-hash") or headers.get("X-Setuphelfer-Payload-Hash") or ""
     ).strip().lower()
     if not declared_hash or declared_hash != server_hash:
-        _write_runtime_status(cfg, {"last_error_code": TELEMETRY_ERROR_CODES["hash_mismatch"]})
+        _record_error(cfg, TELEMETRY_ERROR_CODES["hash_mismatch"])
         return {
             "http_status": 409,
             "body": {
@@ -375,7 +435,7 @@ def process_telemetry_ingest(
             },
         }
     if client_hash and client_hash != server_hash:
-        _write_runtime_status(cfg, {"last_error_code": TELEMETRY_ERROR_CODES["hash_mismatch"]})
+        _record_error(cfg, TELEMETRY_ERROR_CODES["hash_mismatch"])
         return {
             "http_status": 409,
             "body": {
@@ -417,9 +477,17 @@ def process_telemetry_ingest(
             },
         }
 
-    ingest_path = cfg.ingest_dir / f"{run_id}_{ack_id}.json"
-    ack_path = cfg.ack_dir / f"{ack_id}.json"
-    if not _write_json_atomic(ingest_path, {**stored, "envelope": payload}):
+    ack_body = {
+        "status": "acknowledged",
+        "ack_id": ack_id,
+        "received_at": received_at,
+        "payload_hash_sha256": server_hash,
+        "schema_version": str(payload.get("schema_version") or "1.0.0"),
+        "hash_match": True,
+    }
+    try:
+        _received_log(cfg).append_json({**stored, "ack": ack_body, "envelope": payload})
+    except (OSError, SegmentLogError):
         q = enqueue_payload(payload, run_id=run_id, reason="ingest_write_failed", config=cfg)
         return {
             "http_status": 202,
@@ -432,22 +500,5 @@ def process_telemetry_ingest(
                 "schema_version": payload.get("schema_version"),
             },
         }
-
-    ack_body = {
-        "status": "acknowledged",
-        "ack_id": ack_id,
-        "received_at": received_at,
-        "payload_hash_sha256": server_hash,
-        "schema_version": str(payload.get("schema_version") or "1.0.0"),
-        "hash_match": True,
-    }
-    _write_json_atomic(ack_path, ack_body)
-    _write_runtime_status(
-        cfg,
-        {
-            "last_ingest_at": received_at,
-            "last_ack_id": ack_id,
-            "last_error_code": None,
-        },
-    )
+    # last_ingest_at/last_ack_id und das Zurücksetzen von last_error_code ergeben sich aus dem Log-Ende
     return {"http_status": 200, "body": ack_body}
@@ -1,4 +1,9 @@
-"""Controlled rescue telemetry task pull — allowlist only, no remote shell."""
+"""Controlled rescue telemetry task pull — allowlist only, no remote shell.
+
+Zustellung über ``core.agent_task_dispatch``: Polls lesen aus In-Memory-Queues je ``boot_id``,
+Long-Polls (``wait_for_next_task``) werden beim Einstellen eines Tasks sofort geweckt. Die Dateien
+unter ``pending/`` werden beim ersten Zugriff und nach Änderungen am Verzeichnis neu eingelesen.
+"""
 
 from __future__ import annotations
 
@@ -9,6 +14,10 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from core.agent_task_dispatch import TaskDispatcher, dispatcher_for
+
+LONG_POLL_MAX_SECONDS = 25.0  # unter dem Upstream-Timeout des LAN-Proxys (30 s)
+
 ALLOWED_TASK_TYPES = frozenset(
     {
         "collect_logs",
@@ -67,21 +76,32 @@ def validate_task_manifest(task: dict[str, Any]) -> tuple[bool, str | None]:
     return True, None
 
 
+def _dispatcher() -> TaskDispatcher:
+    return dispatcher_for(tasks_storage_root() / "pending", validate=validate_task_manifest)
+
+
 def get_next_task(*, boot_id: str) -> dict[str, Any] | None:
-    queue = tasks_storage_root() / "pending"
-    if not queue.is_dir():
-        return None
-    for path in sorted(queue.glob("*.json")):
+    return _dispatcher().peek(boot_id)
+
+
+async def wait_for_next_task(*, boot_id: str, timeout: float) -> dict[str, Any] | None:
+    """Long-Poll: nächsten Task liefern oder bis ``timeout`` (max. ``LONG_POLL_MAX_SECONDS``) warten."""
+    wait = min(max(0.0, float(timeout)), LONG_POLL_MAX_SECONDS)
+    return await _dispatcher().wait_next(boot_id, timeout=wait)
+
+
+def _unlink_unknown_pending(task_id: str) -> None:
+    """Fallback: Task-Datei, die der Dispatcher (noch) nicht kennt, per Scan entfernen."""
+    pending = tasks_storage_root() / "pending"
+    if not pending.is_dir():
+        return
+    for candidate in pending.glob("*.json"):
         try:
-            task = json.loads(path.read_text(encoding="utf-8"))
+            task = json.loads(candidate.read_text(encoding="utf-8"))
         except (OSError, json.JSONDecodeError):
             continue
-        if str(task.get("boot_id") or "*") not in {boot_id, "*", ""}:
-            continue
-        ok, _reason = validate_task_manifest(task)
-        if ok:
-            return task
-    return None
+        if isinstance(task, dict) and str(task.get("task_id")) == task_id:
+            candidate.unlink(missing_ok=True)
 
 
 def store_task_result(payload: dict[str, Any]) -> dict[str, Any]:
@@ -102,14 +122,11 @@ def store_task_result(payload: dict[str, Any]) -> dict[str, Any]:
     }
     path = root / f"{task_id}.json"
     path.write_text(json.dumps(record, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    pending = tasks_storage_root() / "pending"
-    for candidate in pending.glob("*.json"):
-        try:
-            task = json.loads(candidate.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            continue
-        if str(task.get("task_id")) == task_id:
-            candidate.unlink(missing_ok=True)
+    pending_path = _dispatcher().remove(task_id)
+    if pending_path is not None:
+        pending_path.unlink(missing_ok=True)
+    else:
+        _unlink_unknown_pending(task_id)
     return {"stored": True, "task_id": task_id, "path": str(path)}
 
 
@@ -135,6 +152,7 @@ def build_compact_task_pull_status() -> dict[str, Any]:
         "last_task_id": last_task_id,
         "last_task_result": last_result,
         "task_pull_allowed_paths_only": True,
+        "long_poll_max_seconds": LONG_POLL_MAX_SECONDS,
         "allowed_task_types": sorted(ALLOWED_TASK_TYPES),
         "secrets_exposed": False,
     }
@@ -160,4 +178,5 @@ def enqueue_dev_task(task_type: str, *, boot_id: str = "*", dry_run: bool = True
     pending.mkdir(parents=True, exist_ok=True)
     path = pending / f"{task_id}.json"
     path.write_text(json.dumps(task, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    _dispatcher().push(task, path=path)
     return task
@@ -0,0 +1,78 @@
+"""
+Gemeinsame Bausteine für die SQLite-Ablagen (Fleet-Sessions, Dev-Server-Index).
+
+- ``iso_epoch``: ISO-8601-Zeitstempel → Unix-Sekunden (naiv = UTC), ``None`` bei leer/ungültig.
+- ``open_wal_connection``: Verbindung mit den gemeinsamen Pragmas (WAL, synchronous=NORMAL, busy_timeout).
+- ``ConnectionRegistry``: ein Objekt je Datenbankpfad. Wird eine neue Ablage geöffnet, werden
+  Verbindungen zu inzwischen gelöschten Datenbanken (z. B. Testverzeichnisse) geschlossen.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Generic, Protocol, TypeVar
+
+
+class _Closable(Protocol):
+    def close(self) -> None: ...
+
+
+T = TypeVar("T", bound=_Closable)
+
+
+def iso_epoch(value: Any) -> float | None:
+    s = str(value or "")
+    if not s:
+        return None
+    try:
+        ts = datetime.fromisoformat(s[:-1] + "+00:00" if s.endswith("Z") else s)
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def open_wal_connection(db_path: Path, **connect_kwargs: Any) -> sqlite3.Connection:
+    """
+    Verbindung zu ``db_path`` öffnen (Elternverzeichnis wird angelegt), threadübergreifend nutzbar.
+    ``connect_kwargs`` gehen an ``sqlite3.connect`` (z. B. ``factory``, ``isolation_level``).
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, **connect_kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class ConnectionRegistry(Generic[T]):
+    def __init__(self) -> None:
+        self._items: dict[Path, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db_path: Path, factory: Callable[[], T]) -> tuple[T, bool]:
+        """Vorhandenes Objekt für ``db_path`` oder neu geöffnet; zweiter Wert: frisch geöffnet."""
+        with self._lock:
+            item = self._items.get(db_path)
+            if item is not None and db_path.exists():
+                return item, False
+            for path, old in list(self._items.items()):
+                if path == db_path or not path.exists():
+                    old.close()
+                    del self._items[path]
+            item = self._items[db_path] = factory()
+            return item, True
+
+    def close_all(self) -> None:
+        with self._lock:
+            items = list(self._items.values())
+            self._items.clear()
+        for item in items:
+            item.close()
+
+
+__all__ = ["ConnectionRegistry", "iso_epoch", "open_wal_connection"]
@@ -0,0 +1,473 @@
+"""
+Nativer, nur lesender SquashFS-4.0-Reader mit Cache je Image.
+
+Ersetzt für Verifikationen die wiederholten ``unsquashfs -ll`` / ``-cat``-Aufrufe: Superblock,
+Inode-, Verzeichnis-, Fragment- und ID-Tabelle werden einmal je Image gelesen; Listing und
+einzelne Dateien kommen danach aus dem Speicher bzw. per ``os.pread`` aus den Datenblöcken.
+``open_squashfs`` hält die geparsten Images im Prozess, Schlüssel ist Pfad + mtime + Größe –
+ein neu gebautes Image wird dadurch automatisch neu gelesen. Jeder Aufruf liefert eine Referenz,
+die mit ``release()`` bzw. ``with`` zurückgegeben wird; aus dem Cache verdrängte Images werden erst
+geschlossen, wenn der letzte Nutzer (auch in anderen Threads) fertig ist.
+
+Kompression: gzip, xz und lzma (Standardbibliothek). lzo/lz4/zstd lösen
+``SquashfsUnsupportedError`` aus – Aufrufer fallen dann auf ``unsquashfs`` zurück.
+"""
+
+from __future__ import annotations
+
+import lzma
+import os
+import stat
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+SQUASHFS_MAGIC = 0x73717368
+METADATA_BLOCK_SIZE = 8192
+MAX_CACHED_IMAGES = 4
+
+_SUPERBLOCK = struct.Struct("<IIIIIHHHHHHQQQQQQQQ")
+_INODE_HEADER = struct.Struct("<HHHHII")
+_DIR_HEADER = struct.Struct("<III")
+_DIR_ENTRY = struct.Struct("<HhHH")
+_FRAGMENT_ENTRY = struct.Struct("<QII")
+
+_FLAG_COMPRESSOR_OPTIONS = 0x0400
+_METADATA_UNCOMPRESSED = 0x8000
+_DATA_UNCOMPRESSED = 1 << 24
+_NO_FRAGMENT = 0xFFFFFFFF
+
+_COMPRESSORS = {1: "gzip", 2: "lzma", 3: "lzo", 4: "xz", 5: "lz4", 6: "zstd"}
+
+# Inode-Typen (Basis / erweitert) -> stat-Dateityp
+_TYPE_MODE = {
+    1: stat.S_IFDIR, 8: stat.S_IFDIR,
+    2: stat.S_IFREG, 9: stat.S_IFREG,
+    3: stat.S_IFLNK, 10: stat.S_IFLNK,
+    4: stat.S_IFBLK, 11: stat.S_IFBLK,
+    5: stat.S_IFCHR, 12: stat.S_IFCHR,
+    6: stat.S_IFIFO, 13: stat.S_IFIFO,
+    7: stat.S_IFSOCK, 14: stat.S_IFSOCK,
+}
+
+
+class SquashfsError(Exception):
+    """Image ungültig oder nicht lesbar."""
+
+
+_DECODE_ERRORS = (struct.error, zlib.error, lzma.LZMAError, EOFError, IndexError, ValueError)
+
+
+class SquashfsUnsupportedError(SquashfsError):
+    """Gültiges Image, aber Kompression/Version wird nicht unterstützt."""
+
+
+@dataclass(frozen=True)
+class SquashfsEntry:
+    path: str  # relativ zur Wurzel, ohne führenden "/", Wurzel = ""
+    mode: int  # inkl. Dateityp-Bits
+    uid: int
+    gid: int
+    mtime: int
+    size: int
+    link_target: str | None = None
+    # nur reguläre Dateien
+    blocks_start: int = 0
+    block_sizes: tuple[int, ...] = ()
+    fragment_index: int = _NO_FRAGMENT
+    fragment_offset: int = 0
+
+    @property
+    def is_dir(self) -> bool:
+        return stat.S_ISDIR(self.mode)
+
+    @property
+    def is_file(self) -> bool:
+        return stat.S_ISREG(self.mode)
+
+    @property
+    def is_symlink(self) -> bool:
+        return stat.S_ISLNK(self.mode)
+
+
+def _decompressor(compression_id: int):
+    if compression_id == 1:
+        return zlib.decompress
+    if compression_id == 4:
+        return lambda data: lzma.decompress(data, format=lzma.FORMAT_XZ)
+    if compression_id == 2:
+        return lambda data: lzma.decompress(data, format=lzma.FORMAT_ALONE)
+    name = _COMPRESSORS.get(compression_id, str(compression_id))
+    raise SquashfsUnsupportedError(f"compression_not_supported:{name}")
+
+
+class SquashfsImage:
+    """Geparstes Image; alle Tabellen werden im Konstruktor einmal gelesen."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._fd = os.open(str(self.path), os.O_RDONLY)
+        self._listing: str | None = None
+        self._refs = 0  # Cache + Nutzer aus open_squashfs; geschützt durch _images_lock
+        try:
+            self._parse()
+        except _DECODE_ERRORS as exc:
+            os.close(self._fd)
+            raise SquashfsError(f"corrupt_image:{exc}") from exc
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    # --- Low-Level ---------------------------------------------------------------------------
+
+    def _pread(self, size: int, offset: int) -> bytes:
+        data = os.pread(self._fd, size, offset)
+        if len(data) != size:
+            raise SquashfsError(f"short_read:{offset}+{size}")
+        return data
+
+    def _metadata_block(self, pos: int) -> tuple[bytes, int]:
+        """Metadatenblock ab absoluter Position: (Inhalt, Position des nächsten Blocks)."""
+        cached = self._meta_cache.get(pos)
+        if cached is not None:
+            return cached
+        (header,) = struct.unpack("<H", self._pread(2, pos))
+        size = header & 0x7FFF
+        raw = self._pread(size, pos + 2)
+        data = raw if header & _METADATA_UNCOMPRESSED else self._decompress(raw)
+        entry = (data, pos + 2 + size)
+        self._meta_cache[pos] = entry
+        return entry
+
+    def _read_metadata(self, table_start: int, block: int, offset: int, size: int) -> tuple[bytes, int, int]:
+        """``size`` Bytes ab (Block, Offset) einer Metadaten-Tabelle; liefert auch die Folgeposition."""
+        pos = table_start + block
+        out = bytearray()
+        while True:
+            data, next_pos = self._metadata_block(pos)
+            take = data[offset:offset + size - len(out)]
+            out += take
+            offset += len(take)
+            if len(out) >= size:
+                return bytes(out), pos - table_start, offset
+            if offset >= len(data):
+                pos, offset = next_pos, 0
+            if not data:
+                raise SquashfsError("empty_metadata_block")
+
+    def _read_lookup_table(self, start: int, count: int, entry_size: int) -> bytes:
+        """Indizierte Tabelle (ID/Fragment): u64-Zeiger auf Metadatenblöcke, dann Einträge."""
+        if count == 0:
+            return b""
+        total = count * entry_size
+        blocks = (total + METADATA_BLOCK_SIZE - 1) // METADATA_BLOCK_SIZE
+        pointers = struct.unpack(f"<{blocks}Q", self._pread(8 * blocks, start))
+        out = bytearray()
+        for ptr in pointers:
+            out += self._metadata_block(ptr)[0]
+        return bytes(out[:total])
+
+    # --- Parse -------------------------------------------------------------------------------
+
+    def _parse(self) -> None:
+        sb = _SUPERBLOCK.unpack(self._pread(_SUPERBLOCK.size, 0))
+        (
+            magic, self.inode_count, self.mod_time, self.block_size, fragment_count,
+            compression_id, block_log, self.flags, id_count, major, minor,
+            root_ref, self.bytes_used, id_table, _xattr_table, inode_table, directory_table,
+            fragment_table, _export_table,
+        ) = sb
+        if magic != SQUASHFS_MAGIC:
+            raise SquashfsError("bad_magic")
+        if (major, minor) != (4, 0):
+            raise SquashfsUnsupportedError(f"version_not_supported:{major}.{minor}")
+        if self.block_size != 1 << block_log:
+            raise SquashfsError("inconsistent_block_size")
+        self.compression = _COMPRESSORS.get(compression_id, str(compression_id))
+        self._decompress = _decompressor(compression_id)
+        self._meta_cache: dict[int, tuple[bytes, int]] = {}
+        self._inode_table = inode_table
+        self._directory_table = directory_table
+
+        ids = self._read_lookup_table(id_table, id_count, 4)
+        self._ids = struct.unpack(f"<{id_count}I", ids) if id_count else ()
+        frags = self._read_lookup_table(fragment_table, fragment_count, _FRAGMENT_ENTRY.size)
+        self._fragments = [
+            _FRAGMENT_ENTRY.unpack_from(frags, i * _FRAGMENT_ENTRY.size)[:2] for i in range(fragment_count)
+        ]
+        self._fragment_cache: OrderedDict[int, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.entries: dict[str, SquashfsEntry] = {}
+        self._children: dict[str, list[str]] = {}
+        self._walk(root_ref, "")
+        # Metadaten werden nach dem Aufbau nicht mehr gebraucht
+        self._meta_cache.clear()
+
+    def _id(self, index: int) -> int:
+        return self._ids[index] if index < len(self._ids) else index
+
+    def _read_inode(self, ref: int, path: str) -> tuple[SquashfsEntry, tuple[int, int, int] | None]:
+        """Inode lesen; für Verzeichnisse zusätzlich (Block, Offset, Größe) der Einträge."""
+        block, offset = ref >> 16, ref & 0xFFFF
+        raw, block, offset = self._read_metadata(self._inode_table, block, offset, _INODE_HEADER.size)
+        itype, perms, uid_idx, gid_idx, mtime, _number = _INODE_HEADER.unpack(raw)
+        if itype not in _TYPE_MODE:
+            raise SquashfsError(f"bad_inode_type:{itype}")
+        base = {"path": path, "mode": _TYPE_MODE[itype] | perms, "uid": self._id(uid_idx), "gid": self._id(gid_idx), "mtime": mtime}
+
+        def take(n: int) -> bytes:
+            nonlocal block, offset
+            data, block, offset = self._read_metadata(self._inode_table, block, offset, n)
+            return data
+
+        if itype == 1:
+            dir_block, _links, file_size, dir_offset, _parent = struct.unpack("<IIHHI", take(16))
+            return SquashfsEntry(size=file_size, **base), (dir_block, dir_offset, file_size)
+        if itype == 8:
+            _links, file_size, dir_block, _parent, _index_count, dir_offset, _xattr = struct.unpack(
+                "<IIIIHHI", take(24)
+            )
+            return SquashfsEntry(size=file_size, **base), (dir_block, dir_offset, file_size)
+        if itype in (2, 9):
+            if itype == 2:
+                blocks_start, frag, frag_offset, size = struct.unpack("<IIII", take(16))
+            else:
+                blocks_start, size, _sparse, _links, frag, frag_offset, _xattr = struct.unpack(
+                    "<QQQIIII", take(40)
+                )
+            full, tail = divmod(size, self.block_size)
+            count = full + (1 if tail and frag == _NO_FRAGMENT else 0)
+            sizes = struct.unpack(f"<{count}I", take(4 * count)) if count else ()
+            return SquashfsEntry(
+                size=size,
+                blocks_start=blocks_start,
+                block_sizes=sizes,
+                fragment_index=frag,
+                fragment_offset=frag_offset,
+                **base,
+            ), None
+        if itype in (3, 10):
+            _links, target_size = struct.unpack("<II", take(8))
+            target = take(target_size).decode("utf-8", errors="surrogateescape")
+            return SquashfsEntry(size=target_size, link_target=target, **base), None
+        return SquashfsEntry(size=0, **base), None
+
+    def _walk(self, root_ref: int, root_path: str) -> None:
+        stack = [(root_ref, root_path)]
+        while stack:
+            ref, path = stack.pop()
+            entry, listing = self._read_inode(ref, path)
+            self.entries[path] = entry
+            if listing is None:
+                continue
+            children: list[str] = []
+            for name, child_ref in self._read_directory(*listing):
+                child = f"{path}/{name}" if path else name
+                children.append(child)
+                stack.append((child_ref, child))
+            self._children[path] = children
+
+    def _read_directory(self, block: int, offset: int, file_size: int) -> list[tuple[str, int]]:
+        remaining = file_size - 3  # Größe enthält 3 Bytes für "." und ".."
+        out: list[tuple[str, int]] = []
+        while remaining > 0:
+            raw, block, offset = self._read_metadata(self._directory_table, block, offset, _DIR_HEADER.size)
+            count, start, _inode_base = _DIR_HEADER.unpack(raw)
+            remaining -= _DIR_HEADER.size
+            for _ in range(count + 1):
+                raw, block, offset = self._read_metadata(self._directory_table, block, offset, _DIR_ENTRY.size)
+                entry_offset, _inode_delta, _etype, name_size = _DIR_ENTRY.unpack(raw)
+                name_raw, block, offset = self._read_metadata(self._directory_table, block, offset, name_size + 1)
+                remaining -= _DIR_ENTRY.size + name_size + 1
+                name = name_raw.decode("utf-8", errors="surrogateescape")
+                if not name or "/" in name or name in (".", ".."):
+                    raise SquashfsError(f"bad_directory_entry:{name!r}")
+                out.append((name, (start << 16) | entry_offset))
+        return out
+
+    # --- API ---------------------------------------------------------------------------------
+
+    @staticmethod
+    def _norm(path: str) -> str:
+        return str(path or "").strip().lstrip("/").rstrip("/").removeprefix("squashfs-root/")
+
+    def lookup(self, path: str) -> SquashfsEntry | None:
+        return self.entries.get(self._norm(path))
+
+    def listdir(self, path: str = "") -> list[str]:
+        return [c.rsplit("/", 1)[-1] for c in self._children.get(self._norm(path), [])]
+
+    def iter_paths(self) -> list[str]:
+        """Alle Pfade in Listing-Reihenfolge (Verzeichnis vor Inhalt, Einträge sortiert)."""
+        out: list[str] = []
+        stack = [""]
+        while stack:
+            path = stack.pop()
+            out.append(path)
+            stack.extend(reversed(self._children.get(path, [])))
+        return out
+
+    def listing_text(self) -> str:
+        """Listing im Stil von ``unsquashfs -ll`` (Pfade unter ``squashfs-root``), einmal erzeugt."""
+        if self._listing is not None:
+            return self._listing
+        lines: list[str] = []
+        for path in self.iter_paths():
+            e = self.entries[path]
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.gmtime(e.mtime))
+            name = f"squashfs-root/{path}" if path else "squashfs-root"
+            line = f"{stat.filemode(e.mode)} {e.uid}/{e.gid} {e.size:>26} {stamp} {name}"
+            if e.link_target is not None:
+                line += f" -> {e.link_target}"
+            lines.append(line)
+        self._listing = "\n".join(lines) + "\n"
+        return self._listing
+
+    def _fragment(self, index: int) -> bytes:
+        with self._lock:
+            cached = self._fragment_cache.get(index)
+            if cached is not None:
+                self._fragment_cache.move_to_end(index)
+                return cached
+        if index >= len(self._fragments):
+            raise SquashfsError(f"bad_fragment_index:{index}")
+        start, word = self._fragments[index]
+        data = self._pread(word & (_DATA_UNCOMPRESSED - 1), start)
+        if not word & _DATA_UNCOMPRESSED:
+            data = self._decompress(data)
+        with self._lock:
+            self._fragment_cache[index] = data
+            while len(self._fragment_cache) > 8:
+                self._fragment_cache.popitem(last=False)
+        return data
+
+    def read_file(self, path: str, *, max_bytes: int | None = None) -> bytes:
+        """Inhalt einer regulären Datei (Symlinks werden innerhalb des Images aufgelöst)."""
+        try:
+            return self._read_file(path, max_bytes)
+        except _DECODE_ERRORS as exc:
+            raise SquashfsError(f"corrupt_data:{path}:{exc}") from exc
+
+    def _read_file(self, path: str, max_bytes: int | None) -> bytes:
+        entry = self.lookup(path)
+        for _ in range(40):
+            if entry is None or not entry.is_symlink:
+                break
+            target = entry.link_target or ""
+            parent = entry.path.rsplit("/", 1)[0] if "/" in entry.path else ""
+            joined = target if target.startswith("/") else f"{parent}/{target}"
+            parts: list[str] = []
+            for part in joined.split("/"):
+                if part in ("", "."):
+                    continue
+                if part == "..":
+                    if parts:
+                        parts.pop()
+                    continue
+                parts.append(part)
+            entry = self.entries.get("/".join(parts))
+        if entry is None:
+            raise FileNotFoundError(path)
+        if not entry.is_file:
+            raise IsADirectoryError(path) if entry.is_dir else SquashfsError(f"not_a_regular_file:{path}")
+        limit = entry.size if max_bytes is None else min(entry.size, max_bytes)
+        out = bytearray()
+        pos = entry.blocks_start
+        for word in entry.block_sizes:
+            if len(out) >= limit:
+                break
+            size = word & (_DATA_UNCOMPRESSED - 1)
+            if size == 0:
+                out += bytes(min(self.block_size, entry.size - len(out)))  # Sparse-Block
+                continue
+            data = self._pread(size, pos)
+            pos += size
+            out += data if word & _DATA_UNCOMPRESSED else self._decompress(data)
+        if len(out) < limit and entry.fragment_index != _NO_FRAGMENT:
+            tail = entry.size % self.block_size
+            frag = self._fragment(entry.fragment_index)
+            out += frag[entry.fragment_offset:entry.fragment_offset + tail]
+        return bytes(out[:limit])
+
+    def read_text(self, path: str, *, encoding: str = "utf-8") -> str:
+        return self.read_file(path).decode(encoding, errors="replace")
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, -1
+        if fd >= 0:
+            os.close(fd)
+
+    def release(self) -> None:
+        """Gibt eine Referenz aus ``open_squashfs`` zurück; die letzte schließt das Image."""
+        with _images_lock:
+            last = _drop_ref_locked(self)
+        if last:
+            self.close()
+
+    def __enter__(self) -> SquashfsImage:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.release()
+
+
+_images: OrderedDict[tuple[str, int, int], SquashfsImage] = OrderedDict()
+_images_lock = threading.Lock()
+_parse_count = 0
+
+
+def _drop_ref_locked(image: SquashfsImage) -> bool:
+    """Referenz abziehen (unter ``_images_lock``); ``True``, wenn es die letzte war."""
+    image._refs = max(0, image._refs - 1)
+    return image._refs == 0
+
+
+def open_squashfs(path: str | Path) -> SquashfsImage:
+    """
+    Geparstes Image aus dem Prozess-Cache (Schlüssel: Pfad, mtime, Größe).
+
+    Der Aufrufer hält eine Referenz und gibt sie mit ``release()`` (oder ``with``) zurück.
+    """
+    global _parse_count
+    resolved = str(Path(path).resolve())
+    st = os.stat(resolved)
+    key = (resolved, st.st_mtime_ns, st.st_size)
+    evicted: list[SquashfsImage] = []
+    with _images_lock:
+        image = _images.get(key)
+        if image is not None:
+            _images.move_to_end(key)
+            image._refs += 1
+            return image
+        image = SquashfsImage(Path(resolved))
+        _parse_count += 1
+        image._refs = 2  # Cache + Aufrufer
+        # ältere Stände desselben Pfads verwerfen, dann auf MAX_CACHED_IMAGES begrenzen
+        for old in [k for k in _images if k[0] == resolved]:
+            evicted.append(_images.pop(old))
+        _images[key] = image
+        while len(_images) > MAX_CACHED_IMAGES:
+            evicted.append(_images.popitem(last=False)[1])
+        evicted = [old for old in evicted if _drop_ref_locked(old)]
+    for old in evicted:
+        old.close()
+    return image
+
+
+def squashfs_parse_count() -> int:
+    """Anzahl Tabellen-Parses seit Prozessstart (Diagnose/Tests)."""
+    return _parse_count
+
+
+def clear_squashfs_cache() -> None:
+    """Leert den Cache; Images mit offenen Referenzen bleiben bis zum letzten ``release()`` offen."""
+    with _images_lock:
+        images = [image for image in _images.values() if _drop_ref_locked(image)]
+        _images.clear()
+    for image in images:
+        image.close()
@@ -0,0 +1,371 @@
+"""
+Append-only Segment-Log für Telemetrie-Ingest (statt einer Datei je Payload).
+
+Layout je Log-Verzeichnis:
+
+- ``<base_seq>.seg`` – Records ``[len u32][crc32 u32][seq u64][payload]`` (little endian), der
+  CRC deckt ``seq`` und Payload ab. Ein Segment wird ab ``SEGMENT_MAX_BYTES`` abgeschlossen.
+- ``<base_seq>.idx`` – dünner Offset-Index ``[seq u64][offset u64]``, ein Eintrag etwa alle
+  ``INDEX_INTERVAL_BYTES``; dient zum Springen an eine Sequenznummer, ist jederzeit neu ableitbar.
+- ``cursor.json`` – zuletzt verarbeitete Sequenznummer des Konsumenten (atomar ersetzt).
+
+Zähler ohne Verzeichnis-Scan: ``pending = last_seq - committed_seq``, ``processed = committed_seq``.
+
+Crash-Recovery beim Öffnen: Das letzte Segment wird ab dem letzten gültigen Index-Eintrag geprüft
+und hinter dem letzten vollständigen Record mit passender Prüfsumme abgeschnitten (halb
+geschriebener Record, Nullblöcke). Index-Einträge hinter dieser Grenze werden verworfen, ein Cursor
+jenseits des letzten Records auf ``last_seq`` begrenzt. Abgeschlossene Segmente gelten als
+vollständig (beim Rollen per fsync gesichert).
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+CURSOR_NAME = "cursor.json"
+SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+INDEX_INTERVAL_BYTES = 64 * 1024
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+DRAIN_BATCH_SIZE = 256
+
+_HEADER = struct.Struct("<IIQ")
+_SEQ = struct.Struct("<Q")
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+
+class SegmentLogError(Exception):
+    pass
+
+
+def _crc(seq: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(_SEQ.pack(seq))) & 0xFFFFFFFF
+
+
+def _segment_name(base_seq: int) -> str:
+    return f"{base_seq:020d}"
+
+
+class _Segment:
+    def __init__(self, directory: Path, base_seq: int) -> None:
+        self.base_seq = base_seq
+        self.path = directory / (_segment_name(base_seq) + SEGMENT_SUFFIX)
+        self.index_path = directory / (_segment_name(base_seq) + INDEX_SUFFIX)
+        self._index: list[tuple[int, int]] | None = None
+
+    def index(self) -> list[tuple[int, int]]:
+        if self._index is None:
+            entries: list[tuple[int, int]] = []
+            try:
+                raw = self.index_path.read_bytes()
+            except OSError:
+                raw = b""
+            usable = len(raw) - len(raw) % _INDEX_ENTRY.size
+            for pos in range(0, usable, _INDEX_ENTRY.size):
+                entries.append(_INDEX_ENTRY.unpack_from(raw, pos))
+            self._index = entries
+        return self._index
+
+    def seek_offset(self, seq: int) -> int:
+        """Offset des letzten Index-Eintrags mit Sequenznummer <= ``seq`` (sonst Segmentanfang)."""
+        entries = self.index()
+        pos = bisect.bisect_right(entries, (seq, float("inf"))) - 1
+        return entries[pos][1] if pos >= 0 else 0
+
+
+def _read_record(fh: Any, *, limit: int) -> tuple[int, bytes, int] | None:
+    """Nächsten gültigen Record lesen: ``(seq, payload, länge_gesamt)`` oder None (Ende/kaputt)."""
+    head = fh.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        return None
+    length, crc, seq = _HEADER.unpack(head)
+    if length == 0 or length > MAX_RECORD_BYTES or length > limit:
+        return None
+    payload = fh.read(length)
+    if len(payload) < length or _crc(seq, payload) != crc:
+        return None
+    return seq, payload, _HEADER.size + length
+
+
+class SegmentLog:
+    """Ein Schreiber je Verzeichnis; Zugriffe über ein Lock serialisiert."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        segment_max_bytes: int = SEGMENT_MAX_BYTES,
+        index_interval_bytes: int = INDEX_INTERVAL_BYTES,
+        fsync: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.segment_max_bytes = max(_HEADER.size + 1, segment_max_bytes)
+        self.index_interval_bytes = max(1, index_interval_bytes)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+        self._segments = [
+            _Segment(directory, int(p.stem))
+            for p in sorted(directory.glob("*" + SEGMENT_SUFFIX))
+            if p.stem.isdigit() and not p.is_symlink()
+        ]
+        self._fh: Any = None
+        self._idx_fh: Any = None
+        self._size = 0
+        self._since_index = 0
+        self._last_seq = 0
+        self._last_payload: bytes | None = None
+        self.truncated_bytes = 0
+        self._recover()
+        self._committed = min(self._read_cursor(), self._last_seq)
+
+    # --- Öffnen / Recovery -------------------------------------------------
+
+    def _recover(self) -> None:
+        if not self._segments:
+            return  # erstes Segment entsteht beim ersten Append
+        seg = self._segments[-1]
+        size = seg.path.stat().st_size
+        entries = [e for e in seg.index() if e[1] < size]
+        # Ab dem letzten Index-Eintrag prüfen; ist schon dessen Record kaputt, einen Eintrag zurück
+        while True:
+            start_seq, offset = entries[-1] if entries else (seg.base_seq, 0)
+            kept = list(entries)
+            last_seq, last_payload, valid_end = start_seq - 1, None, offset
+            with seg.path.open("rb") as fh:
+                fh.seek(offset)
+                while True:
+                    rec = _read_record(fh, limit=size - valid_end)
+                    if rec is None or rec[0] != last_seq + 1:
+                        break
+                    if not kept or valid_end - kept[-1][1] >= self.index_interval_bytes:
+                        kept.append((rec[0], valid_end))
+                    last_seq, last_payload = rec[0], rec[1]
+                    valid_end += rec[2]
+            if last_payload is not None or not entries:
+                break
+            entries.pop()
+        if valid_end < size:
+            self.truncated_bytes = size - valid_end
+            with seg.path.open("r+b") as fh:
+                fh.truncate(valid_end)
+        if kept != seg.index():
+            with seg.index_path.open("wb") as fh:
+                fh.write(b"".join(_INDEX_ENTRY.pack(*e) for e in kept))
+        seg._index = kept
+        if last_payload is None and len(self._segments) > 1:
+            # Leeres letztes Segment: letzten Record des Vorgängers für ``last_record`` übernehmen
+            last_payload = self._tail_of(self._segments[-2])[1]
+        self._last_seq = last_seq
+        self._last_payload = last_payload
+        self._size = valid_end
+        self._since_index = valid_end - kept[-1][1] if kept else 0
+        self._fh = seg.path.open("ab")
+        self._idx_fh = seg.index_path.open("ab")
+
+    def _tail_of(self, seg: _Segment) -> tuple[int, bytes | None]:
+        last: tuple[int, bytes | None] = (seg.base_seq - 1, None)
+        for seq, payload in self._scan(seg, seg.seek_offset(1 << 62)):
+            last = (seq, payload)
+        return last
+
+    def _open_segment(self, base_seq: int) -> None:
+        seg = _Segment(self.directory, base_seq)
+        seg._index = []
+        self._segments.append(seg)
+        self._fh = seg.path.open("ab")
+        self._idx_fh = seg.index_path.open("ab")
+        self._size = 0
+        self._since_index = 0
+
+    def _read_cursor(self) -> int:
+        try:
+            data = json.loads((self.directory / CURSOR_NAME).read_text(encoding="utf-8"))
+            return max(0, int(data.get("committed_seq") or 0))
+        except (OSError, ValueError, AttributeError, json.JSONDecodeError):
+            return 0
+
+    # --- Schreiben ---------------------------------------------------------
+
+    def _roll(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        self._idx_fh.close()
+        self._open_segment(self._last_seq + 1)
+
+    def append_many(self, payloads: list[bytes]) -> list[int]:
+        """Payloads anhängen und ihre Sequenznummern liefern (ein flush je Aufruf)."""
+        seqs: list[int] = []
+        with self._lock:
+            for payload in payloads:
+                if not payload or len(payload) > MAX_RECORD_BYTES:
+                    raise SegmentLogError("record_size_invalid")
+                if self._fh is None:
+                    self._open_segment(self._last_seq + 1)
+                elif self._size and self._size + _HEADER.size + len(payload) > self.segment_max_bytes:
+                    self._roll()
+                seq = self._last_seq + 1
+                if self._size == 0 or self._since_index >= self.index_interval_bytes:
+                    entry = (seq, self._size)
+                    self._idx_fh.write(_INDEX_ENTRY.pack(*entry))
+                    self._segments[-1].index().append(entry)
+                    self._since_index = 0
+                self._fh.write(_HEADER.pack(len(payload), _crc(seq, payload), seq) + payload)
+                total = _HEADER.size + len(payload)
+                self._size += total
+                self._since_index += total
+                self._last_seq, self._last_payload = seq, payload
+                seqs.append(seq)
+            self._fh.flush()
+            self._idx_fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+        return seqs
+
+    def append(self, payload: bytes) -> int:
+        return self.append_many([payload])[0]
+
+    def append_json(self, record: dict[str, Any]) -> int:
+        return self.append(json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+    # --- Lesen -------------------------------------------------------------
+
+    def _scan(self, seg: _Segment, offset: int) -> Iterator[tuple[int, bytes]]:
+        try:
+            fh = seg.path.open("rb")
+        except OSError:
+            return
+        with fh:
+            size = os.fstat(fh.fileno()).st_size
+            fh.seek(offset)
+            pos = offset
+            while True:
+                rec = _read_record(fh, limit=size - pos)
+                if rec is None:
+                    return
+                pos += rec[2]
+                yield rec[0], rec[1]
+
+    def read_from(self, seq: int, *, max_records: int) -> list[tuple[int, bytes]]:
+        """Bis zu ``max_records`` Records ab Sequenznummer ``seq`` (Sprung über den Offset-Index)."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+            segments = list(self._segments)
+            last_seq = self._last_seq
+        out: list[tuple[int, bytes]] = []
+        if max_records <= 0 or seq > last_seq:
+            return out
+        bases = [s.base_seq for s in segments]
+        pos = max(0, bisect.bisect_right(bases, seq) - 1)
+        for seg in segments[pos:]:
+            for rec_seq, payload in self._scan(seg, seg.seek_offset(seq)):
+                if rec_seq < seq:
+                    continue
+                if rec_seq > last_seq:
+                    return out
+                out.append((rec_seq, payload))
+                if len(out) >= max_records:
+                    return out
+        return out
+
+    def last_record(self) -> tuple[int, bytes | None]:
+        with self._lock:
+            return self._last_seq, self._last_payload
+
+    # --- Konsument ---------------------------------------------------------
+
+    def commit(self, seq: int) -> None:
+        with self._lock:
+            seq = min(max(seq, self._committed), self._last_seq)
+            if seq == self._committed:
+                return
+            path = self.directory / CURSOR_NAME
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(json.dumps({"committed_seq": seq}) + "\n", encoding="utf-8")
+            os.replace(tmp, path)
+            self._committed = seq
+
+    def drain(
+        self,
+        handler: Callable[[list[dict[str, Any]]], None],
+        *,
+        batch_size: int = DRAIN_BATCH_SIZE,
+        max_batches: int | None = None,
+    ) -> int:
+        """Unverarbeitete Records blockweise an ``handler`` geben; Cursor nach jedem Block.
+
+        Wirft ``handler`` eine Ausnahme, bleibt der Cursor vor diesem Block (at-least-once).
+        """
+        done = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with self._lock:
+                start = self._committed + 1
+            records = self.read_from(start, max_records=max(1, batch_size))
+            if not records:
+                break
+            docs: list[dict[str, Any]] = []
+            for _seq, payload in records:
+                try:
+                    doc = json.loads(payload)
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                if isinstance(doc, dict):
+                    docs.append(doc)
+            handler(docs)
+            self.commit(records[-1][0])
+            done += len(records)
+            batches += 1
+        return done
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "last_seq": self._last_seq,
+                "pending": self._last_seq - self._committed,
+                "processed": self._committed,
+                "segments": len(self._segments),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for fh in (self._fh, self._idx_fh):
+                if fh is not None and not fh.closed:
+                    fh.close()
+
+
+_logs: dict[Path, SegmentLog] = {}
+_logs_lock = threading.Lock()
+
+
+def open_segment_log(directory: Path) -> SegmentLog:
+    """Gemeinsames Log je Verzeichnis (ein Schreiber je Prozess)."""
+    with _logs_lock:
+        log = _logs.get(directory)
+        if log is not None and directory.is_dir():
+            return log
+        # Verzeichnisse, die inzwischen entfernt wurden (Tests, Neuinstallation), freigeben
+        for path, old in list(_logs.items()):
+            if path == directory or not path.is_dir():
+                old.close()
+                del _logs[path]
+        log = _logs[directory] = SegmentLog(directory)
+        return log
+
+
+def close_segment_logs() -> None:
+    with _logs_lock:
+        logs = list(_logs.values())
+        _logs.clear()
+    for log in logs:
+        log.close()
@@ -1,14 +1,47 @@
-"""Deploy planning (advisory only, no installation or writes)."""
-
-from .execute import create_deploy_session, execute_deploy
-from .image_inspect import inspect_deploy_image
-from .plan import generate_deploy_plan
-from .write_execute import create_deploy_write_session, execute_deploy_write_dryrun
-from .final_confirmation import create_final_confirmation_session, check_final_confirmation_dryrun
-from .write_harness import create_deploy_write_harness_session, execute_deploy_write_harness
-from .real_write_guard import create_real_write_guard_session, check_real_write_guard
-from .hardware_gate import build_hardware_gate_report, validate_test_device, build_operator_protocol
-from .write_plan import generate_deploy_write_plan
+"""Deploy planning (advisory only, no installation or writes).
+
+Die öffentlichen Funktionen werden erst beim ersten Zugriff importiert
+(PEP 562), damit ``import deploy.routes`` beim App-Start nicht alle
+Deploy-Untermodule lädt.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_LAZY_EXPORTS: dict[str, str] = {
+    "create_deploy_session": ".execute",
+    "execute_deploy": ".execute",
+    "inspect_deploy_image": ".image_inspect",
+    "generate_deploy_plan": ".plan",
+    "create_deploy_write_session": ".write_execute",
+    "execute_deploy_write_dryrun": ".write_execute",
+    "create_final_confirmation_session": ".final_confirmation",
+    "check_final_confirmation_dryrun": ".final_confirmation",
+    "create_deploy_write_harness_session": ".write_harness",
+    "execute_deploy_write_harness": ".write_harness",
+    "create_real_write_guard_session": ".real_write_guard",
+    "check_real_write_guard": ".real_write_guard",
+    "build_hardware_gate_report": ".hardware_gate",
+    "validate_test_device": ".hardware_gate",
+    "build_operator_protocol": ".hardware_gate",
+    "generate_deploy_write_plan": ".write_plan",
+}
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _LAZY_EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "generate_deploy_plan",
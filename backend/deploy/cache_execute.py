@@ -9,6 +9,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from deploy.image_digest_cache import cached_image_sha256
+
 _DEPLOY_CACHE_SESSION_STORE: dict[str, dict[str, Any]] = {}
 _DEPLOY_CACHE_TTL_SECONDS = 900
 # Repo layout: backend/cache/deploy (unabhängig vom CWD; ./cache/deploy nur wenn CWD=Backend-Root).
@@ -133,20 +135,15 @@ def _verify_checksum(source: dict[str, Any]) -> tuple[bool, str, dict[str, Any]]
     if not expected:
         return True, "", {"checksum_checked": False}
     file_path = Path(str(source.get("local_path") or ""))
-    h = hashlib.sha256()
-    with file_path.open("rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    actual = h.hexdigest()
+    digest = cached_image_sha256(file_path, trust_xattr=False)
+    actual = digest.sha256
+    details = {"checksum_checked": True, "checksum": actual, "checksum_source": digest.source}
     exp = expected.lower().strip()
     if exp.startswith("sha256:"):
         exp = exp.split(":", 1)[1]
     if actual.lower() == exp:
-        return True, "DEPLOY_CACHE_CHECKSUM_OK", {"checksum_checked": True, "checksum": actual}
-    return False, "DEPLOY_CACHE_CHECKSUM_FAILED", {"checksum_checked": True, "checksum": actual}
+        return True, "DEPLOY_CACHE_CHECKSUM_OK", details
+    return False, "DEPLOY_CACHE_CHECKSUM_FAILED", details
 
 
 def execute_deploy_cache(request: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,288 @@
+"""
+Persistenter SHA-256-Cache für Deploy-Abbilder (Inspect und Cache-Execute).
+
+Schlüssel ist die Datei-Identität ``(st_dev, st_ino)``; gültig ist ein Eintrag nur, solange
+``st_size``, ``st_mtime_ns`` und ``st_ctime_ns`` übereinstimmen. Die ctime ist aus dem
+Userspace nicht setzbar – ein Überschreiben mit erhaltener mtime (``cp -p``, ``rsync -t``,
+``tar x``, ``os.utime``) invalidiert den Eintrag damit trotzdem.
+
+Optional wird der Digest zusätzlich als ``user.setuphelfer.sha256``-xattr am Abbild abgelegt.
+Wer das Abbild schreiben kann, kann auch das xattr schreiben: ein xattr-Treffer ist daher nur
+ein Hinweis und wird bei ``trust_xattr=False`` (Prüfsummenvergleich) verworfen und neu
+gerechnet. xattr-Treffer werden auch nie in die Cache-Datei übernommen.
+
+Dateien, deren ctime jünger als ``_RACY_WINDOW_NS`` ist, werden nicht gecacht: innerhalb der
+Zeitstempel-Granularität wäre ein noch laufender Schreibvorgang nicht erkennbar (gleiches
+Prinzip wie im Evidence-Index bzw. Git-Index).
+
+Bei einem Miss liest ein kleiner Thread-Pool die Datei per ``os.pread`` voraus (mehrere
+Requests gleichzeitig in der Queue des Geräts), während der Aufrufer-Thread hasht; ``hashlib``
+gibt dabei den GIL frei. Schreibfehler am Cache sind nicht fatal.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DIGEST_CACHE_VERSION = 2
+XATTR_NAME = "user.setuphelfer.sha256"
+READ_CHUNK = 1024 * 1024
+READ_AHEAD = 8
+READERS = 2
+MAX_ENTRIES = 1024
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def default_cache_path() -> Path:
+    raw = (os.environ.get("SETUPHELFER_IMAGE_DIGEST_CACHE") or "").strip()
+    if raw:
+        return Path(raw)
+    xdg = (os.environ.get("XDG_CACHE_HOME") or "").strip()
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "setuphelfer" / "image-digests.json"
+
+
+def _xattr_enabled() -> bool:
+    return (os.environ.get("SETUPHELFER_IMAGE_DIGEST_XATTR") or "1").strip() not in ("0", "false", "no")
+
+
+@dataclass(frozen=True)
+class ImageDigest:
+    sha256: str
+    source: str  # "cache" | "xattr" | "computed"
+    size: int
+
+
+def sha256_file_pipelined(path: Path, *, chunk_size: int = READ_CHUNK, read_ahead: int = READ_AHEAD, readers: int = READERS) -> str:
+    """SHA-256 mit vorauslaufenden ``pread``-Requests; Hashen und Lesen überlappen."""
+    h = hashlib.sha256()
+    fd = os.open(str(path), os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        with ThreadPoolExecutor(max_workers=max(1, readers), thread_name_prefix="image-digest") as pool:
+            pending: deque[Future[bytes]] = deque()
+            offset = 0
+
+            def _fill() -> None:
+                nonlocal offset
+                while offset < size and len(pending) < max(1, read_ahead):
+                    pending.append(pool.submit(os.pread, fd, chunk_size, offset))
+                    offset += chunk_size
+
+            hashed = 0
+            _fill()
+            while pending:
+                data = pending.popleft().result()
+                _fill()
+                h.update(data)
+                hashed += len(data)
+        # Datei während des Lesens gewachsen: Rest sequentiell nachlesen (wird dann nicht gecacht)
+        while True:
+            data = os.pread(fd, chunk_size, hashed)
+            if not data:
+                break
+            h.update(data)
+            hashed += len(data)
+    finally:
+        os.close(fd)
+    return h.hexdigest()
+
+
+class ImageDigestCache:
+    """JSON-persistierter Digest-Cache (ein Dokument, atomar ersetzt)."""
+
+    def __init__(self, path: Path | None = None, *, use_xattr: bool | None = None) -> None:
+        self._path = Path(path) if path is not None else None
+        self._xattr_override = use_xattr
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._loaded_stamp: tuple[int, int] | None = None
+
+    def cache_path(self) -> Path:
+        return self._path if self._path is not None else default_cache_path()
+
+    @property
+    def _use_xattr(self) -> bool:
+        return _xattr_enabled() if self._xattr_override is None else bool(self._xattr_override)
+
+    # -- Persistenz -------------------------------------------------------
+
+    def _load(self) -> None:
+        """Lädt neu, wenn die Cache-Datei von außen geändert wurde (andere Prozesse)."""
+        path = self.cache_path()
+        try:
+            st = path.stat()
+        except OSError:
+            self._entries, self._loaded_stamp = {}, None
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._loaded_stamp:
+            return
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        if not isinstance(entries, dict) or payload.get("version") != DIGEST_CACHE_VERSION:
+            entries = {}
+        self._entries = entries
+        self._loaded_stamp = stamp
+
+    def _save(self) -> None:
+        path = self.cache_path()
+        if len(self._entries) > MAX_ENTRIES:
+            keep = sorted(self._entries.items(), key=lambda kv: kv[1].get("hashed_at", 0), reverse=True)
+            self._entries = dict(keep[:MAX_ENTRIES])
+        payload = {"version": DIGEST_CACHE_VERSION, "entries": self._entries}
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, path)
+            st = path.stat()
+            self._loaded_stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    # -- xattr ------------------------------------------------------------
+
+    def _read_xattr(self, path: Path, st: os.stat_result) -> str | None:
+        if not self._use_xattr or not hasattr(os, "getxattr"):
+            return None
+        try:
+            raw = json.loads(os.getxattr(str(path), XATTR_NAME).decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(raw, dict):
+            return None
+        if raw.get("size") != st.st_size or raw.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        digest = str(raw.get("sha256") or "")
+        return digest if len(digest) == 64 else None
+
+    def _write_xattr(self, path: Path, st: os.stat_result, digest: str) -> None:
+        if not self._use_xattr or not hasattr(os, "setxattr"):
+            return
+        value = json.dumps({"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}, separators=(",", ":"))
+        try:
+            os.setxattr(str(path), XATTR_NAME, value.encode("utf-8"))
+        except OSError:
+            pass  # ENOTSUP (tmpfs/vfat), EROFS, EPERM: Cache-Datei genügt
+
+    # -- API --------------------------------------------------------------
+
+    @staticmethod
+    def _key(st: os.stat_result) -> str:
+        return f"{st.st_dev}:{st.st_ino}"
+
+    def lookup(self, path: Path, *, trust_xattr: bool = True) -> ImageDigest | None:
+        st = os.stat(path)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(self._key(st))
+        if entry and _stamp(entry) == (st.st_size, st.st_mtime_ns, st.st_ctime_ns):
+            return ImageDigest(str(entry["sha256"]), "cache", st.st_size)
+        if trust_xattr:
+            digest = self._read_xattr(path, st)
+            if digest is not None:
+                return ImageDigest(digest, "xattr", st.st_size)
+        return None
+
+    def _remember(self, path: Path, st: os.stat_result, digest: str) -> None:
+        with self._lock:
+            self._load()
+            self._entries[self._key(st)] = {
+                "path": str(path),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "ctime_ns": st.st_ctime_ns,
+                "sha256": digest,
+                "hashed_at": int(time.time()),
+            }
+            self._save()
+
+    def sha256(self, path: str | Path, *, trust_xattr: bool = True) -> ImageDigest:
+        """Digest aus Cache/xattr oder neu berechnet (und dann gemerkt).
+
+        Für Prüfsummenvergleiche ``trust_xattr=False`` übergeben: dann zählt nur die eigene
+        Cache-Datei (ctime-geprüft), ein xattr-Treffer führt zur Neuberechnung.
+        """
+        p = Path(path)
+        hit = self.lookup(p, trust_xattr=trust_xattr)
+        if hit is not None:
+            return hit
+        before = os.stat(p)
+        digest = sha256_file_pipelined(p)
+        after = os.stat(p)
+        # Nur merken, wenn sich die Datei während des Hashens nicht verändert hat und die
+        # letzte Änderung außerhalb des Racy-Fensters liegt
+        if _identity(before) == _identity(after) and time.time_ns() - after.st_ctime_ns >= _RACY_WINDOW_NS:
+            self._write_xattr(p, after, digest)
+            # setxattr ändert die ctime: Eintrag mit dem Stand danach speichern
+            final = os.stat(p)
+            if (final.st_ino, final.st_size, final.st_mtime_ns) == (after.st_ino, after.st_size, after.st_mtime_ns):
+                self._remember(p, final, digest)
+        return ImageDigest(digest, "computed", after.st_size)
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        with self._lock:
+            self._load()
+            if path is None:
+                self._entries.clear()
+            else:
+                try:
+                    self._entries.pop(self._key(os.stat(path)), None)
+                except OSError:
+                    return
+            self._save()
+
+
+def _identity(st: os.stat_result) -> tuple[int, int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def _stamp(entry: dict[str, Any]) -> tuple[Any, Any, Any]:
+    return (entry.get("size"), entry.get("mtime_ns"), entry.get("ctime_ns"))
+
+
+_default_cache: ImageDigestCache | None = None
+_default_lock = threading.Lock()
+
+
+def image_digest_cache() -> ImageDigestCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ImageDigestCache()
+        return _default_cache
+
+
+def cached_image_sha256(path: str | Path, *, trust_xattr: bool = True) -> ImageDigest:
+    return image_digest_cache().sha256(path, trust_xattr=trust_xattr)
+
+
+__all__ = [
+    "ImageDigest",
+    "ImageDigestCache",
+    "cached_image_sha256",
+    "default_cache_path",
+    "image_digest_cache",
+    "sha256_file_pipelined",
+]
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import hashlib
 from pathlib import Path
 from typing import Any
 
 from deploy.cache_execute import _ALLOWED_CACHE_PREFIXES
+from deploy.image_digest_cache import ImageDigest, cached_image_sha256
 
 _VALID_EXT_MAP = {".img": "img", ".iso": "iso", ".qcow2": "qcow2"}
 
@@ -20,15 +20,12 @@ def _under_allowed_cache(path: Path) -> bool:
     return False
 
 
-def _sha256(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
+def _sha256(path: Path) -> ImageDigest:
+    """Digest über den persistenten Cache (invalidiert bei Größen-/mtime-/ctime-Änderung).
+
+    Das xattr am Abbild ist für den Soll/Ist-Vergleich nicht vertrauenswürdig.
+    """
+    return cached_image_sha256(path, trust_xattr=False)
 
 
 def inspect_deploy_image(request: dict[str, Any]) -> dict[str, Any]:
@@ -104,9 +101,11 @@ def inspect_deploy_image(request: dict[str, Any]) -> dict[str, Any]:
     out["warnings"].append("DEPLOY_IMAGE_ARCHITECTURE_UNVERIFIED")
 
     if expected_checksum:
-        actual = _sha256(p)
+        digest = _sha256(p)
+        actual = digest.sha256
         out["verification"]["checksum_checked"] = True
         out["verification"]["checksum_actual"] = actual
+        out["verification"]["checksum_source"] = digest.source
         chk = expected_checksum.lower().strip()
         if chk.startswith("sha256:"):
             chk = chk.split(":", 1)[1]
@@ -5,281 +5,221 @@ from typing import Any
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
-from deploy.cache_execute import create_deploy_cache_session, execute_deploy_cache
-from deploy.execute import create_deploy_session, execute_deploy
-from deploy.cache_plan import generate_deploy_cache_plan
-from deploy.image_inspect import inspect_deploy_image
-from deploy.plan import generate_deploy_plan
-from deploy.preview import preview_deploy
-from deploy.source_registry import (
-    evaluate_source_compatibility,
-    get_deploy_source_registry,
-    validate_local_image_entry,
-    validate_remote_image_metadata,
-)
-from deploy.write_plan import generate_deploy_write_plan
-from deploy.write_execute import create_deploy_write_session, execute_deploy_write_dryrun
-from deploy.final_confirmation import create_final_confirmation_session, check_final_confirmation_dryrun
-from deploy.write_harness import create_deploy_write_harness_session, execute_deploy_write_harness
-from deploy.real_write_guard import create_real_write_guard_session, check_real_write_guard
-from deploy.real_write_prototype import execute_deploy_real_write_prototype
-from deploy.hardware_gate import build_hardware_gate_report, build_operator_protocol
-from deploy.runner_handoff import execute_runner_dryrun_handoff
-from deploy.runner_permission_boundary import (
-    audit_runner_binary_path,
-    audit_runner_environment,
-    audit_runner_job_directory,
-    build_runner_sudoers_policy_example,
-)
-from deploy.runner_sandbox import (
-    build_runner_privilege_model,
-    build_runner_recovery_analysis,
-    build_runner_sandbox_policy,
-    build_runner_stdio_policy,
-    build_runner_timeout_model,
-    build_sandbox_environment,
-)
-from deploy.runner_install_plan import build_runner_install_plan
-from deploy.runner_install_validator import validate_runner_installation_dryrun
-from deploy.runner_package_blueprint import build_runner_package_blueprint
-from deploy.runner_install_consistency import validate_runner_install_consistency
-from deploy.runner_sudoers_runtime_test_plan import build_runner_sudoers_runtime_test_plan
-from deploy.runner_privileged_validation_test_plan import build_runner_privileged_validation_test_plan
-from deploy.runner_real_write_hardware_e2e_test_plan import build_runner_real_write_hardware_e2e_test_plan
-from deploy.runner_failure_injection_hardware_test_plan import build_runner_failure_injection_hardware_test_plan
-from deploy.runner_device_reenumeration_test_plan import build_runner_device_reenumeration_test_plan
-from deploy.runner_hotplug_race_test_plan import build_runner_hotplug_race_test_plan
-from deploy.runner_rollback_runtime_test_plan import build_runner_rollback_runtime_test_plan
-from deploy.runner_lab_acceptance_report_export import build_runner_lab_acceptance_report_export
-from deploy.runner_manual_runtime_precheck import build_runner_manual_runtime_precheck
-from deploy.runner_manual_runtime_result_template import create_manual_runtime_result_template
-from deploy.runner_manual_runtime_result_edit_checker import check_manual_runtime_result_file
-from deploy.runner_manual_runtime_result_bundle_checker import check_manual_runtime_result_bundle
-from deploy.runner_manual_runtime_result_validator_handoff_gate import build_manual_runtime_result_validator_handoff
-from deploy.runner_manual_runtime_result_validator_dryrun_from_handoff import run_manual_runtime_result_validator_dryrun_from_handoff
-from deploy.runner_manual_runtime_validator_report_seal import seal_manual_runtime_validator_report
-from deploy.runner_manual_runtime_final_acceptance_gate import evaluate_manual_runtime_final_acceptance
-from deploy.runner_manual_runtime_final_export_package import build_manual_runtime_final_export_package
-from deploy.runner_manual_runtime_laptop_failure_run_selector import select_manual_laptop_failure_test_runs
-from deploy.runner_manual_runtime_laptop_failure_operator_runorder import build_manual_laptop_failure_operator_runorder
-from deploy.runner_manual_runtime_laptop_failure_execution_log_template import (
-    build_manual_laptop_failure_execution_log_template,
-)
-from deploy.runner_manual_runtime_laptop_failure_execution_log_validator import (
-    validate_manual_laptop_failure_execution_log,
-)
-from deploy.runner_manual_runtime_laptop_failure_test_summary import (
-    build_manual_laptop_failure_test_summary,
-)
-from deploy.runner_manual_runtime_laptop_failure_final_report import (
-    build_manual_laptop_failure_final_report,
-)
-from deploy.runner_manual_runtime_laptop_failure_final_export_package import (
-    build_manual_laptop_failure_final_export_package,
-)
-from deploy.runner_manual_runtime_laptop_failure_evidence_timeline import (
-    build_manual_laptop_failure_evidence_timeline,
-)
-from deploy.runner_manual_runtime_laptop_failure_final_snapshot import (
-    build_manual_laptop_failure_final_snapshot,
-)
-from deploy.runner_manual_runtime_laptop_failure_final_acceptance_gate import (
-    evaluate_manual_laptop_failure_final_acceptance,
-)
-from deploy.runner_manual_runtime_laptop_failure_finalized_export_package import (
-    build_manual_laptop_failure_finalized_export_package,
-)
-from deploy.runner_laptop_failure_test_execution_readiness_final_gate import (
-    build_laptop_failure_test_execution_readiness_final_gate,
-)
-from deploy.runner_laptop_live_probe_execution_handoff import (
-    build_laptop_live_probe_final_gate,
-    build_laptop_live_probe_plan,
-    execute_laptop_live_probe_readonly,
-)
-from deploy.runner_setuphelfer_controlled_rewrite_apply import apply_setuphelfer_controlled_rewrite
-from deploy.runner_setuphelfer_identifier_cleanup_cycle import (
-    apply_setuphelfer_identifier_cleanup_cycle,
-    build_setuphelfer_identifier_cleanup_cycle,
-    build_setuphelfer_identifier_cleanup_cycle_postcheck,
-)
-from deploy.runner_setuphelfer_identifier_hotspot_cleanup_cycle import (
-    apply_setuphelfer_identifier_hotspot_cleanup_cycle,
-    build_setuphelfer_identifier_hotspot_cleanup_cycle,
-    build_setuphelfer_identifier_hotspot_cleanup_cycle_postcheck,
-)
-from deploy.runner_setuphelfer_runtime_identifier_elimination import (
-    apply_runtime_identifier_elimination,
-    build_runtime_identifier_elimination_postcheck,
-)
-from deploy.runner_setuphelfer_branding_guard import build_setuphelfer_branding_guard_report
-from deploy.runner_runtime_identifier_patch_bump_apply import (
-    apply_runtime_identifier_patch_bump,
-    build_runtime_identifier_patch_bump_postcheck,
-)
-from deploy.runner_rescue_debian_live_build_inputs import (
-    build_debian_live_bootloader_templates,
-    build_debian_live_build_inputs_final_gate,
-    build_debian_live_config_structure,
-    build_debian_live_hook_templates,
-    build_debian_live_includes_ch_root,
-    build_debian_live_package_lists,
-    validate_debian_live_build_inputs_safety,
-)
-from deploy.runner_rescue_dry_build_orchestration import (
-    build_rescue_dry_build_final_gate,
-    build_rescue_dry_build_input_resolution,
-    build_rescue_dry_build_stage_graph,
-    build_rescue_package_resolution_plan,
-    simulate_rescue_dry_build_execution,
-    validate_rescue_build_order,
-    validate_rescue_dry_build_safety,
-)
-from deploy.runner_rescue_build_sandbox_preparation import (
-    build_rescue_build_cleanup_plan,
-    build_rescue_build_sandbox_final_gate,
-    build_rescue_build_sandbox_root,
-    build_rescue_overlay_workspace_plan,
-    build_rescue_sandbox_config_copy_plan,
-    build_rescue_sandbox_runtime_copy_plan,
-    validate_rescue_build_sandbox_safety,
-)
-from deploy.runner_rescue_sandbox_controlled_copy import (
-    build_rescue_sandbox_copy_execution_precheck,
-    build_rescue_sandbox_copy_final_gate,
-    build_rescue_sandbox_copy_seal,
-    execute_rescue_sandbox_config_copy,
-    execute_rescue_sandbox_runtime_copy,
-    verify_rescue_sandbox_copy_results,
-)
-from deploy.runner_rescue_build_environment_emulation import (
-    build_rescue_build_emulation_final_gate,
-    build_rescue_build_emulation_seal,
-    build_rescue_build_environment_snapshot,
-    build_rescue_overlay_persistence_emulation,
-    build_rescue_simulated_build_logs,
-    build_rescue_simulated_build_outputs,
-    build_rescue_simulated_build_workspace,
-    verify_rescue_build_emulation,
-)
-from deploy.runner_rescue_stick_readonly_build_emulation import (
-    build_rescue_stick_build_workspace_snapshot,
-    build_rescue_stick_evidence_manifest,
-    build_rescue_stick_expected_debian_live_tree,
-    build_rescue_stick_frontend_bundle_preview,
-    build_rescue_stick_network_webui_preview,
-    build_rescue_stick_package_list_preview,
-    build_rescue_stick_readonly_build_final_gate,
-    build_rescue_stick_runtime_bundle_preview,
-    build_rescue_stick_systemd_service_preview,
-    run_rescue_stick_readonly_build_emulation_all,
-)
-from deploy.runner_rescue_iso_test_matrix import build_rescue_iso_test_matrix
-from deploy.runner_rescue_build_readiness_gate import build_rescue_build_readiness_gate
-from deploy.runner_rescue_live_build_config_generator import build_rescue_live_build_config
-from deploy.runner_rescue_iso_build_execution_plan import build_rescue_iso_execution_plan
-from deploy.runner_rescue_iso_build_execution import build_rescue_iso_build_precheck, execute_rescue_iso_build
-from deploy.runner_rescue_vm_test_orchestrator import build_rescue_vm_test_plan, execute_rescue_vm_boot_validation
-from deploy.runner_rescue_iso_live_runtime_probe import (
-    build_rescue_iso_live_runtime_probe_plan,
-    build_rescue_iso_live_runtime_probe_result,
-    execute_rescue_iso_live_runtime_probe,
-)
-from deploy.runner_rescue_iso_readiness_gate import build_rescue_iso_readiness_gate
-from deploy.runner_rescue_storage_discovery import (
-    build_rescue_storage_discovery_plan,
-    build_rescue_storage_discovery_result,
-    execute_rescue_storage_discovery,
-)
-from deploy.runner_rescue_readonly_mount_orchestrator import (
-    build_readonly_mount_plan,
-    build_readonly_mount_result,
-    execute_readonly_mount_validation,
-)
-from rescue.backup_orchestrator import build_rescue_offline_backup_plan
-from rescue.boot_context import build_rescue_boot_context
-from rescue.restore_preview_orchestrator import build_rescue_restore_preview_plan
-from deploy.runner_rescue_efi_boot_analyzer import build_rescue_efi_boot_analysis
-from deploy.runner_rescue_persistent_evidence_export import (
-    build_rescue_evidence_export_plan,
-    build_rescue_evidence_export_result,
-    execute_rescue_evidence_export,
-)
-from deploy.runner_rescue_remote_help_preparation import build_rescue_remote_help_plan, build_rescue_remote_help_result
-from deploy.runner_rescue_live_hardware_matrix import build_rescue_live_hardware_matrix
-from deploy.runner_rescue_live_runtime_safety_gate import build_rescue_live_runtime_safety_gate
-from deploy.runner_rescue_recovery_scenario_matrix import build_rescue_recovery_scenario_matrix
-from deploy.runner_rescue_recovery_target_validation import (
-    build_rescue_recovery_target_validation_plan,
-    build_rescue_recovery_target_validation_result,
-    execute_rescue_recovery_target_validation,
-)
-from deploy.runner_rescue_backup_discovery_verify import (
-    build_rescue_backup_discovery_plan,
-    build_rescue_backup_verify_result,
-    execute_rescue_backup_discovery,
-    execute_rescue_backup_verify,
-)
-from deploy.runner_rescue_restore_preview_orchestrator import (
-    build_rescue_restore_preview_plan,
-    build_rescue_restore_preview_result,
-    execute_rescue_restore_preview,
-)
-from deploy.runner_rescue_hardware_recovery_test_chain import build_rescue_hardware_recovery_test_chain
-from deploy.runner_rescue_final_recovery_readiness_gate import build_rescue_final_recovery_readiness_gate
-from deploy.runner_rescue_manual_recovery_operator_guides import build_rescue_manual_recovery_operator_guides
-from deploy.runner_rescue_recovery_evidence_timeline import build_rescue_recovery_evidence_timeline
-from deploy.runner_rescue_iso_readiness_pipeline import (
-    build_rescue_iso_baseline,
-    build_rescue_bootflow_simulation,
-    build_rescue_iso_build_plan,
-    build_rescue_iso_filesystem_layout,
-    build_rescue_iso_final_readiness_gate,
-    validate_offline_recovery_runtime,
-    validate_rescue_iso_safety,
-)
-from deploy.runner_rescue_iso_artifact_preparation import (
-    build_offline_frontend_artifacts,
-    build_rescue_artifact_readiness_gate,
-    build_rescue_backend_artifacts,
-    build_rescue_boot_artifact_structure,
-    build_rescue_overlay_persistence_strategy,
-    build_rescue_rootfs_artifact,
-)
-from deploy.runner_rescue_pseudo_boot_integration import (
-    build_rescue_backend_health_integration,
-    build_rescue_overlay_boot_strategy,
-    build_rescue_pseudo_boot_final_readiness,
-    build_rescue_pseudo_boot_manifest,
-    build_rescue_recovery_ui_integration,
-    build_rescue_service_startup_simulation,
-    validate_rescue_pseudo_boot_safety,
-)
-from deploy.runner_rescue_runtime_assembly_pipeline import (
-    build_rescue_backend_runtime_assembly,
-    build_rescue_frontend_runtime_assembly,
-    build_rescue_offline_configuration_assembly,
-    build_rescue_recovery_runtime_assembly,
-    build_rescue_runtime_assembly_final_gate,
-    build_rescue_runtime_root,
-    build_rescue_startup_script_assembly,
-    validate_rescue_runtime_assembly_safety,
-)
-from deploy.runner_rescue_runtime_bundle_manifest import (
-    build_rescue_runtime_bundle_hash_manifest,
-    build_rescue_runtime_bundle_inventory,
-    build_rescue_runtime_bundle_seal,
-    check_rescue_runtime_bundle_consistency,
-)
+from core.lazy_imports import lazy_callable
 from deploy.routes_diagnostics import router as deploy_diagnostics_router
 from deploy.routes_evidence import router as deploy_evidence_router
 from deploy.routes_governance import router as deploy_governance_router
 from deploy.routes_registry import router as deploy_registry_router
+from deploy.routes_rescue_plan import router as deploy_rescue_plan_router
+from deploy.routes_rescue_readonly import router as deploy_rescue_readonly_router
 from deploy.routes_risk_gate import router as deploy_risk_gate_router
 from deploy.routes_runtime import router as deploy_runtime_router
 from deploy.routes_versioning import router as deploy_versioning_router
-from deploy.routes_rescue_readonly import router as deploy_rescue_readonly_router
-from deploy.routes_rescue_plan import router as deploy_rescue_plan_router
+
+create_deploy_cache_session = lazy_callable("deploy.cache_execute", "create_deploy_cache_session")
+execute_deploy_cache = lazy_callable("deploy.cache_execute", "execute_deploy_cache")
+create_deploy_session = lazy_callable("deploy.execute", "create_deploy_session")
+execute_deploy = lazy_callable("deploy.execute", "execute_deploy")
+generate_deploy_cache_plan = lazy_callable("deploy.cache_plan", "generate_deploy_cache_plan")
+inspect_deploy_image = lazy_callable("deploy.image_inspect", "inspect_deploy_image")
+generate_deploy_plan = lazy_callable("deploy.plan", "generate_deploy_plan")
+preview_deploy = lazy_callable("deploy.preview", "preview_deploy")
+evaluate_source_compatibility = lazy_callable("deploy.source_registry", "evaluate_source_compatibility")
+get_deploy_source_registry = lazy_callable("deploy.source_registry", "get_deploy_source_registry")
+validate_local_image_entry = lazy_callable("deploy.source_registry", "validate_local_image_entry")
+validate_remote_image_metadata = lazy_callable("deploy.source_registry", "validate_remote_image_metadata")
+generate_deploy_write_plan = lazy_callable("deploy.write_plan", "generate_deploy_write_plan")
+create_deploy_write_session = lazy_callable("deploy.write_execute", "create_deploy_write_session")
+execute_deploy_write_dryrun = lazy_callable("deploy.write_execute", "execute_deploy_write_dryrun")
+create_final_confirmation_session = lazy_callable("deploy.final_confirmation", "create_final_confirmation_session")
+check_final_confirmation_dryrun = lazy_callable("deploy.final_confirmation", "check_final_confirmation_dryrun")
+create_deploy_write_harness_session = lazy_callable("deploy.write_harness", "create_deploy_write_harness_session")
+execute_deploy_write_harness = lazy_callable("deploy.write_harness", "execute_deploy_write_harness")
+create_real_write_guard_session = lazy_callable("deploy.real_write_guard", "create_real_write_guard_session")
+check_real_write_guard = lazy_callable("deploy.real_write_guard", "check_real_write_guard")
+execute_deploy_real_write_prototype = lazy_callable("deploy.real_write_prototype", "execute_deploy_real_write_prototype")
+build_hardware_gate_report = lazy_callable("deploy.hardware_gate", "build_hardware_gate_report")
+build_operator_protocol = lazy_callable("deploy.hardware_gate", "build_operator_protocol")
+execute_runner_dryrun_handoff = lazy_callable("deploy.runner_handoff", "execute_runner_dryrun_handoff")
+audit_runner_binary_path = lazy_callable("deploy.runner_permission_boundary", "audit_runner_binary_path")
+audit_runner_environment = lazy_callable("deploy.runner_permission_boundary", "audit_runner_environment")
+audit_runner_job_directory = lazy_callable("deploy.runner_permission_boundary", "audit_runner_job_directory")
+build_runner_sudoers_policy_example = lazy_callable("deploy.runner_permission_boundary", "build_runner_sudoers_policy_example")
+build_runner_privilege_model = lazy_callable("deploy.runner_sandbox", "build_runner_privilege_model")
+build_runner_recovery_analysis = lazy_callable("deploy.runner_sandbox", "build_runner_recovery_analysis")
+build_runner_sandbox_policy = lazy_callable("deploy.runner_sandbox", "build_runner_sandbox_policy")
+build_runner_stdio_policy = lazy_callable("deploy.runner_sandbox", "build_runner_stdio_policy")
+build_runner_timeout_model = lazy_callable("deploy.runner_sandbox", "build_runner_timeout_model")
+build_sandbox_environment = lazy_callable("deploy.runner_sandbox", "build_sandbox_environment")
+build_runner_install_plan = lazy_callable("deploy.runner_install_plan", "build_runner_install_plan")
+validate_runner_installation_dryrun = lazy_callable("deploy.runner_install_validator", "validate_runner_installation_dryrun")
+build_runner_package_blueprint = lazy_callable("deploy.runner_package_blueprint", "build_runner_package_blueprint")
+validate_runner_install_consistency = lazy_callable("deploy.runner_install_consistency", "validate_runner_install_consistency")
+build_runner_sudoers_runtime_test_plan = lazy_callable("deploy.runner_sudoers_runtime_test_plan", "build_runner_sudoers_runtime_test_plan")
+build_runner_privileged_validation_test_plan = lazy_callable("deploy.runner_privileged_validation_test_plan", "build_runner_privileged_validation_test_plan")
+build_runner_real_write_hardware_e2e_test_plan = lazy_callable("deploy.runner_real_write_hardware_e2e_test_plan", "build_runner_real_write_hardware_e2e_test_plan")
+build_runner_failure_injection_hardware_test_plan = lazy_callable("deploy.runner_failure_injection_hardware_test_plan", "build_runner_failure_injection_hardware_test_plan")
+build_runner_device_reenumeration_test_plan = lazy_callable("deploy.runner_device_reenumeration_test_plan", "build_runner_device_reenumeration_test_plan")
+build_runner_hotplug_race_test_plan = lazy_callable("deploy.runner_hotplug_race_test_plan", "build_runner_hotplug_race_test_plan")
+build_runner_rollback_runtime_test_plan = lazy_callable("deploy.runner_rollback_runtime_test_plan", "build_runner_rollback_runtime_test_plan")
+build_runner_lab_acceptance_report_export = lazy_callable("deploy.runner_lab_acceptance_report_export", "build_runner_lab_acceptance_report_export")
+build_runner_manual_runtime_precheck = lazy_callable("deploy.runner_manual_runtime_precheck", "build_runner_manual_runtime_precheck")
+create_manual_runtime_result_template = lazy_callable("deploy.runner_manual_runtime_result_template", "create_manual_runtime_result_template")
+check_manual_runtime_result_file = lazy_callable("deploy.runner_manual_runtime_result_edit_checker", "check_manual_runtime_result_file")
+check_manual_runtime_result_bundle = lazy_callable("deploy.runner_manual_runtime_result_bundle_checker", "check_manual_runtime_result_bundle")
+build_manual_runtime_result_validator_handoff = lazy_callable("deploy.runner_manual_runtime_result_validator_handoff_gate", "build_manual_runtime_result_validator_handoff")
+run_manual_runtime_result_validator_dryrun_from_handoff = lazy_callable("deploy.runner_manual_runtime_result_validator_dryrun_from_handoff", "run_manual_runtime_result_validator_dryrun_from_handoff")
+seal_manual_runtime_validator_report = lazy_callable("deploy.runner_manual_runtime_validator_report_seal", "seal_manual_runtime_validator_report")
+evaluate_manual_runtime_final_acceptance = lazy_callable("deploy.runner_manual_runtime_final_acceptance_gate", "evaluate_manual_runtime_final_acceptance")
+build_manual_runtime_final_export_package = lazy_callable("deploy.runner_manual_runtime_final_export_package", "build_manual_runtime_final_export_package")
+select_manual_laptop_failure_test_runs = lazy_callable("deploy.runner_manual_runtime_laptop_failure_run_selector", "select_manual_laptop_failure_test_runs")
+build_manual_laptop_failure_operator_runorder = lazy_callable("deploy.runner_manual_runtime_laptop_failure_operator_runorder", "build_manual_laptop_failure_operator_runorder")
+build_manual_laptop_failure_execution_log_template = lazy_callable("deploy.runner_manual_runtime_laptop_failure_execution_log_template", "build_manual_laptop_failure_execution_log_template")
+validate_manual_laptop_failure_execution_log = lazy_callable("deploy.runner_manual_runtime_laptop_failure_execution_log_validator", "validate_manual_laptop_failure_execution_log")
+build_manual_laptop_failure_test_summary = lazy_callable("deploy.runner_manual_runtime_laptop_failure_test_summary", "build_manual_laptop_failure_test_summary")
+build_manual_laptop_failure_final_report = lazy_callable("deploy.runner_manual_runtime_laptop_failure_final_report", "build_manual_laptop_failure_final_report")
+build_manual_laptop_failure_final_export_package = lazy_callable("deploy.runner_manual_runtime_laptop_failure_final_export_package", "build_manual_laptop_failure_final_export_package")
+build_manual_laptop_failure_evidence_timeline = lazy_callable("deploy.runner_manual_runtime_laptop_failure_evidence_timeline", "build_manual_laptop_failure_evidence_timeline")
+build_manual_laptop_failure_final_snapshot = lazy_callable("deploy.runner_manual_runtime_laptop_failure_final_snapshot", "build_manual_laptop_failure_final_snapshot")
+evaluate_manual_laptop_failure_final_acceptance = lazy_callable("deploy.runner_manual_runtime_laptop_failure_final_acceptance_gate", "evaluate_manual_laptop_failure_final_acceptance")
+build_manual_laptop_failure_finalized_export_package = lazy_callable("deploy.runner_manual_runtime_laptop_failure_finalized_export_package", "build_manual_laptop_failure_finalized_export_package")
+build_laptop_failure_test_execution_readiness_final_gate = lazy_callable("deploy.runner_laptop_failure_test_execution_readiness_final_gate", "build_laptop_failure_test_execution_readiness_final_gate")
+build_laptop_live_probe_final_gate = lazy_callable("deploy.runner_laptop_live_probe_execution_handoff", "build_laptop_live_probe_final_gate")
+build_laptop_live_probe_plan = lazy_callable("deploy.runner_laptop_live_probe_execution_handoff", "build_laptop_live_probe_plan")
+execute_laptop_live_probe_readonly = lazy_callable("deploy.runner_laptop_live_probe_execution_handoff", "execute_laptop_live_probe_readonly")
+apply_setuphelfer_controlled_rewrite = lazy_callable("deploy.runner_setuphelfer_controlled_rewrite_apply", "apply_setuphelfer_controlled_rewrite")
+apply_setuphelfer_identifier_cleanup_cycle = lazy_callable("deploy.runner_setuphelfer_identifier_cleanup_cycle", "apply_setuphelfer_identifier_cleanup_cycle")
+build_setuphelfer_identifier_cleanup_cycle = lazy_callable("deploy.runner_setuphelfer_identifier_cleanup_cycle", "build_setuphelfer_identifier_cleanup_cycle")
+build_setuphelfer_identifier_cleanup_cycle_postcheck = lazy_callable("deploy.runner_setuphelfer_identifier_cleanup_cycle", "build_setuphelfer_identifier_cleanup_cycle_postcheck")
+apply_setuphelfer_identifier_hotspot_cleanup_cycle = lazy_callable("deploy.runner_setuphelfer_identifier_hotspot_cleanup_cycle", "apply_setuphelfer_identifier_hotspot_cleanup_cycle")
+build_setuphelfer_identifier_hotspot_cleanup_cycle = lazy_callable("deploy.runner_setuphelfer_identifier_hotspot_cleanup_cycle", "build_setuphelfer_identifier_hotspot_cleanup_cycle")
+build_setuphelfer_identifier_hotspot_cleanup_cycle_postcheck = lazy_callable("deploy.runner_setuphelfer_identifier_hotspot_cleanup_cycle", "build_setuphelfer_identifier_hotspot_cleanup_cycle_postcheck")
+apply_runtime_identifier_elimination = lazy_callable("deploy.runner_setuphelfer_runtime_identifier_elimination", "apply_runtime_identifier_elimination")
+build_runtime_identifier_elimination_postcheck = lazy_callable("deploy.runner_setuphelfer_runtime_identifier_elimination", "build_runtime_identifier_elimination_postcheck")
+build_setuphelfer_branding_guard_report = lazy_callable("deploy.runner_setuphelfer_branding_guard", "build_setuphelfer_branding_guard_report")
+apply_runtime_identifier_patch_bump = lazy_callable("deploy.runner_runtime_identifier_patch_bump_apply", "apply_runtime_identifier_patch_bump")
+build_runtime_identifier_patch_bump_postcheck = lazy_callable("deploy.runner_runtime_identifier_patch_bump_apply", "build_runtime_identifier_patch_bump_postcheck")
+build_debian_live_bootloader_templates = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_bootloader_templates")
+build_debian_live_build_inputs_final_gate = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_build_inputs_final_gate")
+build_debian_live_config_structure = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_config_structure")
+build_debian_live_hook_templates = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_hook_templates")
+build_debian_live_includes_ch_root = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_includes_ch_root")
+build_debian_live_package_lists = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_package_lists")
+validate_debian_live_build_inputs_safety = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "validate_debian_live_build_inputs_safety")
+build_rescue_dry_build_final_gate = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_dry_build_final_gate")
+build_rescue_dry_build_input_resolution = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_dry_build_input_resolution")
+build_rescue_dry_build_stage_graph = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_dry_build_stage_graph")
+build_rescue_package_resolution_plan = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_package_resolution_plan")
+simulate_rescue_dry_build_execution = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "simulate_rescue_dry_build_execution")
+validate_rescue_build_order = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "validate_rescue_build_order")
+validate_rescue_dry_build_safety = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "validate_rescue_dry_build_safety")
+build_rescue_build_cleanup_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_build_cleanup_plan")
+build_rescue_build_sandbox_final_gate = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_build_sandbox_final_gate")
+build_rescue_build_sandbox_root = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_build_sandbox_root")
+build_rescue_overlay_workspace_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_overlay_workspace_plan")
+build_rescue_sandbox_config_copy_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_sandbox_config_copy_plan")
+build_rescue_sandbox_runtime_copy_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_sandbox_runtime_copy_plan")
+validate_rescue_build_sandbox_safety = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "validate_rescue_build_sandbox_safety")
+build_rescue_sandbox_copy_execution_precheck = lazy_callable("deploy.runner_rescue_sandbox_controlled_copy", "build_rescue_sandbox_copy_execution_precheck")
+build_rescue_sandbox_copy_final_gate = lazy_callable("deploy.runner_rescue_sandbox_controlled_copy", "build_rescue_sandbox_copy_final_gate")
+build_rescue_sandbox_copy_seal = lazy_callable("deploy.runner_rescue_sandbox_controlled_copy", "build_rescue_sandbox_copy_seal")
+execute_rescue_sandbox_config_copy = lazy_callable("deploy.runner_rescue_sandbox_controlled_copy", "execute_rescue_sandbox_config_copy")
+execute_rescue_sandbox_runtime_copy = lazy_callable("deploy.runner_rescue_sandbox_controlled_copy", "execute_rescue_sandbox_runtime_copy")
+verify_rescue_sandbox_copy_results = lazy_callable("deploy.runner_rescue_sandbox_controlled_copy", "verify_rescue_sandbox_copy_results")
+build_rescue_build_emulation_final_gate = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_build_emulation_final_gate")
+build_rescue_build_emulation_seal = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_build_emulation_seal")
+build_rescue_build_environment_snapshot = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_build_environment_snapshot")
+build_rescue_overlay_persistence_emulation = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_overlay_persistence_emulation")
+build_rescue_simulated_build_logs = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_simulated_build_logs")
+build_rescue_simulated_build_outputs = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_simulated_build_outputs")
+build_rescue_simulated_build_workspace = lazy_callable("deploy.runner_rescue_build_environment_emulation", "build_rescue_simulated_build_workspace")
+verify_rescue_build_emulation = lazy_callable("deploy.runner_rescue_build_environment_emulation", "verify_rescue_build_emulation")
+build_rescue_stick_build_workspace_snapshot = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_build_workspace_snapshot")
+build_rescue_stick_evidence_manifest = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_evidence_manifest")
+build_rescue_stick_expected_debian_live_tree = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_expected_debian_live_tree")
+build_rescue_stick_frontend_bundle_preview = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_frontend_bundle_preview")
+build_rescue_stick_network_webui_preview = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_network_webui_preview")
+build_rescue_stick_package_list_preview = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_package_list_preview")
+build_rescue_stick_readonly_build_final_gate = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_readonly_build_final_gate")
+build_rescue_stick_runtime_bundle_preview = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_runtime_bundle_preview")
+build_rescue_stick_systemd_service_preview = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "build_rescue_stick_systemd_service_preview")
+run_rescue_stick_readonly_build_emulation_all = lazy_callable("deploy.runner_rescue_stick_readonly_build_emulation", "run_rescue_stick_readonly_build_emulation_all")
+build_rescue_iso_test_matrix = lazy_callable("deploy.runner_rescue_iso_test_matrix", "build_rescue_iso_test_matrix")
+build_rescue_build_readiness_gate = lazy_callable("deploy.runner_rescue_build_readiness_gate", "build_rescue_build_readiness_gate")
+build_rescue_live_build_config = lazy_callable("deploy.runner_rescue_live_build_config_generator", "build_rescue_live_build_config")
+build_rescue_iso_execution_plan = lazy_callable("deploy.runner_rescue_iso_build_execution_plan", "build_rescue_iso_execution_plan")
+build_rescue_iso_build_precheck = lazy_callable("deploy.runner_rescue_iso_build_execution", "build_rescue_iso_build_precheck")
+execute_rescue_iso_build = lazy_callable("deploy.runner_rescue_iso_build_execution", "execute_rescue_iso_build")
+build_rescue_vm_test_plan = lazy_callable("deploy.runner_rescue_vm_test_orchestrator", "build_rescue_vm_test_plan")
+execute_rescue_vm_boot_validation = lazy_callable("deploy.runner_rescue_vm_test_orchestrator", "execute_rescue_vm_boot_validation")
+build_rescue_iso_live_runtime_probe_plan = lazy_callable("deploy.runner_rescue_iso_live_runtime_probe", "build_rescue_iso_live_runtime_probe_plan")
+build_rescue_iso_live_runtime_probe_result = lazy_callable("deploy.runner_rescue_iso_live_runtime_probe", "build_rescue_iso_live_runtime_probe_result")
+execute_rescue_iso_live_runtime_probe = lazy_callable("deploy.runner_rescue_iso_live_runtime_probe", "execute_rescue_iso_live_runtime_probe")
+build_rescue_iso_readiness_gate = lazy_callable("deploy.runner_rescue_iso_readiness_gate", "build_rescue_iso_readiness_gate")
+build_rescue_storage_discovery_plan = lazy_callable("deploy.runner_rescue_storage_discovery", "build_rescue_storage_discovery_plan")
+build_rescue_storage_discovery_result = lazy_callable("deploy.runner_rescue_storage_discovery", "build_rescue_storage_discovery_result")
+execute_rescue_storage_discovery = lazy_callable("deploy.runner_rescue_storage_discovery", "execute_rescue_storage_discovery")
+build_readonly_mount_plan = lazy_callable("deploy.runner_rescue_readonly_mount_orchestrator", "build_readonly_mount_plan")
+build_readonly_mount_result = lazy_callable("deploy.runner_rescue_readonly_mount_orchestrator", "build_readonly_mount_result")
+execute_readonly_mount_validation = lazy_callable("deploy.runner_rescue_readonly_mount_orchestrator", "execute_readonly_mount_validation")
+build_rescue_offline_backup_plan = lazy_callable("rescue.backup_orchestrator", "build_rescue_offline_backup_plan")
+build_rescue_boot_context = lazy_callable("rescue.boot_context", "build_rescue_boot_context")
+build_rescue_restore_preview_plan = lazy_callable("rescue.restore_preview_orchestrator", "build_rescue_restore_preview_plan")
+build_rescue_efi_boot_analysis = lazy_callable("deploy.runner_rescue_efi_boot_analyzer", "build_rescue_efi_boot_analysis")
+build_rescue_evidence_export_plan = lazy_callable("deploy.runner_rescue_persistent_evidence_export", "build_rescue_evidence_export_plan")
+build_rescue_evidence_export_result = lazy_callable("deploy.runner_rescue_persistent_evidence_export", "build_rescue_evidence_export_result")
+execute_rescue_evidence_export = lazy_callable("deploy.runner_rescue_persistent_evidence_export", "execute_rescue_evidence_export")
+build_rescue_remote_help_plan = lazy_callable("deploy.runner_rescue_remote_help_preparation", "build_rescue_remote_help_plan")
+build_rescue_remote_help_result = lazy_callable("deploy.runner_rescue_remote_help_preparation", "build_rescue_remote_help_result")
+build_rescue_live_hardware_matrix = lazy_callable("deploy.runner_rescue_live_hardware_matrix", "build_rescue_live_hardware_matrix")
+build_rescue_live_runtime_safety_gate = lazy_callable("deploy.runner_rescue_live_runtime_safety_gate", "build_rescue_live_runtime_safety_gate")
+build_rescue_recovery_scenario_matrix = lazy_callable("deploy.runner_rescue_recovery_scenario_matrix", "build_rescue_recovery_scenario_matrix")
+build_rescue_recovery_target_validation_plan = lazy_callable("deploy.runner_rescue_recovery_target_validation", "build_rescue_recovery_target_validation_plan")
+build_rescue_recovery_target_validation_result = lazy_callable("deploy.runner_rescue_recovery_target_validation", "build_rescue_recovery_target_validation_result")
+execute_rescue_recovery_target_validation = lazy_callable("deploy.runner_rescue_recovery_target_validation", "execute_rescue_recovery_target_validation")
+build_rescue_backup_discovery_plan = lazy_callable("deploy.runner_rescue_backup_discovery_verify", "build_rescue_backup_discovery_plan")
+build_rescue_backup_verify_result = lazy_callable("deploy.runner_rescue_backup_discovery_verify", "build_rescue_backup_verify_result")
+execute_rescue_backup_discovery = lazy_callable("deploy.runner_rescue_backup_discovery_verify", "execute_rescue_backup_discovery")
+execute_rescue_backup_verify = lazy_callable("deploy.runner_rescue_backup_discovery_verify", "execute_rescue_backup_verify")
+build_rescue_restore_preview_plan = lazy_callable("deploy.runner_rescue_restore_preview_orchestrator", "build_rescue_restore_preview_plan")
+build_rescue_restore_preview_result = lazy_callable("deploy.runner_rescue_restore_preview_orchestrator", "build_rescue_restore_preview_result")
+execute_rescue_restore_preview = lazy_callable("deploy.runner_rescue_restore_preview_orchestrator", "execute_rescue_restore_preview")
+build_rescue_hardware_recovery_test_chain = lazy_callable("deploy.runner_rescue_hardware_recovery_test_chain", "build_rescue_hardware_recovery_test_chain")
+build_rescue_final_recovery_readiness_gate = lazy_callable("deploy.runner_rescue_final_recovery_readiness_gate", "build_rescue_final_recovery_readiness_gate")
+build_rescue_manual_recovery_operator_guides = lazy_callable("deploy.runner_rescue_manual_recovery_operator_guides", "build_rescue_manual_recovery_operator_guides")
+build_rescue_recovery_evidence_timeline = lazy_callable("deploy.runner_rescue_recovery_evidence_timeline", "build_rescue_recovery_evidence_timeline")
+build_rescue_iso_baseline = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "build_rescue_iso_baseline")
+build_rescue_bootflow_simulation = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "build_rescue_bootflow_simulation")
+build_rescue_iso_build_plan = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "build_rescue_iso_build_plan")
+build_rescue_iso_filesystem_layout = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "build_rescue_iso_filesystem_layout")
+build_rescue_iso_final_readiness_gate = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "build_rescue_iso_final_readiness_gate")
+validate_offline_recovery_runtime = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "validate_offline_recovery_runtime")
+validate_rescue_iso_safety = lazy_callable("deploy.runner_rescue_iso_readiness_pipeline", "validate_rescue_iso_safety")
+build_offline_frontend_artifacts = lazy_callable("deploy.runner_rescue_iso_artifact_preparation", "build_offline_frontend_artifacts")
+build_rescue_artifact_readiness_gate = lazy_callable("deploy.runner_rescue_iso_artifact_preparation", "build_rescue_artifact_readiness_gate")
+build_rescue_backend_artifacts = lazy_callable("deploy.runner_rescue_iso_artifact_preparation", "build_rescue_backend_artifacts")
+build_rescue_boot_artifact_structure = lazy_callable("deploy.runner_rescue_iso_artifact_preparation", "build_rescue_boot_artifact_structure")
+build_rescue_overlay_persistence_strategy = lazy_callable("deploy.runner_rescue_iso_artifact_preparation", "build_rescue_overlay_persistence_strategy")
+build_rescue_rootfs_artifact = lazy_callable("deploy.runner_rescue_iso_artifact_preparation", "build_rescue_rootfs_artifact")
+build_rescue_backend_health_integration = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "build_rescue_backend_health_integration")
+build_rescue_overlay_boot_strategy = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "build_rescue_overlay_boot_strategy")
+build_rescue_pseudo_boot_final_readiness = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "build_rescue_pseudo_boot_final_readiness")
+build_rescue_pseudo_boot_manifest = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "build_rescue_pseudo_boot_manifest")
+build_rescue_recovery_ui_integration = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "build_rescue_recovery_ui_integration")
+build_rescue_service_startup_simulation = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "build_rescue_service_startup_simulation")
+validate_rescue_pseudo_boot_safety = lazy_callable("deploy.runner_rescue_pseudo_boot_integration", "validate_rescue_pseudo_boot_safety")
+build_rescue_backend_runtime_assembly = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_backend_runtime_assembly")
+build_rescue_frontend_runtime_assembly = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_frontend_runtime_assembly")
+build_rescue_offline_configuration_assembly = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_offline_configuration_assembly")
+build_rescue_recovery_runtime_assembly = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_recovery_runtime_assembly")
+build_rescue_runtime_assembly_final_gate = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_runtime_assembly_final_gate")
+build_rescue_runtime_root = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_runtime_root")
+build_rescue_startup_script_assembly = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "build_rescue_startup_script_assembly")
+validate_rescue_runtime_assembly_safety = lazy_callable("deploy.runner_rescue_runtime_assembly_pipeline", "validate_rescue_runtime_assembly_safety")
+build_rescue_runtime_bundle_hash_manifest = lazy_callable("deploy.runner_rescue_runtime_bundle_manifest", "build_rescue_runtime_bundle_hash_manifest")
+build_rescue_runtime_bundle_inventory = lazy_callable("deploy.runner_rescue_runtime_bundle_manifest", "build_rescue_runtime_bundle_inventory")
+build_rescue_runtime_bundle_seal = lazy_callable("deploy.runner_rescue_runtime_bundle_manifest", "build_rescue_runtime_bundle_seal")
+check_rescue_runtime_bundle_consistency = lazy_callable("deploy.runner_rescue_runtime_bundle_manifest", "check_rescue_runtime_bundle_consistency")
 
 router = APIRouter(prefix="/api/deploy", tags=["deploy-plan"])
 router.include_router(deploy_registry_router)
@@ -11,7 +11,9 @@ from typing import Any
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
-from deploy.runner_api_facade import build_plan_only_response
+from core.lazy_imports import lazy_callable
+
+build_plan_only_response = lazy_callable("deploy.runner_api_facade", "build_plan_only_response")
 
 router = APIRouter(tags=["deploy-governance"])
 
@@ -10,13 +10,13 @@ from typing import Any
 
 from fastapi import APIRouter
 
-from deploy.runner_api_facade import (
-    build_runner_catalog,
-    build_runner_catalog_summary,
-    build_runner_policy_warnings,
-    get_runner_empty_result,
-    get_runner_registry_entry,
-)
+from core.lazy_imports import lazy_callable
+
+build_runner_catalog = lazy_callable("deploy.runner_api_facade", "build_runner_catalog")
+build_runner_catalog_summary = lazy_callable("deploy.runner_api_facade", "build_runner_catalog_summary")
+build_runner_policy_warnings = lazy_callable("deploy.runner_api_facade", "build_runner_policy_warnings")
+get_runner_empty_result = lazy_callable("deploy.runner_api_facade", "get_runner_empty_result")
+get_runner_registry_entry = lazy_callable("deploy.runner_api_facade", "get_runner_registry_entry")
 
 router = APIRouter(prefix="/runners", tags=["deploy-runners-registry"])
 
@@ -12,33 +12,29 @@ from typing import Any
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from deploy.runner_rescue_build_sandbox_preparation import (
-    build_rescue_build_cleanup_plan,
-    build_rescue_build_sandbox_final_gate,
-    build_rescue_build_sandbox_root,
-    build_rescue_overlay_workspace_plan,
-    build_rescue_sandbox_config_copy_plan,
-    build_rescue_sandbox_runtime_copy_plan,
-    validate_rescue_build_sandbox_safety,
-)
-from deploy.runner_rescue_debian_live_build_inputs import (
-    build_debian_live_bootloader_templates,
-    build_debian_live_build_inputs_final_gate,
-    build_debian_live_config_structure,
-    build_debian_live_hook_templates,
-    build_debian_live_includes_ch_root,
-    build_debian_live_package_lists,
-    validate_debian_live_build_inputs_safety,
-)
-from deploy.runner_rescue_dry_build_orchestration import (
-    build_rescue_dry_build_final_gate,
-    build_rescue_dry_build_input_resolution,
-    build_rescue_dry_build_stage_graph,
-    build_rescue_package_resolution_plan,
-    simulate_rescue_dry_build_execution,
-    validate_rescue_build_order,
-    validate_rescue_dry_build_safety,
-)
+from core.lazy_imports import lazy_callable
+
+build_rescue_build_cleanup_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_build_cleanup_plan")
+build_rescue_build_sandbox_final_gate = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_build_sandbox_final_gate")
+build_rescue_build_sandbox_root = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_build_sandbox_root")
+build_rescue_overlay_workspace_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_overlay_workspace_plan")
+build_rescue_sandbox_config_copy_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_sandbox_config_copy_plan")
+build_rescue_sandbox_runtime_copy_plan = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "build_rescue_sandbox_runtime_copy_plan")
+validate_rescue_build_sandbox_safety = lazy_callable("deploy.runner_rescue_build_sandbox_preparation", "validate_rescue_build_sandbox_safety")
+build_debian_live_bootloader_templates = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_bootloader_templates")
+build_debian_live_build_inputs_final_gate = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_build_inputs_final_gate")
+build_debian_live_config_structure = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_config_structure")
+build_debian_live_hook_templates = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_hook_templates")
+build_debian_live_includes_ch_root = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_includes_ch_root")
+build_debian_live_package_lists = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "build_debian_live_package_lists")
+validate_debian_live_build_inputs_safety = lazy_callable("deploy.runner_rescue_debian_live_build_inputs", "validate_debian_live_build_inputs_safety")
+build_rescue_dry_build_final_gate = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_dry_build_final_gate")
+build_rescue_dry_build_input_resolution = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_dry_build_input_resolution")
+build_rescue_dry_build_stage_graph = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_dry_build_stage_graph")
+build_rescue_package_resolution_plan = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "build_rescue_package_resolution_plan")
+simulate_rescue_dry_build_execution = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "simulate_rescue_dry_build_execution")
+validate_rescue_build_order = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "validate_rescue_build_order")
+validate_rescue_dry_build_safety = lazy_callable("deploy.runner_rescue_dry_build_orchestration", "validate_rescue_dry_build_safety")
 
 router = APIRouter(tags=["deploy-rescue-plan"])
 
@@ -11,10 +11,12 @@ from typing import Any
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from deploy.runner_rescue_debian_live_build_plan import build_rescue_debian_live_build_plan
-from deploy.runner_rescue_live_os_base_decision import build_rescue_live_os_base_decision
-from deploy.runner_rescue_mvp_scope_gate import build_rescue_mvp_scope_gate
-from deploy.runner_rescue_stick_component_inventory import build_rescue_stick_component_inventory
+from core.lazy_imports import lazy_callable
+
+build_rescue_debian_live_build_plan = lazy_callable("deploy.runner_rescue_debian_live_build_plan", "build_rescue_debian_live_build_plan")
+build_rescue_live_os_base_decision = lazy_callable("deploy.runner_rescue_live_os_base_decision", "build_rescue_live_os_base_decision")
+build_rescue_mvp_scope_gate = lazy_callable("deploy.runner_rescue_mvp_scope_gate", "build_rescue_mvp_scope_gate")
+build_rescue_stick_component_inventory = lazy_callable("deploy.runner_rescue_stick_component_inventory", "build_rescue_stick_component_inventory")
 
 router = APIRouter(tags=["deploy-rescue-readonly"])
 
@@ -10,13 +10,13 @@ from typing import Any
 
 from fastapi import APIRouter
 
-from deploy.runner_api_facade import (
-    build_runner_risk_gate_summary,
-    get_runner_risk_gate_decision,
-    list_runner_never_auto,
-    list_runner_operator_required,
-    list_runner_plan_allowed,
-)
+from core.lazy_imports import lazy_callable
+
+build_runner_risk_gate_summary = lazy_callable("deploy.runner_api_facade", "build_runner_risk_gate_summary")
+get_runner_risk_gate_decision = lazy_callable("deploy.runner_api_facade", "get_runner_risk_gate_decision")
+list_runner_never_auto = lazy_callable("deploy.runner_api_facade", "list_runner_never_auto")
+list_runner_operator_required = lazy_callable("deploy.runner_api_facade", "list_runner_operator_required")
+list_runner_plan_allowed = lazy_callable("deploy.runner_api_facade", "list_runner_plan_allowed")
 
 router = APIRouter(prefix="/runners", tags=["deploy-runners-risk-gate"])
 
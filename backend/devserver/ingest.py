@@ -7,7 +7,9 @@ from typing import Any
 from devserver.config import DevServerConfig
 from devserver.models import default_dev_node, default_dev_report, merge_node_update, new_id, utc_now_iso
 from devserver.redaction import apply_lab_mode_redaction, detect_forbidden_sensitive_fields
-from devserver.storage import DevServerStorage
+from devserver.storage import DevServerStorage, DevServerStorageError
+
+BATCH_MAX_ITEMS = 500
 
 
 def _validate_token(config: DevServerConfig, token: str | None) -> tuple[bool, list[str]]:
@@ -21,6 +23,14 @@ def _validate_token(config: DevServerConfig, token: str | None) -> tuple[bool, l
     return True, []
 
 
+def _lab_mode_error(config: DevServerConfig, lab_mode: str) -> str | None:
+    if lab_mode == "public_rescue" and not config.public_uploads_allowed:
+        return "public_uploads_blocked"
+    if config.mode != "local_lab" and lab_mode == "local_lab":
+        return "local_lab_not_active"
+    return None
+
+
 def ingest_report(
     *,
     config: DevServerConfig,
@@ -44,24 +54,15 @@ def ingest_report(
 
     lab_mode = str(report_data.get("lab_mode") or node_data.get("lab_mode") or "local_lab")
 
-    if lab_mode == "public_rescue" and not config.public_uploads_allowed:
-        return {
-            "code": "DEV_SERVER_REPORT_BLOCKED",
-            "node_id": None,
-            "report_id": None,
-            "redaction_status": None,
-            "warnings": warnings,
-            "errors": ["public_uploads_blocked"],
-        }
-
-    if config.mode != "local_lab" and lab_mode == "local_lab":
+    lab_mode_error = _lab_mode_error(config, lab_mode)
+    if lab_mode_error:
         return {
             "code": "DEV_SERVER_REPORT_BLOCKED",
             "node_id": None,
             "report_id": None,
             "redaction_status": None,
             "warnings": warnings,
-            "errors": ["local_lab_not_active"],
+            "errors": [lab_mode_error],
         }
 
     ok_token, token_errors = _validate_token(config, auth_token)
@@ -84,11 +85,39 @@ def ingest_report(
             "errors": token_errors,
         }
 
+    return _store_report(
+        storage=storage,
+        node_data=node_data,
+        report_data=report_data,
+        lab_mode=lab_mode,
+        warnings=warnings,
+        errors=errors,
+    )
+
+
+def _store_report(
+    *,
+    storage: DevServerStorage,
+    node_data: dict[str, Any],
+    report_data: dict[str, Any],
+    lab_mode: str,
+    warnings: list[str],
+    errors: list[str],
+    node_cache: dict[str, dict[str, Any]] | None = None,
+    audit_sink: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Node aktualisieren und Report speichern (nach bestandenen Request-Prüfungen).
+
+    Mit ``node_cache``/``audit_sink`` (Bulk-Ingest) werden Nodes, Summaries und Audit-Zeilen
+    gesammelt und vom Aufrufer einmal je Batch geschrieben.
+    """
     node_id = str(node_data.get("node_id") or report_data.get("node_id") or "").strip()
     if not node_id:
         node_id = new_id("node")
 
-    existing = storage.load_node(node_id)
+    existing = node_cache.get(node_id) if node_cache is not None else None
+    if existing is None:
+        existing = storage.load_node(node_id)
     if existing:
         node = merge_node_update(existing, node_data)
     else:
@@ -101,7 +130,10 @@ def ingest_report(
         node = merge_node_update(node, node_data)
 
     node["status"] = "online"
-    storage.save_node(node)
+    if node_cache is not None:
+        node_cache[node_id] = node
+    else:
+        storage.save_node(node)
 
     report_id = str(report_data.get("report_id") or new_id("report"))
     report = default_dev_report(
@@ -145,16 +177,20 @@ def ingest_report(
     if not report.get("created_at"):
         report["created_at"] = utc_now_iso()
 
-    storage.save_report(report)
-
-    storage.append_audit_event({
+    audit_event = {
         "at": utc_now_iso(),
         "event_type": "report_ingested",
         "node_id": node_id,
         "report_id": report_id,
         "lab_mode": lab_mode,
         "redaction_status": report.get("redaction_status"),
-    })
+    }
+    if audit_sink is not None:
+        storage.save_report(report, refresh_summary=False)
+        audit_sink.append(audit_event)
+    else:
+        storage.save_report(report)
+        storage.append_audit_event(audit_event)
 
     code = "DEV_SERVER_REPORT_ACCEPTED"
     if report.get("redaction_status") == "redacted":
@@ -168,3 +204,85 @@ def ingest_report(
         "warnings": warnings,
         "errors": errors,
     }
+
+
+def _item_blocked(errors: list[str]) -> dict[str, Any]:
+    return {
+        "code": "DEV_SERVER_REPORT_BLOCKED",
+        "node_id": None,
+        "report_id": None,
+        "redaction_status": None,
+        "warnings": [],
+        "errors": errors,
+    }
+
+
+def ingest_reports_bulk(
+    *,
+    config: DevServerConfig,
+    storage: DevServerStorage,
+    items: list[tuple[dict[str, Any], dict[str, Any]]],
+    auth_token: str | None = None,
+) -> dict[str, Any]:
+    """Mehrere ``(node, report)``-Paare in einem Request annehmen, mit Quittung je Eintrag.
+
+    Freigabe und Token werden einmal geprüft; Nodes, Report-Summary und Audit-Zeilen werden
+    einmal je Batch geschrieben statt je Report. Speicherfehler eines Eintrags (z. B.
+    ungültige ``report_id``) lehnen nur diesen Eintrag ab.
+    """
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"batch too large: {len(items)} > {BATCH_MAX_ITEMS}")
+    if not config.enabled:
+        return {"code": "DEV_SERVER_BATCH_BLOCKED", "items": [], "errors": ["dev_server_disabled"]}
+    ok_token, token_errors = _validate_token(config, auth_token)
+    if not ok_token:
+        return {
+            "code": "DEV_SERVER_BATCH_BLOCKED",
+            "items": [],
+            "redaction_status": "review_required" if "token_required_but_not_configured" in token_errors else None,
+            "errors": token_errors,
+        }
+
+    node_cache: dict[str, dict[str, Any]] = {}
+    audit: list[dict[str, Any]] = []
+    acks: list[dict[str, Any]] = []
+    try:
+        for index, (node_data, report_data) in enumerate(items):
+            lab_mode = str(report_data.get("lab_mode") or node_data.get("lab_mode") or "local_lab")
+            lab_mode_error = _lab_mode_error(config, lab_mode)
+            if lab_mode_error:
+                result: dict[str, Any] = _item_blocked([lab_mode_error])
+            else:
+                try:
+                    result = _store_report(
+                        storage=storage,
+                        node_data=node_data,
+                        report_data=report_data,
+                        lab_mode=lab_mode,
+                        warnings=[],
+                        errors=[],
+                        node_cache=node_cache,
+                        audit_sink=audit,
+                    )
+                except DevServerStorageError as exc:
+                    # z. B. ungültige report_id: nur dieser Eintrag wird abgelehnt, der Rest läuft weiter
+                    result = _item_blocked([str(exc) or "storage_error"])
+                except OSError:
+                    result = _item_blocked(["storage_write_failed"])
+            acks.append({"index": index, "ok": result["code"] != "DEV_SERVER_REPORT_BLOCKED", **result})
+    finally:
+        # Bereits gespeicherte Reports brauchen ihre Nodes und Audit-Zeilen, auch bei Abbruch
+        for node in node_cache.values():
+            storage.save_node(node)
+        if audit:
+            storage.build_reports_summary()
+            storage.append_audit_events(audit)
+    accepted = sum(1 for a in acks if a["ok"])
+    return {
+        "code": "DEV_SERVER_BATCH_ACCEPTED",
+        "count": len(acks),
+        "accepted": accepted,
+        "rejected": len(acks) - accepted,
+        "items": acks,
+        "errors": [],
+    }
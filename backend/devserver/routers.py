@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
+import json
+import zlib
 from typing import Any
 
-from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from pydantic import ValidationError
 
 from devserver.actions import execute_ssh_profile_action
 from devserver.config import DevServerConfig, load_dev_server_config
-from devserver.ingest import ingest_report
+from devserver.ingest import BATCH_MAX_ITEMS, ingest_report, ingest_reports_bulk
 from devserver.models import utc_now_iso
 from devserver.prompt_candidates import build_prompt_candidate_from_reports
-from devserver.schemas import IngestReportRequest, PromptCandidateFromReportsRequest
+from devserver.schemas import IngestBatchRequest, IngestReportRequest, PromptCandidateFromReportsRequest
 from devserver.storage import DevServerStorage
 
 router = APIRouter(prefix="/api/dev-server", tags=["dev-server"])
 
+BATCH_MAX_BODY_BYTES = 64 * 1024 * 1024
+
 
 def _get_config() -> DevServerConfig:
     return load_dev_server_config()
@@ -142,6 +147,52 @@ async def dev_server_ingest_report(
     return result
 
 
+def _decode_batch_body(raw: bytes, content_encoding: str | None) -> bytes:
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        data = raw
+    elif encoding == "gzip":
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            data = inflater.decompress(raw, BATCH_MAX_BODY_BYTES + 1)
+        except zlib.error as exc:
+            raise HTTPException(status_code=400, detail={"code": "DEV_SERVER_BATCH_INVALID", "errors": ["gzip_invalid"]}) from exc
+        if inflater.unconsumed_tail:
+            data += b"x"  # Grenze überschritten
+    else:
+        raise HTTPException(status_code=415, detail={"code": "DEV_SERVER_BATCH_INVALID", "errors": ["unsupported_encoding"]})
+    if len(data) > BATCH_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail={"code": "DEV_SERVER_BATCH_TOO_LARGE", "errors": ["body_too_large"]})
+    return data
+
+
+@router.post("/ingest/batch")
+async def dev_server_ingest_batch(
+    request: Request,
+    x_dev_server_token: str | None = Header(default=None, alias="X-Dev-Server-Token"),
+) -> dict[str, Any]:
+    """Mehrere Reports je Request (optional ``Content-Encoding: gzip``), Quittung je Eintrag."""
+    data = _decode_batch_body(await request.body(), request.headers.get("content-encoding"))
+    try:
+        body = IngestBatchRequest.model_validate(json.loads(data or b"{}"))
+    except (ValueError, ValidationError) as exc:
+        raise HTTPException(status_code=422, detail={"code": "DEV_SERVER_BATCH_INVALID", "errors": ["invalid_body"]}) from exc
+    if len(body.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail={"code": "DEV_SERVER_BATCH_TOO_LARGE", "errors": ["too_many_items"]})
+    config = _get_config()
+    storage = _get_storage(config)
+    result = ingest_reports_bulk(
+        config=config,
+        storage=storage,
+        items=[(item.node, item.report) for item in body.items],
+        auth_token=x_dev_server_token,
+    )
+    if result["code"] == "DEV_SERVER_BATCH_BLOCKED":
+        status = 202 if result.get("redaction_status") == "review_required" else 403
+        raise HTTPException(status_code=status, detail=result)
+    return result
+
+
 @router.get("/actions")
 async def dev_server_list_actions(
     limit: int = Query(default=100, ge=1, le=500),
@@ -171,13 +222,13 @@ async def dev_server_get_action(action_id: str) -> dict[str, Any]:
 async def dev_server_summary() -> dict[str, Any]:
     config = _get_config()
     storage = _get_storage(config)
-    nodes = storage.list_nodes() if config.enabled else []
+    node_status = storage.node_status_counts() if config.enabled else {}
     actions = storage.list_actions(limit=200) if config.enabled else []
-    reports = storage.list_reports(limit=200) if config.enabled else []
+    reports = storage.list_reports(limit=10) if config.enabled else []
 
-    online = sum(1 for n in nodes if n.get("status") == "online")
-    busy = sum(1 for n in nodes if n.get("status") == "busy")
-    error = sum(1 for n in nodes if n.get("status") == "error")
+    online = node_status.get("online", 0)
+    busy = node_status.get("busy", 0)
+    error = node_status.get("error", 0)
     open_actions = [a for a in actions if a.get("status") in ("queued", "running")]
     blocked_actions = [a for a in actions if a.get("status") == "blocked"]
 
@@ -195,7 +246,7 @@ async def dev_server_summary() -> dict[str, Any]:
     return {
         "code": "DEV_SERVER_SUMMARY_OK",
         "enabled": config.enabled,
-        "node_count": len(nodes),
+        "node_count": sum(node_status.values()),
         "online_count": online,
         "busy_count": busy,
         "error_count": error,
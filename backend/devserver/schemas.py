@@ -82,5 +82,9 @@ class IngestReportRequest(BaseModel):
     report: dict[str, Any] = Field(default_factory=dict)
 
 
+class IngestBatchRequest(BaseModel):
+    items: list[IngestReportRequest] = Field(default_factory=list)
+
+
 class PromptCandidateFromReportsRequest(BaseModel):
     report_ids: list[str] = Field(default_factory=list)
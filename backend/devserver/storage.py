@@ -1,14 +1,45 @@
-"""Dateibasierte Persistenz für den Development Server."""
+"""
+Dateibasierte Persistenz für den Development Server.
+
+Eine JSON-Datei je Entity bleibt die Quelle der Wahrheit; Listen, Filter und Summaries laufen über
+den SQLite-Index (``devserver.storage_index``), der bei jedem Save um genau eine Zeile aktualisiert
+wird. Summary-Dateien unter ``latest/`` entstehen aus dem Index statt durch erneutes Lesen aller
+Dateien; die Node-Summary (alle Nodes) wird beim Save höchstens alle
+``NODES_SUMMARY_MIN_INTERVAL_SECONDS`` neu geschrieben. Fällt ein Save in dieses Fenster, schreibt
+ein Nachlauf-Timer die Summary am Fensterende (bzw. ``flush_pending_nodes_summaries`` beim Beenden),
+damit sie nach einem Burst nicht veraltet stehen bleibt.
+"""
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from devserver.storage_index import (
+    ID_FIELDS,
+    INDEX_DB_NAME,
+    INDEX_DIR_NAME,
+    StorageIndex,
+    index_row,
+    open_index,
+)
+
 UTC = timezone.utc
+SUMMARY_LIMIT = 50
+NODES_SUMMARY_MIN_INTERVAL_SECONDS = 5.0
+
+# Node-Summary je Storage-Root (Instanzen entstehen je Request neu): letzter Schreibzeitpunkt und
+# ausstehender Nachlauf
+_nodes_summary_written: dict[Path, float] = {}
+_nodes_summary_pending: dict[Path, threading.Timer] = {}
+_nodes_summary_lock = threading.Lock()
 
 
 class DevServerStorageError(Exception):
@@ -63,176 +94,188 @@ class DevServerStorage:
         self.latest_dir = self.root / "latest"
         self.audit_dir = self.root / "audit"
         self.audit_file = self.audit_dir / "dev_server_events.jsonl"
+        self.index_path = self.root / INDEX_DIR_NAME / INDEX_DB_NAME
+        self._index_obj: StorageIndex | None = None
 
     def _entity_path(self, subdir: Path, entity_id: str) -> Path:
         safe = _validate_id(entity_id, "entity_id")
         return _ensure_under_root(subdir / f"{safe}.json", self.root)
 
+    def _dir_for(self, kind: str) -> Path:
+        return {"node": self.nodes_dir, "report": self.reports_dir, "action": self.actions_dir}[kind]
+
     def ensure_layout(self) -> None:
         for d in (self.nodes_dir, self.reports_dir, self.actions_dir, self.latest_dir, self.audit_dir):
             d.mkdir(parents=True, exist_ok=True)
 
-    def save_node(self, node: dict[str, Any]) -> None:
-        node_id = _validate_id(str(node.get("node_id") or ""), "node_id")
-        path = self._entity_path(self.nodes_dir, node_id)
-        _atomic_write_json(path, node)
-        self.build_nodes_summary()
+    @property
+    def index(self) -> StorageIndex:
+        if self._index_obj is None or not self.index_path.exists():
+            self.ensure_layout()
+            idx, fresh = open_index(self.index_path)
+            if fresh and not idx.is_built():
+                idx.rebuild(self._scan_rows())
+            self._index_obj = idx
+        return self._index_obj
 
-    def load_node(self, node_id: str) -> dict[str, Any] | None:
-        path = self._entity_path(self.nodes_dir, node_id)
+    def _scan_rows(self) -> list[tuple[Any, ...]]:
+        rows: list[tuple[Any, ...]] = []
+        for kind in ID_FIELDS:
+            for fp in sorted(self._dir_for(kind).glob("*.json")):
+                if fp.is_symlink():
+                    continue
+                try:
+                    data = json.loads(fp.read_text(encoding="utf-8"))
+                except (json.JSONDecodeError, OSError):
+                    continue
+                if isinstance(data, dict):
+                    rows.append(index_row(kind, fp.stem, data))
+        return rows
+
+    def rebuild_index(self) -> int:
+        """Index vollständig aus den Entity-Dateien neu aufbauen (nach manuellen Änderungen)."""
+        rows = self._scan_rows()
+        self.index.rebuild(rows)
+        return len(rows)
+
+    def _save(self, kind: str, data: dict[str, Any]) -> str:
+        entity_id = _validate_id(str(data.get(ID_FIELDS[kind]) or ""), ID_FIELDS[kind])
+        path = self._entity_path(self._dir_for(kind), entity_id)
+        _atomic_write_json(path, data)
+        self.index.upsert(kind, entity_id, data)
+        return entity_id
+
+    def _load(self, kind: str, entity_id: str) -> dict[str, Any] | None:
+        path = self._entity_path(self._dir_for(kind), entity_id)
         if not path.is_file():
             return None
         return json.loads(path.read_text(encoding="utf-8"))
 
+    def _list(
+        self,
+        kind: str,
+        *,
+        newest_first: bool,
+        limit: int | None = None,
+        node_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Entities in Dateinamen-Reihenfolge; liest nur die benötigten Dateien."""
+        items: list[dict[str, Any]] = []
+        chunk = max(limit or 0, 100)
+        offset = 0
+        while True:
+            ids = self.index.ids(kind, newest_first=newest_first, limit=chunk, offset=offset, node_id=node_id)
+            for entity_id in ids:
+                try:
+                    data = self._load(kind, entity_id)
+                except (DevServerStorageError, json.JSONDecodeError, OSError):
+                    continue
+                if data is None:
+                    continue
+                if node_id and data.get("node_id") != node_id:
+                    continue
+                items.append(data)
+                if limit is not None and len(items) >= limit:
+                    return items
+            if len(ids) < chunk:
+                return items
+            offset += chunk
+
+    def save_node(self, node: dict[str, Any]) -> None:
+        self._save("node", node)
+        self._refresh_nodes_summary()
+
+    def load_node(self, node_id: str) -> dict[str, Any] | None:
+        return self._load("node", node_id)
+
     def list_nodes(self) -> list[dict[str, Any]]:
-        self.ensure_layout()
-        out: list[dict[str, Any]] = []
-        for fp in sorted(self.nodes_dir.glob("*.json")):
-            if fp.is_symlink():
-                continue
-            try:
-                out.append(json.loads(fp.read_text(encoding="utf-8")))
-            except (json.JSONDecodeError, OSError):
-                continue
-        return out
-
-    def save_report(self, report: dict[str, Any]) -> None:
-        report_id = _validate_id(str(report.get("report_id") or ""), "report_id")
-        path = self._entity_path(self.reports_dir, report_id)
-        _atomic_write_json(path, report)
-        self.build_reports_summary()
+        return self._list("node", newest_first=False)
+
+    def save_report(self, report: dict[str, Any], *, refresh_summary: bool = True) -> None:
+        self._save("report", report)
+        if refresh_summary:
+            self.build_reports_summary()
 
     def load_report(self, report_id: str) -> dict[str, Any] | None:
-        path = self._entity_path(self.reports_dir, report_id)
-        if not path.is_file():
-            return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        return self._load("report", report_id)
 
     def list_reports(self, *, limit: int = 100, node_id: str | None = None) -> list[dict[str, Any]]:
-        self.ensure_layout()
-        items: list[dict[str, Any]] = []
-        for fp in sorted(self.reports_dir.glob("*.json"), reverse=True):
-            if fp.is_symlink():
-                continue
-            try:
-                data = json.loads(fp.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                continue
-            if node_id and data.get("node_id") != node_id:
-                continue
-            items.append(data)
-            if len(items) >= limit:
-                break
-        return items
+        return self._list("report", newest_first=True, limit=limit, node_id=node_id)
 
     def save_action(self, action: dict[str, Any]) -> None:
-        action_id = _validate_id(str(action.get("action_id") or ""), "action_id")
-        path = self._entity_path(self.actions_dir, action_id)
-        _atomic_write_json(path, action)
+        self._save("action", action)
         self.build_actions_summary()
 
     def load_action(self, action_id: str) -> dict[str, Any] | None:
-        path = self._entity_path(self.actions_dir, action_id)
-        if not path.is_file():
-            return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        return self._load("action", action_id)
 
     def list_actions(self, *, limit: int = 100, node_id: str | None = None) -> list[dict[str, Any]]:
-        self.ensure_layout()
-        items: list[dict[str, Any]] = []
-        for fp in sorted(self.actions_dir.glob("*.json"), reverse=True):
-            if fp.is_symlink():
-                continue
-            try:
-                data = json.loads(fp.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                continue
-            if node_id and data.get("node_id") != node_id:
-                continue
-            items.append(data)
-            if len(items) >= limit:
-                break
-        return items
+        return self._list("action", newest_first=True, limit=limit, node_id=node_id)
 
     def append_audit_event(self, event: dict[str, Any]) -> None:
+        self.append_audit_events([event])
+
+    def append_audit_events(self, events: list[dict[str, Any]]) -> None:
         self.ensure_layout()
         if self.audit_file.is_symlink():
             raise DevServerStorageError("symlink_blocked")
-        line = json.dumps(event, sort_keys=True, ensure_ascii=False) + "\n"
+        lines = "".join(json.dumps(e, sort_keys=True, ensure_ascii=False) + "\n" for e in events)
         with self.audit_file.open("a", encoding="utf-8") as fh:
-            fh.write(line)
+            fh.write(lines)
+
+    def _refresh_nodes_summary(self) -> None:
+        with _nodes_summary_lock:
+            last = _nodes_summary_written.get(self.root)
+            wait = 0.0 if last is None else NODES_SUMMARY_MIN_INTERVAL_SECONDS - (time.monotonic() - last)
+            if wait > 0:
+                if self.root not in _nodes_summary_pending:
+                    timer = threading.Timer(wait, _write_pending_nodes_summary, (self.root,))
+                    timer.daemon = True
+                    _nodes_summary_pending[self.root] = timer
+                    timer.start()
+                return
+        self.build_nodes_summary()
 
     def build_nodes_summary(self) -> dict[str, Any]:
-        nodes = self.list_nodes()
+        nodes = self.index.summaries("node", newest_first=False)
         summary = {
             "generated_at": datetime.now(tz=UTC).replace(microsecond=0).isoformat(),
             "count": len(nodes),
-            "nodes": [
-                {
-                    "node_id": n.get("node_id"),
-                    "display_name": n.get("display_name"),
-                    "status": n.get("status"),
-                    "last_seen_at": n.get("last_seen_at"),
-                    "node_kind": n.get("node_kind"),
-                }
-                for n in nodes
-            ],
+            "nodes": nodes,
         }
         _atomic_write_json(self.latest_dir / "nodes_summary.json", summary)
+        with _nodes_summary_lock:
+            _nodes_summary_written[self.root] = time.monotonic()
+            pending = _nodes_summary_pending.pop(self.root, None)
+        if pending is not None:
+            pending.cancel()
         return summary
 
     def build_reports_summary(self) -> dict[str, Any]:
-        reports = self.list_reports(limit=200)
         summary = {
             "generated_at": datetime.now(tz=UTC).replace(microsecond=0).isoformat(),
-            "count": len(reports),
-            "reports": [
-                {
-                    "report_id": r.get("report_id"),
-                    "node_id": r.get("node_id"),
-                    "report_type": r.get("report_type"),
-                    "created_at": r.get("created_at"),
-                    "redaction_status": r.get("redaction_status"),
-                }
-                for r in reports[:50]
-            ],
+            "count": self.index.count("report"),
+            "reports": self.index.summaries("report", newest_first=True, limit=SUMMARY_LIMIT),
         }
         _atomic_write_json(self.latest_dir / "reports_summary.json", summary)
         return summary
 
     def build_actions_summary(self) -> dict[str, Any]:
-        actions = self.list_actions(limit=200)
         summary = {
             "generated_at": datetime.now(tz=UTC).replace(microsecond=0).isoformat(),
-            "count": len(actions),
-            "actions": [
-                {
-                    "action_id": a.get("action_id"),
-                    "node_id": a.get("node_id"),
-                    "action_type": a.get("action_type"),
-                    "status": a.get("status"),
-                    "requested_at": a.get("requested_at"),
-                }
-                for a in actions[:50]
-            ],
+            "count": self.index.count("action"),
+            "actions": self.index.summaries("action", newest_first=True, limit=SUMMARY_LIMIT),
         }
         _atomic_write_json(self.latest_dir / "actions_summary.json", summary)
         return summary
 
+    def node_status_counts(self) -> dict[str, int]:
+        """Nodes je Status aus dem Index (ohne Dateien zu lesen)."""
+        return self.index.status_counts("node")
+
     def reports_last_24h_count(self) -> int:
         cutoff = datetime.now(tz=UTC) - timedelta(hours=24)
-        count = 0
-        for r in self.list_reports(limit=500):
-            created = str(r.get("created_at") or "")
-            try:
-                ts = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=UTC)
-            except ValueError:
-                continue
-            if ts >= cutoff:
-                count += 1
-        return count
+        return self.index.count("report", since_ts=cutoff.timestamp())
 
     def storage_ok(self) -> bool:
         try:
@@ -243,3 +286,27 @@ class DevServerStorage:
             return True
         except (DevServerStorageError, OSError):
             return False
+
+
+def _write_pending_nodes_summary(root: Path) -> None:
+    with _nodes_summary_lock:
+        _nodes_summary_pending.pop(root, None)
+    if not root.is_dir():
+        return  # Ablage inzwischen entfernt: nicht neu anlegen
+    try:
+        DevServerStorage(root).build_nodes_summary()
+    except (DevServerStorageError, OSError, sqlite3.Error):
+        pass
+
+
+def flush_pending_nodes_summaries() -> None:
+    """Ausstehende Node-Summaries sofort schreiben (Shutdown)."""
+    with _nodes_summary_lock:
+        pending = list(_nodes_summary_pending.items())
+        _nodes_summary_pending.clear()
+    for root, timer in pending:
+        timer.cancel()
+        _write_pending_nodes_summary(root)
+
+
+atexit.register(flush_pending_nodes_summaries)
@@ -0,0 +1,189 @@
+"""
+SQLite-Index über die JSON-Dateien des Development Servers.
+
+Die Entity-Dateien unter ``nodes/``, ``reports/`` und ``actions/`` bleiben die Quelle der Wahrheit;
+der Index hält je Entity eine Zeile mit den Feldern, die Listen, Filter und Summaries brauchen
+(Dateiname als Sortierschlüssel, node_id, Status, Zeitstempel, Summary-Auszug). Ein Save aktualisiert
+genau eine Zeile – die Kosten hängen nicht mehr von der Zahl der gespeicherten Entities ab.
+
+Fehlt der Index (Altbestand, gelöscht), wird er beim Öffnen einmal aus den Dateien aufgebaut.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+from core.sqlite_registry import ConnectionRegistry, iso_epoch, open_wal_connection
+
+INDEX_DIR_NAME = "index"
+INDEX_DB_NAME = "devserver_index.db"
+INDEX_SCHEMA_VERSION = 1
+_INSERT_SQL = "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+# Felder je Entity-Art, die in Summaries erscheinen (Reihenfolge wie in den Summary-Dateien)
+SUMMARY_FIELDS: dict[str, tuple[str, ...]] = {
+    "node": ("node_id", "display_name", "status", "last_seen_at", "node_kind"),
+    "report": ("report_id", "node_id", "report_type", "created_at", "redaction_status"),
+    "action": ("action_id", "node_id", "action_type", "status", "requested_at"),
+}
+ID_FIELDS = {"node": "node_id", "report": "report_id", "action": "action_id"}
+TIME_FIELDS = {"node": "last_seen_at", "report": "created_at", "action": "requested_at"}
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    node_id TEXT,
+    status TEXT,
+    ts REAL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (kind, entity_id)
+);
+CREATE INDEX IF NOT EXISTS idx_entities_kind_file ON entities(kind, file_name);
+CREATE INDEX IF NOT EXISTS idx_entities_kind_node_file ON entities(kind, node_id, file_name);
+CREATE INDEX IF NOT EXISTS idx_entities_kind_status ON entities(kind, status);
+CREATE INDEX IF NOT EXISTS idx_entities_kind_ts ON entities(kind, ts);
+CREATE TABLE IF NOT EXISTS kind_counts (kind TEXT PRIMARY KEY, n INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def index_row(kind: str, entity_id: str, data: dict[str, Any]) -> tuple[Any, ...]:
+    summary = {f: data.get(f) for f in SUMMARY_FIELDS[kind]}
+    return (
+        kind,
+        entity_id,
+        f"{entity_id}.json",
+        str(data.get("node_id") or "") or None,
+        str(data.get("status") or "") or None,
+        iso_epoch(data.get(TIME_FIELDS[kind])),
+        json.dumps(summary, ensure_ascii=False, sort_keys=True),
+    )
+
+
+class StorageIndex:
+    """Eine Verbindung je Storage-Root; Zugriffe über ein Lock serialisiert."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = open_wal_connection(db_path, isolation_level=None)
+        self._conn.executescript(_SCHEMA_SQL)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def is_built(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        return bool(row) and row[0] == str(INDEX_SCHEMA_VERSION)
+
+    def rebuild(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        rows = list(rows)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM entities")
+                self._conn.execute("DELETE FROM kind_counts")
+                self._conn.executemany(_INSERT_SQL, rows)
+                self._conn.execute("INSERT INTO kind_counts SELECT kind, COUNT(*) FROM entities GROUP BY kind")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(INDEX_SCHEMA_VERSION),),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def upsert(self, kind: str, entity_id: str, data: dict[str, Any]) -> None:
+        """Eine Zeile schreiben; der Zähler je Art wächst nur bei neuen Entities."""
+        row = index_row(kind, entity_id, data)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM entities WHERE kind = ? AND entity_id = ?", (kind, entity_id)
+                ).fetchone()
+                self._conn.execute(_INSERT_SQL, row)
+                if not exists:
+                    self._conn.execute(
+                        "INSERT INTO kind_counts (kind, n) VALUES (?, 1) ON CONFLICT(kind) DO UPDATE SET n = n + 1",
+                        (kind,),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def ids(
+        self,
+        kind: str,
+        *,
+        newest_first: bool,
+        limit: int | None = None,
+        offset: int = 0,
+        node_id: str | None = None,
+    ) -> list[str]:
+        """Entity-IDs in Dateinamen-Reihenfolge (wie ``sorted(glob)``), optional je Node."""
+        sql = "SELECT entity_id FROM entities WHERE kind = ?"
+        params: list[Any] = [kind]
+        if node_id:
+            sql += " AND node_id = ?"
+            params.append(node_id)
+        sql += " ORDER BY file_name DESC" if newest_first else " ORDER BY file_name"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend((int(limit), int(offset)))
+        with self._lock:
+            return [r[0] for r in self._conn.execute(sql, params).fetchall()]
+
+    def summaries(self, kind: str, *, newest_first: bool, limit: int | None = None) -> list[dict[str, Any]]:
+        sql = "SELECT summary FROM entities WHERE kind = ? ORDER BY file_name" + (" DESC" if newest_first else "")
+        params: list[Any] = [kind]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def count(self, kind: str, *, status: str | None = None, since_ts: float | None = None) -> int:
+        if status is None and since_ts is None:
+            with self._lock:
+                row = self._conn.execute("SELECT n FROM kind_counts WHERE kind = ?", (kind,)).fetchone()
+            return int(row[0]) if row else 0
+        sql = "SELECT COUNT(*) FROM entities WHERE kind = ?"
+        params: list[Any] = [kind]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        if since_ts is not None:
+            sql += " AND ts >= ?"
+            params.append(float(since_ts))
+        with self._lock:
+            return int(self._conn.execute(sql, params).fetchone()[0])
+
+    def status_counts(self, kind: str) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM entities WHERE kind = ? GROUP BY status", (kind,)
+            ).fetchall()
+        return {str(s or ""): int(n) for s, n in rows}
+
+
+_indexes: ConnectionRegistry[StorageIndex] = ConnectionRegistry()
+
+
+def open_index(db_path: Path) -> tuple[StorageIndex, bool]:
+    """Gemeinsamer Index je Pfad; zweiter Wert: frisch geöffnet (Aufbau ggf. nötig)."""
+    return _indexes.get(db_path, lambda: StorageIndex(db_path))
+
+
+def close_indexes() -> None:
+    _indexes.close_all()
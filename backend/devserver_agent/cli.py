@@ -9,7 +9,13 @@ import sys
 from pathlib import Path
 from typing import Any
 
-from devserver_agent.client import health_check, post_report, validate_server_health
+from devserver_agent.client import (
+    DevServerConnection,
+    health_check,
+    post_report,
+    post_reports_batch,
+    validate_server_health,
+)
 from devserver_agent.collector import build_dev_node_from_config, build_dev_report_from_collection
 from devserver_agent.config import load_dev_agent_config, validate_server_url
 from devserver_agent.models import resolve_node_identity
@@ -21,7 +27,7 @@ from devserver_agent.rescue_profile import (
     validate_developer_profile,
     validate_public_profile_guard,
 )
-from devserver_agent.spool import AgentSpool
+from devserver_agent.spool import DEFAULT_RETRY_BATCH_SIZE, AgentSpool
 
 EXIT_OK = 0
 EXIT_DISABLED = 10
@@ -363,7 +369,45 @@ def cmd_spool_retry(args: argparse.Namespace) -> int:
             return {"ok": False, "code": "redaction_failed"}
         return post_report(cfg.server_url, node, report, cfg.token, timeout=cfg.timeout_seconds)
 
-    out = spool.retry_spooled_reports(upload_fn=_upload)
+    batch_size = int(getattr(args, "spool_batch_size", None) or DEFAULT_RETRY_BATCH_SIZE)
+    if batch_size <= 1:
+        out = spool.retry_spooled_reports(upload_fn=_upload)
+        _emit({"code": "DEV_AGENT_SPOOL_RETRY", **out}, as_json=args.json)
+        return EXIT_OK
+
+    unsupported: list[bool] = []
+
+    def _upload_batch(items: list[tuple[dict, dict]]) -> dict:
+        # Redaction je Eintrag; blockierte Einträge gehen nicht über die Leitung
+        sendable: list[tuple[int, dict, dict]] = []
+        acks: list[dict] = []
+        for i, (node, report) in enumerate(items):
+            report, _, errors = enforce_mode_redaction(cfg.mode, report)
+            if errors:
+                acks.append({"index": i, "ok": False, "code": "redaction_failed"})
+            else:
+                sendable.append((i, node, report))
+        if not sendable:
+            return {"ok": True, "items": acks}
+        out = post_reports_batch(
+            cfg.server_url,
+            [(node, report) for _i, node, report in sendable],
+            cfg.token,
+            timeout=cfg.timeout_seconds,
+            connection=conn,
+        )
+        if out.get("http_status") in (404, 405):
+            unsupported.append(True)  # älterer Server ohne Batch-Endpunkt
+        for ack in out.get("items") or []:
+            pos = int(ack.get("index", -1))
+            if 0 <= pos < len(sendable):
+                acks.append({**ack, "index": sendable[pos][0]})
+        return {**out, "items": acks}
+
+    with DevServerConnection(cfg.server_url, timeout=cfg.timeout_seconds) as conn:
+        out = spool.retry_spooled_reports_batched(upload_batch_fn=_upload_batch, batch_size=batch_size)
+    if unsupported:
+        out = spool.retry_spooled_reports(upload_fn=_upload)
     _emit({"code": "DEV_AGENT_SPOOL_RETRY", **out}, as_json=args.json)
     return EXIT_OK
 
@@ -386,6 +430,7 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--display-name")
     p.add_argument("--spool-list", action="store_true")
     p.add_argument("--spool-retry", action="store_true")
+    p.add_argument("--spool-batch-size", type=int, default=DEFAULT_RETRY_BATCH_SIZE)
     p.add_argument("--validate-rescue-profile", action="store_true")
     p.add_argument("--rescue-iso-dry-build", action="store_true")
     p.add_argument("--developer-profile-root")
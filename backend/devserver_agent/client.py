@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import gzip
+import http.client
 import json
 import logging
 import urllib.error
@@ -12,6 +14,7 @@ from urllib.parse import urlparse
 logger = logging.getLogger(__name__)
 
 INGEST_PATH = "/api/dev-server/ingest/report"
+BATCH_INGEST_PATH = "/api/dev-server/ingest/batch"
 HEALTH_PATH = "/api/dev-server/health"
 LAB_PROXY_HOST_HEADER = "127.0.0.1:8000"
 
@@ -153,3 +156,138 @@ def post_report(
         "method": "POST",
         "host_header": effective_host,
     }
+
+
+class DevServerConnection:
+    """Persistente HTTP/1.1-Verbindung (Keep-Alive) für viele Requests an denselben Server.
+
+    Bei abgerissener Verbindung wird einmal neu verbunden; weitere Fehler liefern ``(0, None, err)``
+    wie ``_request_json``.
+    """
+
+    def __init__(self, server_url: str, *, timeout: float = 5.0, host_header: str | None = None) -> None:
+        parsed = urlparse((server_url or "").strip())
+        self.base_url = server_url.rstrip("/")
+        self.scheme = parsed.scheme or "http"
+        self.host = parsed.hostname or ""
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.host_header = host_header or lab_proxy_host_header_for_url(server_url)
+        self._conn: http.client.HTTPConnection | None = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._conn = cls(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "DevServerConnection":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def request_json(
+        self,
+        path: str,
+        *,
+        method: str = "POST",
+        body: dict[str, Any] | None = None,
+        token: str | None = None,
+        compress: bool = True,
+    ) -> tuple[int, dict[str, Any] | None, str | None]:
+        headers = {"Content-Type": "application/json", "Accept": "application/json", "Connection": "keep-alive"}
+        if self.host_header:
+            headers["Host"] = self.host_header
+        if token:
+            headers["X-Dev-Server-Token"] = token
+        data = b""
+        if body is not None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            if compress:
+                data = gzip.compress(data, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+        for attempt in (0, 1):
+            conn = self._connect()
+            try:
+                # skip_host: Host-Header ggf. selbst setzen (Lab-Proxy)
+                conn.putrequest(method, self.base_path + path, skip_host=bool(self.host_header), skip_accept_encoding=True)
+                for key, value in headers.items():
+                    conn.putheader(key, value)
+                conn.putheader("Content-Length", str(len(data)))
+                conn.endheaders(data)
+                resp = conn.getresponse()
+                raw = resp.read().decode("utf-8", errors="replace")
+                if resp.will_close:
+                    self.close()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as exc:
+                self.close()
+                if attempt == 0:
+                    continue
+                return 0, None, str(exc)
+            except TimeoutError:
+                self.close()
+                return 0, None, "timeout"
+            except (OSError, http.client.HTTPException) as exc:
+                self.close()
+                return 0, None, str(exc)
+            try:
+                parsed = json.loads(raw) if raw.strip() else {}
+            except json.JSONDecodeError:
+                parsed = {"detail": raw}
+            return resp.status, parsed, None
+        return 0, None, "connection_failed"
+
+
+def post_reports_batch(
+    server_url: str,
+    items: list[tuple[dict[str, Any], dict[str, Any]]],
+    token: str | None = None,
+    *,
+    timeout: float = 5.0,
+    host_header: str | None = None,
+    connection: DevServerConnection | None = None,
+) -> dict[str, Any]:
+    """Mehrere Reports in einem gzip-komprimierten Request; ``items`` enthält die Quittung je Eintrag."""
+    url = server_url.rstrip("/") + BATCH_INGEST_PATH
+    conn = connection or DevServerConnection(server_url, timeout=timeout, host_header=host_header)
+    try:
+        body = {"items": [{"node": node, "report": report} for node, report in items]}
+        status, parsed, err = conn.request_json(BATCH_INGEST_PATH, body=body, token=token)
+    finally:
+        if connection is None:
+            conn.close()
+    base = {"http_status": status, "url": url, "method": "POST", "host_header": conn.host_header}
+    if err:
+        logger.warning("dev_agent batch upload failed: %s", err[:200])
+        return {"ok": False, "code": "DEV_AGENT_UPLOAD_FAILED", "error": err, "items": [], **base}
+    if status == 200 and isinstance(parsed, dict):
+        return {
+            "ok": True,
+            "code": parsed.get("code", "DEV_SERVER_BATCH_ACCEPTED"),
+            "error": None,
+            "items": list(parsed.get("items") or []),
+            **base,
+        }
+    detail = parsed.get("detail") if isinstance(parsed, dict) else parsed
+    if isinstance(detail, dict):
+        return {
+            "ok": False,
+            "code": detail.get("code", "DEV_AGENT_UPLOAD_BLOCKED"),
+            "error": ",".join(detail.get("errors") or []) or "upload_blocked",
+            "items": [],
+            **base,
+        }
+    return {
+        "ok": False,
+        "code": "DEV_AGENT_UPLOAD_FAILED",
+        "error": str(detail) if detail else f"http_{status}",
+        "items": [],
+        **base,
+    }
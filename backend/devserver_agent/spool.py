@@ -10,6 +10,7 @@ from typing import Any
 
 UTC = timezone.utc
 MAX_SPOOL_FILE_BYTES = 512 * 1024
+DEFAULT_RETRY_BATCH_SIZE = 200
 
 
 class AgentSpoolError(Exception):
@@ -125,3 +126,54 @@ class AgentSpool:
             except (json.JSONDecodeError, OSError, AgentSpoolError) as exc:
                 results.append({"filename": fp.name, "ok": False, "error": str(exc)})
         return {"retried": len(results), "results": results}
+
+    def retry_spooled_reports_batched(
+        self,
+        *,
+        upload_batch_fn,
+        batch_size: int = DEFAULT_RETRY_BATCH_SIZE,
+    ) -> dict[str, Any]:
+        """Spool blockweise hochladen: ``upload_batch_fn(items)`` erhält ``[(node, report), ...]``.
+
+        Jede Datei wird genau einmal gelesen; gelöscht wird nur, was der Server je Eintrag
+        quittiert hat. Scheitert ein Block als Ganzes, bleibt der Rest liegen.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        size = max(1, int(batch_size))
+        results: list[dict[str, Any]] = []
+        pending: list[tuple[Path, dict[str, Any], dict[str, Any]]] = []
+        aborted: dict[str, Any] | None = None
+
+        def _flush() -> bool:
+            nonlocal aborted
+            if not pending:
+                return True
+            out = upload_batch_fn([(node, report) for _fp, node, report in pending])
+            acks = {int(a.get("index", -1)): a for a in out.get("items") or [] if isinstance(a, dict)}
+            if not out.get("ok"):
+                aborted = {"code": out.get("code"), "error": out.get("error"), "http_status": out.get("http_status")}
+            for i, (fp, _node, _report) in enumerate(pending):
+                ack = acks.get(i) or {}
+                ok = bool(out.get("ok") and ack.get("ok"))
+                if ok:
+                    fp.unlink(missing_ok=True)
+                results.append({"filename": fp.name, "ok": ok, "code": ack.get("code") or out.get("code")})
+            pending.clear()
+            return aborted is None
+
+        with os.scandir(self.root) as it:
+            # DirEntry liefert den Symlink-Status ohne weiteren stat()-Aufruf
+            names = sorted(e.name for e in it if e.name.endswith(".json") and not e.is_symlink())
+        for name in names:
+            fp = self.root / name
+            try:
+                data = json.loads(fp.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as exc:
+                results.append({"filename": fp.name, "ok": False, "error": str(exc)})
+                continue
+            pending.append((fp, data.get("node") or {}, data.get("report") or {}))
+            if len(pending) >= size and not _flush():
+                break
+        if aborted is None:
+            _flush()
+        return {"retried": len(results), "results": results, "aborted": aborted}
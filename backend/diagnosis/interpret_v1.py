@@ -3,6 +3,7 @@ Interpreter – regelbasiert, gekapselt.
 
 INTERPRETER_VERSION bei ausgabe-relevanten Änderungen erhöhen.
 Regeln: erste passende Regel gewinnt (Priorität = Reihenfolge in RULES_V1).
+Vorauswahl über ``RULE_AREAS`` – je Anfrage laufen nur die Regeln des passenden Bereichs.
 
 Übergang: Firewall-Regeln noch ``localization_model=legacy`` (Freitexte);
 Webserver-Port, Backup-Verify, System-Backend und generischer Fallback nutzen ``key_v1``
@@ -91,6 +92,43 @@ def _snapshot_source(req: DiagnosisInterpretRequest) -> dict:
     return out
 
 
+def _any_of(*patterns: str) -> "re.Pattern[str]":
+    """Alternativen einmalig zu einem Regex kompilieren (ein Durchlauf statt je Muster)."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+_FIREWALL_PORT_RE = _any_of(
+    "could not add",
+    "already exists",
+    "bereits",
+    "schon vorhanden",
+    "address already in use",
+    "bind",
+    "belegt",
+    "port.*in use",
+)
+
+_WEBSERVER_PORT_RE = _any_of(
+    r"address already in use",
+    r"eaddrinuse",
+    r"already in use",
+    r"port.+already",
+    r"could not bind",
+    r"unable to bind",
+    r"bind failed",
+    r"bind:.+address",
+    r"socket.+in use",
+    r"listen.+failed",
+    r"\b:80\b",
+    r"\b:443\b",
+    r"\bport 80\b",
+    r"\bport 443\b",
+    r"\b98:\s*address",
+    r"adresse.*bereits.*verwendung",
+    r"port.*belegt",
+)
+
+
 def _rule_firewall_sudo(req: DiagnosisInterpretRequest) -> Optional[DiagnosisRecord]:
     if req.area != "firewall":
         return None
@@ -129,18 +167,7 @@ def _rule_firewall_port_conflict(req: DiagnosisInterpretRequest) -> Optional[Dia
     if req.api_status != "error":
         return None
     raw = req.message or ""
-    low = raw.lower()
-    patterns = (
-        "could not add",
-        "already exists",
-        "bereits",
-        "schon vorhanden",
-        "address already in use",
-        "bind",
-        "belegt",
-        "port.*in use",
-    )
-    if not any(re.search(p, low) for p in patterns):
+    if not _FIREWALL_PORT_RE.search(raw.lower()):
         return None
     return DiagnosisRecord(
         interpreter_version=INTERPRETER_VERSION,
@@ -291,27 +318,7 @@ def _rule_webserver_port_conflict(req: DiagnosisInterpretRequest) -> Optional[Di
     if req.event_type not in ("configure_failed", "api_error"):
         return None
     raw = req.message or ""
-    low = raw.lower()
-    patterns = (
-        r"address already in use",
-        r"eaddrinuse",
-        r"already in use",
-        r"port.+already",
-        r"could not bind",
-        r"unable to bind",
-        r"bind failed",
-        r"bind:.+address",
-        r"socket.+in use",
-        r"listen.+failed",
-        r"\b:80\b",
-        r"\b:443\b",
-        r"\bport 80\b",
-        r"\bport 443\b",
-        r"\b98:\s*address",
-        r"adresse.*bereits.*verwendung",
-        r"port.*belegt",
-    )
-    if not any(re.search(p, low) for p in patterns):
+    if not _WEBSERVER_PORT_RE.search(raw.lower()):
         return None
     ev: dict[str, Any] = {}
     if req.extra.get("server_type"):
@@ -425,8 +432,32 @@ RULES_V1: tuple[RuleFn, ...] = (
 )
 
 
+# Bereich je Regel (jede Regel prüft ``req.area`` als erste Bedingung); neue Regeln hier eintragen.
+RULE_AREAS: dict[RuleFn, str] = {
+    _rule_firewall_sudo: "firewall",
+    _rule_firewall_port_conflict: "firewall",
+    _rule_firewall_generic: "firewall",
+    _rule_webserver_port_conflict: "webserver",
+    _rule_system_backend_unreachable: "system",
+    _rule_backup_verify_failed: "backup_restore",
+}
+
+
+def _rules_by_area(rules: tuple[RuleFn, ...]) -> dict[Optional[str], tuple[RuleFn, ...]]:
+    """Regeln je Bereich in RULES_V1-Reihenfolge; Regeln ohne Bereich gelten überall."""
+    areas = {RULE_AREAS.get(r) for r in rules} - {None}
+    return {
+        area: tuple(r for r in rules if RULE_AREAS.get(r) in (area, None))
+        for area in areas | {None}
+    }
+
+
+_RULES_BY_AREA = _rules_by_area(RULES_V1)
+
+
 def interpret_v1(req: DiagnosisInterpretRequest) -> DiagnosisRecord:
-    for rule in RULES_V1:
+    rules = _RULES_BY_AREA.get(req.area) or _RULES_BY_AREA[None]
+    for rule in rules:
         hit = rule(req)
         if hit is not None:
             return hit
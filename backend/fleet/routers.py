@@ -50,17 +50,23 @@ async def fleet_list_sessions(
     assert_no_forbidden_routes("/sessions")
     if not fleet_sessions_enabled():
         return _fleet_disabled_response() | {"code": "FLEET_SESSION_LIST_OK"}
-    detect_stale_sessions()
-    return list_fleet_sessions(limit=limit, include_finished=include_finished)
+    try:
+        detect_stale_sessions()
+        return list_fleet_sessions(limit=limit, include_finished=include_finished)
+    except FleetSessionError as exc:
+        raise _handle_error(exc) from exc
 
 
 @router.get("/sessions/summary")
 async def fleet_sessions_summary() -> dict[str, Any]:
     assert_no_forbidden_routes("/sessions/summary")
-    if not fleet_sessions_enabled():
-        return _fleet_disabled_response() | build_fleet_session_summary()
-    detect_stale_sessions()
-    return build_fleet_session_summary()
+    try:
+        if not fleet_sessions_enabled():
+            return _fleet_disabled_response() | build_fleet_session_summary()
+        detect_stale_sessions()
+        return build_fleet_session_summary()
+    except FleetSessionError as exc:
+        raise _handle_error(exc) from exc
 
 
 @router.get("/sessions/{session_id}")
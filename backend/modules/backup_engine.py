@@ -317,9 +317,15 @@ def create_image_backup(
     allowed_output_prefixes: Sequence[Path],
     runner: Callable[..., subprocess.CompletedProcess[str]] | None = None,
     dd_bs: str = "4M",
+    used_blocks_only: bool = False,
+    layout_device: str | Path | None = None,
 ) -> ImageBackupResult:
     """
     Rohabbild mit dd (nur allowlisted Blockgeräte). output_file muss unter allowed_output_prefixes liegen.
+
+    ``used_blocks_only``: statt dd nur belegte Blöcke (ext/vfat/ntfs-Bitmap) in einen
+    komprimierten Container mit Blockkarte (``modules.used_blocks_image``). Mit
+    ``layout_device`` (Whole-Disk) wird ``sfdisk -d`` ins eingebettete Manifest übernommen.
     """
     try:
         validate_write_target(target_device, runner=runner)
@@ -329,6 +335,16 @@ def create_image_backup(
     _assert_output_allowed(out, allowed_output_prefixes)
 
     dev = str(target_device)
+    if used_blocks_only:
+        from modules.used_blocks_image import UsedBlocksImageError, write_used_blocks_image
+
+        try:
+            manifest = create_manifest(None, partition_device=layout_device, runner=runner)
+            manifest["source_device"] = dev
+            write_used_blocks_image(dev, out, manifest=manifest)
+        except (OSError, RuntimeError, UsedBlocksImageError, WriteTargetProtectionError) as e:
+            return ImageBackupResult(False, None, K_DD_FAILED, str(e)[:2000])
+        return ImageBackupResult(True, str(out), K_OPERATION_OK, None)
     argv = [
         "dd",
         f"if={dev}",
@@ -0,0 +1,452 @@
+"""
+Klon-Engine: rsync des laufenden Systems auf ein ext4-Ziel mit Live-Fortschritt und Abbruch.
+
+- Wiedererkennung: nach erfolgreichem Klon liegt auf dem Ziel ``CLONE_MARKER_REL`` mit der
+  ``machine-id`` der Quelle (geschrieben mit demselben sudo-Präfix wie rsync; ein Fehlschlag wird
+  als ``CloneMarkerResult`` gemeldet). Erkennt der nächste Klon diesen Marker, läuft nur ein Delta-Sync
+  (``--delete``, unveränderte Dateien überspringt rsync per Größe/mtime); sonst Vollklon
+  wie bisher (ohne ``--delete``, fremde Daten auf dem Ziel bleiben unangetastet).
+- Fortschritt: ``--info=progress2`` wird zeilenweise (``\\r``) gelesen und in den Job-State
+  (``progress_optional``) geschrieben.
+- Abbruch: jeder rsync läuft in eigener Prozessgruppe (``start_new_session``); bei
+  ``cancel_event`` werden alle Gruppen mit SIGTERM (danach SIGKILL) beendet.
+- Parallelität: große Top-Level-Bäume (``/usr``, ``/var``, …) auf demselben Dateisystem wie
+  ``/`` laufen auf Mehrkern-Systemen als eigene rsync-Worker; der Rest in einem Lauf mit
+  diesen Bäumen als Exclude. Hardlinks werden nur innerhalb eines Worker-Baums erhalten.
+
+fstab/cmdline.txt-Anpassung und Mount/Unmount bleiben beim Aufrufer (``app._do_clone_logic``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+CLONE_MARKER_REL = "var/lib/setuphelfer/clone-origin.json"
+CLONE_MARKER_KIND = "setuphelfer-clone-origin"
+DEFAULT_SPLIT_TREES = ("usr", "var", "home", "opt", "srv")
+MAX_PARALLEL_WORKERS = 4
+RSYNC_BASE_FLAGS = ("-axHAWXS", "--numeric-ids", "--info=progress2")
+POLL_INTERVAL_SEC = 0.5
+TERM_GRACE_SEC = 5.0
+
+_PROGRESS2_RE = re.compile(
+    r"^\s*(?P<bytes>[\d.,']+)(?P<unit>[KMGT]?)\s+(?P<pct>\d{1,3})%\s+(?P<rate>\S+/s)\s+(?P<eta>\d+:\d{2}:\d{2})"
+    r"(?:\s+\(xfr#(?P<xfr>\d+),\s*(?:ir|to)-chk=(?P<chk_left>\d+)/(?P<chk_total>\d+)\))?"
+)
+
+PopenFactory = Callable[..., subprocess.Popen]
+
+
+def parse_progress2_line(line: str) -> dict[str, Any] | None:
+    """Eine ``--info=progress2``-Zeile → ``{bytes, pct, rate, eta, xfr, chk_left, chk_total}``."""
+    m = _PROGRESS2_RE.match(line or "")
+    if not m:
+        return None
+    raw = m.group("bytes")
+    unit = m.group("unit")
+    if unit:
+        # ``--human-readable``: Dezimalpunkt/-komma, Einheiten zur Basis 1000 (rsync-Standard).
+        try:
+            nbytes = int(float(raw.replace(",", ".")) * 1000 ** ("KMGT".index(unit) + 1))
+        except ValueError:
+            return None
+    else:
+        digits = re.sub(r"\D", "", raw)
+        if not digits:
+            return None
+        nbytes = int(digits)
+    out: dict[str, Any] = {
+        "bytes": nbytes,
+        "pct": min(100, int(m.group("pct"))),
+        "rate": m.group("rate"),
+        "eta": m.group("eta"),
+    }
+    for key in ("xfr", "chk_left", "chk_total"):
+        val = m.group(key)
+        out[key] = int(val) if val is not None else None
+    return out
+
+
+# --- Ziel-Wiedererkennung ---------------------------------------------------
+
+
+def read_machine_id(root: str | Path = "/") -> str | None:
+    for rel in ("etc/machine-id", "var/lib/dbus/machine-id"):
+        try:
+            mid = (Path(root) / rel).read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+        if re.fullmatch(r"[0-9a-f]{32}", mid):
+            return mid
+    return None
+
+
+def read_clone_marker(mountpoint: str | Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads((Path(mountpoint) / CLONE_MARKER_REL).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("kind") != CLONE_MARKER_KIND:
+        return None
+    return data
+
+
+def is_incremental_target(marker: dict[str, Any] | None, source_machine_id: str | None) -> bool:
+    """Delta-Sync nur, wenn das Ziel nachweislich von genau dieser Quelle geklont wurde."""
+    if not marker or not source_machine_id:
+        return False
+    return marker.get("source_machine_id") == source_machine_id
+
+
+@dataclass(frozen=True)
+class CloneMarkerResult:
+    written: bool
+    path: str
+    detail: str = ""
+
+
+# Schreibt stdin atomar nach $3 (über $2 als Zwischendatei); läuft mit demselben Präfix wie rsync.
+_MARKER_WRITE_SCRIPT = 'umask 022 && mkdir -p -- "$1" && cat > "$2" && mv -f -- "$2" "$3"'
+
+
+def write_clone_marker(
+    mountpoint: str | Path,
+    *,
+    source_machine_id: str | None,
+    source_device: str | None,
+    target_device: str,
+    mode: str,
+    sudo_password: str | None = None,
+    run: Callable[..., subprocess.CompletedProcess] = subprocess.run,
+    timeout_sec: float = 30.0,
+) -> CloneMarkerResult:
+    """
+    Legt den Herkunftsmarker auf dem (root-eigenen) Ziel an – wie rsync über
+    ``privilege_prefix`` (``sudo -S``/``sudo -n``, als root direkt). Fehler werden nicht
+    geworfen, sondern als ``CloneMarkerResult(written=False, detail=…)`` zurückgegeben.
+    """
+    path = Path(mountpoint) / CLONE_MARKER_REL
+    payload = {
+        "kind": CLONE_MARKER_KIND,
+        "version": 1,
+        "source_machine_id": source_machine_id,
+        "source_device": source_device,
+        "target_device": target_device,
+        "mode": mode,
+        "cloned_at": datetime.now(timezone.utc).isoformat(),
+    }
+    prefix = privilege_prefix(sudo_password)
+    argv = [*prefix, "sh", "-c", _MARKER_WRITE_SCRIPT, "sh", str(path.parent), str(path) + ".tmp", str(path)]
+    data = (json.dumps(payload, indent=2) + "\n").encode("utf-8")
+    if prefix[:2] == ["sudo", "-S"]:
+        data = ((sudo_password or "") + "\n").encode("utf-8") + data
+    try:
+        proc = run(argv, input=data, capture_output=True, timeout=timeout_sec, check=False)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        return CloneMarkerResult(False, str(path), str(exc))
+    if proc.returncode != 0:
+        err = (proc.stderr or b"").decode("utf-8", "replace").strip()
+        return CloneMarkerResult(False, str(path), err[-300:] or f"exit {proc.returncode}")
+    return CloneMarkerResult(True, str(path))
+
+
+# --- Planung ----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CloneTree:
+    """Ein rsync-Lauf: ``source`` → ``dest`` mit eigenen (auf den Baum umgerechneten) Excludes."""
+
+    label: str
+    source: str
+    dest: str
+    excludes: tuple[str, ...]
+
+
+def _reroot_excludes(excludes: list[str], tree: str) -> list[str]:
+    """Absolute Excludes auf die Transferwurzel ``/<tree>/`` umrechnen (nur die darunter)."""
+    prefix = "/" + tree.strip("/") + "/"
+    out = []
+    for ex in excludes:
+        ex_n = "/" + ex.strip("/")
+        if ex_n.startswith(prefix):
+            out.append(ex_n[len(prefix) - 1 :])
+    return out
+
+
+def plan_clone_trees(
+    mountpoint: str,
+    excludes: list[str],
+    *,
+    source_root: str = "/",
+    split_trees: tuple[str, ...] = DEFAULT_SPLIT_TREES,
+    max_workers: int | None = None,
+) -> list[CloneTree]:
+    """
+    Teilt den Klon in rsync-Läufe auf. Bei nur einem Worker bleibt es bei einem Lauf über
+    ``/`` (identisch zum bisherigen Befehl). Abgespalten werden nur echte Verzeichnisse
+    (keine Symlinks, z. B. ``/bin -> usr/bin``) auf demselben Dateisystem wie ``/`` –
+    sonst würde ``-x`` andere Mounts mitkopieren.
+    """
+    root = source_root.rstrip("/") or "/"
+    dest_root = mountpoint.rstrip("/") + "/"
+    workers = max_workers if max_workers is not None else min(MAX_PARALLEL_WORKERS, os.cpu_count() or 1)
+    excl_abs = ["/" + x.strip("/") for x in excludes]
+    split: list[str] = []
+    if workers > 1:
+        try:
+            root_dev = os.stat(root).st_dev
+        except OSError:
+            root_dev = None
+        for name in split_trees:
+            p = os.path.join(root, name)
+            if "/" + name in excl_abs or os.path.islink(p) or not os.path.isdir(p):
+                continue
+            try:
+                if os.stat(p).st_dev != root_dev:
+                    continue
+            except OSError:
+                continue
+            split.append(name)
+    rest = CloneTree(
+        label="/",
+        source=root.rstrip("/") + "/",
+        dest=dest_root,
+        excludes=tuple(excl_abs + ["/" + name for name in split]),
+    )
+    trees = [
+        CloneTree(
+            label="/" + name,
+            source=os.path.join(root, name) + "/",
+            dest=dest_root + name + "/",
+            excludes=tuple(_reroot_excludes(excl_abs, name)),
+        )
+        for name in split
+    ]
+    return trees + [rest]
+
+
+def build_rsync_argv(tree: CloneTree, *, delete: bool, rsync_bin: str = "rsync") -> list[str]:
+    argv = [rsync_bin, *RSYNC_BASE_FLAGS]
+    if delete:
+        argv.append("--delete")
+    argv.extend(f"--exclude={x}" for x in tree.excludes)
+    argv.extend([tree.source, tree.dest])
+    return argv
+
+
+def privilege_prefix(sudo_password: str | None) -> list[str]:
+    """Als root direkt, sonst ``sudo -S`` (Passwort über stdin) bzw. ``sudo -n``."""
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        return []
+    return ["sudo", "-S", "-p", ""] if sudo_password else ["sudo", "-n"]
+
+
+# --- Ausführung -------------------------------------------------------------
+
+
+@dataclass
+class _Worker:
+    tree: CloneTree
+    proc: subprocess.Popen
+    progress: dict[str, Any] = field(default_factory=dict)
+    stderr_tail: deque[str] = field(default_factory=lambda: deque(maxlen=40))
+    threads: list[threading.Thread] = field(default_factory=list)
+
+
+@dataclass
+class CloneSyncResult:
+    status: str  # success | cancelled | error | timeout
+    detail: str = ""
+    bytes_transferred: int = 0
+    workers: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _read_progress(worker: _Worker) -> None:
+    stream = worker.proc.stdout
+    if stream is None:
+        return
+    buf = b""
+    try:
+        while True:
+            chunk = stream.read1(8192) if hasattr(stream, "read1") else stream.read(8192)
+            if not chunk:
+                break
+            buf += chunk
+            parts = re.split(rb"[\r\n]", buf)
+            buf = parts.pop()
+            for raw in parts:
+                parsed = parse_progress2_line(raw.decode("utf-8", "replace"))
+                if parsed is not None:
+                    worker.progress = parsed
+    except (OSError, ValueError):
+        pass
+
+
+def _drain_stderr(worker: _Worker) -> None:
+    stream = worker.proc.stderr
+    if stream is None:
+        return
+    try:
+        for raw in iter(stream.readline, b""):
+            line = raw.decode("utf-8", "replace").rstrip()
+            if line:
+                worker.stderr_tail.append(line)
+    except (OSError, ValueError):
+        pass
+
+
+def _signal_group(proc: subprocess.Popen, sig: int) -> None:
+    try:
+        os.killpg(os.getpgid(proc.pid), sig)
+    except (OSError, ProcessLookupError):
+        try:
+            proc.send_signal(sig)
+        except OSError:
+            pass
+
+
+def _stop_workers(workers: list[_Worker]) -> None:
+    live = [w for w in workers if w.proc.poll() is None]
+    for w in live:
+        _signal_group(w.proc, signal.SIGTERM)
+    deadline = time.monotonic() + TERM_GRACE_SEC
+    for w in live:
+        try:
+            w.proc.wait(timeout=max(0.1, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            _signal_group(w.proc, signal.SIGKILL)
+            try:
+                w.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+
+
+def run_clone_sync(
+    trees: list[CloneTree],
+    *,
+    delete: bool,
+    sudo_password: str | None = None,
+    cancel_event: threading.Event | None = None,
+    on_progress: Callable[[int, list[dict[str, Any]]], None] | None = None,
+    on_spawn: Callable[[list[int]], None] | None = None,
+    max_parallel: int | None = None,
+    timeout_sec: float = 7200.0,
+    rsync_bin: str = "rsync",
+    popen: PopenFactory = subprocess.Popen,
+) -> CloneSyncResult:
+    """
+    Führt die geplanten rsync-Läufe aus (höchstens ``max_parallel`` gleichzeitig, Reihenfolge
+    wie geplant). ``on_progress(bytes_gesamt, worker_status)`` kommt etwa alle 0,5 s,
+    ``on_spawn(pgids)`` nach jedem Prozessstart (für den Cancel-Endpunkt).
+    """
+    parallel = max(1, max_parallel if max_parallel is not None else min(MAX_PARALLEL_WORKERS, os.cpu_count() or 1))
+    prefix = privilege_prefix(sudo_password)
+    pending = list(trees)
+    running: list[_Worker] = []
+    finished: list[_Worker] = []
+    started = time.monotonic()
+
+    def _status() -> list[dict[str, Any]]:
+        rows = []
+        for w in finished + running:
+            rows.append(
+                {
+                    "tree": w.tree.label,
+                    "done": w.proc.poll() is not None,
+                    "returncode": w.proc.returncode,
+                    "bytes": int(w.progress.get("bytes") or 0),
+                    "pct": w.progress.get("pct"),
+                    "rate": w.progress.get("rate"),
+                }
+            )
+        for t in pending:
+            rows.append({"tree": t.label, "done": False, "returncode": None, "bytes": 0, "pct": None, "rate": None})
+        return rows
+
+    def _total() -> int:
+        return sum(int(w.progress.get("bytes") or 0) for w in finished + running)
+
+    def _result(status: str, detail: str = "") -> CloneSyncResult:
+        return CloneSyncResult(status=status, detail=detail, bytes_transferred=_total(), workers=_status())
+
+    try:
+        while pending or running:
+            if cancel_event is not None and cancel_event.is_set():
+                _stop_workers(running)
+                return _result("cancelled", "Abgebrochen")
+            if time.monotonic() - started > timeout_sec:
+                _stop_workers(running)
+                return _result("timeout", "Timeout")
+            while pending and len(running) < parallel:
+                tree = pending.pop(0)
+                proc = popen(
+                    prefix + build_rsync_argv(tree, delete=delete, rsync_bin=rsync_bin),
+                    stdin=subprocess.PIPE if prefix[:2] == ["sudo", "-S"] else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    start_new_session=True,
+                )
+                if proc.stdin is not None:
+                    try:
+                        proc.stdin.write(((sudo_password or "") + "\n").encode("utf-8"))
+                        proc.stdin.close()
+                    except OSError:
+                        pass
+                worker = _Worker(tree=tree, proc=proc)
+                for target in (_read_progress, _drain_stderr):
+                    th = threading.Thread(target=target, args=(worker,), daemon=True)
+                    th.start()
+                    worker.threads.append(th)
+                running.append(worker)
+                if on_spawn is not None:
+                    on_spawn([w.proc.pid for w in running])
+            for w in list(running):
+                if w.proc.poll() is None:
+                    continue
+                for th in w.threads:
+                    th.join(timeout=2)
+                running.remove(w)
+                finished.append(w)
+                # rsync 24: Dateien verschwanden während des Laufs (laufendes System) → kein Fehler.
+                if w.proc.returncode not in (0, 24):
+                    _stop_workers(running)
+                    tail = "\n".join(w.stderr_tail)
+                    return _result("error", f"{w.tree.label}: rc={w.proc.returncode} {tail}"[:2000])
+            if on_progress is not None:
+                on_progress(_total(), _status())
+            if running:
+                time.sleep(POLL_INTERVAL_SEC)
+    except BaseException:
+        _stop_workers(running)
+        raise
+    if on_progress is not None:
+        on_progress(_total(), _status())
+    return _result("success")
+
+
+__all__ = [
+    "CLONE_MARKER_REL",
+    "CloneSyncResult",
+    "CloneTree",
+    "build_rsync_argv",
+    "is_incremental_target",
+    "parse_progress2_line",
+    "plan_clone_trees",
+    "privilege_prefix",
+    "read_clone_marker",
+    "read_machine_id",
+    "run_clone_sync",
+    "write_clone_marker",
+]
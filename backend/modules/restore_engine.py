@@ -6,20 +6,24 @@ from __future__ import annotations
 
 import posixpath
 import subprocess
-import tarfile
+import threading
 from pathlib import Path
-from typing import Callable, Sequence
+from typing import TYPE_CHECKING, Callable, Sequence
 
 from core.backup_path_allowlist import path_under_any_prefix
 from core.backup_recovery_i18n import (
     K_BOOTLOADER_FAILED,
     K_OPERATION_OK,
     K_RESTORE_FILES_FAILED,
+    K_RESTORE_IMAGE_CANCELLED,
     K_RESTORE_IMAGE_FAILED,
     K_RESTORE_PT_FAILED,
 )
 from core.safety_facade import WriteTargetProtectionError, validate_write_target
-from modules.backup_symlink_safety import tar_symlink_linkname_allowed
+
+if TYPE_CHECKING:
+    from modules.streaming_image_restore import ProgressCallback as ImageProgressCallback
+    from modules.streaming_tar_restore import ProgressCallback
 
 
 def _is_tar_root_placeholder(name: str | None) -> bool:
@@ -88,9 +92,22 @@ def restore_image(
     *,
     dry_run: bool = False,
     runner: Callable[..., subprocess.CompletedProcess[str]] | None = None,
-    dd_bs: str = "4M",
+    progress: "ImageProgressCallback | None" = None,
+    cancel_event: threading.Event | None = None,
 ) -> tuple[bool, str, str | None]:
-    """dd von Abbild auf Zielgerät (destruktiv)."""
+    """
+    Abbild (roh, gzip, xz, zstd) in einem Durchlauf auf das Zielgerät schreiben (destruktiv).
+
+    Dekompression im Prozess, kein entpacktes Zwischenabbild; siehe
+    ``modules.streaming_image_restore``. ``progress`` erhält ``ImageRestoreProgress``-Ereignisse,
+    ``cancel_event`` bricht zwischen zwei Puffern ab.
+    """
+    from modules.streaming_image_restore import (
+        ImageRestoreCancelled,
+        ImageRestoreError,
+        restore_image_stream,
+    )
+
     try:
         validate_write_target(target_device, runner=runner)
     except WriteTargetProtectionError as e:
@@ -100,11 +117,45 @@ def restore_image(
     img = Path(image_file)
     if not img.is_file():
         return False, K_RESTORE_IMAGE_FAILED, str(img)
-    dev = str(target_device)
-    argv = ["dd", f"if={img}", f"of={dev}", f"bs={dd_bs}", "conv=fsync", "status=progress"]
-    r = _run(argv, runner=runner, timeout=86400)
-    if r.returncode != 0:
-        return False, K_RESTORE_IMAGE_FAILED, (r.stderr or r.stdout or "")[:2000]
+    try:
+        restore_image_stream(img, target_device, progress=progress, cancel_event=cancel_event)
+    except ImageRestoreCancelled as e:
+        return False, K_RESTORE_IMAGE_CANCELLED, str(e)
+    except (OSError, ImageRestoreError) as e:
+        return False, K_RESTORE_IMAGE_FAILED, str(e)[:2000]
+    return True, K_OPERATION_OK, None
+
+
+def restore_used_blocks_image(
+    image_file: str | Path,
+    target_device: str | Path,
+    *,
+    dry_run: bool = False,
+    runner: Callable[..., subprocess.CompletedProcess[str]] | None = None,
+) -> tuple[bool, str, str | None]:
+    """Used-Blocks-Container (``*.shimg``) auf Zielgerät schreiben; Container wird vorab vollständig geprüft."""
+    from modules.used_blocks_image import (
+        UsedBlocksImageError,
+        restore_used_blocks_image as _restore_blocks,
+        verify_used_blocks_image,
+    )
+
+    try:
+        validate_write_target(target_device, runner=runner)
+    except WriteTargetProtectionError as e:
+        return False, K_RESTORE_IMAGE_FAILED, f"{e.diagnosis_id}: {e}"
+    img = Path(image_file)
+    if not img.is_file():
+        return False, K_RESTORE_IMAGE_FAILED, str(img)
+    ok, err = verify_used_blocks_image(img)
+    if not ok:
+        return False, K_RESTORE_IMAGE_FAILED, err
+    if dry_run:
+        return True, K_OPERATION_OK, None
+    try:
+        _restore_blocks(img, target_device)
+    except (OSError, UsedBlocksImageError) as e:
+        return False, K_RESTORE_IMAGE_FAILED, str(e)[:2000]
     return True, K_OPERATION_OK, None
 
 
@@ -115,8 +166,17 @@ def restore_files(
     allowed_target_prefixes: Sequence[Path],
     dry_run: bool = False,
     runner: Callable[..., subprocess.CompletedProcess[str]] | None = None,
+    progress: "ProgressCallback | None" = None,
+    writers: int = 2,
 ) -> tuple[bool, str, str | None]:
-    """Entpackt tar.gz unter target_directory (muss unter erlaubten Präfixen liegen)."""
+    """
+    Entpackt tar(.gz/.xz/.bz2) unter target_directory (muss unter erlaubten Präfixen liegen).
+
+    Ein Durchlauf über das Archiv: Mitglieder werden beim Lesen geprüft und sofort
+    geschrieben (``modules.streaming_tar_restore``); ``progress`` erhält
+    ``RestoreProgress``-Ereignisse. Bei einem unsicheren Mitglied mitten im Archiv
+    bleiben bereits entpackte Dateien im Ziel liegen.
+    """
     td = Path(target_directory)
     try:
         validate_write_target(td, runner=runner)
@@ -132,47 +192,18 @@ def restore_files(
         return True, K_OPERATION_OK, None
     try:
         from modules.backup_engine import MANIFEST_NAME
-
-        td.mkdir(parents=True, exist_ok=True)
-        root_resolved = td.absolute()
-        with tarfile.open(archive_path, "r:*") as tf:
-            allowed_members: list[tarfile.TarInfo] = []
-            for member in tf.getmembers():
-                if _is_tar_root_placeholder(member.name):
-                    continue
-                if not _is_safe_member_name(member.name):
-                    return False, K_RESTORE_FILES_FAILED, f"unsafe archive path: {member.name}"
-                safe_name = _safe_member_name(member.name)
-                if safe_name == MANIFEST_NAME:
-                    continue
-                target_path = (td / safe_name).absolute()
-                try:
-                    target_path.relative_to(root_resolved.absolute())
-                except ValueError:
-                    return False, K_RESTORE_FILES_FAILED, f"path traversal detected: {member.name}"
-
-                if member.issym():
-                    if "\x00" in (member.linkname or ""):
-                        return False, K_RESTORE_FILES_FAILED, f"unsafe symlink target: {member.name}"
-                    if not tar_symlink_linkname_allowed(member.linkname or "", safe_name, root_resolved):
-                        return False, K_RESTORE_FILES_FAILED, f"symlink target escapes restore root: {member.name}"
-                    allowed_members.append(member)
-                    continue
-                if member.islnk() and not member.issym():
-                    if "\x00" in (member.linkname or ""):
-                        return False, K_RESTORE_FILES_FAILED, f"unsafe hardlink target: {member.name}"
-                    allowed_members.append(member)
-                    continue
-                if member.isdev() or member.isfifo():
-                    return False, K_RESTORE_FILES_FAILED, f"unsupported archive member: {member.name}"
-                allowed_members.append(member)
-            try:
-                tf.extractall(path=td, members=allowed_members, filter="tar")
-            except TypeError:
-                try:
-                    tf.extractall(path=td, members=allowed_members, filter="data")
-                except TypeError:
-                    tf.extractall(path=td, members=allowed_members)
+        from modules.streaming_tar_restore import stream_restore_tar
+
+        stream_restore_tar(
+            archive_path,
+            td,
+            is_safe_name=_is_safe_member_name,
+            normalize_name=_safe_member_name,
+            is_root_placeholder=_is_tar_root_placeholder,
+            skip_names=(MANIFEST_NAME,),
+            writers=writers,
+            progress=progress,
+        )
         return True, K_OPERATION_OK, None
     except Exception as e:
         return False, K_RESTORE_FILES_FAILED, str(e)
@@ -208,6 +239,7 @@ def install_bootloader(
 __all__ = [
     "restore_partition_table",
     "restore_image",
+    "restore_used_blocks_image",
     "restore_files",
     "install_bootloader",
 ]
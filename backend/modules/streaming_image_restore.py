@@ -0,0 +1,344 @@
+"""
+Streaming-Restore von Datenträgerabbildern (roh, ``.img.gz``, ``.img.xz``, ``.img.zst``).
+
+Das Abbild wird im Prozess dekomprimiert und direkt auf das Ziel geschrieben – kein
+entpacktes Zwischenabbild, kein zweiter I/O-Durchlauf:
+
+1. Ein Lese-Thread dekomprimiert (gzip/xz über die Standardbibliothek, zstd über
+   ``compression.zstd`` bzw. ``zstandard``, falls installiert) in Puffer fester Größe.
+   zlib/lzma/zstd geben während der Dekompression den GIL frei; Dekompression und
+   Schreiben laufen dadurch parallel, eine kleine Queue begrenzt den Speicher.
+2. Der Schreiber legt jeden Puffer per ``os.pwrite`` an einen ``WRITE_CHUNK``-ausgerichteten
+   Offset (4 MiB – Vielfaches jeder Sektor-/Erase-Block-Größe).
+3. Null-Blöcke (``SPARSE_BLOCK``) gehen nicht als Daten durch ``pwrite``: Reguläre Zieldateien
+   überspringen sie und werden am Ende per ``truncate`` auf Endgröße gesetzt – Lücken bleiben
+   Löcher. Blockgeräte müssen den alten Inhalt verlieren; zusammenhängende Null-Läufe gehen dort
+   per ``BLKZEROOUT`` an den Kernel (WRITE ZEROES/Unmap, sofern das Gerät es kann). ``BLKDISCARD``
+   scheidet aus, weil danach gelesene Blöcke nicht garantiert Null sind. Lehnt das Gerät
+   ``BLKZEROOUT`` ab, werden die Nullen wie bisher geschrieben.
+4. Fortschritt (geschriebene/gelesene Bytes, Durchsatz) etwa alle ``PROGRESS_INTERVAL_SEC``;
+   ``cancel_event`` wird je Puffer geprüft, ein Abbruch endet mit ``ImageRestoreCancelled``.
+
+Die ``validate_write_target``-Prüfung liegt beim Aufrufer (``modules.restore_engine``).
+"""
+
+from __future__ import annotations
+
+import errno
+import fcntl
+import gzip
+import lzma
+import os
+import queue
+import stat
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+WRITE_CHUNK = 4 * 1024 * 1024
+SPARSE_BLOCK = 64 * 1024
+QUEUE_DEPTH = 4
+PROGRESS_INTERVAL_SEC = 0.5
+
+IMAGE_CODECS = ("raw", "gzip", "xz", "zstd")
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_ZERO_BLOCK = bytes(SPARSE_BLOCK)
+_EOF = object()
+BLKZEROOUT = 0x127F  # _IO(0x12, 127), <linux/fs.h>: uint64 Bereich {start, len}
+
+
+class ImageRestoreError(RuntimeError):
+    """Abbild unlesbar/beschädigt, Codec nicht verfügbar oder Schreibfehler."""
+
+
+class ImageRestoreCancelled(ImageRestoreError):
+    """Abbruch über ``cancel_event``; das Ziel ist unvollständig."""
+
+
+@dataclass
+class ImageRestoreProgress:
+    codec: str
+    bytes_written: int = 0
+    bytes_read: int = 0
+    source_size: int | None = None
+    sparse_bytes_skipped: int = 0  # nicht per pwrite geschrieben (Loch bzw. BLKZEROOUT)
+    throughput_bytes_per_sec: float | None = None
+    phase: str = "writing"
+
+
+@dataclass
+class ImageRestoreResult:
+    codec: str
+    bytes_written: int
+    bytes_read: int
+    sparse_bytes_skipped: int
+    seconds: float
+    sparse_target: bool
+
+
+ProgressCallback = Callable[[ImageRestoreProgress], None]
+ZeroRunHandler = Callable[[int, int], bool]
+
+
+def detect_image_codec(image_file: str | Path) -> str:
+    """Codec anhand der Magic-Bytes (Dateiendung wird nicht vertraut)."""
+    with open(image_file, "rb") as f:
+        head = f.read(8)
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return "raw"
+
+
+def _zstd_reader(raw: BinaryIO) -> BinaryIO:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]  # Python ≥ 3.14
+
+        return zstd.ZstdFile(raw)  # type: ignore[return-value]
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise ImageRestoreError("zstd_not_available: compression.zstd/zstandard nicht installiert") from e
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_size=1024 * 1024, read_across_frames=True)
+
+
+def _open_decompressed(raw: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "raw":
+        return raw
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")  # type: ignore[return-value]
+    if codec == "xz":
+        return lzma.LZMAFile(raw, mode="rb")  # type: ignore[return-value]
+    if codec == "zstd":
+        return _zstd_reader(raw)
+    raise ImageRestoreError(f"unsupported_codec:{codec}")
+
+
+def _iter_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """Volle ``WRITE_CHUNK``-Puffer; nur der letzte darf kürzer sein (ausgerichtete Offsets)."""
+    pending = bytearray()
+    while True:
+        data = stream.read(WRITE_CHUNK - len(pending))
+        if not data:
+            break
+        if not pending and len(data) == WRITE_CHUNK:
+            yield data
+            continue
+        pending += data
+        if len(pending) >= WRITE_CHUNK:
+            yield bytes(pending)
+            pending.clear()
+    if pending:
+        yield bytes(pending)
+
+
+def _is_regular_target(target: Path) -> bool:
+    return not str(target).startswith("/dev/") and (not target.exists() or target.is_file())
+
+
+def _pwrite_all(fd: int, data: memoryview, offset: int) -> None:
+    while data:
+        n = os.pwrite(fd, data, offset)
+        data = data[n:]
+        offset += n
+
+
+def _zero_runs(chunk: bytes) -> Iterator[tuple[int, int]]:
+    """(Start, Ende) zusammenhängender Null-Blöcke im Puffer, blockweise geprüft."""
+    run_start: int | None = None
+    size = len(chunk)
+    for pos in range(0, size, SPARSE_BLOCK):
+        end = min(pos + SPARSE_BLOCK, size)
+        # bytes-Vergleich (memcmp) – memoryview-Vergleiche laufen elementweise
+        if chunk[pos:end] == _ZERO_BLOCK[: end - pos]:
+            if run_start is None:
+                run_start = pos
+        elif run_start is not None:
+            yield run_start, pos
+            run_start = None
+    if run_start is not None:
+        yield run_start, size
+
+
+class _BlockZeroOut:
+    """Null-Läufe per ``BLKZEROOUT``; nach der ersten grundsätzlichen Ablehnung nur noch ``pwrite``."""
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+        self.supported = True
+
+    def __call__(self, offset: int, length: int) -> bool:
+        if not self.supported:
+            return False
+        try:
+            fcntl.ioctl(self.fd, BLKZEROOUT, struct.pack("=QQ", offset, length))
+        except OSError as e:
+            if e.errno != errno.EINVAL:  # EINVAL: Lauf nicht am Sektor ausgerichtet (Abbildende)
+                self.supported = False
+            return False
+        return True
+
+
+def _skip_zero_run(_offset: int, _length: int) -> bool:
+    return True
+
+
+def _write_chunk(fd: int, chunk: bytes, offset: int, zero_run: ZeroRunHandler | None) -> int:
+    """
+    Schreibt ``chunk`` an ``offset``. Null-Läufe gehen an ``zero_run`` (absoluter Offset, Länge);
+    liefert es ``False``, werden sie normal geschrieben. Rückgabe: nicht geschriebene Bytes.
+    """
+    view = memoryview(chunk)
+    if zero_run is None:
+        _pwrite_all(fd, view, offset)
+        return 0
+    handled = 0
+    data_start = 0
+    for start, end in _zero_runs(chunk):
+        if not zero_run(offset + start, end - start):
+            continue  # bleibt Teil des nächsten Datenblocks
+        if data_start < start:
+            _pwrite_all(fd, view[data_start:start], offset + data_start)
+        handled += end - start
+        data_start = end
+    if data_start < len(chunk):
+        _pwrite_all(fd, view[data_start:], offset + data_start)
+    return handled
+
+
+def restore_image_stream(
+    image_file: str | Path,
+    target: str | Path,
+    *,
+    progress: ProgressCallback | None = None,
+    cancel_event: threading.Event | None = None,
+    sparse: bool | None = None,
+) -> ImageRestoreResult:
+    """
+    Dekomprimiert ``image_file`` in einem Durchlauf auf ``target`` (Blockgerät oder Abbilddatei).
+
+    ``sparse=None``: Null-Blöcke bei regulären Zieldateien auslassen, bei Blockgeräten per
+    ``BLKZEROOUT`` nullen; ``sparse=False`` schreibt alles per ``pwrite``.
+    """
+    img = Path(image_file)
+    tgt = Path(target)
+    codec = detect_image_codec(img)
+    source_size = img.stat().st_size
+    regular = _is_regular_target(tgt)
+    use_sparse = regular if sparse is None else bool(sparse and regular)
+    state = ImageRestoreProgress(codec=codec, source_size=source_size)
+    started = time.monotonic()
+    last_report = 0.0
+    chunks: queue.Queue[Any] = queue.Queue(maxsize=QUEUE_DEPTH)
+    stop = threading.Event()
+    read_pos = [0]
+
+    def _cancelled() -> bool:
+        return stop.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader() -> None:
+        try:
+            with img.open("rb") as raw:
+                stream = _open_decompressed(raw, codec)
+                try:
+                    for chunk in _iter_chunks(stream):
+                        read_pos[0] = raw.tell()
+                        if _cancelled() or not _put(chunk):
+                            return
+                finally:
+                    if stream is not raw:
+                        stream.close()
+            _put(_EOF)
+        except BaseException as e:  # an den Schreiber weiterreichen
+            _put(e)
+
+    def _report(force: bool = False) -> None:
+        nonlocal last_report
+        if progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - last_report < PROGRESS_INTERVAL_SEC:
+            return
+        last_report = now
+        elapsed = now - started
+        state.bytes_read = read_pos[0]
+        state.throughput_bytes_per_sec = round(state.bytes_written / elapsed, 1) if elapsed > 0 else None
+        progress(ImageRestoreProgress(**state.__dict__))
+
+    flags = os.O_WRONLY | (os.O_CREAT | os.O_TRUNC if regular else 0) | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(str(tgt), flags, 0o644)
+    zero_run: ZeroRunHandler | None = None
+    if use_sparse:
+        zero_run = _skip_zero_run
+    elif sparse is not False and stat.S_ISBLK(os.fstat(fd).st_mode):
+        zero_run = _BlockZeroOut(fd)
+    reader = threading.Thread(target=_reader, name="image-restore-reader", daemon=True)
+    reader.start()
+    try:
+        offset = 0
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ImageRestoreCancelled("restore_cancelled")
+            try:
+                item = chunks.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if item is _EOF:
+                break
+            if isinstance(item, BaseException):
+                if isinstance(item, Exception) and not isinstance(item, ImageRestoreError):
+                    raise ImageRestoreError(f"image_read_failed:{item}") from item
+                raise item
+            state.sparse_bytes_skipped += _write_chunk(fd, item, offset, zero_run)
+            offset += len(item)
+            state.bytes_written = offset
+            _report()
+        if regular:
+            os.ftruncate(fd, offset)
+        state.phase = "syncing"
+        _report(force=True)
+        os.fsync(fd)
+    finally:
+        stop.set()
+        reader.join(timeout=5)
+        os.close(fd)
+    state.phase = "done"
+    state.bytes_read = read_pos[0]
+    _report(force=True)
+    return ImageRestoreResult(
+        codec=codec,
+        bytes_written=state.bytes_written,
+        bytes_read=state.bytes_read,
+        sparse_bytes_skipped=state.sparse_bytes_skipped,
+        seconds=round(time.monotonic() - started, 3),
+        sparse_target=use_sparse,
+    )
+
+
+__all__ = [
+    "IMAGE_CODECS",
+    "ImageRestoreCancelled",
+    "ImageRestoreError",
+    "ImageRestoreProgress",
+    "ImageRestoreResult",
+    "detect_image_codec",
+    "restore_image_stream",
+]
@@ -0,0 +1,438 @@
+"""
+Streaming-Restore für Datei-Backups (tar, tar.gz, …): ein einziger Dekompressionsdurchlauf.
+
+Ablauf je Mitglied, in Archivreihenfolge (``tarfile`` im Stream-Modus ``r|*``):
+
+1. Prüfung sofort beim Eintreffen – dieselben Regeln wie bisher in
+   ``modules.restore_engine`` (sichere Namen, kein Traversal, Symlink-Ziele
+   innerhalb des Restore-Roots, keine Geräte/FIFOs) plus ``tarfile``-Filter ``tar``.
+2. Verzeichnisse werden sofort angelegt, Attribute erst am Ende gesetzt.
+3. Reguläre Dateien: Nutzdaten werden im Lese-Thread dekomprimiert und an einen
+   kleinen Writer-Pool übergeben (begrenzter Puffer → Backpressure).
+4. Hard- und Symlinks werden gesammelt und erst nach allen Dateien angelegt; damit
+   kann kein Symlink aus dem Archiv einen späteren Schreibpfad umlenken.
+
+Bricht die Prüfung mitten im Archiv ab, bleiben bereits geschriebene Dateien liegen
+(kein zweiter Vorab-Durchlauf); der Fehler nennt das betroffene Mitglied.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import stat
+import tarfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable
+
+from modules.backup_symlink_safety import tar_symlink_linkname_allowed
+
+READ_CHUNK = 1024 * 1024
+SMALL_FILE_MAX = 1024 * 1024
+MAX_INFLIGHT_BYTES = 64 * 1024 * 1024
+DEFAULT_WRITERS = 2
+PROGRESS_INTERVAL_SEC = 0.5
+
+_EOF = object()
+_BY_PATH_PRUNE_AT = 4096
+
+
+class StreamingRestoreError(RuntimeError):
+    """Unsicheres oder nicht unterstütztes Archivmitglied bzw. Schreibfehler."""
+
+
+@dataclass
+class RestoreProgress:
+    """Fortschritt: Nutzdaten-Bytes/Dateien sowie gelesene (komprimierte) Archiv-Bytes."""
+
+    files_done: int = 0
+    bytes_done: int = 0
+    archive_bytes_read: int = 0
+    archive_size: int | None = None
+    current_path: str | None = None
+    phase: str = "extract"
+
+
+@dataclass
+class StreamRestoreResult:
+    files: int = 0
+    directories: int = 0
+    symlinks: int = 0
+    hardlinks: int = 0
+    bytes_written: int = 0
+    skipped: list[str] = field(default_factory=list)
+
+
+ProgressCallback = Callable[[RestoreProgress], None]
+NameCheck = Callable[[str], bool]
+NameNormalize = Callable[[str], str]
+
+
+class _InflightBudget:
+    """Begrenzt gepufferte, noch nicht geschriebene Bytes (Backpressure für den Lese-Thread)."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = max(READ_CHUNK, limit)
+        self._used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> None:
+        with self._cond:
+            while self._used and self._used + n > self._limit:
+                self._cond.wait()
+            self._used += n
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self._used -= n
+            self._cond.notify_all()
+
+
+class _Progress:
+    def __init__(self, callback: ProgressCallback | None, archive_size: int | None, fileobj: BinaryIO) -> None:
+        self._cb = callback
+        self._fileobj = fileobj
+        self._lock = threading.Lock()
+        self._last = 0.0
+        self.state = RestoreProgress(archive_size=archive_size)
+
+    def add(self, *, files: int = 0, nbytes: int = 0) -> None:
+        with self._lock:
+            self.state.files_done += files
+            self.state.bytes_done += nbytes
+
+    def emit(self, *, current: str | None = None, phase: str | None = None, force: bool = False) -> None:
+        if self._cb is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last < PROGRESS_INTERVAL_SEC:
+            return
+        self._last = now
+        with self._lock:
+            if current is not None:
+                self.state.current_path = current
+            if phase is not None:
+                self.state.phase = phase
+            try:
+                self.state.archive_bytes_read = int(self._fileobj.tell())
+            except (OSError, ValueError):
+                pass
+            snap = RestoreProgress(**self.state.__dict__)
+        self._cb(snap)
+
+
+def _open_for_write(path: str) -> int:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_CLOEXEC", 0)
+    try:
+        return os.open(path, flags, 0o600)
+    except OSError:
+        # Vorhandener Symlink/Sonderdatei an dieser Stelle wird ersetzt, nie verfolgt.
+        if os.path.lexists(path) and not os.path.isdir(path):
+            os.unlink(path)
+            return os.open(path, flags, 0o600)
+        raise
+
+
+def _apply_attrs(tf: tarfile.TarFile, member: tarfile.TarInfo, path: str) -> None:
+    """chown/chmod/utime wie ``TarFile.extractall`` (errorlevel 1: Attributfehler nicht fatal)."""
+    for op in (
+        lambda: tf.chown(member, path, False),
+        lambda: tf.chmod(member, path),
+        lambda: tf.utime(member, path),
+    ):
+        try:
+            op()
+        except (OSError, tarfile.ExtractError):
+            continue
+
+
+def _write_whole(path: str, data: bytes) -> None:
+    fd = _open_for_write(path)
+    try:
+        view = memoryview(data)
+        while view:
+            n = os.write(fd, view)
+            view = view[n:]
+    finally:
+        os.close(fd)
+
+
+def _write_from_queue(path: str, chunks: "queue.Queue[object]", budget: _InflightBudget) -> None:
+    fd = _open_for_write(path)
+    failed: BaseException | None = None
+    try:
+        while True:
+            item = chunks.get()
+            if item is _EOF:
+                break
+            assert isinstance(item, bytes)
+            try:
+                if failed is None:
+                    view = memoryview(item)
+                    while view:
+                        n = os.write(fd, view)
+                        view = view[n:]
+            except OSError as exc:
+                failed = exc
+            finally:
+                budget.release(len(item))
+    finally:
+        os.close(fd)
+    if failed is not None:
+        raise failed
+
+
+def _filtered(member: tarfile.TarInfo, dest: str) -> tarfile.TarInfo:
+    tar_filter = getattr(tarfile, "tar_filter", None)
+    if tar_filter is None:
+        return member
+    try:
+        return tar_filter(member, dest)
+    except tarfile.FilterError as exc:
+        raise StreamingRestoreError(f"unsafe archive member: {member.name} ({exc})") from exc
+
+
+def _ensure_parent(path: str, root_real: str) -> None:
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    real_parent = os.path.realpath(parent)
+    if os.path.commonpath([real_parent, root_real]) != root_real:
+        raise StreamingRestoreError(f"path traversal detected: {path}")
+
+
+def stream_restore_tar(
+    archive_path: str | Path,
+    target_directory: str | Path,
+    *,
+    is_safe_name: NameCheck,
+    normalize_name: NameNormalize,
+    is_root_placeholder: NameCheck,
+    skip_names: Iterable[str] = (),
+    writers: int = DEFAULT_WRITERS,
+    progress: ProgressCallback | None = None,
+    max_inflight_bytes: int = MAX_INFLIGHT_BYTES,
+) -> StreamRestoreResult:
+    """
+    Entpackt ``archive_path`` nach ``target_directory`` in einem Durchlauf.
+    Die Namensregeln werden vom Aufrufer übergeben (``restore_engine``), damit es
+    genau eine Definition gibt. Wirft ``StreamingRestoreError`` bei unsicheren Mitgliedern.
+    """
+    td = Path(target_directory)
+    td.mkdir(parents=True, exist_ok=True)
+    root_abs = td.absolute()
+    root_real = os.path.realpath(root_abs)
+    skip = frozenset(skip_names)
+    result = StreamRestoreResult()
+    deferred_dirs: list[tuple[tarfile.TarInfo, str]] = []
+    deferred_links: list[tuple[tarfile.TarInfo, str, str]] = []
+    budget = _InflightBudget(max_inflight_bytes)
+    futures: list[Future[None]] = []
+    # Zuletzt eingereichter Schreibauftrag je Zielpfad: doppelte Mitglieder (angehängte/inkrementelle
+    # Archive) werden nacheinander geschrieben, das letzte im Archiv gewinnt wie bei ``tar x``.
+    by_path: dict[str, Future[None]] = {}
+
+    try:
+        archive_size: int | None = os.path.getsize(archive_path)
+    except OSError:
+        archive_size = None
+
+    with open(archive_path, "rb") as raw, ThreadPoolExecutor(
+        max_workers=max(1, int(writers)), thread_name_prefix="restore-writer"
+    ) as pool:
+        prog = _Progress(progress, archive_size, raw)
+        tf = tarfile.open(fileobj=raw, mode="r|*")
+        try:
+            for member in tf:
+                _raise_writer_errors(futures)
+                if is_root_placeholder(member.name):
+                    continue
+                if not is_safe_name(member.name):
+                    raise StreamingRestoreError(f"unsafe archive path: {member.name}")
+                safe_name = normalize_name(member.name)
+                if safe_name in skip:
+                    result.skipped.append(safe_name)
+                    continue
+                target_path = (td / safe_name).absolute()
+                try:
+                    target_path.relative_to(root_abs)
+                except ValueError as exc:
+                    raise StreamingRestoreError(f"path traversal detected: {member.name}") from exc
+                _wait_for_path(by_path, str(target_path))
+
+                if member.issym():
+                    if "\x00" in (member.linkname or ""):
+                        raise StreamingRestoreError(f"unsafe symlink target: {member.name}")
+                    if not tar_symlink_linkname_allowed(member.linkname or "", safe_name, root_abs):
+                        raise StreamingRestoreError(f"symlink target escapes restore root: {member.name}")
+                    deferred_links.append((member, safe_name, str(target_path)))
+                    continue
+                if member.islnk():
+                    if "\x00" in (member.linkname or ""):
+                        raise StreamingRestoreError(f"unsafe hardlink target: {member.name}")
+                    if not is_safe_name(member.linkname or ""):
+                        raise StreamingRestoreError(f"hardlink target escapes restore root: {member.name}")
+                    # Ziel wird wie ein Mitgliedsname abgebildet, damit es auf die entpackte Datei zeigt.
+                    member.linkname = normalize_name(member.linkname)
+                    deferred_links.append((member, safe_name, str(target_path)))
+                    continue
+                if member.isdev() or member.isfifo():
+                    raise StreamingRestoreError(f"unsupported archive member: {member.name}")
+
+                path = str(target_path)
+                if os.path.islink(path):
+                    # Vorhandener Symlink im Ziel wird ersetzt, nie verfolgt (auch nicht vom Filter).
+                    os.unlink(path)
+                fm = _filtered(member, root_real)
+                if fm.isdir():
+                    _ensure_parent(path, root_real)
+                    if os.path.lexists(path) and not os.path.isdir(path):
+                        os.unlink(path)
+                    os.makedirs(path, 0o700, exist_ok=True)
+                    deferred_dirs.append((fm, path))
+                    result.directories += 1
+                    continue
+                if not fm.isreg():
+                    # Andere Typen (z. B. contiguous) behandelt tarfile wie reguläre Dateien.
+                    if not fm.isfile():
+                        continue
+                _ensure_parent(path, root_real)
+                src = tf.extractfile(member)
+                size = int(fm.size or 0)
+                if src is None:
+                    continue
+                if size <= SMALL_FILE_MAX:
+                    data = src.read()
+                    budget.acquire(len(data))
+                    futures.append(pool.submit(_small_file_job, tf, fm, path, data, budget, prog))
+                else:
+                    chunks: queue.Queue[object] = queue.Queue()
+                    futures.append(pool.submit(_large_file_job, tf, fm, path, chunks, budget, prog))
+                    try:
+                        while True:
+                            buf = src.read(READ_CHUNK)
+                            if not buf:
+                                break
+                            budget.acquire(len(buf))
+                            chunks.put(buf)
+                            prog.emit(current=safe_name)
+                    finally:
+                        chunks.put(_EOF)
+                by_path[path] = futures[-1]
+                result.files += 1
+                result.bytes_written += size
+                prog.emit(current=safe_name)
+        finally:
+            tf.close()
+        for fut in futures:
+            fut.result()
+
+        prog.emit(phase="links", force=True)
+        for member, safe_name, path in deferred_links:
+            _make_link(tf, member, safe_name, path, root_abs, root_real)
+            if member.issym():
+                result.symlinks += 1
+            else:
+                result.hardlinks += 1
+
+        prog.emit(phase="directories", force=True)
+        deferred_dirs.sort(key=lambda item: item[1], reverse=True)
+        for fm, path in deferred_dirs:
+            _apply_attrs(tf, fm, path)
+        prog.emit(phase="done", force=True)
+    return result
+
+
+def _wait_for_path(by_path: dict[str, Future[None]], path: str) -> None:
+    """Wartet auf einen noch laufenden Schreibauftrag für denselben Zielpfad; räumt erledigte auf."""
+    earlier = by_path.pop(path, None)
+    if earlier is not None:
+        earlier.result()
+    if len(by_path) > _BY_PATH_PRUNE_AT:
+        for key in [k for k, fut in by_path.items() if fut.done()]:
+            del by_path[key]
+
+
+def _raise_writer_errors(futures: list[Future[None]]) -> None:
+    if not futures:
+        return
+    pending: list[Future[None]] = []
+    for fut in futures:
+        if fut.done():
+            fut.result()
+        else:
+            pending.append(fut)
+    futures[:] = pending
+
+
+def _small_file_job(
+    tf: tarfile.TarFile,
+    member: tarfile.TarInfo,
+    path: str,
+    data: bytes,
+    budget: _InflightBudget,
+    prog: _Progress,
+) -> None:
+    try:
+        _write_whole(path, data)
+    finally:
+        budget.release(len(data))
+    _apply_attrs(tf, member, path)
+    prog.add(files=1, nbytes=len(data))
+
+
+def _large_file_job(
+    tf: tarfile.TarFile,
+    member: tarfile.TarInfo,
+    path: str,
+    chunks: "queue.Queue[object]",
+    budget: _InflightBudget,
+    prog: _Progress,
+) -> None:
+    _write_from_queue(path, chunks, budget)
+    _apply_attrs(tf, member, path)
+    prog.add(files=1, nbytes=int(member.size or 0))
+
+
+def _make_link(
+    tf: tarfile.TarFile,
+    member: tarfile.TarInfo,
+    safe_name: str,
+    path: str,
+    root_abs: Path,
+    root_real: str,
+) -> None:
+    _ensure_parent(path, root_real)
+    if os.path.lexists(path):
+        if os.path.isdir(path) and not os.path.islink(path):
+            raise StreamingRestoreError(f"link would replace directory: {safe_name}")
+        os.unlink(path)
+    if member.issym():
+        os.symlink(member.linkname, path)
+        try:
+            tf.chown(member, path, False)
+        except (OSError, tarfile.ExtractError):
+            pass
+        return
+    source = os.path.realpath(os.path.join(root_abs, member.linkname))
+    if os.path.commonpath([source, root_real]) != root_real:
+        raise StreamingRestoreError(f"hardlink target escapes restore root: {member.name}")
+    try:
+        st = os.lstat(source)
+    except FileNotFoundError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise StreamingRestoreError(f"hardlink target missing: {member.name}")
+    os.link(source, path)
+
+
+__all__ = [
+    "DEFAULT_WRITERS",
+    "RestoreProgress",
+    "StreamRestoreResult",
+    "StreamingRestoreError",
+    "stream_restore_tar",
+]
@@ -0,0 +1,802 @@
+"""
+Used-Blocks-Abbild: nur belegte Blöcke eines Dateisystems sichern und zurückschreiben.
+
+Die Belegung stammt aus nativen Parsern (ext2/3/4 Block-Bitmaps, FAT12/16/32 FAT-Tabelle,
+NTFS ``$Bitmap``) – vergleichbar mit partclone/e2image, aber ohne externe Werkzeuge.
+Für unbekannte Dateisysteme (z. B. btrfs) gilt ein konservativer Fallback: alle Blöcke
+werden gelesen, gespeichert werden nur Nicht-Null-Blöcke; beim Restore werden die
+Lücken explizit genullt.
+
+Ganze Datenträger (MBR inkl. logischer Partitionen, GPT) werden über die Partitionstabelle
+abgebildet: Bereich vor der ersten Partition (Tabelle, Bootloader-Lücke) und GPT-Backup
+vollständig, jede Partition über ihren Parser; Partitionen ohne nativen Parser werden ganz
+übernommen. Nicht partitionierter Platz wird nicht gesichert. Die Karte rechnet dann in
+512-Byte-Sektoren.
+
+Container-Format (``*.shimg``)::
+
+    MAGIC (8 B) | u32 Header-Länge | Header-JSON | Extent-Tabelle (u64 start, u64 count)*
+    | zlib-Datenstrom (belegte Blöcke in Extent-Reihenfolge) | SHA-256 (32 B) | END_MAGIC (8 B)
+
+Die Allowlist-/``validate_write_target``-Prüfungen liegen bei den Aufrufern
+(``modules.backup_engine.create_image_backup`` bzw. ``modules.restore_engine``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, Mapping
+
+IMAGE_MAGIC = b"SHUBI001"
+IMAGE_END_MAGIC = b"SHUBIEND"
+IMAGE_KIND = "setuphelfer-used-blocks-image"
+IMAGE_SUFFIX = ".shimg"
+COPY_CHUNK = 4 * 1024 * 1024
+ZERO_SCAN_BLOCK = 64 * 1024
+_EXTENT = struct.Struct("<QQ")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class UsedBlocksImageError(RuntimeError):
+    """Container beschädigt, Dateisystem nicht lesbar oder Ziel zu klein."""
+
+
+@dataclass
+class BlockMap:
+    """Belegte Bereiche in Einheiten von ``block_size`` Bytes (sortiert, zusammengeführt)."""
+
+    filesystem: str
+    block_size: int
+    device_size: int
+    extents: list[tuple[int, int]] = field(default_factory=list)
+    zero_fill_gaps: bool = False
+    partitions: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(
+            min(count * self.block_size, self.device_size - start * self.block_size)
+            for start, count in self.extents
+        )
+
+
+class _ExtentBuilder:
+    def __init__(self) -> None:
+        self.extents: list[tuple[int, int]] = []
+
+    def add(self, start: int, count: int) -> None:
+        if count <= 0:
+            return
+        if self.extents:
+            ls, lc = self.extents[-1]
+            if start <= ls + lc:
+                self.extents[-1] = (ls, max(lc, start + count - ls))
+                return
+        self.extents.append((start, count))
+
+
+def _merge_extents(extents: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    b = _ExtentBuilder()
+    for start, count in sorted(extents):
+        b.add(start, count)
+    return b.extents
+
+
+def _bitmap_runs(bitmap: bytes, base: int, nbits: int) -> Iterator[tuple[int, int]]:
+    """Läufe gesetzter Bits (LSB-first wie ext4/NTFS) als (base+start, count)."""
+    for m in re.finditer(rb"[^\x00]+", bitmap[: (nbits + 7) // 8]):
+        run_start = -1
+        bit = m.start() * 8
+        for byte in m.group(0):
+            if byte == 0xFF and bit + 8 <= nbits:
+                if run_start < 0:
+                    run_start = bit
+                bit += 8
+                continue
+            for i in range(8):
+                if bit >= nbits:
+                    break
+                if byte & (1 << i):
+                    if run_start < 0:
+                        run_start = bit
+                elif run_start >= 0:
+                    yield base + run_start, bit - run_start
+                    run_start = -1
+                bit += 1
+        if run_start >= 0:
+            yield base + run_start, bit - run_start
+
+
+def _pread(f: BinaryIO, offset: int, size: int) -> bytes:
+    f.seek(offset)
+    data = f.read(size)
+    if len(data) != size:
+        raise UsedBlocksImageError(f"short read at offset {offset} ({len(data)}/{size})")
+    return data
+
+
+def _device_size(f: BinaryIO) -> int:
+    return f.seek(0, os.SEEK_END)
+
+
+def _add_tail(builder: _ExtentBuilder, fs_bytes: int, device_size: int, block_size: int) -> None:
+    """Bereich hinter dem Dateisystem (z. B. NTFS-Backup-Bootsektor) immer mitsichern."""
+    if device_size > fs_bytes:
+        first = fs_bytes // block_size
+        last = (device_size + block_size - 1) // block_size
+        builder.add(first, last - first)
+
+
+# --- ext2/3/4 -----------------------------------------------------------------
+
+_EXT_MAGIC = 0xEF53
+_EXT_INCOMPAT_META_BG = 0x10
+_EXT_INCOMPAT_64BIT = 0x80
+_EXT_RO_COMPAT_SPARSE_SUPER = 0x1
+_EXT_BG_BLOCK_UNINIT = 0x2
+
+
+def _ext_group_has_super(group: int, sparse_super: bool) -> bool:
+    if group <= 1 or not sparse_super:
+        return True
+    for base in (3, 5, 7):
+        n = base
+        while n < group:
+            n *= base
+        if n == group:
+            return True
+    return False
+
+
+def _probe_ext(f: BinaryIO) -> bool:
+    try:
+        sb = _pread(f, 1024, 1024)
+    except UsedBlocksImageError:
+        return False
+    return struct.unpack_from("<H", sb, 56)[0] == _EXT_MAGIC
+
+
+def _map_ext(f: BinaryIO, device_size: int) -> BlockMap:
+    sb = _pread(f, 1024, 1024)
+    blocks_lo, first_data_block, log_block_size, blocks_per_group = (
+        struct.unpack_from("<I", sb, 4)[0],
+        struct.unpack_from("<I", sb, 20)[0],
+        struct.unpack_from("<I", sb, 24)[0],
+        struct.unpack_from("<I", sb, 32)[0],
+    )
+    inodes_per_group = struct.unpack_from("<I", sb, 40)[0]
+    rev_level = struct.unpack_from("<I", sb, 76)[0]
+    inode_size = struct.unpack_from("<H", sb, 88)[0] if rev_level >= 1 else 128
+    incompat = struct.unpack_from("<I", sb, 96)[0]
+    ro_compat = struct.unpack_from("<I", sb, 100)[0]
+    reserved_gdt = struct.unpack_from("<H", sb, 206)[0]
+    block_size = 1024 << log_block_size
+    is64 = bool(incompat & _EXT_INCOMPAT_64BIT)
+    desc_size = struct.unpack_from("<H", sb, 254)[0] if is64 else 32
+    desc_size = desc_size or 32
+    blocks_count = blocks_lo | ((struct.unpack_from("<I", sb, 336)[0] << 32) if is64 else 0)
+    if blocks_per_group == 0 or blocks_count == 0:
+        raise UsedBlocksImageError("ext: invalid superblock geometry")
+    if incompat & _EXT_INCOMPAT_META_BG:
+        raise UsedBlocksImageError("ext: meta_bg layout not supported by native parser")
+
+    groups = (blocks_count - first_data_block + blocks_per_group - 1) // blocks_per_group
+    gdt_blocks = (groups * desc_size + block_size - 1) // block_size
+    gdt = _pread(f, (first_data_block + 1) * block_size, gdt_blocks * block_size)
+    itable_blocks = (inodes_per_group * inode_size + block_size - 1) // block_size
+    sparse_super = bool(ro_compat & _EXT_RO_COMPAT_SPARSE_SUPER)
+
+    def _u64(desc: bytes, lo: int, hi: int) -> int:
+        v = struct.unpack_from("<I", desc, lo)[0]
+        if is64 and desc_size >= 64:
+            v |= struct.unpack_from("<I", desc, hi)[0] << 32
+        return v
+
+    raw: list[tuple[int, int]] = []
+    for g in range(groups):
+        desc = gdt[g * desc_size : (g + 1) * desc_size]
+        block_bitmap = _u64(desc, 0x00, 0x20)
+        inode_bitmap = _u64(desc, 0x04, 0x24)
+        inode_table = _u64(desc, 0x08, 0x28)
+        flags = struct.unpack_from("<H", desc, 0x12)[0]
+        g_start = first_data_block + g * blocks_per_group
+        g_count = min(blocks_per_group, blocks_count - g_start)
+        # Metadaten jeder Gruppe unabhängig von der Bitmap (flex_bg legt sie in fremde Gruppen).
+        raw.append((block_bitmap, 1))
+        raw.append((inode_bitmap, 1))
+        raw.append((inode_table, itable_blocks))
+        if flags & _EXT_BG_BLOCK_UNINIT:
+            if _ext_group_has_super(g, sparse_super):
+                raw.append((g_start, min(g_count, 1 + gdt_blocks + reserved_gdt)))
+            continue
+        bitmap = _pread(f, block_bitmap * block_size, block_size)
+        raw.extend(_bitmap_runs(bitmap, g_start, g_count))
+    # Bootsektor/Superblock: bei 1k-Blöcken liegt Block 0 vor first_data_block und fehlt in jeder Bitmap.
+    raw.append((0, max(1, first_data_block)))
+    builder = _ExtentBuilder()
+    for start, count in _merge_extents([r for r in raw if r[0] < blocks_count]):
+        builder.add(start, min(count, blocks_count - start))
+    _add_tail(builder, blocks_count * block_size, device_size, block_size)
+    return BlockMap("ext", block_size, device_size, builder.extents)
+
+
+# --- FAT12/16/32 ----------------------------------------------------------------
+
+
+def _probe_fat(f: BinaryIO) -> bool:
+    try:
+        bs = _pread(f, 0, 512)
+    except UsedBlocksImageError:
+        return False
+    if bs[510:512] != b"\x55\xaa":
+        return False
+    bps = struct.unpack_from("<H", bs, 11)[0]
+    spc = bs[13]
+    fat_label = bs[54:57] == b"FAT" or bs[82:87] == b"FAT32"
+    return fat_label and bps in (512, 1024, 2048, 4096) and spc > 0 and (spc & (spc - 1)) == 0
+
+
+def _map_fat(f: BinaryIO, device_size: int) -> BlockMap:
+    bs = _pread(f, 0, 512)
+    bps = struct.unpack_from("<H", bs, 11)[0]
+    spc = bs[13]
+    reserved = struct.unpack_from("<H", bs, 14)[0]
+    num_fats = bs[16]
+    root_entries = struct.unpack_from("<H", bs, 17)[0]
+    total = struct.unpack_from("<H", bs, 19)[0] or struct.unpack_from("<I", bs, 32)[0]
+    fat_size = struct.unpack_from("<H", bs, 22)[0] or struct.unpack_from("<I", bs, 36)[0]
+    root_sectors = (root_entries * 32 + bps - 1) // bps
+    data_start = reserved + num_fats * fat_size + root_sectors
+    clusters = (total - data_start) // spc
+    if clusters <= 0:
+        raise UsedBlocksImageError("fat: invalid geometry")
+    fat = _pread(f, reserved * bps, fat_size * bps) + b"\x00\x00"
+
+    builder = _ExtentBuilder()
+    builder.add(0, data_start)
+    if clusters < 4085:
+        for c in range(2, clusters + 2):
+            off = c + c // 2
+            v = struct.unpack_from("<H", fat, off)[0]
+            v = v >> 4 if c & 1 else v & 0x0FFF
+            if v:
+                builder.add(data_start + (c - 2) * spc, spc)
+    else:
+        width, mask = (2, 0xFFFF) if clusters < 65525 else (4, 0x0FFFFFFF)
+        fmt = "<%d%s" % (clusters, "H" if width == 2 else "I")
+        entries = struct.unpack_from(fmt, fat, 2 * width)
+        for i, v in enumerate(entries):
+            if v & mask:
+                builder.add(data_start + i * spc, spc)
+    fs_sectors = data_start + clusters * spc
+    _add_tail(builder, fs_sectors * bps, device_size, bps)
+    return BlockMap("vfat", bps, device_size, builder.extents)
+
+
+# --- NTFS ---------------------------------------------------------------------
+
+
+def _probe_ntfs(f: BinaryIO) -> bool:
+    try:
+        return _pread(f, 3, 8) == b"NTFS    "
+    except UsedBlocksImageError:
+        return False
+
+
+def _ntfs_runlist(data: bytes, off: int) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    lcn = 0
+    while off < len(data) and data[off]:
+        hdr = data[off]
+        len_size, off_size = hdr & 0x0F, hdr >> 4
+        off += 1
+        length = int.from_bytes(data[off : off + len_size], "little")
+        off += len_size
+        if off_size:
+            lcn += int.from_bytes(data[off : off + off_size], "little", signed=True)
+            runs.append((lcn, length))
+        off += off_size
+    return runs
+
+
+def _map_ntfs(f: BinaryIO, device_size: int) -> BlockMap:
+    bs = _pread(f, 0, 512)
+    bps = struct.unpack_from("<H", bs, 11)[0]
+    spc_raw = bs[13]
+    spc = 1 << (256 - spc_raw) if spc_raw > 0x80 else spc_raw
+    cluster = bps * spc
+    total_sectors = struct.unpack_from("<Q", bs, 40)[0]
+    mft_lcn = struct.unpack_from("<Q", bs, 48)[0]
+    cpr = struct.unpack_from("<b", bs, 64)[0]
+    record_size = 1 << -cpr if cpr < 0 else cpr * cluster
+    rec = bytearray(_pread(f, mft_lcn * cluster + 6 * record_size, record_size))
+    if rec[:4] != b"FILE":
+        raise UsedBlocksImageError("ntfs: $Bitmap MFT record not found")
+    usa_off, usa_cnt = struct.unpack_from("<HH", rec, 4)
+    usn = rec[usa_off : usa_off + 2]
+    for i in range(1, usa_cnt):
+        end = i * bps - 2
+        if rec[end : end + 2] != usn:
+            raise UsedBlocksImageError("ntfs: MFT record fixup mismatch")
+        rec[end : end + 2] = rec[usa_off + 2 * i : usa_off + 2 * i + 2]
+
+    total_clusters = total_sectors // spc
+    bitmap = b""
+    off = struct.unpack_from("<H", rec, 20)[0]
+    while off + 8 <= len(rec):
+        atype, alen = struct.unpack_from("<II", rec, off)
+        if atype == 0xFFFFFFFF or alen == 0:
+            break
+        if atype == 0x80 and rec[off + 9] == 0:
+            if rec[off + 8] == 0:
+                clen, coff = struct.unpack_from("<IH", rec, off + 16)
+                bitmap = bytes(rec[off + coff : off + coff + clen])
+            else:
+                run_off = struct.unpack_from("<H", rec, off + 32)[0]
+                parts = [
+                    _pread(f, lcn * cluster, length * cluster)
+                    for lcn, length in _ntfs_runlist(bytes(rec[off : off + alen]), run_off)
+                ]
+                bitmap = b"".join(parts)
+            break
+        off += alen
+    if not bitmap:
+        raise UsedBlocksImageError("ntfs: $Bitmap data attribute missing")
+
+    builder = _ExtentBuilder()
+    for start, count in _bitmap_runs(bitmap, 0, total_clusters):
+        builder.add(start, count)
+    _add_tail(builder, total_clusters * cluster, device_size, cluster)
+    return BlockMap("ntfs", cluster, device_size, builder.extents)
+
+
+# --- Fallback -----------------------------------------------------------------
+
+
+def _map_nonzero(f: BinaryIO, device_size: int, filesystem: str) -> BlockMap:
+    builder = _ExtentBuilder()
+    zero = bytes(ZERO_SCAN_BLOCK)
+    f.seek(0)
+    block = 0
+    while True:
+        chunk = f.read(COPY_CHUNK)
+        if not chunk:
+            break
+        for i in range(0, len(chunk), ZERO_SCAN_BLOCK):
+            piece = chunk[i : i + ZERO_SCAN_BLOCK]
+            if piece != zero[: len(piece)]:
+                builder.add(block, 1)
+            block += 1
+    return BlockMap(filesystem, ZERO_SCAN_BLOCK, device_size, builder.extents, zero_fill_gaps=True)
+
+
+# --- Partitionstabellen (Whole-Disk) ------------------------------------------
+
+SECTOR = 512
+_MBR_EXTENDED_TYPES = frozenset({0x05, 0x0F, 0x85})
+_MBR_GPT_PROTECTIVE = 0xEE
+_MAX_LOGICAL_PARTITIONS = 128
+
+
+class _PartitionView:
+    """Lesesicht auf einen Bereich von ``f``; Parser sehen die Partition wie ein eigenes Gerät."""
+
+    def __init__(self, f: BinaryIO, base: int, size: int) -> None:
+        self._f = f
+        self._base = base
+        self._size = size
+        self._pos = 0
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_END:
+            offset += self._size
+        elif whence == os.SEEK_CUR:
+            offset += self._pos
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        left = max(0, self._size - self._pos)
+        n = left if size is None or size < 0 else min(size, left)
+        if n == 0:
+            return b""
+        self._f.seek(self._base + self._pos)
+        data = self._f.read(n)
+        self._pos += len(data)
+        return data
+
+
+@dataclass(frozen=True)
+class _Partition:
+    number: int
+    offset: int
+    size: int
+
+
+def _mbr_entries(sector: bytes) -> list[tuple[int, int, int]]:
+    """(Typ, Start-LBA, Sektoren) der vier Einträge; leere Einträge ausgelassen."""
+    out = []
+    for i in range(4):
+        off = 446 + 16 * i
+        ptype = sector[off + 4]
+        lba, count = struct.unpack_from("<II", sector, off + 8)
+        if ptype and count:
+            out.append((ptype, lba, count))
+    return out
+
+
+def _read_gpt(f: BinaryIO, device_size: int) -> tuple[list[_Partition], list[tuple[int, int]]]:
+    hdr = _pread(f, SECTOR, SECTOR)
+    if hdr[:8] != b"EFI PART":
+        raise UsedBlocksImageError("gpt: header signature missing")
+    alt_lba, first_usable = struct.unpack_from("<QQ", hdr, 32)
+    entries_lba = struct.unpack_from("<Q", hdr, 72)[0]
+    n_entries, entry_size = struct.unpack_from("<II", hdr, 80)
+    if entry_size < 128 or n_entries > 4096:
+        raise UsedBlocksImageError("gpt: invalid entry geometry")
+    table = _pread(f, entries_lba * SECTOR, n_entries * entry_size)
+    parts = []
+    for i in range(n_entries):
+        entry = table[i * entry_size : (i + 1) * entry_size]
+        if entry[:16] == bytes(16):
+            continue
+        first, last = struct.unpack_from("<QQ", entry, 32)
+        if last >= first:
+            parts.append(_Partition(i + 1, first * SECTOR, (last - first + 1) * SECTOR))
+    # Kopf bis zur ersten Partition (Bootloader in der Ausrichtungslücke) und Backup-Header
+    # samt Backup-Tabelle davor
+    table_sectors = (n_entries * entry_size + SECTOR - 1) // SECTOR
+    disk_sectors = device_size // SECTOR
+    alt_lba = min(alt_lba, disk_sectors - 1) if alt_lba else disk_sectors - 1
+    head = max(first_usable, entries_lba + table_sectors, min((p.offset // SECTOR for p in parts), default=0))
+    keep = [(0, head), (alt_lba - table_sectors, table_sectors + 1)]
+    return parts, keep
+
+
+def read_partition_table(f: BinaryIO, device_size: int) -> tuple[str, list[_Partition], list[tuple[int, int]]] | None:
+    """
+    MBR/GPT eines ganzen Datenträgers: ``(label, partitionen, immer_zu_sichernde_sektoren)``.
+    ``None``, wenn keine plausible Tabelle vorliegt (z. B. Dateisystem ohne Partitionierung).
+    """
+    try:
+        mbr = _pread(f, 0, SECTOR)
+    except UsedBlocksImageError:
+        return None
+    if mbr[510:512] != b"\x55\xaa":
+        return None
+    entries = _mbr_entries(mbr)
+    disk_sectors = device_size // SECTOR
+    if not entries or any(lba + count > disk_sectors + 1 for ptype, lba, count in entries if ptype != _MBR_GPT_PROTECTIVE):
+        return None
+    if any(ptype == _MBR_GPT_PROTECTIVE for ptype, _lba, _count in entries):
+        try:
+            parts, keep = _read_gpt(f, device_size)
+        except UsedBlocksImageError:
+            return None
+        return "gpt", parts, keep
+
+    parts: list[_Partition] = []
+    keep = [(0, 1)]
+    for number, (ptype, lba, count) in enumerate(entries, start=1):
+        if ptype not in _MBR_EXTENDED_TYPES:
+            parts.append(_Partition(number, lba * SECTOR, count * SECTOR))
+            continue
+        # Logische Partitionen: EBR-Kette, Adressen relativ zum Anfang der erweiterten Partition
+        ebr_lba, logical = lba, 5
+        while ebr_lba and logical < 5 + _MAX_LOGICAL_PARTITIONS:
+            ebr = _pread(f, ebr_lba * SECTOR, SECTOR)
+            if ebr[510:512] != b"\x55\xaa":
+                break
+            keep.append((ebr_lba, 1))
+            links = _mbr_entries(ebr)
+            data = [e for e in links if e[0] not in _MBR_EXTENDED_TYPES]
+            if data:
+                parts.append(_Partition(logical, (ebr_lba + data[0][1]) * SECTOR, data[0][2] * SECTOR))
+                logical += 1
+            nxt = [e for e in links if e[0] in _MBR_EXTENDED_TYPES]
+            ebr_lba = lba + nxt[0][1] if nxt else 0
+    if parts:
+        first = min(p.offset for p in parts) // SECTOR
+        keep[0] = (0, max(1, first))
+    return "mbr", parts, keep
+
+
+def _map_partitioned(f: BinaryIO, device_size: int, label: str, parts: list[_Partition], keep: list[tuple[int, int]]) -> BlockMap:
+    extents = [(start, count) for start, count in keep if count > 0]
+    info: list[dict[str, Any]] = []
+    for part in parts:
+        size = max(0, min(part.size, device_size - part.offset))
+        if size <= 0:
+            continue
+        view = _PartitionView(f, part.offset, size)
+        fs = detect_filesystem(view) or "unknown"  # type: ignore[arg-type]
+        pmap: BlockMap | None = None
+        for name, _probe, mapper in _PARSERS:
+            if name == fs:
+                try:
+                    pmap = mapper(view, size)  # type: ignore[arg-type]
+                except (UsedBlocksImageError, struct.error):
+                    pmap = None
+                break
+        base = part.offset // SECTOR
+        if pmap is None:
+            # Ohne nativen Parser ganz übernehmen (kein Nullen von Lücken nötig)
+            extents.append((base, (size + SECTOR - 1) // SECTOR))
+        else:
+            scale = pmap.block_size // SECTOR
+            for start, count in pmap.extents:
+                first = base + start * scale
+                last = min(base + (start + count) * scale, base + (size + SECTOR - 1) // SECTOR)
+                extents.append((first, last - first))
+        info.append({"number": part.number, "offset": part.offset, "size": size, "filesystem": fs if pmap else f"{fs} (full)"})
+    disk_sectors = (device_size + SECTOR - 1) // SECTOR
+    clipped = [(s, min(c, disk_sectors - s)) for s, c in extents if s < disk_sectors]
+    return BlockMap(f"disk-{label}", SECTOR, device_size, _merge_extents(clipped), partitions=info)
+
+
+_PARSERS: tuple[tuple[str, Callable[[BinaryIO], bool], Callable[[BinaryIO, int], BlockMap]], ...] = (
+    ("ext", _probe_ext, _map_ext),
+    ("ntfs", _probe_ntfs, _map_ntfs),
+    ("vfat", _probe_fat, _map_fat),
+)
+
+
+def detect_filesystem(f: BinaryIO) -> str | None:
+    """Erkennt ext/ntfs/vfat am Superblock; btrfs nur zur Kennzeichnung (Fallback-Pfad)."""
+    for name, probe, _mapper in _PARSERS:
+        if probe(f):
+            return name
+    try:
+        if _pread(f, 0x10040, 8) == b"_BHRfS_M":
+            return "btrfs"
+    except UsedBlocksImageError:
+        pass
+    return None
+
+
+def build_block_map(source: str | Path) -> BlockMap:
+    """Belegungskarte für Gerät, Partition oder Abbilddatei ``source`` (nur lesend)."""
+    with open(source, "rb") as f:
+        size = _device_size(f)
+        fs = detect_filesystem(f)
+        if fs is None:
+            table = read_partition_table(f, size)
+            if table is not None:
+                return _map_partitioned(f, size, *table)
+        fs = fs or "unknown"
+        for name, _probe, mapper in _PARSERS:
+            if name == fs:
+                try:
+                    return mapper(f, size)
+                except (UsedBlocksImageError, struct.error):
+                    # Nicht unterstützte Variante: konservativ alle Nicht-Null-Blöcke sichern.
+                    break
+        return _map_nonzero(f, size, fs)
+
+
+def _iter_extent_bytes(f: BinaryIO, bmap: BlockMap) -> Iterator[bytes]:
+    for start, count in bmap.extents:
+        offset = start * bmap.block_size
+        remaining = min(count * bmap.block_size, bmap.device_size - offset)
+        f.seek(offset)
+        while remaining > 0:
+            data = f.read(min(COPY_CHUNK, remaining))
+            if not data:
+                raise UsedBlocksImageError(f"short read at offset {f.tell()}")
+            remaining -= len(data)
+            yield data
+
+
+def write_used_blocks_image(
+    source: str | Path,
+    output_file: str | Path,
+    *,
+    manifest: Mapping[str, Any] | None = None,
+    compress_level: int = 1,
+    progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """
+    Schreibt den Container für ``source`` nach ``output_file`` und liefert den Header.
+    ``manifest`` (z. B. aus ``create_manifest`` mit ``partition_layout_sfdisk_d``) wird eingebettet.
+    """
+    bmap = build_block_map(source)
+    header: dict[str, Any] = {
+        "kind": IMAGE_KIND,
+        "version": 1,
+        "filesystem": bmap.filesystem,
+        "block_size": bmap.block_size,
+        "device_size": bmap.device_size,
+        "used_bytes": bmap.used_bytes,
+        "extent_count": len(bmap.extents),
+        "zero_fill_gaps": bmap.zero_fill_gaps,
+        "partitions": bmap.partitions,
+        "compression": "zlib",
+        "manifest": dict(manifest or {}),
+    }
+    header_raw = json.dumps(header, sort_keys=True).encode("utf-8")
+    out = Path(output_file)
+    tmp = out.with_name(out.name + ".partial")
+    digest = hashlib.sha256()
+    done = 0
+    try:
+        with open(source, "rb") as src, tmp.open("wb") as dst:
+            dst.write(IMAGE_MAGIC)
+            dst.write(struct.pack("<I", len(header_raw)))
+            dst.write(header_raw)
+            for start, count in bmap.extents:
+                dst.write(_EXTENT.pack(start, count))
+            comp = zlib.compressobj(compress_level)
+            for data in _iter_extent_bytes(src, bmap):
+                digest.update(data)
+                dst.write(comp.compress(data))
+                done += len(data)
+                if progress is not None:
+                    progress(done, bmap.used_bytes)
+            dst.write(comp.flush())
+            dst.write(digest.digest())
+            dst.write(IMAGE_END_MAGIC)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    header["data_sha256"] = digest.hexdigest()
+    return header
+
+
+def read_image_header(image_file: str | Path) -> tuple[dict[str, Any], list[tuple[int, int]], int]:
+    """Header, Extent-Tabelle und Offset des Datenstroms."""
+    with open(image_file, "rb") as f:
+        if f.read(8) != IMAGE_MAGIC:
+            raise UsedBlocksImageError("not a used-blocks image container")
+        (hlen,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(hlen).decode("utf-8"))
+        if header.get("kind") != IMAGE_KIND:
+            raise UsedBlocksImageError("unexpected container kind")
+        n = int(header.get("extent_count") or 0)
+        table = f.read(n * _EXTENT.size)
+        if len(table) != n * _EXTENT.size:
+            raise UsedBlocksImageError("extent table truncated")
+        extents = [_EXTENT.unpack_from(table, i * _EXTENT.size) for i in range(n)]
+        return header, extents, f.tell()
+
+
+def _iter_image_data(f: BinaryIO, data_offset: int) -> Iterator[bytes]:
+    """Dekomprimierter Datenstrom; prüft Trailer und SHA-256 am Ende."""
+    f.seek(0, os.SEEK_END)
+    end = f.tell() - 40
+    if end < data_offset:
+        raise UsedBlocksImageError("container truncated")
+    f.seek(end)
+    trailer = f.read(40)
+    if trailer[32:] != IMAGE_END_MAGIC:
+        raise UsedBlocksImageError("container trailer missing (truncated image)")
+    expected = trailer[:32]
+    f.seek(data_offset)
+    remaining = end - data_offset
+    dec = zlib.decompressobj()
+    digest = hashlib.sha256()
+    while remaining > 0:
+        raw = f.read(min(COPY_CHUNK, remaining))
+        if not raw:
+            raise UsedBlocksImageError("container truncated")
+        remaining -= len(raw)
+        data = dec.decompress(raw)
+        if data:
+            digest.update(data)
+            yield data
+    data = dec.flush()
+    if data:
+        digest.update(data)
+        yield data
+    if not dec.eof or digest.digest() != expected:
+        raise UsedBlocksImageError("data checksum mismatch")
+
+
+def verify_used_blocks_image(image_file: str | Path) -> tuple[bool, str | None]:
+    """Liest den Container vollständig und prüft Länge und SHA-256 (ohne Schreibzugriff)."""
+    try:
+        header, extents, data_offset = read_image_header(image_file)
+        bs = int(header["block_size"])
+        dev_size = int(header["device_size"])
+        expected = sum(min(c * bs, dev_size - s * bs) for s, c in extents)
+        total = 0
+        with open(image_file, "rb") as f:
+            for data in _iter_image_data(f, data_offset):
+                total += len(data)
+        if total != expected:
+            return False, f"data length mismatch ({total}/{expected})"
+        return True, None
+    except (OSError, ValueError, KeyError, zlib.error, UsedBlocksImageError) as e:
+        return False, str(e)
+
+
+def _write_zeros(dst: BinaryIO, offset: int, length: int) -> None:
+    zero = bytes(min(COPY_CHUNK, length))
+    dst.seek(offset)
+    while length > 0:
+        n = min(len(zero), length)
+        dst.write(zero[:n])
+        length -= n
+
+
+def restore_used_blocks_image(
+    image_file: str | Path,
+    target: str | Path,
+    *,
+    progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """
+    Schreibt belegte Blöcke an ihre Offsets auf ``target`` (Blockgerät oder Abbilddatei).
+    Reguläre Zieldateien werden auf ``device_size`` gesetzt (Lücken bleiben sparse).
+    """
+    header, extents, data_offset = read_image_header(image_file)
+    bs = int(header["block_size"])
+    dev_size = int(header["device_size"])
+    zero_gaps = bool(header.get("zero_fill_gaps"))
+    used = int(header.get("used_bytes") or 0)
+    tgt = Path(target)
+    is_regular = not str(target).startswith("/dev/") and (not tgt.exists() or tgt.is_file())
+    mode = "r+b" if tgt.exists() else "w+b"
+    with open(image_file, "rb") as src, open(tgt, mode) as dst:
+        if is_regular:
+            dst.truncate(0)
+            dst.truncate(dev_size)
+        elif _device_size(dst) < dev_size:
+            raise UsedBlocksImageError(f"target too small ({_device_size(dst)} < {dev_size})")
+        stream = _iter_image_data(src, data_offset)
+        buf = b""
+        done = 0
+        cursor = 0
+        for start, count in extents:
+            offset = start * bs
+            length = min(count * bs, dev_size - offset)
+            if zero_gaps and not is_regular and offset > cursor:
+                _write_zeros(dst, cursor, offset - cursor)
+            dst.seek(offset)
+            while length > 0:
+                if not buf:
+                    buf = next(stream, b"")
+                    if not buf:
+                        raise UsedBlocksImageError("data stream shorter than block map")
+                piece, buf = buf[:length], buf[length:]
+                dst.write(piece)
+                length -= len(piece)
+                done += len(piece)
+                if progress is not None:
+                    progress(done, used)
+            cursor = offset + min(count * bs, dev_size - offset)
+        if zero_gaps and not is_regular and cursor < dev_size:
+            _write_zeros(dst, cursor, dev_size - cursor)
+        if buf or next(stream, b""):
+            raise UsedBlocksImageError("data stream longer than block map")
+        dst.flush()
+        os.fsync(dst.fileno())
+    return header
+
+
+__all__ = [
+    "IMAGE_KIND",
+    "IMAGE_SUFFIX",
+    "BlockMap",
+    "UsedBlocksImageError",
+    "build_block_map",
+    "detect_filesystem",
+    "read_partition_table",
+    "read_image_header",
+    "restore_used_blocks_image",
+    "verify_used_blocks_image",
+    "write_used_blocks_image",
+]
@@ -2,6 +2,9 @@
 """
 PI-Installer OLED Display Runner
 Zeigt zyklisch ausgewählte Metriken auf SSD1306 OLED (I2C 0x3C/0x3D).
+
+Werte werden während der Anzeigedauer einer Seite jede ``REFRESH_INTERVAL_SEC`` aktualisiert;
+gezeichnet und über I2C gesendet wird nur, was sich geändert hat (``oled_render``).
 """
 
 from __future__ import annotations
@@ -20,6 +23,10 @@ import psutil
 
 
 RUNNING = True
+REFRESH_INTERVAL_SEC = 1.0
+IP_CACHE_SEC = 30.0
+
+_ip_cache: Tuple[float, str] = (0.0, "")
 
 
 def _on_signal(_signum, _frame):
@@ -85,7 +92,8 @@ def get_cpu_temp() -> str:
 
 def get_utilization() -> str:
     try:
-        return f"{psutil.cpu_percent(interval=0.2):.0f}%"
+        # nicht blockierend: Auslastung seit dem letzten Aufruf (Refresh-Intervall)
+        return f"{psutil.cpu_percent(interval=None):.0f}%"
     except Exception:
         return "n/a"
 
@@ -98,6 +106,16 @@ def get_memory_usage() -> str:
 
 
 def get_ip() -> str:
+    global _ip_cache
+    now = time.monotonic()
+    if _ip_cache[1] and now - _ip_cache[0] < IP_CACHE_SEC:
+        return _ip_cache[1]
+    ip = _lookup_ip()
+    _ip_cache = (now, ip)
+    return ip
+
+
+def _lookup_ip() -> str:
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
@@ -139,39 +157,17 @@ def metric_info(metric: str) -> Tuple[str, str, int]:
     return ("PI-Installer", "n/a", 0)
 
 
-def draw_metric_page(draw, width: int, height: int, font, ip_text: str, metric: str) -> None:
+def metric_values(metric: str, ip_text: str) -> Dict[str, Any]:
+    """Widget-Werte der Metrik-Seite (siehe ``oled_render.metric_page_layout``)."""
     label, value_text, percent = metric_info(metric)
-    # Kopfzeile mit IP (immer sichtbar)
-    draw.rectangle((0, 0, width, 12), outline=255, fill=0)
-    draw.text((2, 2), f"IP {ip_text}", font=font, fill=255)
-
-    # Grafikbereich darunter (Tortendiagramm)
-    pie_left = 4
-    pie_top = 16
-    pie_size = min(height - pie_top - 2, 44)
-    pie_box = (pie_left, pie_top, pie_left + pie_size, pie_top + pie_size)
-    draw.ellipse(pie_box, outline=255, fill=0)
-    if percent > 0:
-        end_angle = -90 + int(360 * (percent / 100.0))
-        draw.pieslice(pie_box, start=-90, end=end_angle, outline=255, fill=255)
-        # Loch in der Mitte für besseren "Donut"-Look auf Monochrom
-        inset = 10
-        inner = (
-            pie_box[0] + inset,
-            pie_box[1] + inset,
-            pie_box[2] - inset,
-            pie_box[3] - inset,
-        )
-        if inner[2] > inner[0] and inner[3] > inner[1]:
-            draw.ellipse(inner, outline=255, fill=0)
-
-    # Text rechts vom Diagramm
-    text_x = pie_left + pie_size + 6
-    draw.text((text_x, 20), label, font=font, fill=255)
-    draw.text((text_x, 34), value_text, font=font, fill=255)
-    # Wenn der Wert bereits Prozent enthält (z. B. "47%"), nicht doppelt anzeigen.
-    if "%" not in value_text:
-        draw.text((text_x, 48), f"{percent:3d}%", font=font, fill=255)
+    return {
+        "ip": f"IP {ip_text}",
+        "label": label,
+        "value": value_text,
+        "percent": percent,
+        # Wenn der Wert bereits Prozent enthält (z. B. "47%"), nicht doppelt anzeigen.
+        "percent_text": "" if "%" in value_text else f"{percent:3d}%",
+    }
 
 
 def main() -> int:
@@ -185,7 +181,9 @@ def main() -> int:
     try:
         from luma.core.interface.serial import i2c
         from luma.oled.device import ssd1306
-        from PIL import Image, ImageDraw, ImageFont
+        from PIL import ImageFont
+
+        from oled_render import DamageRenderer, LumaPanel
     except Exception as e:
         print(f"[oled-runner] Fehlende OLED-Abhängigkeiten: {e}", flush=True)
         return 2
@@ -230,16 +228,17 @@ def main() -> int:
             for addr in (0x3C, 0x3D):
                 try:
                     serial = i2c(port=port, address=addr)
-                    # 180 Grad drehen
-                    dev = ssd1306(serial, rotate=2)
+                    # 180 Grad drehen (per Controller-Remap, Frames werden direkt ins GDDRAM geschrieben)
+                    renderer = DamageRenderer(LumaPanel(ssd1306(serial), rotate180=True), font)
                     print(f"[oled-runner] OLED initialisiert auf I2C-Bus {port}, Adresse 0x{addr:02x}", flush=True)
-                    return dev
+                    return renderer
                 except Exception:
                     continue
         return None
 
     font = ImageFont.load_default()
     device = _try_init_device()
+    psutil.cpu_percent(interval=None)  # Referenzpunkt für die nicht blockierende Messung
 
     while RUNNING:
         if device is None:
@@ -269,30 +268,26 @@ def main() -> int:
             rotating_metrics = [("utilization", 3)]
 
         for metric, duration in rotating_metrics:
-            if not RUNNING:
-                break
-            ip_text = get_ip()
-            image = Image.new("1", (device.width, device.height))
-            draw = ImageDraw.Draw(image)
-            draw.rectangle((0, 0, device.width, device.height), outline=0, fill=0)
-            draw_metric_page(draw, device.width, device.height, font, ip_text, metric)
-            try:
-                device.display(image)
-            except Exception:
-                print("[oled-runner] OLED-Verbindung verloren. Reinitialisiere...", flush=True)
-                device = None
+            if not RUNNING or device is None:
                 break
-
             end_at = time.time() + max(1, min(120, duration))
-            while RUNNING and time.time() < end_at:
-                time.sleep(0.2)
+            while RUNNING:
+                try:
+                    device.render(metric_values(metric, get_ip()))
+                except Exception:
+                    print("[oled-runner] OLED-Verbindung verloren. Reinitialisiere...", flush=True)
+                    device = None
+                    break
+                remaining = end_at - time.time()
+                if remaining <= 0:
+                    break
+                next_refresh = time.time() + min(REFRESH_INTERVAL_SEC, remaining)
+                while RUNNING and time.time() < next_refresh:
+                    time.sleep(0.2)
 
     if device is not None:
         try:
-            image = Image.new("1", (device.width, device.height))
-            draw = ImageDraw.Draw(image)
-            draw.rectangle((0, 0, device.width, device.height), outline=0, fill=0)
-            device.display(image)
+            device.clear()
         except Exception:
             pass
     try:
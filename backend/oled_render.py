@@ -0,0 +1,271 @@
+"""
+Damage-Tracking-Renderer für SSD1306-OLEDs (I2C) des OLED Display Runners.
+
+Statt je Zyklus das ganze Bild neu zu zeichnen und 1024 Byte über I2C zu schicken:
+
+- Die Seite besteht aus Widgets mit festen Boxen. Ein Widget wird nur neu gezeichnet, wenn
+  sich sein Wert geändert hat; statische Teile (Kopfzeilen-Rahmen) einmal beim Start.
+- Text- und Donut-Bilder werden vorgerendert gecacht (Text je String und Box, Donut je
+  Prozentwert) und nur noch in die Leinwand kopiert.
+- Die Leinwand wird in das GDDRAM-Format des Controllers gepackt (Pages à 8 Zeilen, ein Byte
+  je Spalte, LSB oben) und gegen den zuletzt gesendeten Stand verglichen. Gesendet werden
+  nur geänderte Spaltenbereiche je Page (``0x21``/``0x22``-Adressfenster + Daten); kleine
+  Lücken werden mitgesendet, wenn das billiger ist als ein weiteres Fenster.
+
+PIL wird nur für das Zeichnen gebraucht; luma.oled nur im Adapter ``LumaPanel``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Protocol
+
+from PIL import Image, ImageDraw
+
+PAGE_HEIGHT = 8
+# Adressfenster: 0x21 col_start col_end 0x22 page_start page_end
+WINDOW_CMD_BYTES = 6
+TEXT_CACHE_MAX = 256
+
+_BITREV = bytes(int(f"{b:08b}"[::-1], 2) for b in range(256))
+
+Box = tuple[int, int, int, int]  # x0, y0, x1, y1 (exklusiv)
+
+
+class PanelDriver(Protocol):
+    """Minimal-Schnittstelle zum Controller; Fenster in Page-/Spalten-Koordinaten (inklusiv)."""
+
+    width: int
+    height: int
+
+    def write_window(self, page_start: int, page_end: int, col_start: int, col_end: int, data: bytes) -> None: ...
+
+
+def pack_pages(image: Image.Image) -> bytes:
+    """1-Bit-Bild → GDDRAM-Layout: ``out[page * width + x]``, Bit 0 = oberste Zeile der Page."""
+    width, height = image.size
+    pages = height // PAGE_HEIGHT
+    # TRANSPOSE: je Quellspalte eine Zeile mit ``pages`` Bytes (MSB oben) → Bits umdrehen
+    raw = image.transpose(Image.Transpose.TRANSPOSE).tobytes().translate(_BITREV)
+    return b"".join(raw[p::pages] for p in range(pages))
+
+
+def _page_runs(prev: bytes, cur: bytes, start: int, width: int) -> list[tuple[int, int]]:
+    """Geänderte Spalten einer Page als (erste, letzte); Lücken ≤ WINDOW_CMD_BYTES werden überbrückt."""
+    if prev[start:start + width] == cur[start:start + width]:
+        return []
+    runs: list[tuple[int, int]] = []
+    x = 0
+    while x < width:
+        if prev[start + x] == cur[start + x]:
+            x += 1
+            continue
+        first = x
+        last = x
+        x += 1
+        while x < width:
+            if prev[start + x] != cur[start + x]:
+                last = x
+            elif x - last > WINDOW_CMD_BYTES:
+                break
+            x += 1
+        runs.append((first, last))
+    return runs
+
+
+def dirty_windows(prev: bytes | None, cur: bytes, width: int, height: int) -> list[tuple[int, int, int, int]]:
+    """Fenster (page_start, page_end, col_start, col_end); gleiche Spaltenbereiche benachbarter Pages werden vereint."""
+    pages = height // PAGE_HEIGHT
+    if prev is None or len(prev) != len(cur):
+        return [(0, pages - 1, 0, width - 1)]
+    windows: list[tuple[int, int, int, int]] = []
+    open_windows: dict[tuple[int, int], int] = {}
+    for page in range(pages):
+        next_open: dict[tuple[int, int], int] = {}
+        for run in _page_runs(prev, cur, page * width, width):
+            idx = open_windows.get(run)
+            if idx is not None and windows[idx][1] == page - 1:
+                p0, _p1, c0, c1 = windows[idx]
+                windows[idx] = (p0, page, c0, c1)
+            else:
+                idx = len(windows)
+                windows.append((page, page, run[0], run[1]))
+            next_open[run] = idx
+        open_windows = next_open
+    return windows
+
+
+def window_data(buf: bytes, width: int, window: tuple[int, int, int, int]) -> bytes:
+    p0, p1, c0, c1 = window
+    return b"".join(buf[p * width + c0:p * width + c1 + 1] for p in range(p0, p1 + 1))
+
+
+class RenderCache:
+    """Vorgerenderte Text-Kacheln (LRU) und Donut-Bilder je Prozentwert."""
+
+    def __init__(self, font: Any) -> None:
+        self.font = font
+        self._text: OrderedDict[tuple[str, int, int, int, int], Image.Image] = OrderedDict()
+        self._donut: dict[tuple[int, int], Image.Image] = {}
+
+    def text(self, value: str, size: tuple[int, int], offset: tuple[int, int] = (0, 0)) -> Image.Image:
+        key = (value, size[0], size[1], offset[0], offset[1])
+        tile = self._text.get(key)
+        if tile is not None:
+            self._text.move_to_end(key)
+            return tile
+        tile = Image.new("1", size, 0)
+        if value:
+            ImageDraw.Draw(tile).text(offset, value, font=self.font, fill=255)
+        self._text[key] = tile
+        while len(self._text) > TEXT_CACHE_MAX:
+            self._text.popitem(last=False)
+        return tile
+
+    def donut(self, percent: int, size: int) -> Image.Image:
+        """Tortendiagramm mit Loch (Donut) für Monochrom; Kachel ist ``size``+1 Pixel groß."""
+        percent = max(0, min(100, int(percent)))
+        key = (percent, size)
+        tile = self._donut.get(key)
+        if tile is not None:
+            return tile
+        tile = Image.new("1", (size + 1, size + 1), 0)
+        draw = ImageDraw.Draw(tile)
+        box = (0, 0, size, size)
+        draw.ellipse(box, outline=255, fill=0)
+        if percent > 0:
+            draw.pieslice(box, start=-90, end=-90 + int(360 * (percent / 100.0)), outline=255, fill=255)
+            inset = 10
+            inner = (inset, inset, size - inset, size - inset)
+            if inner[2] > inner[0] and inner[3] > inner[1]:
+                draw.ellipse(inner, outline=255, fill=0)
+        self._donut[key] = tile
+        return tile
+
+
+@dataclass(frozen=True)
+class Widget:
+    key: str
+    box: Box
+    render: Callable[[RenderCache, Any, tuple[int, int]], Image.Image]
+
+
+def text_widget(key: str, box: Box, offset: tuple[int, int] = (0, 0)) -> Widget:
+    return Widget(key, box, lambda cache, value, size: cache.text(str(value or ""), size, offset))
+
+
+def donut_widget(key: str, box: Box) -> Widget:
+    return Widget(key, box, lambda cache, value, size: cache.donut(int(value or 0), size[0] - 1))
+
+
+@dataclass
+class FrameStats:
+    widgets_redrawn: list[str] = field(default_factory=list)
+    windows: int = 0
+    data_bytes: int = 0
+
+    @property
+    def bytes_sent(self) -> int:
+        return self.data_bytes + self.windows * WINDOW_CMD_BYTES
+
+
+def metric_page_layout(width: int, height: int) -> tuple[list[Widget], Callable[[ImageDraw.ImageDraw], None]]:
+    """Layout der Metrik-Seite (Kopfzeile mit IP, Donut links, Texte rechts) + statischer Hintergrund."""
+    pie_left, pie_top = 4, 16
+    pie_size = min(height - pie_top - 2, 44)
+    text_x = pie_left + pie_size + 6
+    widgets = [
+        # Innenraum des Kopfzeilen-Rahmens; Text wie bisher bei (2, 2)
+        text_widget("ip", (1, 1, width, 12), offset=(1, 1)),
+        donut_widget("percent", (pie_left, pie_top, pie_left + pie_size + 1, pie_top + pie_size + 1)),
+        text_widget("label", (text_x, 20, width, 34)),
+        text_widget("value", (text_x, 34, width, 48)),
+        text_widget("percent_text", (text_x, 48, width, height)),
+    ]
+
+    def _static(draw: ImageDraw.ImageDraw) -> None:
+        draw.rectangle((0, 0, width, 12), outline=255, fill=0)
+
+    return widgets, _static
+
+
+class DamageRenderer:
+    """Hält Leinwand, letzte Widget-Werte und den zuletzt gesendeten GDDRAM-Stand."""
+
+    def __init__(
+        self,
+        panel: PanelDriver,
+        font: Any,
+        *,
+        layout: tuple[list[Widget], Callable[[ImageDraw.ImageDraw], None]] | None = None,
+    ) -> None:
+        self.panel = panel
+        self.width = int(panel.width)
+        self.height = int(panel.height)
+        self.widgets, self._draw_static = layout or metric_page_layout(self.width, self.height)
+        self.cache = RenderCache(font)
+        self.canvas = Image.new("1", (self.width, self.height), 0)
+        self._draw_static(ImageDraw.Draw(self.canvas))
+        self._values: dict[str, Any] = {}
+        self._sent: bytes | None = None
+
+    def invalidate(self) -> None:
+        """Panel-Inhalt unbekannt (z. B. nach Reconnect): nächster Frame sendet alles."""
+        self._sent = None
+
+    def render(self, values: dict[str, Any]) -> FrameStats:
+        stats = FrameStats()
+        for widget in self.widgets:
+            value = values.get(widget.key)
+            if widget.key in self._values and self._values[widget.key] == value:
+                continue
+            x0, y0, x1, y1 = widget.box
+            self.canvas.paste(widget.render(self.cache, value, (x1 - x0, y1 - y0)), (x0, y0))
+            self._values[widget.key] = value
+            stats.widgets_redrawn.append(widget.key)
+        return self.flush(stats)
+
+    def flush(self, stats: FrameStats | None = None) -> FrameStats:
+        stats = stats or FrameStats()
+        cur = pack_pages(self.canvas)
+        for window in dirty_windows(self._sent, cur, self.width, self.height):
+            data = window_data(cur, self.width, window)
+            self.panel.write_window(*window, data)
+            stats.windows += 1
+            stats.data_bytes += len(data)
+        self._sent = cur
+        return stats
+
+    def clear(self) -> FrameStats:
+        self.canvas = Image.new("1", (self.width, self.height), 0)
+        self._values.clear()
+        return self.flush()
+
+
+class LumaPanel:
+    """Adapter für ``luma.oled.device.ssd1306``: schreibt Fenster direkt ins GDDRAM."""
+
+    def __init__(self, device: Any, *, rotate180: bool = False) -> None:
+        self.device = device
+        self.width = int(device.width)
+        self.height = int(device.height)
+        if rotate180:
+            # Segment-Remap/COM-Scan zurückdrehen statt das Bild je Frame zu rotieren
+            device.command(0xA0, 0xC0)
+
+    def write_window(self, page_start: int, page_end: int, col_start: int, col_end: int, data: bytes) -> None:
+        self.device.command(0x21, col_start, col_end, 0x22, page_start, page_end)
+        self.device.data(list(data))
+
+
+__all__ = [
+    "DamageRenderer",
+    "FrameStats",
+    "LumaPanel",
+    "PanelDriver",
+    "RenderCache",
+    "dirty_windows",
+    "metric_page_layout",
+    "pack_pages",
+]
@@ -5,11 +5,17 @@ from __future__ import annotations
 import json
 from typing import Any
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse, Response
 
 from core.rescue_telemetry_ingest import build_health_payload, process_telemetry_ingest
-from core.rescue_telemetry_tasks import build_compact_task_pull_status, get_next_task, store_task_result
+from core.rescue_telemetry_tasks import (
+    LONG_POLL_MAX_SECONDS,
+    build_compact_task_pull_status,
+    get_next_task,
+    store_task_result,
+    wait_for_next_task,
+)
 
 router = APIRouter(prefix="/api/rescue/telemetry", tags=["rescue-telemetry"])
 
@@ -46,9 +52,18 @@ async def rescue_telemetry_ingest_v1(request: Request) -> JSONResponse:
 
 
 @router.get("/v1/tasks/next")
-async def rescue_telemetry_task_next(boot_id: str = "") -> JSONResponse:
-    """Return next allowlisted task for rescue stick pull (outbound from stick only)."""
-    task = get_next_task(boot_id=boot_id or "*")
+async def rescue_telemetry_task_next(
+    boot_id: str = "",
+    wait: float = Query(default=0.0, ge=0.0, le=LONG_POLL_MAX_SECONDS),
+) -> JSONResponse:
+    """Return next allowlisted task for rescue stick pull (outbound from stick only).
+
+    ``wait`` > 0 turns the request into a long-poll that returns as soon as a task is queued.
+    """
+    if wait > 0:
+        task = await wait_for_next_task(boot_id=boot_id or "*", timeout=wait)
+    else:
+        task = get_next_task(boot_id=boot_id or "*")
     if task is None:
         return Response(status_code=204)
     return JSONResponse(status_code=200, content=task)
@@ -6,6 +6,7 @@ from .db import (
     get_remote_db_path,
     init_remote_db,
     get_connection,
+    close_connection_pools,
     hash_token,
     verify_token,
     audit_log_insert,
@@ -15,6 +16,7 @@ __all__ = [
     "get_remote_db_path",
     "init_remote_db",
     "get_connection",
+    "close_connection_pools",
     "hash_token",
     "verify_token",
     "audit_log_insert",
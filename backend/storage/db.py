@@ -7,16 +7,21 @@ DB-Pfad: optional über init_remote_db(config_dir) gesetzt, sonst Zustandsverzei
 import hashlib
 import os
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Optional
 
 from core.install_paths import get_state_dir
+from core.sqlite_registry import open_wal_connection
 
 # Wird von init_remote_db() gesetzt; Fallback für get_remote_db_path()
 _remote_db_path: Optional[Path] = None
 
 # Schema-Version für spätere Migrationen
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = 3
+
+# Höchstzahl ruhender Verbindungen je DB-Datei im Pool
+POOL_MAX_IDLE = 8
 
 
 def get_remote_db_path() -> Path:
@@ -58,7 +63,13 @@ def init_remote_db(config_dir: Optional[Path] = None) -> None:
             except sqlite3.OperationalError:
                 pass  # Spalte existiert bereits
             conn.execute("UPDATE _schema_version SET version = 2")
+        if current < 3:
+            # Token-Lookups (Session-Validierung, Pairing-Claim) ohne Tabellenscan
+            conn.executescript(_TOKEN_INDEX_SQL)
+            conn.execute("UPDATE _schema_version SET version = 3")
         conn.commit()
+        # WAL ist eine Eigenschaft der DB-Datei: Leser blockieren Schreiber nicht mehr
+        conn.execute("PRAGMA journal_mode=WAL")
 
 
 _SCHEMA_SQL = """
@@ -72,6 +83,8 @@ CREATE TABLE IF NOT EXISTS pairing_tickets (
     status TEXT NOT NULL DEFAULT 'pending'
 );
 
+CREATE INDEX IF NOT EXISTS idx_pairing_tickets_ticket_hash ON pairing_tickets(ticket_hash);
+
 -- Sessions: nur Hash des Session-Tokens
 CREATE TABLE IF NOT EXISTS sessions (
     id TEXT PRIMARY KEY,
@@ -84,6 +97,7 @@ CREATE TABLE IF NOT EXISTS sessions (
 
 CREATE INDEX IF NOT EXISTS idx_sessions_device_id ON sessions(device_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_token_hash ON sessions(session_token_hash);
 
 -- Gekoppelte Geräte (Profil pro device_id)
 CREATE TABLE IF NOT EXISTS remote_device_profiles (
@@ -111,9 +125,91 @@ CREATE INDEX IF NOT EXISTS idx_audit_log_device_id ON audit_log(device_id);
 """
 
 
+_TOKEN_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_sessions_token_hash ON sessions(session_token_hash);
+CREATE INDEX IF NOT EXISTS idx_pairing_tickets_ticket_hash ON pairing_tickets(ticket_hash);
+"""
+
+
+class _PooledConnection(sqlite3.Connection):
+    """sqlite3-Verbindung, deren close() sie an den Pool zurückgibt statt sie zu schließen."""
+
+    _pool: Optional["_ConnectionPool"] = None
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def close_for_real(self) -> None:
+        self._pool = None
+        super().close()
+
+
+class _ConnectionPool:
+    """Thread-sicherer Pool je DB-Datei (WAL, synchronous=NORMAL, busy_timeout)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._idle: list[_PooledConnection] = []
+
+    def _open(self) -> _PooledConnection:
+        conn = open_wal_connection(self.path, factory=_PooledConnection)
+        conn._pool = self
+        return conn
+
+    def acquire(self) -> _PooledConnection:
+        if not self.path.exists():
+            self.close_all()  # DB-Datei gelöscht: ruhende Verbindungen zeigen auf die alte Datei
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        return conn if conn is not None else self._open()
+
+    def release(self, conn: _PooledConnection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()  # nicht committete Änderungen verwerfen wie beim Schließen
+        except sqlite3.Error:
+            conn.close_for_real()
+            return
+        with self._lock:
+            if len(self._idle) < POOL_MAX_IDLE and conn not in self._idle:
+                self._idle.append(conn)
+                return
+        conn.close_for_real()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close_for_real()
+
+
+_pools: dict[str, _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
 def get_connection() -> sqlite3.Connection:
-    """Öffnet eine Verbindung zur Remote-DB. Caller muss conn.close() aufrufen."""
-    return sqlite3.connect(str(get_remote_db_path()))
+    """Verbindung zur Remote-DB aus dem Pool. Caller muss conn.close() aufrufen (gibt sie zurück)."""
+    path = get_remote_db_path()
+    key = str(path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _ConnectionPool(path)
+    return pool.acquire()
+
+
+def close_connection_pools() -> None:
+    """Alle ruhenden Pool-Verbindungen schließen (Shutdown, Tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
 
 
 def hash_token(plain: str) -> str:
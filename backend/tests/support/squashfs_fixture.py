@@ -0,0 +1,252 @@
+"""Minimaler SquashFS-4.0-Writer für Tests (ohne mksquashfs).
+
+Erzeugt Images mit regulären Dateien (Datenblöcke + Fragmente), Symlinks und Verzeichnissen;
+gzip oder xz, Metadaten wahlweise komprimiert. Kein Export-/Xattr-Table.
+"""
+
+from __future__ import annotations
+
+import lzma
+import struct
+import zlib
+from pathlib import Path
+
+_META = 8192
+_NO_TABLE = 0xFFFFFFFFFFFFFFFF
+_NO_FRAGMENT = 0xFFFFFFFF
+_UNCOMPRESSED_DATA = 1 << 24
+
+
+def _compressor(name: str):
+    if name == "gzip":
+        return 1, lambda data: zlib.compress(data, 9)
+    if name == "xz":
+        return 4, lambda data: lzma.compress(data, format=lzma.FORMAT_XZ, check=lzma.CHECK_CRC32)
+    raise ValueError(name)
+
+
+class _MetaWriter:
+    def __init__(self, compress, enabled: bool) -> None:
+        self.out = bytearray()
+        self.buf = bytearray()
+        self._compress = compress
+        self._enabled = enabled
+
+    def position(self) -> tuple[int, int]:
+        return len(self.out), len(self.buf)
+
+    def write(self, data: bytes) -> None:
+        self.buf += data
+        while len(self.buf) >= _META:
+            self._flush(bytes(self.buf[:_META]))
+            del self.buf[:_META]
+
+    def _flush(self, block: bytes) -> None:
+        packed = self._compress(block) if self._enabled else block
+        if self._enabled and len(packed) < len(block):
+            self.out += struct.pack("<H", len(packed)) + packed
+        else:
+            self.out += struct.pack("<H", len(block) | 0x8000) + block
+
+    def finish(self) -> bytes:
+        if self.buf:
+            self._flush(bytes(self.buf))
+            self.buf.clear()
+        return bytes(self.out)
+
+
+def build_squashfs(
+    target: Path,
+    files: dict[str, bytes | str],
+    *,
+    symlinks: dict[str, str] | None = None,
+    directories: tuple[str, ...] = (),
+    block_size: int = 4096,
+    compression: str = "gzip",
+    compress_metadata: bool = True,
+    use_fragments: bool = True,
+    mtime: int = 1_700_000_000,
+    uid: int = 0,
+    gid: int = 0,
+) -> Path:
+    comp_id, compress = _compressor(compression)
+    block_log = block_size.bit_length() - 1
+    if block_size != 1 << block_log:
+        raise ValueError("block_size must be a power of two")
+
+    # Baum aufbauen: Pfad -> ("dir", None) | ("file", bytes) | ("symlink", str)
+    nodes: dict[str, tuple[str, object]] = {"": ("dir", None)}
+
+    def _add_parents(path: str) -> None:
+        parts = path.split("/")
+        for i in range(1, len(parts)):
+            nodes.setdefault("/".join(parts[:i]), ("dir", None))
+
+    for path in directories:
+        path = path.strip("/")
+        _add_parents(path)
+        nodes[path] = ("dir", None)
+    for path, content in files.items():
+        path = path.strip("/")
+        _add_parents(path)
+        nodes[path] = ("file", content.encode("utf-8") if isinstance(content, str) else bytes(content))
+    for path, link in (symlinks or {}).items():
+        path = path.strip("/")
+        _add_parents(path)
+        nodes[path] = ("symlink", link)
+
+    children: dict[str, list[str]] = {p: [] for p, (kind, _) in nodes.items() if kind == "dir"}
+    for path in nodes:
+        if path:
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            children[parent].append(path)
+    for names in children.values():
+        names.sort(key=lambda p: p.rsplit("/", 1)[-1].encode("utf-8"))
+
+    # Inode-Nummern in Pre-Order (Wurzel = 1)
+    numbers: dict[str, int] = {}
+    stack = [""]
+    while stack:
+        path = stack.pop()
+        numbers[path] = len(numbers) + 1
+        stack.extend(reversed(children.get(path, [])))
+
+    # Datenbereich: Blöcke je Datei, Dateienden in Fragmente
+    data = bytearray(b"\0" * 96)
+    fragments: list[tuple[int, int]] = []
+    frag_buf = bytearray()
+    file_layout: dict[str, tuple[int, list[int], int, int]] = {}
+
+    def _write_block(raw: bytes) -> tuple[int, int]:
+        packed = compress(raw)
+        start = len(data)
+        if len(packed) < len(raw):
+            data.extend(packed)
+            return start, len(packed)
+        data.extend(raw)
+        return start, len(raw) | _UNCOMPRESSED_DATA
+
+    def _flush_fragment() -> None:
+        if frag_buf:
+            fragments.append(_write_block(bytes(frag_buf)))
+            frag_buf.clear()
+
+    for path in sorted(p for p, (kind, _) in nodes.items() if kind == "file"):
+        content = nodes[path][1]
+        assert isinstance(content, bytes)
+        full, tail = divmod(len(content), block_size)
+        sizes: list[int] = []
+        start = len(data)
+        for i in range(full):
+            sizes.append(_write_block(content[i * block_size:(i + 1) * block_size])[1])
+        frag_index, frag_offset = _NO_FRAGMENT, 0
+        if tail:
+            tail_data = content[full * block_size:]
+            if use_fragments:
+                if len(frag_buf) + tail > block_size:
+                    _flush_fragment()
+                frag_index, frag_offset = len(fragments), len(frag_buf)
+                frag_buf += tail_data
+            else:
+                sizes.append(_write_block(tail_data)[1])
+        file_layout[path] = (start, sizes, frag_index, frag_offset)
+    _flush_fragment()
+
+    ids = sorted({uid, gid})
+    uid_idx, gid_idx = ids.index(uid), ids.index(gid)
+    inodes = _MetaWriter(compress, compress_metadata)
+    dirs = _MetaWriter(compress, compress_metadata)
+    refs: dict[str, tuple[int, int]] = {}
+
+    def _header(kind: int, path: str, perms: int) -> bytes:
+        return struct.pack("<HHHHII", kind, perms, uid_idx, gid_idx, mtime, numbers[path])
+
+    def _emit(path: str) -> None:
+        kind, payload = nodes[path]
+        if kind == "dir":
+            for child in children[path]:
+                _emit(child)
+            dir_block, dir_offset = dirs.position()
+            listing = bytearray()
+            group: list[str] = []
+
+            def _flush_group() -> None:
+                if not group:
+                    return
+                block = refs[group[0]][0]
+                base = numbers[group[0]]
+                listing.extend(struct.pack("<III", len(group) - 1, block, base))
+                for child in group:
+                    name = child.rsplit("/", 1)[-1].encode("utf-8")
+                    ckind = nodes[child][0]
+                    etype = {"dir": 1, "file": 2, "symlink": 3}[ckind]
+                    listing.extend(struct.pack("<HhHH", refs[child][1], numbers[child] - base, etype, len(name) - 1))
+                    listing.extend(name)
+                group.clear()
+
+            for child in children[path]:
+                if group and (refs[child][0] != refs[group[0]][0] or len(group) >= 256):
+                    _flush_group()
+                group.append(child)
+            _flush_group()
+            dirs.write(bytes(listing))
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            parent_no = numbers[parent] if path else len(numbers) + 1
+            links = 2 + sum(1 for c in children[path] if nodes[c][0] == "dir")
+            refs[path] = inodes.position()
+            inodes.write(
+                _header(1, path, 0o755)
+                + struct.pack("<IIHHI", dir_block, links, len(listing) + 3, dir_offset, parent_no)
+            )
+        elif kind == "file":
+            assert isinstance(payload, bytes)
+            start, sizes, frag_index, frag_offset = file_layout[path]
+            refs[path] = inodes.position()
+            inodes.write(
+                _header(2, path, 0o644)
+                + struct.pack("<IIII", start, frag_index, frag_offset, len(payload))
+                + struct.pack(f"<{len(sizes)}I", *sizes)
+            )
+        else:
+            link = str(payload).encode("utf-8")
+            refs[path] = inodes.position()
+            inodes.write(_header(3, path, 0o777) + struct.pack("<II", 1, len(link)) + link)
+
+    _emit("")
+    root_block, root_offset = refs[""]
+
+    inode_table = len(data)
+    data += inodes.finish()
+    directory_table = len(data)
+    data += dirs.finish()
+
+    def _lookup_table(payload: bytes) -> int:
+        meta = _MetaWriter(compress, compress_metadata)
+        pointers: list[int] = []
+        for i in range(0, len(payload), _META):
+            pointers.append(len(data) + len(meta.out))
+            meta._flush(payload[i:i + _META])
+        data.extend(meta.out)
+        start = len(data)
+        data.extend(struct.pack(f"<{len(pointers)}Q", *pointers))
+        return start
+
+    fragment_table = (
+        _lookup_table(b"".join(struct.pack("<QII", s, w, 0) for s, w in fragments)) if fragments else _NO_TABLE
+    )
+    id_table = _lookup_table(struct.pack(f"<{len(ids)}I", *ids))
+    bytes_used = len(data)
+
+    superblock = struct.pack(
+        "<IIIIIHHHHHHQQQQQQQQ",
+        0x73717368, len(numbers), mtime, block_size, len(fragments), comp_id, block_log,
+        0x0200, len(ids), 4, 0,
+        (root_block << 16) | root_offset, bytes_used, id_table, _NO_TABLE,
+        inode_table, directory_table, fragment_table, _NO_TABLE,
+    )
+    data[:96] = superblock
+    data += b"\0" * (-len(data) % 4096)
+    target = Path(target)
+    target.write_bytes(bytes(data))
+    return target
+
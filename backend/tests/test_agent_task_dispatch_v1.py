@@ -0,0 +1,149 @@
+"""Task-Dispatch: In-Memory-Queues je boot_id, Long-Poll-Wecken, Dateien nur bei Änderung gelesen."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from core import agent_task_dispatch as atd
+from core import rescue_telemetry_tasks as rtt
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _exp(hours: int = 1) -> str:
+    return (datetime.now(timezone.utc) + timedelta(hours=hours)).isoformat().replace("+00:00", "Z")
+
+
+class AgentTaskDispatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self._patch = patch.object(rtt, "tasks_storage_root", return_value=self.root)
+        self._patch.start()
+        atd.reset_dispatchers()
+
+    def tearDown(self) -> None:
+        self._patch.stop()
+        atd.reset_dispatchers()
+        self._td.cleanup()
+
+    def test_long_poll_wakes_within_100ms(self) -> None:
+        pushed_at: list[float] = []
+
+        def _later() -> None:
+            time.sleep(0.05)
+            pushed_at.append(time.perf_counter())
+            rtt.enqueue_dev_task("run_network_check", boot_id="boot-1")
+
+        async def _scenario() -> tuple[dict | None, float]:
+            threading.Thread(target=_later, daemon=True).start()
+            task = await rtt.wait_for_next_task(boot_id="boot-1", timeout=5)
+            return task, time.perf_counter() - pushed_at[0]
+
+        task, latency = _run(_scenario())
+        self.assertIsNotNone(task)
+        self.assertEqual(task["task_type"], "run_network_check")
+        self.assertLess(latency, 0.1)
+        self.assertEqual(rtt._dispatcher().waiter_count(), 0)
+
+    def test_long_poll_times_out_for_other_boot(self) -> None:
+        async def _scenario() -> dict | None:
+            rtt.enqueue_dev_task("collect_logs", boot_id="boot-other")
+            return await rtt.wait_for_next_task(boot_id="boot-1", timeout=0.05)
+
+        self.assertIsNone(_run(_scenario()))
+        self.assertEqual(rtt._dispatcher().waiter_count(), 0)
+
+    def test_targeting_order_and_result_removal(self) -> None:
+        first = rtt.enqueue_dev_task("collect_logs", boot_id="*")
+        second = rtt.enqueue_dev_task("run_media_check", boot_id="boot-1")
+        self.assertEqual(rtt.get_next_task(boot_id="boot-1")["task_id"], first["task_id"])
+        self.assertEqual(rtt.get_next_task(boot_id="*")["task_id"], first["task_id"])
+        rtt.store_task_result({"task_id": first["task_id"], "result_status": "ok"})
+        self.assertFalse((self.root / "pending" / f"{first['task_id']}.json").exists())
+        self.assertEqual(rtt.get_next_task(boot_id="boot-1")["task_id"], second["task_id"])
+        self.assertIsNone(rtt.get_next_task(boot_id="*"))
+        self.assertIsNone(rtt.get_next_task(boot_id="boot-2"))
+
+    def test_files_are_read_only_on_rehydration(self) -> None:
+        pending = self.root / "pending"
+        pending.mkdir()
+        expired = {"task_id": "rtask-old", "task_type": "collect_logs", "boot_id": "b", "expires_at": _exp(-1)}
+        valid = {"task_id": "rtask-new", "task_type": "collect_logs", "boot_id": "b", "expires_at": _exp()}
+        (pending / "a.json").write_text(json.dumps(expired), encoding="utf-8")
+        (pending / "b.json").write_text(json.dumps(valid), encoding="utf-8")
+        (pending / "c.json").write_text("{", encoding="utf-8")
+        self.assertEqual(rtt.get_next_task(boot_id="b")["task_id"], "rtask-new")
+        with patch.object(Path, "glob", side_effect=AssertionError("pending scan")):
+            for _ in range(10):
+                self.assertEqual(rtt.get_next_task(boot_id="b")["task_id"], "rtask-new")
+            rtt.store_task_result({"task_id": "rtask-new", "result_status": "ok"})
+        self.assertFalse((pending / "b.json").exists())
+        self.assertTrue((pending / "a.json").exists())
+        self.assertIsNone(rtt.get_next_task(boot_id="b"))
+
+    def _drop_file(self, name: str, task: dict) -> Path:
+        pending = self.root / "pending"
+        pending.mkdir(exist_ok=True)
+        path = pending / name
+        path.write_text(json.dumps(task), encoding="utf-8")
+        # grobe Zeitstempel: Verzeichnis-mtime sicher weiterschieben
+        st = os.stat(pending)
+        os.utime(pending, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        return path
+
+    def test_file_written_after_start_is_picked_up(self) -> None:
+        self.assertIsNone(rtt.get_next_task(boot_id="b"))
+        self._drop_file("late.json", {"task_id": "rtask-late", "task_type": "collect_logs", "boot_id": "b", "expires_at": _exp()})
+        self.assertEqual(rtt.get_next_task(boot_id="b")["task_id"], "rtask-late")
+
+    def test_long_poll_sees_file_from_other_process(self) -> None:
+        task = {"task_id": "rtask-ext", "task_type": "collect_logs", "boot_id": "b", "expires_at": _exp()}
+
+        async def _scenario() -> dict | None:
+            rtt.get_next_task(boot_id="b")  # Dispatcher vor der Ablage starten
+            threading.Timer(0.05, self._drop_file, args=("ext.json", task)).start()
+            return await rtt.wait_for_next_task(boot_id="b", timeout=5)
+
+        started = time.perf_counter()
+        self.assertEqual(_run(_scenario())["task_id"], "rtask-ext")
+        self.assertLess(time.perf_counter() - started, atd.DIR_RECHECK_SECONDS + 1)
+
+    def test_rehydration_keeps_order_and_memory_only_tasks(self) -> None:
+        first = rtt.enqueue_dev_task("collect_logs", boot_id="b")
+        second = rtt.enqueue_dev_task("run_media_check", boot_id="b")
+        rtt._dispatcher().push({"task_id": "rtask-mem", "task_type": "collect_logs", "boot_id": "b", "expires_at": _exp()})
+        self._drop_file("0.json", {"task_id": "rtask-ext", "task_type": "collect_logs", "boot_id": "b", "expires_at": _exp()})
+        order = []
+        while (task := rtt.get_next_task(boot_id="b")) is not None:
+            order.append(task["task_id"])
+            rtt.store_task_result({"task_id": task["task_id"], "result_status": "ok"})
+        self.assertEqual(order, [first["task_id"], second["task_id"], "rtask-mem", "rtask-ext"])
+
+    def test_result_unlinks_pending_file_unknown_to_dispatcher(self) -> None:
+        rtt.get_next_task(boot_id="b")
+        pending = self.root / "pending"
+        pending.mkdir()
+        path = pending / "x.json"
+        path.write_text(json.dumps({"task_id": "rtask-x", "boot_id": "b"}), encoding="utf-8")
+        rtt.store_task_result({"task_id": "rtask-x", "result_status": "ok"})
+        self.assertFalse(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Ressourcenbewusster Job-Scheduler: Konflikte, parallele Jobs, Ledger-Recovery, Klassenpriorität."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core import backup_job_scheduler as sched
+
+
+def _active(_jid: str, job: dict) -> bool:
+    return job.get("status") in sched.ACTIVE_STATES
+
+
+class ClaimsTests(unittest.TestCase):
+    def test_normalize_partitions_to_disk(self) -> None:
+        with patch.object(sched.os.path, "realpath", side_effect=lambda p: str(p)):
+            self.assertEqual(sched.normalize_block_device("/dev/sda2"), "sda")
+            self.assertEqual(sched.normalize_block_device("/dev/mmcblk0p2"), "mmcblk0")
+            self.assertEqual(sched.normalize_block_device("/dev/mmcblk0"), "mmcblk0")
+            self.assertEqual(sched.normalize_block_device("/dev/nvme0n1p1"), "nvme0n1")
+        self.assertIsNone(sched.normalize_block_device("nas:/share"))
+
+    def test_conflict_rules(self) -> None:
+        w_usb = [{"key": "dev:sdb", "mode": "w"}, {"key": "path:/media/usb/backups", "mode": "w"}]
+        r_root = [{"key": "dev:mmcblk0", "mode": "r"}]
+        self.assertFalse(sched.claims_conflict(r_root, [{"key": "dev:mmcblk0", "mode": "r"}]))
+        self.assertTrue(sched.claims_conflict(w_usb, [{"key": "dev:sdb", "mode": "r"}]))
+        self.assertTrue(sched.claims_conflict(w_usb, [{"key": "path:/media/usb", "mode": "w"}]))
+        self.assertFalse(sched.claims_conflict(w_usb, [{"key": "path:/media/usb2", "mode": "w"}]))
+        self.assertTrue(sched.claims_conflict(w_usb, None))
+
+    def test_non_conflicting_jobs_run_concurrently(self) -> None:
+        jobs = {
+            "nas": {
+                "status": "running",
+                "resource_claims": [{"key": "path:/mnt/nas/backups", "mode": "w"}, {"key": "dev:mmcblk0", "mode": "r"}],
+            },
+            "legacy": {"status": "success"},
+        }
+        clone_usb = [{"key": "dev:sdb", "mode": "w"}, {"key": "dev:mmcblk0", "mode": "r"}]
+        self.assertIsNone(sched.find_conflicting_job(jobs, clone_usb, is_active=_active))
+        self.assertEqual(
+            sched.find_conflicting_job(jobs, [{"key": "path:/mnt/nas", "mode": "w"}], is_active=_active), "nas"
+        )
+        # Ohne Claims (Altpfad) blockiert jeder aktive Job – und ein aktiver Altjob ohne Claims alles.
+        self.assertEqual(sched.find_conflicting_job(jobs, None, is_active=_active), "nas")
+        jobs["legacy"]["status"] = "running"
+        jobs["nas"]["status"] = "success"
+        self.assertEqual(sched.find_conflicting_job(jobs, clone_usb, is_active=_active), "legacy")
+
+    def test_serialize_claims_prefers_write(self) -> None:
+        got = sched.serialize_claims([sched.ResourceClaim("dev:sda", "r"), sched.ResourceClaim("dev:sda", "w")])
+        self.assertEqual(got, [{"key": "dev:sda", "mode": "w"}])
+
+
+class SchedulerLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = Path(self._td.name)
+        self.scheduler = sched.JobScheduler(lambda: self.dir)
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def test_thread_job_applies_policy_and_persists(self) -> None:
+        jobs: dict[str, dict] = {"j1": {"job_id": "j1", "type": "clone", "status": "queued"}}
+        seen: dict[str, object] = {}
+        done = threading.Event()
+
+        def _target() -> None:
+            seen["nice"] = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+            jobs["j1"]["status"] = "success"
+            done.set()
+
+        base_nice = os.getpriority(os.PRIO_PROCESS, 0)
+        with patch.object(sched.shutil, "which", return_value=None):
+            t = self.scheduler.start_thread(jobs, "j1", _target, kind="clone")
+            t.join(5)
+        self.assertTrue(done.is_set())
+        self.assertEqual(seen["nice"], min(19, base_nice + 10))
+        self.assertEqual(os.getpriority(os.PRIO_PROCESS, 0), base_nice)
+        ledger = json.loads((self.dir / sched.LEDGER_NAME).read_text(encoding="utf-8"))
+        self.assertEqual(ledger["jobs"][0]["status"], "success")
+        self.assertEqual(ledger["jobs"][0]["job_class"], "io_heavy")
+
+    def test_recover_after_restart(self) -> None:
+        jobs: dict[str, dict] = {
+            "t1": {"job_id": "t1", "status": "running", "executor": "thread", "resource_claims": []},
+            "u1": {"job_id": "u1", "status": "running", "executor": "systemd", "unit_name": "setuphelfer-backup@u1.service"},
+            "old": {"job_id": "old", "status": "success", "executor": "thread", "finished_at": "2026-01-01T00:00:00"},
+        }
+        self.scheduler.persist(jobs)
+        restored: dict[str, dict] = {}
+        got = sched.JobScheduler(lambda: self.dir).recover(restored)
+        self.assertEqual(sorted(got), ["old", "t1", "u1"])
+        self.assertEqual(restored["t1"]["status"], "error")
+        self.assertEqual(restored["t1"]["code"], "backup.job_interrupted_by_restart")
+        self.assertEqual(restored["u1"]["status"], "running")
+        self.assertEqual(restored["old"]["status"], "success")
+
+    def test_unit_policy_sets_cgroup_properties(self) -> None:
+        calls: list[list[str]] = []
+
+        def _systemctl(argv: list[str], *, timeout: int) -> dict:
+            calls.append(argv)
+            return {"success": True}
+
+        jobs = {"u": {"job_id": "u", "status": "queued", "unit_name": "setuphelfer-backup@u.service"}}
+        self.scheduler.register_unit(jobs, "u", kind="backup", systemctl=_systemctl)
+        self.assertEqual(calls[0][:4], ["systemctl", "set-property", "--runtime", "setuphelfer-backup@u.service"])
+        self.assertIn("IOWeight=80", calls[0])
+        self.assertTrue(any(a.startswith("CPUQuota=") for a in calls[0]))
+        self.assertEqual(jobs["u"]["executor"], "systemd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,8 @@ import unittest
 from pathlib import Path
 
 from core.backup_tar_warning_classification import (
+    STREAM_SAMPLES_PER_KIND,
+    TarStderrClassifier,
     TarWarningClassification,
     classify_tar_run,
 )
@@ -122,5 +124,42 @@ sh failed with exit status 1.
         self.assertFalse(r.operational_success_allowed)
 
 
+class TestTarStderrStreamingClassifierV1(unittest.TestCase):
+    def test_chunked_feed_matches_blob_classification(self) -> None:
+        stderr = (
+            "tar: /root/.gnupg/S.gpg-agent: Socket ignoriert\n"
+            "tar: /var/log/journal/x/system.journal: Datei hat sich beim Lesen geändert.\n"
+            "tar: /etc/hosts: file changed as we read it\n"
+        )
+        clf = TarStderrClassifier()
+        for i in range(0, len(stderr), 7):
+            clf.feed(stderr[i : i + 7])
+        streamed = classify_tar_run(tar_exit_code=1, stream=clf)
+        blob = classify_tar_run(tar_exit_code=1, stderr_text=stderr)
+        self.assertEqual(streamed.classification, TarWarningClassification.TAR_CRITICAL_WARNING)
+        self.assertEqual(streamed.to_dict(), blob.to_dict())
+
+    def test_many_volatile_lines_keep_bounded_samples(self) -> None:
+        clf = TarStderrClassifier()
+        for i in range(10000):
+            clf.feed(f"tar: /var/tmp/f{i % 50}: file changed as we read it\n")
+        r = classify_tar_run(tar_exit_code=1, stream=clf)
+        self.assertEqual(r.classification, TarWarningClassification.TAR_LIVE_FILE_CHANGED_ONLY)
+        self.assertEqual(r.event_counts["file_changed"], 10000)
+        self.assertEqual(len(r.events), STREAM_SAMPLES_PER_KIND)
+        self.assertEqual(len(r.volatile_paths), 50)
+
+    def test_live_snapshot_and_trailing_line_without_newline(self) -> None:
+        clf = TarStderrClassifier()
+        clf.feed("tar: /var/tmp/a: file changed as we read it\ntar: /media/x: Input/output")
+        snap = clf.snapshot()
+        self.assertEqual(snap["event_counts"], {"file_changed": 1})
+        self.assertFalse(snap["io_errors_found"])
+        clf.feed(" error")
+        r = classify_tar_run(tar_exit_code=1, stream=clf)
+        self.assertEqual(r.classification, TarWarningClassification.TAR_IO_ERROR)
+        self.assertTrue(clf.snapshot()["io_errors_found"])
+
+
 if __name__ == "__main__":
     unittest.main()
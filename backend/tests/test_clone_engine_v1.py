@@ -0,0 +1,164 @@
+"""Klon-Engine: progress2-Parser, Baum-Aufteilung, Wiedererkennung, Live-Fortschritt und Abbruch."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from modules import clone_engine as ce
+
+_FAKE_RSYNC = """#!{python}
+import sys, time
+dest = sys.argv[-1]
+sys.stdout.write("      1,000  10%    1.00MB/s    0:00:10 (xfr#1, to-chk=9/10)\\r")
+sys.stdout.flush()
+if "slow" in dest:
+    time.sleep(30)
+time.sleep(0.2)
+sys.stdout.write("     20,000 100%    2.00MB/s    0:00:00 (xfr#3, to-chk=0/10)\\n")
+sys.stdout.flush()
+if "fail" in dest:
+    sys.stderr.write("rsync: write failed: No space left on device (28)\\n")
+    sys.exit(11)
+"""
+
+
+class Progress2ParserTests(unittest.TestCase):
+    def test_parses_progress2_line(self) -> None:
+        got = ce.parse_progress2_line("  1,234,567,890  45%   12.34MB/s    0:01:23 (xfr#12, ir-chk=1000/2000)")
+        self.assertEqual(got["bytes"], 1_234_567_890)
+        self.assertEqual(got["pct"], 45)
+        self.assertEqual(got["rate"], "12.34MB/s")
+        self.assertEqual((got["xfr"], got["chk_left"], got["chk_total"]), (12, 1000, 2000))
+        self.assertEqual(ce.parse_progress2_line("        32.77K   0%    0.00kB/s    0:00:00")["bytes"], 32_770)
+        self.assertIsNone(ce.parse_progress2_line("sending incremental file list"))
+
+
+class ClonePlanTests(unittest.TestCase):
+    def test_splits_same_fs_directories_and_reroots_excludes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            for name in ("usr", "var/lib/setuphelfer", "etc"):
+                (root / name).mkdir(parents=True)
+            (root / "bin").symlink_to("usr/bin")
+            excludes = ["/proc", "/var/lib/setuphelfer/clone-origin.json"]
+            trees = ce.plan_clone_trees("/mnt/clone", excludes, source_root=str(root), max_workers=4)
+            self.assertEqual([t.label for t in trees], ["/usr", "/var", "/"])
+            var = trees[1]
+            self.assertEqual(var.dest, "/mnt/clone/var/")
+            self.assertEqual(var.excludes, ("/lib/setuphelfer/clone-origin.json",))
+            self.assertEqual(trees[-1].excludes, ("/proc", "/var/lib/setuphelfer/clone-origin.json", "/usr", "/var"))
+            argv = ce.build_rsync_argv(trees[-1], delete=True)
+            self.assertIn("--delete", argv)
+            self.assertEqual(argv[-2:], [str(root) + "/", "/mnt/clone/"])
+            single = ce.plan_clone_trees("/mnt/clone", excludes, source_root=str(root), max_workers=1)
+            self.assertEqual([t.label for t in single], ["/"])
+            self.assertEqual(single[0].excludes, ("/proc", "/var/lib/setuphelfer/clone-origin.json"))
+
+    def test_marker_roundtrip_recognises_same_source_only(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            mid = "0123456789abcdef0123456789abcdef"
+            self.assertIsNone(ce.read_clone_marker(td))
+            with patch.object(ce, "privilege_prefix", return_value=[]):
+                written = ce.write_clone_marker(
+                    td, source_machine_id=mid, source_device="/dev/mmcblk0p2", target_device="/dev/sda2", mode="full"
+                )
+            self.assertTrue(written.written, written.detail)
+            marker = ce.read_clone_marker(td)
+            self.assertTrue(ce.is_incremental_target(marker, mid))
+            self.assertFalse(ce.is_incremental_target(marker, "f" * 32))
+            self.assertFalse(ce.is_incremental_target(marker, None))
+
+    def test_marker_is_written_via_sudo_and_failure_is_reported(self) -> None:
+        calls: list[tuple[list[str], bytes]] = []
+
+        def _run(argv: list[str], **kw: object) -> subprocess.CompletedProcess:
+            calls.append((argv, kw["input"]))
+            return subprocess.CompletedProcess(argv, 1, b"", b"sudo: a password is required\n")
+
+        with patch.object(ce.os, "geteuid", return_value=1000):
+            result = ce.write_clone_marker(
+                "/mnt/clone", source_machine_id=None, source_device=None, target_device="/dev/sda2",
+                mode="full", sudo_password="pw", run=_run,
+            )
+        self.assertFalse(result.written)
+        self.assertEqual(result.path, "/mnt/clone/" + ce.CLONE_MARKER_REL)
+        self.assertIn("password is required", result.detail)
+        argv, stdin = calls[0]
+        self.assertEqual(argv[:6], ["sudo", "-S", "-p", "", "sh", "-c"])
+        self.assertEqual(argv[-1], result.path)
+        self.assertTrue(stdin.startswith(b"pw\n{"))
+        self.assertIn(b'"kind": "setuphelfer-clone-origin"', stdin)
+
+
+class CloneSyncRunTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.base = Path(self._td.name)
+        self.rsync = self.base / "fake-rsync"
+        self.rsync.write_text(_FAKE_RSYNC.format(python=sys.executable), encoding="utf-8")
+        self.rsync.chmod(0o755)
+        p = patch.object(ce, "privilege_prefix", return_value=[])
+        p.start()
+        self.addCleanup(p.stop)
+        p2 = patch.object(ce, "POLL_INTERVAL_SEC", 0.05)
+        p2.start()
+        self.addCleanup(p2.stop)
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _tree(self, label: str, dest: str) -> ce.CloneTree:
+        return ce.CloneTree(label=label, source="/src/", dest=dest, excludes=())
+
+    def test_parallel_workers_report_live_progress(self) -> None:
+        events: list[tuple[int, list[dict]]] = []
+        spawned: list[list[int]] = []
+        res = ce.run_clone_sync(
+            [self._tree("/usr", "/t/usr/"), self._tree("/", "/t/")],
+            delete=False,
+            on_progress=lambda total, workers: events.append((total, workers)),
+            on_spawn=spawned.append,
+            max_parallel=2,
+            rsync_bin=str(self.rsync),
+        )
+        self.assertEqual(res.status, "success", res.detail)
+        self.assertEqual(res.bytes_transferred, 40_000)
+        self.assertEqual(len(spawned[-1]), 2)
+        self.assertTrue(any(0 < total < 40_000 for total, _w in events))
+        self.assertTrue(all(w["done"] and w["pct"] == 100 for w in res.workers))
+
+    def test_failure_reports_stderr_tail(self) -> None:
+        res = ce.run_clone_sync([self._tree("/", "/t/fail/")], delete=False, max_parallel=1, rsync_bin=str(self.rsync))
+        self.assertEqual(res.status, "error")
+        self.assertIn("No space left", res.detail)
+
+    def test_cancel_kills_process_groups(self) -> None:
+        ev = threading.Event()
+        pgids: list[int] = []
+        threading.Timer(0.5, ev.set).start()
+        t0 = time.monotonic()
+        res = ce.run_clone_sync(
+            [self._tree("/usr", "/t/slow/usr/"), self._tree("/", "/t/slow/")],
+            delete=False,
+            cancel_event=ev,
+            on_spawn=lambda ids: pgids.extend(ids),
+            max_parallel=2,
+            rsync_bin=str(self.rsync),
+        )
+        self.assertEqual(res.status, "cancelled")
+        self.assertLess(time.monotonic() - t0, 10)
+        for pid in set(pgids):
+            with self.assertRaises(ProcessLookupError):
+                os.killpg(pid, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
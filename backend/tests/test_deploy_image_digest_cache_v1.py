@@ -0,0 +1,142 @@
+"""Persistenter Image-Digest-Cache: (dev, ino, size, mtime_ns, ctime_ns)-Schlüssel, xattr-Hinweis, vorauslesender Hash."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import deploy.image_digest_cache as idc
+from deploy.image_inspect import inspect_deploy_image
+
+_OLD_NS = time.time_ns() - 3600 * 10**9
+
+
+def _age(path: Path, ns: int = _OLD_NS) -> None:
+    """mtime außerhalb des Racy-Fensters setzen."""
+    os.utime(path, ns=(ns, ns))
+
+
+def _xattr_supported(directory: Path) -> bool:
+    probe = directory / ".xattr-probe"
+    probe.write_bytes(b"x")
+    try:
+        os.setxattr(str(probe), "user.setuphelfer.probe", b"1")
+        return True
+    except (AttributeError, OSError):
+        return False
+    finally:
+        probe.unlink()
+
+
+class ImageDigestCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.cache_file = self.root / "cache" / "digests.json"
+        # _age() setzt die mtime zurück, die ctime bleibt aber "jetzt": Racy-Fenster hier aus
+        self._racy = patch.object(idc, "_RACY_WINDOW_NS", 0)
+        self._racy.start()
+
+    def tearDown(self) -> None:
+        self._racy.stop()
+        self._td.cleanup()
+
+    def _image(self, name: str, data: bytes) -> Path:
+        path = self.root / name
+        path.write_bytes(data)
+        _age(path)
+        return path
+
+    def test_pipelined_hash_matches_hashlib(self) -> None:
+        for size in (0, 1, 4095, 4096, 4097, 3 * 4096 + 17):
+            data = os.urandom(size)
+            path = self._image(f"f{size}.img", data)
+            expected = hashlib.sha256(data).hexdigest()
+            self.assertEqual(idc.sha256_file_pipelined(path, chunk_size=4096, read_ahead=3, readers=2), expected)
+            self.assertEqual(idc.sha256_file_pipelined(path), expected)
+
+    def test_hit_persists_and_invalidates_on_change(self) -> None:
+        data = os.urandom(100_000)
+        image = self._image("disk.img", data)
+        cache = idc.ImageDigestCache(self.cache_file, use_xattr=False)
+        first = cache.sha256(image)
+        self.assertEqual((first.sha256, first.source), (hashlib.sha256(data).hexdigest(), "computed"))
+
+        fresh = idc.ImageDigestCache(self.cache_file, use_xattr=False)  # neuer Prozess
+        with patch.object(idc, "sha256_file_pipelined", side_effect=AssertionError("rehash")):
+            self.assertEqual(fresh.sha256(image).source, "cache")
+
+        _age(image, _OLD_NS + 1)  # nur mtime geändert
+        self.assertEqual(fresh.sha256(image).source, "computed")
+        with image.open("r+b") as f:  # nur Größe geändert (mtime wird wieder gleich gesetzt)
+            f.seek(0, os.SEEK_END)
+            f.write(b"tail")
+        _age(image, _OLD_NS + 1)
+        changed = fresh.sha256(image)
+        self.assertEqual(changed.source, "computed")
+        self.assertEqual(changed.sha256, hashlib.sha256(data + b"tail").hexdigest())
+
+    def test_rewrite_with_preserved_size_and_mtime_is_rehashed(self) -> None:
+        image = self._image("disk.img", b"A" * 8192)
+        cache = idc.ImageDigestCache(self.cache_file, use_xattr=False)
+        cache.sha256(image)
+        self.assertEqual(cache.sha256(image).source, "cache")
+        st = image.stat()
+        image.write_bytes(b"B" * 8192)  # wie ``cp -p`` / ``rsync -t``: gleiche Größe, alte mtime
+        os.utime(image, ns=(st.st_atime_ns, st.st_mtime_ns))
+        rewritten = cache.sha256(image)
+        self.assertEqual(rewritten.source, "computed")
+        self.assertEqual(rewritten.sha256, hashlib.sha256(b"B" * 8192).hexdigest())
+
+    def test_recently_modified_file_is_not_cached(self) -> None:
+        image = self.root / "busy.img"
+        image.write_bytes(b"still being written")
+        cache = idc.ImageDigestCache(self.cache_file, use_xattr=False)
+        with patch.object(idc, "_RACY_WINDOW_NS", 2_000_000_000):
+            self.assertEqual(cache.sha256(image).source, "computed")
+            self.assertEqual(cache.sha256(image).source, "computed")
+        self.assertFalse(self.cache_file.exists())
+
+    def test_xattr_is_only_a_hint_and_never_satisfies_verification(self) -> None:
+        if not _xattr_supported(self.root):
+            self.skipTest("user xattrs not supported on temp filesystem")
+        data = b"payload" * 1000
+        image = self._image("disk.img", data)
+        idc.ImageDigestCache(self.cache_file, use_xattr=True).sha256(image)
+        self.cache_file.unlink()
+        other = idc.ImageDigestCache(self.root / "other.json", use_xattr=True)
+        self.assertEqual(other.sha256(image).source, "xattr")
+        self.assertEqual(other.sha256(image).source, "xattr")  # nicht in die Cache-Datei übernommen
+
+        # Abbild „zertifiziert sich selbst“: gefälschtes xattr mit passender Größe/mtime
+        st = image.stat()
+        forged = {"sha256": "0" * 64, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        os.setxattr(str(image), idc.XATTR_NAME, json.dumps(forged).encode("utf-8"))
+        self.assertEqual(other.sha256(image).sha256, "0" * 64)
+        verified = idc.ImageDigestCache(self.root / "third.json", use_xattr=True).sha256(image, trust_xattr=False)
+        self.assertEqual((verified.source, verified.sha256), ("computed", hashlib.sha256(data).hexdigest()))
+        # Eintrag wurde nach dem setxattr (neue ctime) gespeichert: nächster Vergleich trifft den Cache
+        self.assertEqual(idc.ImageDigestCache(self.root / "third.json").sha256(image, trust_xattr=False).source, "cache")
+
+    def test_inspect_reports_cached_checksum(self) -> None:
+        data = b"\0" * 50_000 + b"image"
+        image = self._image("disk.img", data)
+        request = {"image_path": str(image), "expected_checksum": "sha256:" + hashlib.sha256(data).hexdigest()}
+        env = {"SETUPHELFER_IMAGE_DIGEST_CACHE": str(self.cache_file), "SETUPHELFER_IMAGE_DIGEST_XATTR": "0"}
+        with patch("deploy.image_inspect._ALLOWED_CACHE_PREFIXES", [str(self.root)]), patch.dict(os.environ, env):
+            first = inspect_deploy_image(request)
+            second = inspect_deploy_image(request)
+        self.assertTrue(first["verification"]["checksum_ok"])
+        self.assertEqual(first["verification"]["checksum_source"], "computed")
+        self.assertEqual(second["verification"]["checksum_source"], "cache")
+        self.assertEqual(second["verification"]["checksum_actual"], first["verification"]["checksum_actual"])
+
+
+if __name__ == "__main__":
+    unittest.main()
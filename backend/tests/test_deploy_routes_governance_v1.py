@@ -83,5 +83,5 @@ class DeployRoutesGovernanceV1Tests(unittest.TestCase):
 
     def test_runner_import_count_unchanged(self) -> None:
         routes_src = (_BACKEND / "deploy" / "routes.py").read_text(encoding="utf-8")
-        count = len(re.findall(r"^from deploy\.runner_", routes_src, flags=re.M))
+        count = len(set(re.findall(r'^(?:from |\w+ = lazy_callable\(")(deploy\.runner_\w+)', routes_src, flags=re.M)))
         self.assertEqual(count, 77)
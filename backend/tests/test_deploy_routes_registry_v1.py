@@ -40,7 +40,7 @@ class DeployRoutesRegistryV1Tests(unittest.TestCase):
 
     def test_registry_router_uses_facade(self) -> None:
         src = (_BACKEND / "deploy" / "routes_registry.py").read_text(encoding="utf-8")
-        self.assertIn("from deploy.runner_api_facade import", src)
+        self.assertIn('lazy_callable("deploy.runner_api_facade"', src)
         for fn in (
             "build_runner_catalog",
             "build_runner_catalog_summary",
@@ -89,5 +89,5 @@ class DeployRoutesRegistryV1Tests(unittest.TestCase):
 
     def test_runner_import_count_unchanged(self) -> None:
         routes_src = (_BACKEND / "deploy" / "routes.py").read_text(encoding="utf-8")
-        count = len(re.findall(r"^from deploy\.runner_", routes_src, flags=re.M))
+        count = len(set(re.findall(r'^(?:from |\w+ = lazy_callable\(")(deploy\.runner_\w+)', routes_src, flags=re.M)))
         self.assertEqual(count, 77)
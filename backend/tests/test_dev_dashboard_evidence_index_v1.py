@@ -0,0 +1,158 @@
+"""Inkrementeller Evidence-Index für das Development Control Center."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core import dev_dashboard_evidence_index as dei  # noqa: E402
+from core.dev_dashboard_recent_evidence import build_recent_evidence_feed  # noqa: E402
+
+_OLD = time.time() - 3600
+
+
+def _age(*paths: Path) -> None:
+    for p in paths:
+        os.utime(p, (_OLD, _OLD))
+
+
+class _CountingParser:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, fp: Path, rel: str) -> dict[str, str]:
+        self.calls.append(rel)
+        return {"first_line": fp.read_text(encoding="utf-8").splitlines()[0]}
+
+
+class EvidenceIndexIncrementalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.base = self.root / "evidence"
+        (self.base / "sub").mkdir(parents=True)
+        self.a = self.base / "A_RESULT.md"
+        self.b = self.base / "sub" / "B_RESULT.md"
+        self.a.write_text("alpha\n", encoding="utf-8")
+        self.b.write_text("beta\n", encoding="utf-8")
+        _age(self.a, self.b, self.base / "sub", self.base)
+        self.parser = _CountingParser()
+        self.cache_dir = self.root / "cache"
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _index(self) -> dei.EvidenceIndex:
+        return dei.EvidenceIndex(
+            self.base, rel_root=self.root, parse=self.parser, kind="t", cache_dir=self.cache_dir
+        )
+
+    def test_unchanged_tree_is_not_reparsed(self) -> None:
+        idx = self._index()
+        self.assertTrue(idx.refresh(force=True))
+        self.assertEqual(sorted(self.parser.calls), ["evidence/A_RESULT.md", "evidence/sub/B_RESULT.md"])
+        self.assertFalse(idx.refresh(force=True))
+        self.assertEqual(len(self.parser.calls), 2)
+        self.assertEqual(idx.metas(), [{"first_line": "alpha"}, {"first_line": "beta"}])
+
+    def test_only_changed_file_is_reparsed_and_deletions_drop(self) -> None:
+        idx = self._index()
+        idx.refresh(force=True)
+        gen = idx.generation
+        self.b.write_text("beta v2 longer\n", encoding="utf-8")
+        self.a.unlink()
+        self.assertTrue(idx.refresh(force=True))
+        self.assertEqual(self.parser.calls[2:], ["evidence/sub/B_RESULT.md"])
+        self.assertEqual([k for k, _e in idx.entries()], ["evidence/sub/B_RESULT.md"])
+        self.assertGreater(idx.generation, gen)
+
+    def test_unchanged_directories_skip_scandir(self) -> None:
+        idx = self._index()
+        idx.refresh(force=True)
+        new = self.base / "sub" / "C_RESULT.md"
+        with patch.object(dei, "_REFRESH_MIN_INTERVAL_SEC", 0.0), patch.object(
+            dei, "_FULL_VERIFY_INTERVAL_SEC", 3600.0
+        ), patch.object(dei.os, "scandir", wraps=os.scandir) as scandir:
+            self.assertFalse(idx.refresh())
+            self.assertEqual(scandir.call_count, 0)
+            new.write_text("gamma\n", encoding="utf-8")
+            self.assertTrue(idx.refresh())
+            self.assertEqual(scandir.call_count, 1)
+        self.assertIn("evidence/sub/C_RESULT.md", [k for k, _e in idx.entries()])
+
+    def test_persisted_index_survives_restart_without_reparse(self) -> None:
+        self._index().refresh(force=True)
+        self.assertTrue(any(self.cache_dir.iterdir()))
+        self.parser.calls.clear()
+        idx2 = self._index()
+        self.assertFalse(idx2.refresh(force=True))
+        self.assertEqual(self.parser.calls, [])
+        self.assertEqual(len(idx2.metas()), 2)
+
+    def test_parser_version_invalidates_persisted_index(self) -> None:
+        self._index().refresh(force=True)
+        idx2 = dei.EvidenceIndex(
+            self.base, rel_root=self.root, parse=self.parser, kind="t", parser_version="2", cache_dir=self.cache_dir
+        )
+        self.assertEqual(idx2.entries(), [])
+
+
+class RecentEvidenceFeedIndexTests(unittest.TestCase):
+    def test_feed_picks_up_new_report_and_keeps_cached_items_clean(self) -> None:
+        with tempfile.TemporaryDirectory() as td, patch.object(dei, "_REFRESH_MIN_INTERVAL_SEC", 0.0):
+            repo = Path(td)
+            rescue = repo / "docs/evidence/rescue"
+            rescue.mkdir(parents=True)
+            (rescue / "OLD_RESULT.md").write_text("**Datum:** 2026-05-01\n", encoding="utf-8")
+            first = build_recent_evidence_feed(repo_root=repo, limit=5)
+            self.assertTrue(first["recent_reports"][0]["is_latest"])
+            (rescue / "NEW_BLOCKED_RESULT.md").write_text("**Datum:** 2026-06-01\n", encoding="utf-8")
+            second = build_recent_evidence_feed(repo_root=repo, limit=5)
+            paths = [it["path"] for it in second["recent_reports"]]
+            self.assertEqual(paths[0], "docs/evidence/rescue/NEW_BLOCKED_RESULT.md")
+            self.assertEqual([it["is_latest"] for it in second["recent_reports"]], [True, False])
+            blocked = build_recent_evidence_feed(repo_root=repo, status="blocked", limit=5)
+            self.assertEqual(blocked["total_count"], 1)
+            self.assertEqual(blocked["total_reports_unfiltered"], 2)
+
+    def test_reset_drops_candidate_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as td, patch.object(dei, "_REFRESH_MIN_INTERVAL_SEC", 0.0):
+            repo = Path(td)
+            rescue = repo / "docs/evidence/rescue"
+            rescue.mkdir(parents=True)
+            old = rescue / "OLD_RESULT.md"
+            old.write_text("**Datum:** 2026-05-01\n", encoding="utf-8")
+            build_recent_evidence_feed(repo_root=repo, limit=5)
+            dei.reset_evidence_indexes()
+            old.unlink()
+            (rescue / "OTHER_RESULT.md").write_text("**Datum:** 2026-06-01\n", encoding="utf-8")
+            # neuer Index erreicht wieder dieselbe Generation – der alte Kandidatenstand darf nicht greifen
+            feed = build_recent_evidence_feed(repo_root=repo, limit=5)
+            self.assertEqual([it["path"] for it in feed["recent_reports"]], ["docs/evidence/rescue/OTHER_RESULT.md"])
+
+
+class ReadJsonCachedTests(unittest.TestCase):
+    def test_cached_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "gate.json"
+            p.write_text(json.dumps({"ampel": "green"}), encoding="utf-8")
+            _age(p)
+            first, err = dei.read_json_cached(p)
+            self.assertIsNone(err)
+            again, _ = dei.read_json_cached(p)
+            self.assertIs(first, again)
+            p.write_text(json.dumps({"ampel": "red", "x": 1}), encoding="utf-8")
+            changed, _ = dei.read_json_cached(p)
+            self.assertEqual(changed["ampel"], "red")
+            missing, merr = dei.read_json_cached(Path(td) / "nope.json")
+            self.assertIsNone(missing)
+            self.assertTrue(str(merr).startswith("missing:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
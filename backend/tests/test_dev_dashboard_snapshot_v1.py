@@ -0,0 +1,215 @@
+"""Memoisierter DCC-Snapshot: Abschnitts-Fingerabdrücke, Gesamt-Snapshot, ETag/304."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import dev_dashboard_snapshot as snap_mod  # noqa: E402
+from core.dev_dashboard_snapshot import SectionInputs, SnapshotEngine, if_none_match_matches  # noqa: E402
+
+
+def _fake_git_repo(root: Path) -> Path:
+    gd = root / ".git"
+    (gd / "refs" / "heads").mkdir(parents=True)
+    (gd / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    (gd / "refs" / "heads" / "main").write_text("a" * 40 + "\n", encoding="utf-8")
+    return root
+
+
+def _bump(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class SectionMemoTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.engine = SnapshotEngine()
+        self.calls = 0
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _build(self) -> dict[str, int]:
+        self.calls += 1
+        return {"n": self.calls}
+
+    def test_path_input_change_rebuilds_and_hits_return_copies(self) -> None:
+        f = self.root / "STATUS_MATRIX.md"
+        f.write_text("| a |\n", encoding="utf-8")
+        inputs = SectionInputs(paths=(f,), key="m")
+        first = self.engine.section("matrix", inputs, self._build)
+        first["n"] = 99
+        self.assertEqual(self.engine.section("matrix", inputs, self._build), {"n": 1})
+        _bump(f, "| a |\n| b |\n")
+        self.assertEqual(self.engine.section("matrix", inputs, self._build), {"n": 2})
+        self.assertEqual(self.engine.stats["section_hits"], 1)
+
+    def test_git_head_change_rebuilds(self) -> None:
+        repo = _fake_git_repo(self.root)
+        inputs = SectionInputs(git_repos=(repo,), key=str(repo))
+        self.engine.section("git", inputs, self._build)
+        self.engine.section("git", inputs, self._build)
+        self.assertEqual(self.calls, 1)
+        _bump(repo / ".git" / "refs" / "heads" / "main", "b" * 40 + "\n")
+        self.engine.section("git", inputs, self._build)
+        self.assertEqual(self.calls, 2)
+
+    def test_non_git_directory_is_not_cached(self) -> None:
+        inputs = SectionInputs(git_repos=(self.root,), key="x")
+        self.engine.section("git", inputs, self._build)
+        self.engine.section("git", inputs, self._build)
+        self.assertEqual(self.calls, 2)
+
+    def test_ttl_expiry_rebuilds(self) -> None:
+        inputs = SectionInputs(ttl_sec=5.0, key="unit")
+        with patch.object(snap_mod.time, "monotonic", return_value=100.0):
+            self.engine.section("unit", inputs, self._build)
+        with patch.object(snap_mod.time, "monotonic", return_value=104.0):
+            self.engine.section("unit", inputs, self._build)
+        self.assertEqual(self.calls, 1)
+        with patch.object(snap_mod.time, "monotonic", return_value=106.0):
+            self.engine.section("unit", inputs, self._build)
+        self.assertEqual(self.calls, 2)
+
+
+class SnapshotTests(unittest.TestCase):
+    def test_snapshot_tracks_section_dependencies(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            f = Path(td) / "gate.json"
+            f.write_text("{}", encoding="utf-8")
+            engine = SnapshotEngine()
+            builds: list[int] = []
+
+            def _payload() -> dict[str, object]:
+                builds.append(1)
+                section = engine.section("gate", SectionInputs(paths=(f,)), lambda: {"size": f.stat().st_size})
+                return {"status": "success", "dashboard": section}
+
+            s1 = engine.snapshot("status", "k", _payload)
+            s2 = engine.snapshot("status", "k", _payload)
+            self.assertIs(s1, s2)
+            self.assertEqual(len(builds), 1)
+            self.assertTrue(s1.etag.startswith('"'))
+            _bump(f, '{"ampel": "red"}')
+            s3 = engine.snapshot("status", "k", _payload)
+            self.assertEqual(len(builds), 2)
+            self.assertNotEqual(s3.etag, s1.etag)
+            engine.snapshot("status", "other-jobs", _payload)
+            self.assertEqual(len(builds), 3)
+
+    def test_snapshot_max_age(self) -> None:
+        engine = SnapshotEngine()
+        with patch.object(snap_mod.time, "monotonic", return_value=10.0):
+            s1 = engine.snapshot("s", "k", lambda: {"a": 1}, max_age_sec=5.0)
+        with patch.object(snap_mod.time, "monotonic", return_value=16.0):
+            s2 = engine.snapshot("s", "k", lambda: {"a": 1}, max_age_sec=5.0)
+        self.assertIsNot(s1, s2)
+        self.assertEqual(s1.etag, s2.etag)
+
+    def test_if_none_match(self) -> None:
+        self.assertTrue(if_none_match_matches('W/"abc", "def"', '"def"'))
+        self.assertTrue(if_none_match_matches('W/"abc"', '"abc"'))
+        self.assertTrue(if_none_match_matches("*", '"abc"'))
+        self.assertFalse(if_none_match_matches(None, '"abc"'))
+        self.assertFalse(if_none_match_matches('"zzz"', '"abc"'))
+
+
+class DashboardStatusEtagTests(unittest.TestCase):
+    def setUp(self) -> None:
+        snap_mod.reset_snapshot_cache()
+        self.addCleanup(snap_mod.reset_snapshot_cache)
+
+    def _service_kwargs(self) -> dict[str, object]:
+        return {
+            "backup_jobs": {},
+            "sync_stale_runner_job_from_systemd": lambda _jid: None,
+            "job_snapshot": lambda job: job,
+            "detect_active_package_operations": lambda: [],
+            "frontend_build_version": None,
+            "frontend_runtime_source": None,
+        }
+
+    def test_repeated_polls_reuse_snapshot(self) -> None:
+        from core import dev_dashboard_status_service as svc
+
+        bodies: list[int] = []
+
+        def _body(**_kw: object) -> dict[str, object]:
+            bodies.append(1)
+            return {"generated_at": f"t{len(bodies)}"}
+
+        with patch.object(svc, "build_dcc_profile_block_response", return_value=None), patch(
+            "core.dcc_status_facade.build_dashboard_status_body", side_effect=_body
+        ):
+            loop = asyncio.new_event_loop()
+            try:
+                p1, s1 = loop.run_until_complete(svc.build_dev_dashboard_status_snapshot(**self._service_kwargs()))
+                p2, s2 = loop.run_until_complete(svc.build_dev_dashboard_status_snapshot(**self._service_kwargs()))
+            finally:
+                loop.close()
+        self.assertEqual(len(bodies), 1)
+        self.assertEqual(p1, {"status": "success", "dashboard": {"generated_at": "t1"}})
+        self.assertEqual(p1, p2)
+        self.assertIsNot(p1, p2)
+        self.assertEqual(s1.etag, s2.etag)
+        p1["dashboard"]["generated_at"] = "changed"
+        self.assertEqual(s1.payload["dashboard"]["generated_at"], "t1")
+        self.assertEqual(json.loads(s2.json_bytes())["dashboard"]["generated_at"], "t1")
+
+    def test_facade_keeps_dict_api_and_offers_snapshot_variant(self) -> None:
+        from core import dcc_status_facade as facade
+
+        engine = SnapshotEngine()
+        snapshot = engine.snapshot("s", "k", lambda: {"status": "success", "dashboard": {"x": 1}})
+
+        async def _service(**_kw: object) -> tuple[dict[str, object], object]:
+            return {"status": "success", "dashboard": {"x": 1}}, snapshot
+
+        with patch(
+            "core.dev_dashboard_status_service.build_dev_dashboard_status_snapshot", side_effect=_service
+        ), patch("core.dcc_status_runtime.get_dashboard_status_runtime_adapters", return_value=({}, None, None, None)):
+            loop = asyncio.new_event_loop()
+            try:
+                payload = loop.run_until_complete(facade.build_dcc_dashboard_status_api())
+                pair = loop.run_until_complete(facade.build_dcc_dashboard_status_api_with_snapshot())
+            finally:
+                loop.close()
+        self.assertEqual(payload, {"status": "success", "dashboard": {"x": 1}})
+        self.assertIs(pair[1], snapshot)
+
+    def test_route_returns_etag_and_304(self) -> None:
+        from api.routes.dev_dashboard_readonly import router
+
+        engine = SnapshotEngine()
+        snapshot = engine.snapshot("s", "k", lambda: {"status": "success", "dashboard": {"x": 1}})
+
+        async def _api(**_kw: object) -> tuple[dict[str, object], object]:
+            return snapshot.payload, snapshot
+
+        app = FastAPI()
+        app.include_router(router)
+        with patch("core.dcc_status_facade.build_dcc_dashboard_status_api_with_snapshot", side_effect=_api):
+            client = TestClient(app)
+            first = client.get("/api/dev-dashboard/status")
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.json(), {"status": "success", "dashboard": {"x": 1}})
+            self.assertEqual(first.headers["etag"], snapshot.etag)
+            second = client.get("/api/dev-dashboard/status", headers={"If-None-Match": snapshot.etag})
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second.content, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
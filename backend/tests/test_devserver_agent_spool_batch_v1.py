@@ -0,0 +1,199 @@
+"""Gebündelter Spool-Upload: Bulk-Ingest mit Quittung je Eintrag, gzip-Route, Keep-Alive-Drain."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from devserver.config import load_dev_server_config
+from devserver.ingest import BATCH_MAX_ITEMS, ingest_reports_bulk
+from devserver.storage import DevServerStorage
+from devserver.storage_index import close_indexes
+from devserver_agent.spool import AgentSpool
+from tools import devserver_spool_drain_benchmark as bench
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from devserver.routers import router as dev_server_router
+
+    _HAS_FASTAPI = True
+except Exception:
+    _HAS_FASTAPI = False
+
+_ENV = {
+    "SETUPHELFER_DEV_SERVER_ENABLED": "true",
+    "SETUPHELFER_DEV_SERVER_MODE": "local_lab",
+    "SETUPHELFER_DEV_SERVER_TOKEN": "batch-token",
+}
+
+
+def _item(i: int, *, node_id: str = "n1", lab_mode: str = "local_lab") -> tuple[dict, dict]:
+    return {"node_id": node_id}, {"report_id": f"r-{i:04d}", "node_id": node_id, "lab_mode": lab_mode}
+
+
+class DevServerBulkIngestTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.storage = DevServerStorage(self.root / "dev-server")
+        with patch.dict(os.environ, _ENV, clear=True):
+            self.cfg = load_dev_server_config(repo_root=self.root)
+
+    def tearDown(self) -> None:
+        close_indexes()
+        self._td.cleanup()
+
+    def test_acks_per_item_and_writes_shared_state_once(self) -> None:
+        items = [_item(i) for i in range(5)] + [_item(5, lab_mode="public_rescue")]
+        with patch.object(self.storage, "save_node", wraps=self.storage.save_node) as nodes, patch.object(
+            self.storage, "build_reports_summary", wraps=self.storage.build_reports_summary
+        ) as summaries:
+            out = ingest_reports_bulk(config=self.cfg, storage=self.storage, items=items, auth_token="batch-token")
+        self.assertEqual(out["code"], "DEV_SERVER_BATCH_ACCEPTED")
+        self.assertEqual((out["accepted"], out["rejected"]), (5, 1))
+        self.assertEqual([a["index"] for a in out["items"]], list(range(6)))
+        self.assertEqual(out["items"][5]["errors"], ["public_uploads_blocked"])
+        self.assertEqual(nodes.call_count, 1)
+        self.assertEqual(summaries.call_count, 1)
+        self.assertEqual(len(self.storage.list_reports()), 5)
+        audit = self.storage.audit_file.read_text(encoding="utf-8")
+        self.assertEqual(audit.count("report_ingested"), 5)
+
+    def test_bad_item_is_rejected_without_failing_the_batch(self) -> None:
+        bad_node, bad_report = _item(1)
+        bad_report["report_id"] = "../bad"
+        items = [_item(0), (bad_node, bad_report), _item(2)]
+        out = ingest_reports_bulk(config=self.cfg, storage=self.storage, items=items, auth_token="batch-token")
+        self.assertEqual(out["code"], "DEV_SERVER_BATCH_ACCEPTED")
+        self.assertEqual([a["ok"] for a in out["items"]], [True, False, True])
+        self.assertEqual(out["items"][1]["errors"], ["invalid_report_id"])
+        self.assertEqual(sorted(r["report_id"] for r in self.storage.list_reports()), ["r-0000", "r-0002"])
+        self.assertEqual(self.storage.load_node("n1")["status"], "online")
+        audit = self.storage.audit_file.read_text(encoding="utf-8")
+        self.assertEqual(audit.count("report_ingested"), 2)
+
+        # Agent: nur der abgelehnte Eintrag bleibt im Spool, der Drain läuft durch
+        spool = AgentSpool(self.root / "spool")
+        spool.save_spooled_report(*_item(3), reason="server_unreachable")
+        spool.save_spooled_report(*_item(4), reason="server_unreachable")
+        # z. B. von Hand oder von einer älteren Agent-Version abgelegt
+        (spool.root / "20000101T000000Z_bad.json").write_text(
+            json.dumps({"node": bad_node, "report": bad_report}), encoding="utf-8"
+        )
+
+        def _upload(batch: list) -> dict:
+            res = ingest_reports_bulk(config=self.cfg, storage=self.storage, items=batch, auth_token="batch-token")
+            return {"ok": True, **res}
+
+        drained = spool.retry_spooled_reports_batched(upload_batch_fn=_upload, batch_size=10)
+        self.assertIsNone(drained["aborted"])
+        self.assertEqual([i["report_id"] for i in spool.list_spooled_reports()["items"]], ["../bad"])
+
+    def test_storage_failure_still_flushes_nodes_and_audit(self) -> None:
+        real_save = self.storage.save_report
+
+        def _save(report: dict, **kw: object) -> None:
+            if report["report_id"] == "r-0001":
+                raise RuntimeError("disk gone")
+            real_save(report, **kw)
+
+        with patch.object(self.storage, "save_report", side_effect=_save):
+            with self.assertRaises(RuntimeError):
+                ingest_reports_bulk(
+                    config=self.cfg, storage=self.storage, items=[_item(0), _item(1)], auth_token="batch-token"
+                )
+        self.assertIsNotNone(self.storage.load_node("n1"))
+        self.assertEqual([r["report_id"] for r in self.storage.list_reports()], ["r-0000"])
+        self.assertEqual(self.storage.audit_file.read_text(encoding="utf-8").count("report_ingested"), 1)
+
+    def test_token_and_size_are_checked_per_request(self) -> None:
+        out = ingest_reports_bulk(config=self.cfg, storage=self.storage, items=[_item(0)], auth_token="wrong")
+        self.assertEqual((out["code"], out["errors"]), ("DEV_SERVER_BATCH_BLOCKED", ["invalid_token"]))
+        self.assertEqual(self.storage.list_reports(), [])
+        with self.assertRaises(ValueError):
+            ingest_reports_bulk(
+                config=self.cfg, storage=self.storage, items=[_item(0)] * (BATCH_MAX_ITEMS + 1), auth_token="batch-token"
+            )
+
+    @unittest.skipUnless(_HAS_FASTAPI, "FastAPI nicht verfuegbar")
+    def test_route_accepts_gzip_body(self) -> None:
+        app = FastAPI()
+        app.include_router(dev_server_router)
+        env = {**_ENV, "SETUPHELFER_DEV_SERVER_STORAGE_ROOT": str(self.root / "route")}
+        body = {"items": [{"node": n, "report": r} for n, r in (_item(0), _item(1))]}
+        with patch.dict(os.environ, env, clear=False):
+            client = TestClient(app)
+            resp = client.post(
+                "/api/dev-server/ingest/batch",
+                content=gzip.compress(json.dumps(body).encode("utf-8")),
+                headers={"Content-Encoding": "gzip", "Content-Type": "application/json", "X-Dev-Server-Token": "batch-token"},
+            )
+            self.assertEqual(resp.status_code, 200, resp.text)
+            self.assertEqual([a["ok"] for a in resp.json()["items"]], [True, True])
+            bad = client.post(
+                "/api/dev-server/ingest/batch",
+                content=b"not gzip",
+                headers={"Content-Encoding": "gzip", "X-Dev-Server-Token": "batch-token"},
+            )
+            self.assertEqual(bad.status_code, 400)
+            denied = client.post("/api/dev-server/ingest/batch", json=body, headers={"X-Dev-Server-Token": "x"})
+            self.assertEqual(denied.status_code, 403)
+
+
+class SpoolBatchRetryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.spool = AgentSpool(Path(self._td.name) / "spool")
+        for i in range(7):
+            self.spool.save_spooled_report(*_item(i), reason="server_unreachable")
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def test_only_acked_entries_are_removed(self) -> None:
+        sizes: list[int] = []
+
+        def _upload(items: list) -> dict:
+            sizes.append(len(items))
+            return {"ok": True, "items": [{"index": i, "ok": i != 1, "code": "x"} for i in range(len(items))]}
+
+        out = self.spool.retry_spooled_reports_batched(upload_batch_fn=_upload, batch_size=3)
+        self.assertEqual(sizes, [3, 3, 1])
+        self.assertEqual(out["retried"], 7)
+        left = [i["report_id"] for i in self.spool.list_spooled_reports()["items"]]
+        self.assertEqual(left, ["r-0001", "r-0004"])
+
+    def test_failed_request_stops_drain(self) -> None:
+        calls: list[int] = []
+
+        def _upload(items: list) -> dict:
+            calls.append(len(items))
+            return {"ok": False, "code": "DEV_AGENT_UPLOAD_FAILED", "error": "timeout", "items": []}
+
+        out = self.spool.retry_spooled_reports_batched(upload_batch_fn=_upload, batch_size=3)
+        self.assertEqual(calls, [3])
+        self.assertEqual(out["aborted"]["error"], "timeout")
+        self.assertEqual(self.spool.list_spooled_reports()["count"], 7)
+
+
+class SpoolDrainBenchmarkTests(unittest.TestCase):
+    def test_batched_drain_uses_one_connection_and_few_requests(self) -> None:
+        # Laufzeitverhältnis ist maschinenabhängig (Gate: tools/devserver_spool_drain_benchmark.py --min-ratio);
+        # hier nur die deterministischen Zählwerte je Drain.
+        entries = 1200
+        report = bench.measure(entries, batch_size=BATCH_MAX_ITEMS)
+        self.assertTrue(report["ok"], report)
+        sequential, batched = report["results"]
+        self.assertEqual((sequential["requests"], sequential["connections"]), (entries, entries))
+        self.assertEqual(batched["requests"], -(-entries // BATCH_MAX_ITEMS))
+        self.assertEqual(batched["connections"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""DevServerStorage-Index: Einzelzeilen-Saves, Aufbau aus Altbestand, Listen und Summaries aus dem Index."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from devserver import storage as storage_mod
+from devserver.models import default_dev_action, default_dev_node, default_dev_report
+from devserver.storage import DevServerStorage
+from devserver.storage_index import close_indexes
+from tools import devserver_storage_benchmark as bench
+
+
+class DevServerStorageIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.storage = DevServerStorage(self.root)
+
+    def tearDown(self) -> None:
+        storage_mod.flush_pending_nodes_summaries()
+        close_indexes()
+        self._td.cleanup()
+
+    def test_save_writes_one_row_without_rereading_files(self) -> None:
+        for i in range(20):
+            self.storage.save_report(default_dev_report(report_id=f"r-{i:03d}", node_id="n1"))
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("file re-read")):
+            with patch.object(self.storage.index, "upsert", wraps=self.storage.index.upsert) as spy:
+                self.storage.save_report(default_dev_report(report_id="r-999", node_id="n1"))
+        self.assertEqual(spy.call_count, 1)
+        summary = json.loads((self.root / "latest" / "reports_summary.json").read_text(encoding="utf-8"))
+        self.assertEqual(summary["count"], 21)
+        self.assertEqual(summary["reports"][0]["report_id"], "r-999")
+
+    def test_index_is_built_from_existing_files(self) -> None:
+        self.storage.ensure_layout()
+        for i in range(3):
+            node = default_dev_node(node_id=f"legacy-{i}")
+            (self.root / "nodes" / f"legacy-{i}.json").write_text(json.dumps(node), encoding="utf-8")
+        (self.root / "nodes" / "broken.json").write_text("{", encoding="utf-8")
+        self.assertEqual([n["node_id"] for n in self.storage.list_nodes()], ["legacy-0", "legacy-1", "legacy-2"])
+        self.assertEqual(self.storage.node_status_counts(), {"online": 3})
+
+    def test_list_order_and_node_filter(self) -> None:
+        for rid, node in (("a", "n1"), ("c", "n2"), ("b", "n1")):
+            self.storage.save_report(default_dev_report(report_id=rid, node_id=node))
+        self.assertEqual([r["report_id"] for r in self.storage.list_reports()], ["c", "b", "a"])
+        self.assertEqual([r["report_id"] for r in self.storage.list_reports(node_id="n1", limit=1)], ["b"])
+        self.storage.save_action(default_dev_action(action_id="x1", node_id="n2", action_type="collect"))
+        self.assertEqual([a["action_id"] for a in self.storage.list_actions(node_id="n2")], ["x1"])
+        self.assertEqual(self.storage.list_actions(node_id="n1"), [])
+
+    def test_counts_are_totals_and_updates_do_not_double_count(self) -> None:
+        with patch.object(storage_mod, "SUMMARY_LIMIT", 2):
+            for i in range(5):
+                self.storage.save_action(default_dev_action(action_id=f"a{i}", node_id="n1", action_type="collect"))
+            self.storage.save_action(default_dev_action(action_id="a0", node_id="n1", action_type="collect"))
+            summary = self.storage.build_actions_summary()
+        self.assertEqual(summary["count"], 5)
+        self.assertEqual(len(summary["actions"]), 2)
+
+    def test_reports_last_24h_uses_timestamps(self) -> None:
+        old = default_dev_report(report_id="old", node_id="n1")
+        old["created_at"] = (datetime.now(tz=timezone.utc) - timedelta(days=2)).isoformat()
+        self.storage.save_report(old)
+        self.storage.save_report(default_dev_report(report_id="new", node_id="n1"))
+        self.assertEqual(self.storage.reports_last_24h_count(), 1)
+
+    def test_nodes_summary_is_throttled(self) -> None:
+        self.storage.save_node(default_dev_node(node_id="n1"))
+        self.storage.save_node(default_dev_node(node_id="n2"))
+        summary = json.loads((self.root / "latest" / "nodes_summary.json").read_text(encoding="utf-8"))
+        self.assertEqual(summary["count"], 1)
+        self.assertEqual(self.storage.build_nodes_summary()["count"], 2)
+
+    def _nodes_summary_count(self) -> int:
+        return json.loads((self.root / "latest" / "nodes_summary.json").read_text(encoding="utf-8"))["count"]
+
+    def test_throttled_nodes_summary_gets_trailing_write(self) -> None:
+        with patch.object(storage_mod, "NODES_SUMMARY_MIN_INTERVAL_SECONDS", 0.1):
+            for i in range(3):
+                self.storage.save_node(default_dev_node(node_id=f"n{i}"))
+            self.assertEqual(self._nodes_summary_count(), 1)
+            for _ in range(100):
+                if self._nodes_summary_count() == 3:
+                    break
+                time.sleep(0.01)
+        self.assertEqual(self._nodes_summary_count(), 3)
+
+        self.storage.save_node(default_dev_node(node_id="n9"))  # im Fenster (5 s): Nachlauf ausstehend
+        self.assertEqual(self._nodes_summary_count(), 3)
+        storage_mod.flush_pending_nodes_summaries()
+        self.assertEqual(self._nodes_summary_count(), 4)
+
+    def test_benchmark_save_latency_stays_flat(self) -> None:
+        report = bench.measure((10, 2000), samples=15)
+        self.assertTrue(report["ok"])
+        # großzügige Schranke gegen Messrauschen; ohne Index wächst der Save linear mit dem Bestand
+        self.assertLess(report["ratio"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
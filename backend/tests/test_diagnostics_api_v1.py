@@ -22,6 +22,15 @@ class TestDiagnosticsApiV1(unittest.TestCase):
     def setUp(self):
         self.client = TestClient(app, base_url="http://localhost")
 
+    def test_analyze_batch_status_codes(self):
+        from core.diagnostics.models import BATCH_MAX_EVENTS
+
+        ok = self.client.post("/api/diagnostics/analyze/batch", json={"events": [{}, {"question": "ssh geht nicht"}]})
+        self.assertEqual(ok.status_code, 200, ok.text)
+        self.assertEqual(ok.json()["count"], 2)
+        too_big = self.client.post("/api/diagnostics/analyze/batch", json={"events": [{}] * (BATCH_MAX_EVENTS + 1)})
+        self.assertEqual(too_big.status_code, 422, too_big.text[:200])
+
     def test_catalog_available(self):
         r = self.client.get("/api/diagnostics/catalog")
         self.assertEqual(r.status_code, 200, r.text)
@@ -63,6 +72,23 @@ class TestDiagnosticsApiV1(unittest.TestCase):
         payload = r.json()
         self.assertEqual(payload["primary_diagnosis"]["id"], "NOTIFICATION-EMAIL-PROVIDER-001")
 
+    def test_analyze_batch(self):
+        r = self.client.post(
+            "/api/diagnostics/analyze/batch",
+            json={
+                "events": [
+                    {"signals": {"storage_full": True}},
+                    {"question": "docker container startet nicht"},
+                ]
+            },
+        )
+        self.assertEqual(r.status_code, 200, r.text)
+        payload = r.json()
+        self.assertEqual(payload["count"], 2)
+        self.assertEqual(payload["items"][0]["primary"], "FS-FULL-022")
+        self.assertEqual(payload["items"][1]["primary"], "SYSTEMD-START-009")
+        self.assertIn("DOCKER-028", payload["items"][1]["secondary"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+"""Evidence-Cache: nur geänderte Dateien neu parsen, Summary nach Änderungen neu berechnen."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from core.diagnostics import evidence_store as es
+
+
+def _record(rec_id: str, diagnosis_id: str, status: str = "confirmed") -> dict:
+    return {
+        "id": rec_id,
+        "timestamp": "2026-01-01T00:00:00Z",
+        "source_type": "unit_test",
+        "domain": "backup_restore",
+        "platform": "vm",
+        "scenario": "cache",
+        "test_goal": "cache",
+        "outcome": "success",
+        "severity": "low",
+        "confidence": "high",
+        "diagnosis_links": [{"diagnosis_id": diagnosis_id, "status": status}],
+    }
+
+
+class TestEvidenceCacheV1(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = Path(self._td.name)
+        es.clear_evidence_cache()
+        self._patch = patch.object(es, "EVIDENCE_DIR", self.dir)
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+        es.clear_evidence_cache()
+        self._td.cleanup()
+
+    def _write(self, name: str, payload) -> Path:
+        fp = self.dir / name
+        fp.write_text(payload if isinstance(payload, str) else json.dumps(payload), encoding="utf-8")
+        return fp
+
+    def test_only_changed_files_are_parsed(self):
+        self._write("a.json", _record("A", "DNS-018"))
+        self._write("b.json", _record("B", "DNS-018", "suspected"))
+        self._write(".tmp.json", "{")
+        parsed: list[str] = []
+        orig = es._parse_evidence_file
+
+        def _spy(fp):
+            parsed.append(fp.name)
+            return orig(fp)
+
+        with patch.object(es, "_parse_evidence_file", side_effect=_spy):
+            self.assertEqual([r.id for r in es.load_evidence_records()], ["A", "B"])
+            self.assertEqual(sorted(parsed), ["a.json", "b.json"])
+            parsed.clear()
+            es.load_evidence_records()
+            self.assertEqual(parsed, [])
+
+            fp = self._write("b.json", _record("B", "DNS-018", "refuted"))
+            st = fp.stat()
+            os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            summary = es.evidence_summary_map()["DNS-018"]
+            self.assertEqual(parsed, ["b.json"])
+            self.assertEqual((summary.confirmed, summary.refuted, summary.suspected), (1, 1, 0))
+
+    def test_deleted_and_invalid_files(self):
+        self._write("a.json", _record("A", "FS-FULL-022"))
+        bad = self._write("bad.json", "{not json")
+        self.assertEqual(len(es.load_evidence_records()), 1)
+        (self.dir / "a.json").unlink()
+        bad.unlink()
+        self.assertEqual(es.load_evidence_records(), [])
+        self.assertEqual(es.evidence_summary_map(), {})
+
+    def test_summary_map_is_a_copy(self):
+        self._write("a.json", _record("A", "DNS-018"))
+        es.evidence_summary_map().clear()
+        self.assertIn("DNS-018", es.evidence_summary_map())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Kompilierte Diagnose-Regeln: Semantik, Priorität, Batch-Klassifikation, konstante Kosten je Ereignis."""
+
+import sys
+import unittest
+from pathlib import Path
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from core.diagnostics import rule_engine as re_
+from core.diagnostics.matcher import COMPILED_RULES, match_ids
+from core.diagnostics.models import BATCH_MAX_EVENTS, DiagnosticsAnalyzeRequest, DiagnosticsBatchRequest
+from core.diagnostics.runner import classify_batch
+from diagnosis.interpret_v1 import RULE_AREAS, RULES_V1
+
+
+class TestRuleEngineV1(unittest.TestCase):
+    def test_clauses_and_priority(self):
+        rules = re_.compile_rules(
+            [
+                re_.rule("B", re_.all_of(re_.eq("code", value="x"), re_.has("stderr", any_of=("disk full",)))),
+                re_.rule(("A", "B"), re_.eq("flag", value="true"), re_.asks("hilfe")),
+                re_.rule("C", re_.eq("chain_a", "chain_b", values={"v1", "v2"})),
+            ]
+        )
+        self.assertEqual(rules.match({"code": "x", "stderr": "error: disk full now"}), ["B"])
+        self.assertEqual(rules.match({"code": "x", "stderr": "ok"}), [])
+        self.assertEqual(rules.match({"flag": "true", "code": "x", "stderr": "disk full"}), ["B", "A"])
+        self.assertEqual(rules.match({}, "brauche hilfe"), ["A", "B"])
+        # Kette: erster nicht-leerer Wert zählt
+        self.assertEqual(rules.match({"chain_a": "", "chain_b": "v2"}), ["C"])
+        self.assertEqual(rules.match({"chain_a": "other", "chain_b": "v2"}), [])
+
+    def test_overlapping_literals_all_found(self):
+        rules = re_.compile_rules(
+            [
+                re_.rule("SHORT", re_.asks("tmp")),
+                re_.rule("LONG", re_.asks("tmpfs")),
+                re_.rule("INNER", re_.asks("mpf")),
+            ]
+        )
+        self.assertEqual(rules.match({}, "tmpfs voll"), ["SHORT", "LONG", "INNER"])
+
+    def test_catalog_order_and_fallbacks(self):
+        self.assertEqual(
+            match_ids({"manifest_present": "false", "archive_corrupted": "true"}),
+            ["BACKUP-MANIFEST-001", "BACKUP-ARCHIVE-002"],
+        )
+        ids = match_ids({"code": "backup.restore_failed", "stderr": "no space left on device"}, "tmpfs?")
+        self.assertEqual(ids, ["RESTORE-TMPFS-007"])
+        self.assertEqual(match_ids({}, "irgendwas"), ["LOGS-029"])
+        self.assertEqual(match_ids({}), ["APP-030"])
+
+    def test_catalog_is_compiled_once(self):
+        self.assertGreater(COMPILED_RULES.atom_count, 50)
+        self.assertGreaterEqual(COMPILED_RULES.clause_count, len(COMPILED_RULES.rules))
+
+
+class TestDiagnosticsBatchV1(unittest.TestCase):
+    def test_batch_matches_single_classification(self):
+        events = [
+            DiagnosticsAnalyzeRequest(signals={"manifest_present": False}),
+            DiagnosticsAnalyzeRequest(question="ssh geht nicht"),
+            DiagnosticsAnalyzeRequest(),
+        ]
+        out = classify_batch(DiagnosticsBatchRequest(events=events))
+        self.assertEqual(out.count, 3)
+        self.assertEqual([i.primary for i in out.items], ["BACKUP-MANIFEST-001", "SSH-DISABLED-017", "APP-030"])
+        self.assertEqual(out.items[1].secondary, ["SSH-PORT-016"])
+        self.assertEqual(out.items[0].severity, "critical")
+        self.assertEqual(out.primary_counts["APP-030"], 1)
+
+    def test_batch_limit(self):
+        events = [DiagnosticsAnalyzeRequest()] * (BATCH_MAX_EVENTS + 1)
+        with self.assertRaises(ValueError):  # pydantic.ValidationError ist ein ValueError
+            DiagnosticsBatchRequest(events=events)
+        self.assertEqual(len(DiagnosticsBatchRequest(events=events[:BATCH_MAX_EVENTS]).events), BATCH_MAX_EVENTS)
+
+
+class TestRuleScalingV1(unittest.TestCase):
+    def test_cost_per_event_independent_of_catalog_size(self):
+        sys.path.insert(0, str(_backend / "tools"))
+        import diagnostics_rules_benchmark as bench
+
+        report = bench.measure((1, 30), events=300, runs=3)
+        # Großzügige Schranke gegen Messrauschen; linear wäre ~30×
+        self.assertLess(report["ratio"], 3.0, report)
+
+
+class TestInterpretAreasV1(unittest.TestCase):
+    def test_every_rule_has_area(self):
+        self.assertEqual(set(RULES_V1), set(RULE_AREAS))
+
+
+if __name__ == "__main__":
+    unittest.main()
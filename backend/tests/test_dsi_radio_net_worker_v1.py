@@ -0,0 +1,165 @@
+"""DSI-Radio Netz-Worker: Prioritäts-Pool, Keep-Alive-HTTP-Pool und Logo-Plattencache."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_DSI_RADIO = Path(__file__).resolve().parents[2] / "apps" / "dsi_radio"
+_HAS_QT = importlib.util.find_spec("PyQt6") is not None
+
+if _HAS_QT:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if str(_DSI_RADIO) not in sys.path:
+        sys.path.insert(0, str(_DSI_RADIO))
+    from PyQt6.QtCore import QCoreApplication
+
+    import net_worker
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: list[int] = []
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections.append(id(self))
+
+    def do_GET(self) -> None:  # noqa: N802 – http.server-API
+        if self.path == "/redirect":
+            self._reply(302, b"", {"Location": "/logo"})
+        elif self.path == "/logo":
+            self._reply(200, b"PNGDATA", {"Content-Type": "image/png"})
+        elif self.path == "/big":
+            self._reply(200, b"x" * 4096)
+        else:
+            self._reply(404, b"missing")
+
+    def _reply(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+@unittest.skipUnless(_HAS_QT, "PyQt6 nicht verfuegbar")
+class LogoCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self.cache = net_worker.LogoCache(self._td.name, ttl_sec=3600)
+
+    def _age(self, key: str, seconds: float) -> None:
+        t = time.time() - seconds
+        os.utime(self.cache._path(key), (t, t))
+
+    def test_get_put_and_ttl(self) -> None:
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", b"logo")
+        self.cache.put("empty", b"")
+        self.assertEqual(self.cache.get("a"), b"logo")
+        self.assertIsNone(self.cache.get("empty"))
+        self._age("a", 7200)
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_prune_drops_expired_then_oldest(self) -> None:
+        for i in range(6):
+            self.cache.put(f"k{i}", b"x")
+            self._age(f"k{i}", 100 - i)  # k5 ist der jüngste
+        self.cache.put("old", b"x")
+        self._age("old", 7200)
+        self.cache.prune(max_files=10)
+        self.assertFalse(os.path.exists(self.cache._path("old")))
+        self.assertEqual(len(os.listdir(self._td.name)), 6)
+        self.cache.prune(max_files=4)
+        self.assertEqual(sorted(os.listdir(self._td.name)), sorted(
+            os.path.basename(self.cache._path(f"k{i}")) for i in range(2, 6)
+        ))
+
+
+@unittest.skipUnless(_HAS_QT, "PyQt6 nicht verfuegbar")
+class HttpPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _Handler.connections = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.pool = net_worker.HttpPool()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive_redirect_and_errors(self) -> None:
+        first = self.pool.get(self.base + "/logo")
+        self.assertEqual((first.status, first.body), (200, b"PNGDATA"))
+        self.assertEqual(first.headers["content-type"], "image/png")
+        redirected = self.pool.get(self.base + "/redirect")
+        self.assertEqual(redirected.url, self.base + "/logo")
+        self.assertEqual(redirected.body, b"PNGDATA")
+        self.assertEqual(len(_Handler.connections), 1)  # alle Abrufe über eine Keep-Alive-Verbindung
+
+        with self.assertRaises(net_worker.HttpStatusError) as ctx:
+            self.pool.get(self.base + "/nope")
+        self.assertEqual(ctx.exception.status, 404)
+        with self.assertRaises(OSError):
+            self.pool.get(self.base + "/big", max_bytes=100)
+        self.assertEqual(self.pool.get(self.base + "/logo").body, b"PNGDATA")
+        with self.assertRaises(ValueError):
+            self.pool.get("ftp://example.invalid/x")
+
+
+@unittest.skipUnless(_HAS_QT, "PyQt6 nicht verfuegbar")
+class IoWorkerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QCoreApplication.instance() or QCoreApplication([])
+
+    def _wait(self, cond, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not cond() and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+        self.assertTrue(cond())
+
+    def test_priority_dedup_and_group_cancel(self) -> None:
+        worker = net_worker.IoWorker(workers=1)
+        gate = threading.Event()
+        order: list[str] = []
+        results: list[object] = []
+        worker.submit(gate.wait, priority=net_worker.PRIO_UI)
+        self._wait(lambda: not worker._heap)  # einziger Worker blockiert
+
+        def job(name: str):
+            return lambda: order.append(name) or name
+
+        worker.submit(job("ahead"), priority=net_worker.PRIO_ICON_AHEAD, key="icon:1", callback=results.append)
+        worker.submit(job("meta"), priority=net_worker.PRIO_METADATA, callback=results.append)
+        worker.submit(job("dropped"), priority=net_worker.PRIO_ICON_VISIBLE, group="list", callback=results.append)
+        # gleicher key: kein zweiter Auftrag, aber höhere Priorität
+        self.assertFalse(worker.submit(job("dup"), priority=net_worker.PRIO_UI, key="icon:1"))
+        self.assertTrue(worker.is_pending("icon:1"))
+        worker.cancel_group("list")
+        gate.set()
+
+        self._wait(lambda: len(results) == 2)
+        self.assertEqual(order, ["ahead", "meta"])
+        self.assertEqual(results, ["ahead", "meta"])
+        self.assertFalse(worker.is_pending("icon:1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""SQLite-Fleet-Store: Einzelzeilen-Heartbeats, Stale-Sweep als Abfrage, gepuffertes Audit-Log, Altindex-Import."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from core import fleet_session_state as fss
+from core import fleet_session_store as store_mod
+
+
+class FleetSessionStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.repo = Path(self._td.name)
+        self._env = patch.dict(os.environ, {"SETUPHELFER_FLEET_SESSIONS_ENABLED": "true"}, clear=False)
+        self._env.start()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        store_mod.close_stores()
+        self._td.cleanup()
+
+    def _jsonl_lines(self) -> list[dict]:
+        path = fss._jsonl_path(self.repo)
+        if not path.is_file():
+            return []
+        return [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines() if x.strip()]
+
+    def test_heartbeats_are_single_row_writes_with_batched_audit(self) -> None:
+        sids = [fss.create_fleet_session({"run_id": f"n{i}"}, repo_root=self.repo)["session"]["session_id"] for i in range(5)]
+        self.assertEqual(len(self._jsonl_lines()), 5)
+        store = fss._store(self.repo)
+        with patch.object(store, "upsert_many", wraps=store.upsert_many) as spy:
+            for _ in range(3):
+                for sid in sids:
+                    fss.heartbeat_fleet_session(sid, {"agent_state": "alive"}, repo_root=self.repo)
+        self.assertEqual(spy.call_count, 15)
+        self.assertTrue(all(len(list(c.args[0])) == 1 for c in spy.call_args_list))
+        self.assertFalse(fss._latest_path(self.repo).exists())
+        # Heartbeats landen gepuffert im Audit-Log
+        self.assertEqual(len(self._jsonl_lines()), 5)
+        store_mod.flush_audit_logs()
+        self.assertEqual(len(self._jsonl_lines()), 20)
+
+    def test_stale_sweep_only_touches_candidates(self) -> None:
+        fresh = fss.create_fleet_session({"run_id": "fresh", "status": "booting"}, repo_root=self.repo)["session"]
+        old = fss.create_fleet_session(
+            {"run_id": "old", "status": "booting", "qemu": {"timeout_seconds": 60}}, repo_root=self.repo
+        )["session"]
+        past = (datetime.now(tz=timezone.utc) - timedelta(seconds=200)).replace(microsecond=0).isoformat()
+        old["heartbeat"]["last_heartbeat_at"] = past
+        fss._save_latest_index({old["session_id"]: old}, self.repo)
+
+        candidates = fss._store(self.repo).sweep_candidates(
+            heartbeat_before=datetime.now(tz=timezone.utc).timestamp() - fss.HEARTBEAT_DELAYED_SECONDS
+        )
+        self.assertEqual([c["session_id"] for c in candidates], [old["session_id"]])
+
+        result = fss.detect_stale_sessions(repo_root=self.repo)
+        self.assertEqual(result["updated_session_ids"], [old["session_id"]])
+        self.assertEqual(fss.get_fleet_session(old["session_id"], repo_root=self.repo)["session"]["status"], "timeout")
+        self.assertEqual(fss.get_fleet_session(fresh["session_id"], repo_root=self.repo)["session"]["status"], "booting")
+        summary = result["summary"]
+        self.assertEqual((summary["total"], summary["active_count"], summary["finished_count"]), (2, 1, 1))
+        self.assertEqual(summary["error_count"], 1)
+
+    def test_list_filters_finished_via_index(self) -> None:
+        fss.create_fleet_session({"run_id": "a"}, repo_root=self.repo)
+        b = fss.create_fleet_session({"run_id": "b"}, repo_root=self.repo)["session"]["session_id"]
+        fss.finish_fleet_session(b, "success", repo_root=self.repo)
+        active = fss.list_fleet_sessions(include_finished=False, repo_root=self.repo)
+        self.assertEqual([s["run_id"] for s in active["sessions"]], ["a"])
+        everything = fss.list_fleet_sessions(repo_root=self.repo)
+        self.assertEqual(everything["count"], 2)
+
+    def test_legacy_latest_index_is_imported_once(self) -> None:
+        created = fss.create_fleet_session({"run_id": "legacy"}, repo_root=self.repo)["session"]
+        store_mod.close_stores()
+        storage = fss.fleet_sessions_storage_dir(self.repo)
+        (storage / store_mod.DB_NAME).unlink()
+        for suffix in ("-wal", "-shm"):
+            (storage / (store_mod.DB_NAME + suffix)).unlink(missing_ok=True)
+        fss._latest_path(self.repo).write_text(
+            json.dumps({"sessions": {created["session_id"]: created}}), encoding="utf-8"
+        )
+        got = fss.get_fleet_session(created["session_id"], repo_root=self.repo)["session"]
+        self.assertEqual(got["run_id"], "legacy")
+
+    def test_audit_buffer_flushes_on_timer_without_further_appends(self) -> None:
+        path = self.repo / "audit" / "log.jsonl"
+        path.parent.mkdir()
+        buf = store_mod.AuditLogBuffer(path, batch_size=100, flush_seconds=0.05)
+        buf.append({"n": 1})
+        self.assertEqual(buf.pending(), 1)
+        for _ in range(100):
+            if not buf.pending():
+                break
+            time.sleep(0.01)
+        self.assertEqual(buf.pending(), 0)
+        self.assertEqual(path.read_text(encoding="utf-8").count("\n"), 1)
+
+    def test_symlinked_storage_is_blocked(self) -> None:
+        storage = fss.fleet_sessions_storage_dir(self.repo)
+        storage.parent.mkdir(parents=True)
+        elsewhere = self.repo / "elsewhere"
+        elsewhere.mkdir()
+        storage.symlink_to(elsewhere, target_is_directory=True)
+        with self.assertRaises(fss.FleetSessionError) as ctx:
+            fss.create_fleet_session({"run_id": "x"}, repo_root=self.repo)
+        self.assertEqual(ctx.exception.errors, ["symlink_blocked"])
+        self.assertEqual(list(elsewhere.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Hot-Path-Benchmark-Suite: alle Fälle laufen auf lokalen Fixtures, JSON-Ergebnis, Baseline-Vergleich."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from tools import hot_path_benchmark as hpb
+
+
+def _result(**medians: float) -> dict:
+    return {"schema": hpb.RESULT_SCHEMA, "quick": False, "results": {k: {"median_ms": v} for k, v in medians.items()}}
+
+
+class HotPathBenchmarkSuiteTests(unittest.TestCase):
+    def test_quick_suite_runs_every_case(self) -> None:
+        report = hpb.run_suite(quick=True, repeats=1)
+        self.assertEqual(report["schema"], hpb.RESULT_SCHEMA)
+        self.assertEqual(set(report["results"]), set(hpb.CASES))
+        for name, row in report["results"].items():
+            self.assertGreater(row["median_ms"], 0.0, name)
+            self.assertEqual(row["repeats"], 1)
+        json.dumps(report)  # maschinenlesbar
+
+    def test_unknown_case_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            hpb.run_suite(["no_such_case"], quick=True, repeats=1)
+
+    def test_compare_flags_only_relevant_slowdowns(self) -> None:
+        baseline = _result(a=10.0, b=10.0, c=0.1, d=10.0)
+        current = _result(a=12.0, b=14.0, c=0.3, d=14.0, e=1.0)
+        out = hpb.compare(current, baseline, threshold=0.25, case_thresholds={"d": 0.5})
+        self.assertFalse(out["ok"])
+        self.assertEqual(out["regressions"], ["b"])  # c: unter min_delta_ms, d: eigene Schranke
+        status = {row["case"]: row["status"] for row in out["rows"]}
+        self.assertEqual(status, {"a": "ok", "b": "regressed", "c": "ok", "d": "ok", "e": "new"})
+        self.assertTrue(hpb.compare(current, current)["ok"])
+
+    def test_cli_saves_baseline_and_gates_regressions(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td) / "baseline.json"
+            argv = ["--quick", "--repeats", "1", "--cases", "eventbus_fanout,diagnostics_match"]
+            with redirect_stdout(StringIO()):
+                self.assertEqual(hpb.main([*argv, "--save-baseline", str(base)]), 0)
+            saved = json.loads(base.read_text(encoding="utf-8"))
+            self.assertEqual(set(saved["results"]), {"eventbus_fanout", "diagnostics_match"})
+
+            for row in saved["results"].values():
+                row["median_ms"] = row["median_ms"] / 100.0
+            base.write_text(json.dumps(saved), encoding="utf-8")
+            with redirect_stdout(StringIO()):
+                code = hpb.main([*argv, "--baseline", str(base), "--min-delta-ms", "0"])
+            self.assertEqual(code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
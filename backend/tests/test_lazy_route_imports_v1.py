@@ -0,0 +1,80 @@
+"""Lazy Handler-Imports in Deploy-Routen und Importtime-Benchmark."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_BACKEND = Path(__file__).resolve().parent.parent
+if str(_BACKEND) not in sys.path:
+    sys.path.insert(0, str(_BACKEND))
+
+from core.lazy_imports import lazy_callable, loaded_lazy_modules, resolve_lazy  # noqa: E402
+from tools.startup_importtime_benchmark import parse_importtime  # noqa: E402
+
+
+class TestLazyCallableV1(unittest.TestCase):
+    def test_resolves_on_call_and_honours_patch(self) -> None:
+        fn = lazy_callable("json", "dumps")
+        self.assertEqual(fn.__name__, "dumps")
+        self.assertEqual(fn({"a": 1}), '{"a": 1}')
+        self.assertIs(resolve_lazy(fn), __import__("json").dumps)
+        with patch("json.dumps", return_value="patched"):
+            self.assertEqual(fn({}), "patched")
+        self.assertIn("json", loaded_lazy_modules())
+
+    def test_resolve_lazy_passthrough(self) -> None:
+        self.assertIs(resolve_lazy(len), len)
+
+
+class TestDeployRoutesColdImportV1(unittest.TestCase):
+    def _probe(self, code: str) -> str:
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=str(_BACKEND), capture_output=True, text=True, check=False
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc.stdout.strip()
+
+    def test_import_routes_does_not_load_handler_modules(self) -> None:
+        out = self._probe(
+            "import sys, deploy.routes\n"
+            "print(','.join(sorted(m for m in ('deploy.runner_api_facade', 'deploy.plan',"
+            " 'deploy.execute', 'deploy.runner_rescue_plan') if m in sys.modules)))"
+        )
+        self.assertEqual(out, "")
+
+    def test_package_exports_resolve_lazily(self) -> None:
+        out = self._probe(
+            "import sys, deploy\n"
+            "before = 'deploy.plan' in sys.modules\n"
+            "fn = deploy.generate_deploy_plan\n"
+            "print(before, 'deploy.plan' in sys.modules, callable(fn))"
+        )
+        self.assertEqual(out, "False True True")
+
+
+class TestImporttimeParserV1(unittest.TestCase):
+    def test_aggregates_per_subsystem(self) -> None:
+        text = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       100 |        100 |   core.lazy_imports",
+                "import time:      2000 |       2100 | core",
+                "import time:      3000 |       3000 |     deploy.routes_registry",
+                "import time:      1000 |       4000 |   deploy",
+                "garbage line",
+            ]
+        )
+        report = parse_importtime(text)
+        self.assertEqual(report["total_ms"], 6.1)
+        self.assertEqual(report["module_count"], 4)
+        self.assertEqual(report["subsystems_self_ms"], {"deploy": 4.0, "core": 2.1})
+        self.assertEqual(report["subsystems_cumulative_ms"], {"deploy": 4.0, "core": 2.1})
+        self.assertEqual(report["slowest_modules_ms"][0]["module"], "deploy.routes_registry")
+
+
+if __name__ == "__main__":
+    unittest.main()
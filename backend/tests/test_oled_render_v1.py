@@ -0,0 +1,127 @@
+"""OLED-Damage-Renderer: nur geänderte Widgets zeichnen, nur geänderte Page-/Spaltenbereiche senden."""
+
+from __future__ import annotations
+
+import random
+import unittest
+from unittest.mock import patch
+
+from PIL import Image, ImageFont
+
+import oled_display_runner as runner
+from oled_render import WINDOW_CMD_BYTES, DamageRenderer, pack_pages
+
+FULL_FRAME = 128 * 64 // 8
+
+
+class FakePanel:
+    """SSD1306-Modell: GDDRAM + gezählte Bytes (Fensterkommando + Daten) je Frame."""
+
+    def __init__(self, width: int = 128, height: int = 64) -> None:
+        self.width = width
+        self.height = height
+        self.ram = bytearray(width * height // 8)
+        self.frame_bytes = 0
+        self.windows: list[tuple[int, int, int, int]] = []
+
+    def write_window(self, page_start: int, page_end: int, col_start: int, col_end: int, data: bytes) -> None:
+        cols = col_end - col_start + 1
+        assert len(data) == cols * (page_end - page_start + 1)
+        for i, page in enumerate(range(page_start, page_end + 1)):
+            base = page * self.width + col_start
+            self.ram[base:base + cols] = data[i * cols:(i + 1) * cols]
+        self.frame_bytes += WINDOW_CMD_BYTES + len(data)
+        self.windows.append((page_start, page_end, col_start, col_end))
+
+    def next_frame(self) -> None:
+        self.frame_bytes = 0
+        self.windows = []
+
+
+def _values(value: str = "12%", percent: int = 12, label: str = "Auslastung", ip: str = "192.168.1.20") -> dict:
+    return {
+        "ip": f"IP {ip}",
+        "label": label,
+        "value": value,
+        "percent": percent,
+        "percent_text": "" if "%" in value else f"{percent:3d}%",
+    }
+
+
+class OledRenderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.font = ImageFont.load_default()
+        self.panel = FakePanel()
+        self.renderer = DamageRenderer(self.panel, self.font)
+
+    def _reference(self, values: dict) -> bytes:
+        """Vollständig neu gezeichneter Frame (frischer Renderer) als Vergleich."""
+        panel = FakePanel()
+        DamageRenderer(panel, self.font).render(values)
+        return bytes(panel.ram)
+
+    def _frame(self, values: dict):
+        self.panel.next_frame()
+        stats = self.renderer.render(values)
+        self.assertEqual(stats.bytes_sent, self.panel.frame_bytes)
+        self.assertEqual(bytes(self.panel.ram), self._reference(values))
+        return stats
+
+    def test_pack_pages_matches_controller_layout(self) -> None:
+        img = Image.new("1", (128, 64))
+        px = img.load()
+        rng = random.Random(7)
+        for _ in range(1500):
+            px[rng.randrange(128), rng.randrange(64)] = 255
+        expected = bytearray(FULL_FRAME)
+        for page in range(8):
+            for x in range(128):
+                expected[page * 128 + x] = sum(1 << bit for bit in range(8) if px[x, page * 8 + bit])
+        self.assertEqual(pack_pages(img), bytes(expected))
+
+    def test_bytes_per_frame_follow_damage(self) -> None:
+        first = self._frame(_values())
+        self.assertEqual(self.panel.frame_bytes, WINDOW_CMD_BYTES + FULL_FRAME)
+        self.assertEqual(set(first.widgets_redrawn), {"ip", "percent", "label", "value", "percent_text"})
+
+        same = self._frame(_values())
+        self.assertEqual((same.widgets_redrawn, self.panel.frame_bytes), ([], 0))
+
+        # nur eine Ziffer im Wert: ein kleines Fenster in den Text-Pages
+        digit = self._frame(_values(value="13%", percent=12))
+        self.assertEqual(digit.widgets_redrawn, ["value"])
+        self.assertGreater(self.panel.frame_bytes, 0)
+        self.assertLess(self.panel.frame_bytes, 64)
+        self.assertTrue(all(c0 >= 54 for _p0, _p1, c0, _c1 in self.panel.windows))
+
+        # Donut ändert sich um einen Prozentpunkt: Teilbereich des Diagramms
+        donut = self._frame(_values(value="13%", percent=13))
+        self.assertEqual(donut.widgets_redrawn, ["percent"])
+        self.assertLess(self.panel.frame_bytes, FULL_FRAME // 4)
+
+        page_switch = self._frame(_values(value="47.3 C", percent=39, label="Temperatur"))
+        self.assertEqual(set(page_switch.widgets_redrawn), {"percent", "label", "value", "percent_text"})
+        self.assertLess(self.panel.frame_bytes, FULL_FRAME)
+
+        self.renderer.invalidate()  # z. B. nach I2C-Reconnect
+        self._frame(_values(value="47.3 C", percent=39, label="Temperatur"))
+        self.assertEqual(self.panel.frame_bytes, WINDOW_CMD_BYTES + FULL_FRAME)
+
+    def test_glyph_and_donut_tiles_are_cached(self) -> None:
+        self.renderer.render(_values())
+        self.renderer.render(_values(value="13%", percent=13))
+        # Rückwechsel auf bekannte Werte: nur Kacheln kopieren, nichts neu zeichnen
+        with patch("oled_render.ImageDraw.Draw", side_effect=AssertionError("re-rendered")):
+            stats = self.renderer.render(_values())
+        self.assertEqual(set(stats.widgets_redrawn), {"percent", "value"})
+
+    def test_runner_metric_values_feed_the_layout(self) -> None:
+        with patch.object(runner, "metric_info", return_value=("Speicher", "41%", 41)):
+            values = runner.metric_values("memory_usage", "10.0.0.2")
+        self.assertEqual(values, _values(value="41%", percent=41, label="Speicher", ip="10.0.0.2"))
+        with patch.object(runner, "metric_info", return_value=("Temperatur", "47.3 C", 39)):
+            self.assertEqual(runner.metric_values("temperature", "x")["percent_text"], " 39%")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Bilderrahmen-Lader: Decode/Skalierung mit Plattencache und Speicher-LRU je (Pfad, mtime, Größe)."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_PICTURE_FRAME = Path(__file__).resolve().parents[2] / "apps" / "picture_frame"
+_HAS_QT = importlib.util.find_spec("PyQt6") is not None
+
+if _HAS_QT:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if str(_PICTURE_FRAME) not in sys.path:
+        sys.path.insert(0, str(_PICTURE_FRAME))
+    from PyQt6.QtGui import QColor, QGuiApplication, QImage
+
+    import image_loader
+
+W, H, BORDER = 120, 200, 6
+
+
+@unittest.skipUnless(_HAS_QT, "PyQt6 nicht verfuegbar")
+class PictureFrameImageLoaderTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QGuiApplication.instance() or QGuiApplication([])
+
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self.dir = Path(self._td.name)
+        patcher = patch.object(image_loader, "THUMB_CACHE_DIR", str(self.dir / "frames"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _photo(self, name: str, w: int, h: int, color: str, mtime_ns: int | None = None) -> str:
+        img = QImage(w, h, QImage.Format.Format_RGB32)
+        img.fill(QColor(color))
+        path = str(self.dir / name)
+        self.assertTrue(img.save(path, "JPEG", 95))
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def test_render_frame_scales_into_border_and_reuses_disk_cache(self) -> None:
+        path = self._photo("a.jpg", 1600, 900, "red")
+        out = image_loader.render_frame(path, W, H, BORDER)
+        self.assertEqual((out.width(), out.height()), (W, H))
+        self.assertEqual(out.pixelColor(0, 0).name(), "#ffffff")
+        center = out.pixelColor(W // 2, H // 2)
+        self.assertGreater(center.red(), 200)
+        self.assertLess(center.green(), 60)
+        self.assertEqual(len(os.listdir(self.dir / "frames")), 1)
+
+        with patch.object(image_loader, "_decode_scaled", side_effect=AssertionError("decoded again")):
+            again = image_loader.render_frame(path, W, H, BORDER)
+        self.assertEqual((again.width(), again.height()), (W, H))
+
+        # Gleicher Pfad, neuer Inhalt/mtime: neuer Schlüssel, neu dekodiert
+        self._photo("a.jpg", 900, 1600, "blue", mtime_ns=os.stat(path).st_mtime_ns + 10**9)
+        changed = image_loader.render_frame(path, W, H, BORDER)
+        self.assertGreater(changed.pixelColor(W // 2, H // 2).blue(), 200)
+        self.assertEqual(len(os.listdir(self.dir / "frames")), 2)
+
+    def test_memory_lru_is_keyed_by_path_mtime_and_size(self) -> None:
+        path = self._photo("b.jpg", 64, 64, "green", mtime_ns=1_700_000_000_000_000_000)
+        loader = image_loader.FrameLoader(W, H, BORDER, max_items=2)
+        with patch.object(loader._pool, "start") as start:
+            loader.request(path)
+            self.assertEqual(start.call_count, 1)
+            loader.request(path)  # läuft bereits
+            self.assertEqual(start.call_count, 1)
+            img = image_loader.render_frame(path, W, H, BORDER)
+            loader._on_done(loader._generation, path, img)
+            self.assertIs(loader.get(path), img)
+            loader.request(path)  # Treffer im Speicher
+            self.assertEqual(start.call_count, 1)
+
+            # Datei unter gleichem Pfad ersetzt: alter Speicherstand gilt nicht mehr
+            self._photo("b.jpg", 80, 64, "yellow", mtime_ns=1_700_000_001_000_000_000)
+            self.assertIsNone(loader.get(path))
+            loader.request(path)
+            self.assertEqual(start.call_count, 2)
+            new_img = image_loader.render_frame(path, W, H, BORDER)
+            loader._on_done(loader._generation, path, new_img)
+            self.assertIs(loader.get(path), new_img)
+            self.assertEqual(len(loader._cache), 1)  # alte Fassung verdrängt
+
+            loader.forget([path])
+            self.assertIsNone(loader.get(path))
+
+    def test_memory_lru_evicts_oldest(self) -> None:
+        loader = image_loader.FrameLoader(W, H, BORDER, max_items=2)
+        paths = [self._photo(f"c{i}.jpg", 32, 32, "gray") for i in range(3)]
+        with patch.object(loader._pool, "start"):
+            for p in paths:
+                loader.request(p)
+                loader._on_done(loader._generation, p, image_loader.render_frame(p, W, H, BORDER))
+        self.assertIsNone(loader.get(paths[0]))
+        self.assertIsNotNone(loader.get(paths[1]))
+        self.assertIsNotNone(loader.get(paths[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Remote-DB: Verbindungs-Pool (WAL), Token-Hash-Index per Migration, TTL-Cache der Session-Validierung."""
+
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import core.auth as auth
+import storage.db as storage_db
+from tools import remote_auth_benchmark as bench
+
+
+def _iso(seconds: int) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).isoformat()
+
+
+class RemoteDbPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self._previous = storage_db._remote_db_path
+        storage_db._remote_db_path = Path(self._td.name) / "remote.db"
+        auth.invalidate_session_cache()
+
+    def tearDown(self) -> None:
+        auth.invalidate_session_cache()
+        storage_db.close_connection_pools()
+        storage_db._remote_db_path = self._previous
+        self._td.cleanup()
+
+    def _add_session(self, session_id: str, token: str, *, expires_in: int = 3600) -> None:
+        conn = storage_db.get_connection()
+        try:
+            conn.execute(
+                "INSERT INTO sessions (id, session_token_hash, device_id, created_at, expires_at, refreshed_at)"
+                " VALUES (?,?,?,?,?,NULL)",
+                (session_id, storage_db.hash_token(token), "dev1", _iso(0), _iso(expires_in)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_migration_adds_token_index_to_v2_database(self) -> None:
+        path = storage_db._remote_db_path
+        legacy = sqlite3.connect(str(path))
+        legacy.executescript(
+            """CREATE TABLE sessions (id TEXT PRIMARY KEY, session_token_hash TEXT NOT NULL, device_id TEXT NOT NULL,
+                   created_at TEXT NOT NULL, expires_at TEXT NOT NULL, refreshed_at TEXT);
+               CREATE TABLE _schema_version (version INTEGER NOT NULL);
+               INSERT INTO _schema_version VALUES (2);"""
+        )
+        legacy.close()
+        storage_db.init_remote_db(None)
+        conn = storage_db.get_connection()
+        try:
+            self.assertEqual(conn.execute("SELECT version FROM _schema_version").fetchone()[0], 3)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            plan = " ".join(
+                str(r[-1])
+                for r in conn.execute("EXPLAIN QUERY PLAN SELECT id FROM sessions WHERE session_token_hash = ?", ("x",))
+            )
+        finally:
+            conn.close()
+        self.assertIn("idx_sessions_token_hash", plan)
+
+    def test_connections_are_reused_and_not_shared(self) -> None:
+        storage_db.init_remote_db(None)
+        first = storage_db.get_connection()
+        first.close()
+        again = storage_db.get_connection()
+        self.assertIs(again, first)
+        other = storage_db.get_connection()
+        self.assertIsNot(other, again)
+        again.execute("INSERT INTO audit_log (event_type, created_at) VALUES ('x', 'now')")
+        again.close()  # ohne commit: Änderung wird wie beim Schließen verworfen
+        self.assertEqual(other.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0], 0)
+        other.close()
+
+        seen: list[int] = []
+
+        def _worker() -> None:
+            conn = storage_db.get_connection()
+            try:
+                seen.append(conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0])
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=_worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(seen, [0] * 8)
+
+    def test_validation_is_cached_and_invalidated_explicitly(self) -> None:
+        storage_db.init_remote_db(None)
+        self._add_session("s1", "tok-1")
+        self.assertEqual(auth.validate_session_token("tok-1").session_id, "s1")
+        with patch.object(auth, "get_connection", side_effect=AssertionError("db lookup")):
+            self.assertEqual(auth.validate_session_token("tok-1").session_id, "s1")
+
+        conn = storage_db.get_connection()
+        try:
+            conn.execute("DELETE FROM sessions WHERE id = 's1'")
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertEqual(auth.invalidate_session_cache(session_id="s1"), 1)
+        self.assertIsNone(auth.validate_session_token("tok-1"))
+
+    def test_cache_respects_session_expiry_and_ttl(self) -> None:
+        storage_db.init_remote_db(None)
+        self._add_session("s2", "tok-2")
+        self.assertIsNotNone(auth.validate_session_token("tok-2"))
+        key = next(iter(auth._session_cache))
+        entry = auth._session_cache[key]
+        auth._session_cache[key] = auth._CachedSession(entry.context, _iso(-1), entry.cached_until)
+        self.assertIsNone(auth.validate_session_token("tok-2"))
+        with patch.object(auth, "SESSION_CACHE_TTL_SECONDS", -1.0):
+            auth.invalidate_session_cache()
+            auth.validate_session_token("tok-2")
+            with patch.object(auth, "get_connection", wraps=auth.get_connection) as spy:
+                auth.validate_session_token("tok-2")
+        self.assertEqual(spy.call_count, 1)
+
+    def test_benchmark_latency_flat_with_large_sessions_table(self) -> None:
+        report = bench.measure((1000, 100000), samples=200)
+        self.assertTrue(report["ok"])
+        # großzügige Schranke gegen Messrauschen; ohne Index wächst der Lookup linear mit der Tabelle
+        self.assertLess(report["ratio"], 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
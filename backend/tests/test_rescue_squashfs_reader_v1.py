@@ -0,0 +1,253 @@
+"""Nativer SquashFS-Reader: Listing/Extraktion aus gecachten Tabellen, ein Parse je Image, unsquashfs-Fallback."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import core.squashfs_reader as reader
+from core.rescue_squashfs_react_shell_verify import (
+    squashfs_contains_react_rescue_shell,
+    squashfs_verify_launcher_payload,
+)
+from tests.support.squashfs_fixture import build_squashfs
+
+_SBIN = "usr/local/sbin"
+_UNITS = "etc/systemd/system"
+_PY = "opt/setuphelfer/backend/core"
+
+RESCUE_FILES = {
+    "usr/share/setuphelfer/rescue/ui/rescue.html": "<html></html>",
+    "usr/share/setuphelfer/rescue/ui/rescue-ui-manifest.json": "{}",
+    f"{_SBIN}/setuphelfer-rescue-ui-launch": "fallback_tui review_required rescue-ui-status.json no_graphical_browser\n",
+    f"{_SBIN}/setuphelfer-rescue-network-onboarding": "SKIPPED_BOOT_WAIT_USER\n",
+    f"{_SBIN}/setuphelfer-rescue-telemetry-push": "telemetry_disabled_or_no_consent\n",
+    f"{_UNITS}/setuphelfer-rescue-ui.service": "[Unit]\n",
+    f"{_UNITS}/setuphelfer-rescue-state.service": "[Unit]\n",
+    f"{_UNITS}/setuphelfer-rescue-evidence-spool.service": "[Unit]\n",
+    f"{_UNITS}/setuphelfer-rescue-network-onboarding.service": "ConditionPathExists=network-user-requested\n",
+    f"{_UNITS}/setuphelfer-rescue-telemetry-push.service": "ConditionPathExists=telemetry-opt-in\n",
+    f"{_UNITS}/systemd-networkd-wait-online.service.d/10-setuphelfer-rescue.conf": "[Service]\nExecStart=/bin/true\n",
+    f"{_PY}/rescue_offline_first_policy.py": "",
+    f"{_PY}/rescue_evidence_spool.py": "",
+    f"{_PY}/rescue_machine_profile.py": "",
+    f"{_PY}/rescue_boot_status.py": "",
+    "usr/lib/chromium/chromium": b"\x7fELF" + os.urandom(9000),
+}
+
+
+def _no_subprocess(*_a, **_k):
+    raise AssertionError("unsquashfs must not be called")
+
+
+class SquashfsReaderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        reader.clear_squashfs_cache()
+
+    def tearDown(self) -> None:
+        reader.clear_squashfs_cache()
+        self._td.cleanup()
+
+    def test_files_blocks_fragments_and_symlinks(self) -> None:
+        big = os.urandom(3 * 4096) + b"tail" * 300
+        files = {f"etc/conf.d/f{i:04d}": f"value {i}\n" * (i % 7) for i in range(2000)}
+        files["usr/bin/big"] = big
+        for compression in ("gzip", "xz"):
+            image_path = build_squashfs(
+                self.root / f"{compression}.sqfs",
+                files,
+                symlinks={"usr/bin/alias": "big", "etc/abs": "/usr/bin/big"},
+                directories=("var/empty",),
+                compression=compression,
+            )
+            image = reader.SquashfsImage(image_path)
+            try:
+                self.assertEqual(image.compression, compression)
+                self.assertEqual(image.read_file("usr/bin/big"), big)
+                self.assertEqual(image.read_file("/squashfs-root/usr/bin/alias"), big)
+                self.assertEqual(image.read_file("etc/abs", max_bytes=10), big[:10])
+                self.assertEqual(image.read_text("etc/conf.d/f0013"), files["etc/conf.d/f0013"])
+                self.assertEqual(len(image.listdir("etc/conf.d")), 2000)
+                self.assertEqual(image.listdir("var/empty"), [])
+                self.assertTrue(image.lookup("usr/bin/alias").is_symlink)
+                with self.assertRaises(FileNotFoundError):
+                    image.read_file("usr/bin/missing")
+                with self.assertRaises(IsADirectoryError):
+                    image.read_file("usr/bin")
+                listing = image.listing_text()
+                self.assertIn(" squashfs-root/usr/bin/alias -> big\n", listing)
+                self.assertIn(" squashfs-root/var/empty\n", listing)
+            finally:
+                image.close()
+
+    def test_all_checks_of_one_image_cost_one_parse(self) -> None:
+        image_path = build_squashfs(
+            self.root / "rescue.sqfs",
+            RESCUE_FILES,
+            symlinks={"usr/bin/chromium": "../lib/chromium/chromium"},
+            compression="xz",
+        )
+        before = reader.squashfs_parse_count()
+        with patch.object(subprocess, "run", side_effect=_no_subprocess):
+            report = squashfs_verify_launcher_payload(image_path)
+            again = squashfs_contains_react_rescue_shell(image_path)
+        self.assertEqual(reader.squashfs_parse_count() - before, 1)
+        self.assertTrue(report["unsquashfs_ok"])
+        self.assertTrue(report["contains_react_rescue_shell"], report["checks"])
+        self.assertTrue(report["contains_rescue_ui_launcher_fix"])
+        self.assertTrue(report["contains_network_boot_skip"])
+        self.assertTrue(report["contains_telemetry_default_skipped"])
+        self.assertTrue(report["contains_wait_online_neutralization"])
+        self.assertFalse(report["network_boot_autostart"])
+        self.assertFalse(report["telemetry_required_before_menu"])
+        self.assertEqual(again["checks"], report["checks"])
+
+    def test_cache_is_invalidated_when_image_changes(self) -> None:
+        image_path = build_squashfs(self.root / "img.sqfs", {"a.txt": "one"})
+        first = reader.open_squashfs(image_path)
+        self.assertIs(reader.open_squashfs(image_path), first)
+        self.assertEqual(first.read_text("a.txt"), "one")
+
+        build_squashfs(image_path, {"a.txt": "two", "b.txt": "new"})
+        st = image_path.stat()
+        os.utime(image_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        second = reader.open_squashfs(image_path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.read_text("a.txt"), "two")
+        self.assertEqual(len([k for k in reader._images if k[0] == str(image_path.resolve())]), 1)
+
+    def test_evicted_image_stays_open_until_last_user_releases(self) -> None:
+        image_path = build_squashfs(self.root / "img.sqfs", {"a.txt": "one"})
+        others = [build_squashfs(self.root / f"o{i}.sqfs", {"x": str(i)}) for i in range(reader.MAX_CACHED_IMAGES)]
+        held = reader.open_squashfs(image_path)
+        started, evicted = threading.Event(), threading.Event()
+        seen: list[str] = []
+
+        def _user() -> None:
+            with reader.open_squashfs(image_path) as image:
+                started.set()
+                evicted.wait(5)
+                seen.append(image.read_text("a.txt"))
+
+        worker = threading.Thread(target=_user)
+        worker.start()
+        self.assertTrue(started.wait(5))
+        for other in others:  # verdrängt img.sqfs aus dem Cache
+            reader.open_squashfs(other).release()
+        self.assertNotIn(str(image_path.resolve()), [k[0] for k in reader._images])
+        evicted.set()
+        worker.join(5)
+        self.assertEqual(seen, ["one"])
+        self.assertEqual(held.read_text("a.txt"), "one")
+        self.assertGreaterEqual(held._fd, 0)
+        held.release()
+        self.assertEqual(held._fd, -1)  # letzter Nutzer fertig: fd geschlossen
+
+        cached = reader.open_squashfs(others[-1])
+        reader.clear_squashfs_cache()
+        self.assertEqual(cached.read_text("x"), str(reader.MAX_CACHED_IMAGES - 1))
+        cached.release()
+
+    def test_unsupported_compression_falls_back_to_unsquashfs(self) -> None:
+        image_path = build_squashfs(self.root / "zstd.sqfs", {"a.txt": "x"})
+        raw = bytearray(image_path.read_bytes())
+        struct.pack_into("<H", raw, 20, 6)  # compression_id = zstd
+        image_path.write_bytes(bytes(raw))
+        with self.assertRaises(reader.SquashfsUnsupportedError):
+            reader.SquashfsImage(image_path)
+
+        fake = subprocess.CompletedProcess([], 0, stdout="squashfs-root/usr/bin/chromium\n", stderr="")
+        with patch.object(subprocess, "run", return_value=fake) as run:
+            report = squashfs_contains_react_rescue_shell(image_path)
+        self.assertEqual(run.call_args.args[0][:2], ["unsquashfs", "-ll"])
+        self.assertTrue(report["checks"]["chromium_browser"])
+
+        corrupt = self.root / "corrupt.sqfs"
+        corrupt.write_bytes(b"hsqs" + b"\0" * 200)
+        with self.assertRaises(reader.SquashfsError):
+            reader.open_squashfs(corrupt)
+
+
+@unittest.skipUnless(shutil.which("mksquashfs"), "mksquashfs nicht installiert")
+class MksquashfsInteropTests(unittest.TestCase):
+    """Gegenprobe mit echten mksquashfs-Images statt des Test-Writers."""
+
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.tree = self.root / "tree"
+        files = {
+            "etc/hostname": b"rescue\n",
+            "etc/empty": b"",
+            "usr/bin/big": os.urandom(300 * 1024) + b"tail",
+            "usr/share/doc/readme.txt": b"zeile\n" * 5000,
+            "var/lib/zeros.bin": bytes(200 * 1024),
+        }
+        files.update({f"etc/conf.d/f{i:03d}": f"value {i}\n".encode() * (i % 5) for i in range(300)})
+        for rel, data in files.items():
+            target = self.tree / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+        (self.tree / "usr/bin/alias").symlink_to("big")
+        (self.tree / "etc/abs").symlink_to("/usr/bin/big")
+        (self.tree / "var/empty").mkdir(parents=True)
+        self.files = files
+        reader.clear_squashfs_cache()
+
+    def tearDown(self) -> None:
+        reader.clear_squashfs_cache()
+        self._td.cleanup()
+
+    def _mksquashfs(self, compression: str) -> Path:
+        out = self.root / f"{compression}.sqfs"
+        proc = subprocess.run(
+            ["mksquashfs", str(self.tree), str(out), "-comp", compression, "-noappend", "-no-progress", "-b", "131072"],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=120,
+        )
+        if proc.returncode != 0 and compression != "gzip":
+            self.skipTest(f"mksquashfs ohne {compression}: {proc.stderr.strip()[:200]}")
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return out
+
+    def test_reads_real_mksquashfs_images(self) -> None:
+        for compression in ("gzip", "xz"):
+            with self.subTest(compression=compression):
+                with reader.open_squashfs(self._mksquashfs(compression)) as image:
+                    self.assertEqual(image.compression, compression)
+                    for rel, data in self.files.items():
+                        self.assertEqual(image.read_file(rel), data, rel)
+                    self.assertEqual(image.read_file("usr/bin/alias"), self.files["usr/bin/big"])
+                    self.assertEqual(image.read_file("etc/abs", max_bytes=16), self.files["usr/bin/big"][:16])
+                    self.assertEqual(image.lookup("usr/bin/alias").link_target, "big")
+                    self.assertEqual(image.listdir("var/empty"), [])
+                    self.assertEqual(sorted(image.listdir("etc/conf.d")), sorted(os.listdir(self.tree / "etc/conf.d")))
+                    expected = {
+                        str(p.relative_to(self.tree)) for p in self.tree.rglob("*")
+                    }
+                    self.assertEqual({p for p in image.iter_paths() if p}, expected)
+
+    def test_listing_matches_unsquashfs(self) -> None:
+        if not shutil.which("unsquashfs"):
+            self.skipTest("unsquashfs nicht installiert")
+        image_path = self._mksquashfs("gzip")
+        proc = subprocess.run(["unsquashfs", "-ll", str(image_path)], capture_output=True, text=True, check=True)
+        theirs = {line.split(" squashfs-root", 1)[1] for line in proc.stdout.splitlines() if " squashfs-root" in line}
+        with reader.open_squashfs(image_path) as image:
+            ours = {line.split(" squashfs-root", 1)[1] for line in image.listing_text().splitlines() if " squashfs-root" in line}
+        self.assertEqual(ours, theirs)
+
+
+if __name__ == "__main__":
+    unittest.main()
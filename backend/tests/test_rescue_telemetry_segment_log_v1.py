@@ -0,0 +1,192 @@
+"""Segment-Log für Rescue-Telemetrie: Append, blockweises Drain, O(1)-Zähler, Crash-Recovery, Ingest."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core import telemetry_segment_log as tsl
+from core.rescue_telemetry_ingest import (
+    RescueTelemetryIngestConfig,
+    build_health_payload,
+    compute_payload_hash,
+    ingest_ack_present,
+    process_telemetry_ingest,
+)
+from core.telemetry_segment_log import SegmentLog
+
+
+def _envelope(run_id: str) -> dict:
+    payload = {
+        "schema_version": "1.0.0",
+        "run_id": run_id,
+        "device_session_id": "devsess-seg-001",
+        "created_at": "2026-06-05T13:30:00+02:00",
+        "source": "rescue_stick",
+        "payload_kind": "windows_rescue_inspect",
+        "privacy_level": "diagnostic_metadata",
+        "contains_personal_data": False,
+        "operator_consent_state": "not_required_for_diagnostic_metadata",
+        "diagnostics": {"codes": ["WIN-INSPECT-001"], "severity": "info", "recommended_actions": []},
+    }
+    payload["payload_hash_sha256"] = compute_payload_hash(payload)
+    return payload
+
+
+class SegmentLogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = Path(self._td.name) / "log"
+
+    def tearDown(self) -> None:
+        tsl.close_segment_logs()
+        self._td.cleanup()
+
+    def _log(self) -> SegmentLog:
+        return SegmentLog(self.dir, segment_max_bytes=2048, index_interval_bytes=256)
+
+    def test_append_rolls_segments_and_reads_via_index(self) -> None:
+        log = self._log()
+        for i in range(300):
+            log.append_json({"i": i})
+        counters = log.counters()
+        self.assertEqual((counters["last_seq"], counters["pending"], counters["processed"]), (300, 300, 0))
+        self.assertGreater(counters["segments"], 3)
+        got = log.read_from(257, max_records=3)
+        self.assertEqual([json.loads(p)["i"] for _seq, p in got], [256, 257, 258])
+        log.close()
+
+    def test_drain_is_batched_and_at_least_once(self) -> None:
+        log = self._log()
+        log.append_many([json.dumps({"i": i}).encode() for i in range(10)])
+        batches: list[list[int]] = []
+        self.assertEqual(log.drain(lambda docs: batches.append([d["i"] for d in docs]), batch_size=4), 10)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+        self.assertEqual(log.counters()["processed"], 10)
+
+        log.append_json({"i": 10})
+
+        def _fail(_docs: list) -> None:
+            raise RuntimeError("downstream down")
+
+        with self.assertRaises(RuntimeError):
+            log.drain(_fail)
+        self.assertEqual(log.counters()["pending"], 1)
+        log.close()
+        reopened = self._log()
+        self.assertEqual((reopened.counters()["processed"], reopened.counters()["pending"]), (10, 1))
+        seen: list[int] = []
+        reopened.drain(lambda docs: seen.extend(d["i"] for d in docs))
+        self.assertEqual(seen, [10])
+        reopened.close()
+
+    def test_counters_do_not_scan_directory(self) -> None:
+        log = self._log()
+        log.append_json({"i": 0})
+        with patch.object(Path, "glob", side_effect=AssertionError("directory scan")):
+            log.append_json({"i": 1})
+            self.assertEqual(log.counters()["pending"], 2)
+        log.close()
+
+    def test_truncated_record_is_cut_on_recovery(self) -> None:
+        log = self._log()
+        for i in range(40):
+            log.append_json({"i": i})
+        log.drain(lambda _docs: None, batch_size=100)
+        log.close()
+        last_segment = sorted(self.dir.glob("*.seg"))[-1]
+        size = last_segment.stat().st_size
+        with last_segment.open("r+b") as fh:
+            fh.truncate(size - 5)  # letzter Record halb geschrieben
+
+        log = self._log()
+        self.assertGreater(log.truncated_bytes, 0)
+        counters = log.counters()
+        self.assertEqual(counters["last_seq"], 39)
+        self.assertEqual(counters["processed"], 39)  # Cursor auf das Log-Ende begrenzt
+        self.assertEqual(json.loads(log.last_record()[1])["i"], 38)
+        self.assertEqual(log.append_json({"i": "after-crash"}), 40)
+        self.assertEqual(json.loads(log.read_from(40, max_records=1)[0][1])["i"], "after-crash")
+        log.close()
+
+    def test_garbage_tail_and_stale_index_entry(self) -> None:
+        log = self._log()
+        for i in range(5):
+            log.append_json({"i": i})
+        log.close()
+        seg = sorted(self.dir.glob("*.seg"))[-1]
+        idx = seg.with_suffix(tsl.INDEX_SUFFIX)
+        with seg.open("ab") as fh:
+            fh.write(b"\0" * 64)
+        with idx.open("ab") as fh:
+            fh.write(tsl._INDEX_ENTRY.pack(6, seg.stat().st_size - 32))
+        log = self._log()
+        self.assertEqual(log.truncated_bytes, 64)
+        self.assertEqual(log.counters()["last_seq"], 5)
+        self.assertEqual(log.append_json({"i": 5}), 6)
+        self.assertEqual([s for s, _p in log.read_from(1, max_records=10)], [1, 2, 3, 4, 5, 6])
+        log.close()
+
+
+class TelemetryIngestSegmentLogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        root = Path(self._td.name)
+        self.cfg = RescueTelemetryIngestConfig(
+            enabled=True,
+            ingest_token_configured=False,
+            hmac_required=False,
+            storage_root=root,
+            queue_dir=root / "queue",
+            ingest_dir=root / "received",
+            ack_dir=root / "acks",
+        )
+
+    def tearDown(self) -> None:
+        tsl.close_segment_logs()
+        self._td.cleanup()
+
+    def _ingest(self, envelope: dict) -> dict:
+        return process_telemetry_ingest(envelope, headers={}, body_bytes=b"{}", config=self.cfg)
+
+    def test_ingest_appends_records_without_per_payload_files(self) -> None:
+        health = build_health_payload(config=self.cfg)
+        self.assertEqual((health["received_count"], health["last_ack_id"]), (0, None))
+        self.assertFalse(ingest_ack_present(config=self.cfg))
+        self.assertFalse(any(self.cfg.storage_root.rglob("*.seg")))
+
+        acks = [self._ingest(_envelope(f"run-{i}"))["body"]["ack_id"] for i in range(25)]
+        self.assertEqual(len([p for p in self.cfg.ingest_dir.iterdir() if p.suffix == ".seg"]), 1)
+        self.assertFalse(any(self.cfg.ack_dir.glob("*.json")))
+        health = build_health_payload(config=self.cfg)
+        self.assertEqual((health["received_count"], health["received_pending"]), (25, 25))
+        self.assertEqual(health["last_ack_id"], acks[-1])
+        self.assertTrue(ingest_ack_present(config=self.cfg))
+
+        runs: list[str] = []
+        drained = tsl.open_segment_log(self.cfg.ingest_dir).drain(lambda docs: runs.extend(d["run_id"] for d in docs), batch_size=10)
+        self.assertEqual(drained, 25)
+        self.assertEqual(runs, [f"run-{i}" for i in range(25)])
+        self.assertEqual(build_health_payload(config=self.cfg)["received_processed"], 25)
+
+    def test_error_code_clears_after_next_ingest(self) -> None:
+        bad = _envelope("run-bad")
+        bad["payload_hash_sha256"] = "0" * 64
+        self.assertEqual(self._ingest(bad)["http_status"], 409)
+        self.assertEqual(build_health_payload(config=self.cfg)["last_error_code"], "TELEMETRY-HASH-001")
+        self.assertEqual(self._ingest(_envelope("run-ok"))["http_status"], 200)
+        self.assertIsNone(build_health_payload(config=self.cfg)["last_error_code"])
+
+    def test_legacy_ack_files_are_still_reported(self) -> None:
+        self.cfg.ack_dir.mkdir(parents=True)
+        (self.cfg.ack_dir / "rti-legacy.json").write_text(
+            json.dumps({"ack_id": "rti-legacy", "received_at": "2026-06-05T12:00:00Z"}), encoding="utf-8"
+        )
+        self.assertEqual(build_health_payload(config=self.cfg)["last_ack_id"], "rti-legacy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Gemeinsame SQLite-Bausteine: WAL-Verbindung für alle Ablagen, Registry je Datenbankpfad."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from core import fleet_session_store as fleet_store
+from core.sqlite_registry import ConnectionRegistry, iso_epoch, open_wal_connection
+from devserver.storage_index import StorageIndex
+from storage import db as remote_db
+
+
+def _pragmas(conn) -> tuple[str, int, int]:
+    return (
+        conn.execute("PRAGMA journal_mode").fetchone()[0],
+        conn.execute("PRAGMA synchronous").fetchone()[0],
+        conn.execute("PRAGMA busy_timeout").fetchone()[0],
+    )
+
+
+class OpenWalConnectionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self.root = Path(self._td.name)
+
+    def test_pragmas_parent_dir_and_threads(self) -> None:
+        conn = open_wal_connection(self.root / "a" / "b.db", isolation_level=None)
+        self.addCleanup(conn.close)
+        self.assertEqual(_pragmas(conn), ("wal", 1, 5000))
+        self.assertIsNone(conn.isolation_level)
+        errors: list[BaseException] = []
+
+        def _use() -> None:
+            try:
+                conn.execute("SELECT 1").fetchone()
+            except BaseException as exc:  # noqa: BLE001
+                errors.append(exc)
+
+        t = threading.Thread(target=_use)
+        t.start()
+        t.join()
+        self.assertEqual(errors, [])
+
+    def test_all_stores_share_the_pragmas(self) -> None:
+        index = StorageIndex(self.root / "index.db")
+        self.addCleanup(index.close)
+        store = fleet_store.FleetSessionStore(self.root / "fleet.db", is_terminal=lambda _s: False)
+        self.addCleanup(store.close)
+        pooled = remote_db._ConnectionPool(self.root / "remote.db")._open()
+        self.addCleanup(pooled.close)
+        for conn in (index._conn, store._conn, pooled):
+            self.assertEqual(_pragmas(conn), ("wal", 1, 5000))
+
+
+class RegistryTests(unittest.TestCase):
+    def test_iso_epoch(self) -> None:
+        self.assertEqual(iso_epoch("1970-01-01T00:01:00Z"), 60.0)
+        self.assertEqual(iso_epoch("1970-01-01T00:01:00"), 60.0)
+        self.assertIsNone(iso_epoch(""))
+        self.assertIsNone(iso_epoch("kaputt"))
+
+    def test_reopens_after_database_file_vanished(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = Path(td) / "x.db"
+            registry: ConnectionRegistry = ConnectionRegistry()
+            first, fresh = registry.get(db_path, lambda: open_wal_connection(db_path))
+            self.assertTrue(fresh)
+            self.assertIs(registry.get(db_path, lambda: open_wal_connection(db_path))[0], first)
+            db_path.unlink()
+            second, fresh = registry.get(db_path, lambda: open_wal_connection(db_path))
+            self.assertTrue(fresh)
+            self.assertIsNot(second, first)
+            registry.close_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
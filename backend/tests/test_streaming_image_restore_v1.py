@@ -0,0 +1,153 @@
+"""Streaming-Restore komprimierter Abbilder: ein Durchlauf, ausgerichtete Puffer, Sparse-Ziele, Fortschritt, Abbruch."""
+
+from __future__ import annotations
+
+import errno
+import gzip
+import lzma
+import os
+import struct
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import modules.streaming_image_restore as sir
+from core.backup_recovery_i18n import K_OPERATION_OK, K_RESTORE_IMAGE_CANCELLED, K_RESTORE_IMAGE_FAILED
+from modules.restore_engine import restore_image
+
+MIB = 1024 * 1024
+
+
+def _disk_image() -> bytes:
+    """Abbild mit Daten, langen Null-Bereichen und nicht ausgerichtetem Ende."""
+    rng = os.urandom(3 * MIB + 123)
+    return b"\xeb\x3c\x90" + bytes(509) + rng[:2 * MIB] + bytes(9 * MIB) + rng[2 * MIB:] + bytes(5 * MIB) + b"END"
+
+
+class StreamingImageRestoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.payload = _disk_image()
+        self._gate = patch("modules.restore_engine.validate_write_target", lambda *_a, **_k: None)
+        self._gate.start()
+
+    def tearDown(self) -> None:
+        self._gate.stop()
+        self._td.cleanup()
+
+    def _write(self, name: str, data: bytes) -> Path:
+        path = self.root / name
+        path.write_bytes(data)
+        return path
+
+    def test_codecs_roundtrip_into_sparse_target(self) -> None:
+        half = len(self.payload) // 2
+        images = {
+            "raw": self._write("disk.img", self.payload),
+            # mehrteiliges gzip (pigz/cat-Ketten) und xz wie von ``xz -T0``
+            "gzip": self._write("disk.img.gz", gzip.compress(self.payload[:half]) + gzip.compress(self.payload[half:])),
+            "xz": self._write("disk.img.xz", lzma.compress(self.payload, format=lzma.FORMAT_XZ)),
+        }
+        for codec, image in images.items():
+            target = self.root / f"restored-{codec}.img"
+            target.write_bytes(b"\xff" * 64)  # Altbestand muss verschwinden
+            events: list[sir.ImageRestoreProgress] = []
+            ok, key, err = restore_image(image, target, progress=events.append)
+            self.assertEqual((ok, key, err), (True, K_OPERATION_OK, None), codec)
+            self.assertEqual(target.read_bytes(), self.payload, codec)
+            self.assertEqual(sir.detect_image_codec(image), codec)
+            final = events[-1]
+            self.assertEqual(final.phase, "done")
+            self.assertEqual(final.codec, codec)
+            self.assertEqual(final.bytes_written, len(self.payload))
+            self.assertEqual(final.bytes_read, image.stat().st_size)
+            self.assertGreaterEqual(final.sparse_bytes_skipped, 13 * MIB)
+            self.assertIsNotNone(final.throughput_bytes_per_sec)
+
+    def test_writes_are_chunk_aligned_and_dense_when_not_sparse(self) -> None:
+        image = self._write("disk.img.gz", gzip.compress(self.payload, 1))
+        offsets: list[int] = []
+        real_pwrite = os.pwrite
+
+        def _spy(fd: int, data, offset: int) -> int:
+            offsets.append(offset)
+            return real_pwrite(fd, data, offset)
+
+        target = self.root / "dense.img"
+        with patch.object(sir.os, "pwrite", side_effect=_spy):
+            result = sir.restore_image_stream(image, target, sparse=False)
+        self.assertEqual(target.read_bytes(), self.payload)
+        self.assertEqual(result.sparse_bytes_skipped, 0)
+        self.assertTrue(all(o % sir.WRITE_CHUNK == 0 for o in offsets), offsets)
+        self.assertEqual(len(offsets), -(-len(self.payload) // sir.WRITE_CHUNK))
+
+    def test_cancel_mid_stream(self) -> None:
+        image = self._write("disk.img.xz", lzma.compress(self.payload, format=lzma.FORMAT_XZ, preset=0))
+        cancel = threading.Event()
+        seen: list[int] = []
+
+        def _progress(p: sir.ImageRestoreProgress) -> None:
+            seen.append(p.bytes_written)
+            cancel.set()
+
+        with patch.object(sir, "PROGRESS_INTERVAL_SEC", 0.0):
+            ok, key, err = restore_image(image, self.root / "cancelled.img", progress=_progress, cancel_event=cancel)
+        self.assertFalse(ok)
+        self.assertEqual(key, K_RESTORE_IMAGE_CANCELLED)
+        self.assertEqual(seen, [sir.WRITE_CHUNK])
+        self.assertLess((self.root / "cancelled.img").stat().st_size, len(self.payload))
+
+    def test_corrupt_or_unavailable_codec_fails_cleanly(self) -> None:
+        packed = gzip.compress(self.payload)
+        truncated = self._write("cut.img.gz", packed[: len(packed) // 2])
+        ok, key, err = restore_image(truncated, self.root / "cut.img")
+        self.assertFalse(ok)
+        self.assertEqual(key, K_RESTORE_IMAGE_FAILED)
+        self.assertIn("image_read_failed", err or "")
+
+        # zstd ohne installierten Decoder bzw. kaputter Frame: beides ist ein sauberer Fehler
+        zst = self._write("disk.img.zst", b"\x28\xb5\x2f\xfd" + os.urandom(64))
+        self.assertEqual(sir.detect_image_codec(zst), "zstd")
+        with self.assertRaises(sir.ImageRestoreError):
+            sir.restore_image_stream(zst, self.root / "zst.img")
+
+    def test_block_device_zero_runs_use_blkzeroout(self) -> None:
+        target = self.root / "blockdev.img"
+        target.write_bytes(b"\xff" * len(self.payload))  # alter Inhalt muss zu Nullen werden
+        chunk = self.payload[: sir.WRITE_CHUNK]
+        calls: list[tuple[int, int]] = []
+
+        def _ioctl(fd: int, request: int, arg: bytes) -> bytes:
+            self.assertEqual(request, sir.BLKZEROOUT)
+            start, length = struct.unpack("=QQ", arg)
+            calls.append((start, length))
+            os.pwrite(fd, bytes(length), start)  # Kernel-Seite nachgestellt
+            return arg
+
+        with open(target, "r+b") as fh, patch.object(sir.fcntl, "ioctl", side_effect=_ioctl):
+            zero_out = sir._BlockZeroOut(fh.fileno())
+            handled = sir._write_chunk(fh.fileno(), chunk, sir.WRITE_CHUNK, zero_out)
+        expected = list(sir._zero_runs(chunk))
+        self.assertTrue(expected)
+        self.assertEqual(calls, [(sir.WRITE_CHUNK + a, b - a) for a, b in expected])
+        self.assertEqual(handled, sum(b - a for a, b in expected))
+        self.assertEqual(target.read_bytes()[sir.WRITE_CHUNK : 2 * sir.WRITE_CHUNK], chunk)
+
+    def test_blkzeroout_rejection_falls_back_to_writing(self) -> None:
+        chunk = bytes(sir.SPARSE_BLOCK) + b"data" + bytes(3 * sir.SPARSE_BLOCK)
+        for code, still_supported in ((errno.EINVAL, True), (errno.EOPNOTSUPP, False)):
+            target = self.root / f"fallback-{code}.img"
+            target.write_bytes(b"\xff" * len(chunk))
+            with open(target, "r+b") as fh, patch.object(sir.fcntl, "ioctl", side_effect=OSError(code, "nope")) as ioctl:
+                zero_out = sir._BlockZeroOut(fh.fileno())
+                self.assertEqual(sir._write_chunk(fh.fileno(), chunk, 0, zero_out), 0)
+                sir._write_chunk(fh.fileno(), chunk, 0, zero_out)
+            self.assertEqual(target.read_bytes(), chunk)
+            self.assertEqual(zero_out.supported, still_supported)
+            self.assertEqual(ioctl.call_count, 4 if still_supported else 1)
+
+if __name__ == "__main__":
+    unittest.main()
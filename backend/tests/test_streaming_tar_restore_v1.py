@@ -0,0 +1,130 @@
+"""Streaming-Restore für Datei-Backups: ein Durchlauf, Prüfung im Stream, Links zuletzt, Fortschritt."""
+
+from __future__ import annotations
+
+import io
+import os
+import tarfile
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.backup_recovery_i18n import K_OPERATION_OK, K_RESTORE_FILES_FAILED
+from modules import streaming_tar_restore as str_mod
+from modules.restore_engine import restore_files
+
+
+def _add_bytes(tf: tarfile.TarFile, name: str, data: bytes, mode: int = 0o644) -> None:
+    info = tarfile.TarInfo(name=name)
+    info.size = len(data)
+    info.mode = mode
+    tf.addfile(info, io.BytesIO(data))
+
+
+def _add_special(tf: tarfile.TarFile, name: str, kind: bytes, linkname: str = "") -> None:
+    info = tarfile.TarInfo(name=name)
+    info.type = kind
+    info.linkname = linkname
+    info.mode = 0o755 if kind == tarfile.DIRTYPE else 0o777
+    tf.addfile(info)
+
+
+class StreamingRestoreFilesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.base = Path(self._td.name)
+        self.arch = self.base / "b.tar.gz"
+        self.out = self.base / "out"
+        p = patch("modules.restore_engine.validate_write_target", lambda *_a, **_k: None)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _restore(self, **kw: object) -> tuple[bool, str, str | None]:
+        return restore_files(self.arch, self.out, allowed_target_prefixes=(self.base,), dry_run=False, **kw)
+
+    def test_single_pass_with_links_and_progress(self) -> None:
+        big = os.urandom(300_000)
+        with tarfile.open(self.arch, "w:gz") as tf:
+            _add_special(tf, "./etc", tarfile.DIRTYPE)
+            # Symlink vor der Datei, über deren Pfad er zeigt: darf nicht umlenken.
+            _add_special(tf, "./etc/alias", tarfile.SYMTYPE, "conf.txt")
+            _add_bytes(tf, "./etc/conf.txt", b"key=value\n", mode=0o600)
+            _add_bytes(tf, "./var/big.bin", big)
+            _add_special(tf, "./var/big-link.bin", tarfile.LNKTYPE, "./var/big.bin")
+            _add_bytes(tf, "MANIFEST.json", b"{}")
+        events: list[str_mod.RestoreProgress] = []
+        with patch.object(tarfile.TarFile, "getmembers", side_effect=AssertionError("second pass")), patch.object(
+            str_mod, "SMALL_FILE_MAX", 64 * 1024
+        ), patch.object(str_mod, "READ_CHUNK", 16 * 1024):
+            ok, key, err = self._restore(progress=events.append, writers=3)
+        self.assertTrue(ok, err)
+        self.assertEqual(key, K_OPERATION_OK)
+        self.assertEqual((self.out / "etc/conf.txt").read_bytes(), b"key=value\n")
+        self.assertEqual(os.readlink(self.out / "etc/alias"), "conf.txt")
+        self.assertEqual((self.out / "var/big.bin").read_bytes(), big)
+        self.assertEqual(os.stat(self.out / "var/big-link.bin").st_ino, os.stat(self.out / "var/big.bin").st_ino)
+        self.assertEqual((self.out / "etc/conf.txt").stat().st_mode & 0o777, 0o600)
+        self.assertFalse((self.out / "MANIFEST.json").exists())
+        self.assertEqual(events[-1].phase, "done")
+        self.assertEqual(events[-1].files_done, 2)
+        self.assertEqual(events[-1].bytes_done, len(big) + 10)
+        self.assertEqual(events[-1].archive_size, self.arch.stat().st_size)
+        self.assertGreater(events[-1].archive_bytes_read, 0)
+
+    def test_existing_symlink_in_target_is_replaced_not_followed(self) -> None:
+        outside = self.base / "outside.txt"
+        outside.write_text("keep", encoding="utf-8")
+        self.out.mkdir()
+        (self.out / "f.txt").symlink_to(outside)
+        with tarfile.open(self.arch, "w:gz") as tf:
+            _add_bytes(tf, "f.txt", b"new")
+        ok, _key, err = self._restore()
+        self.assertTrue(ok, err)
+        self.assertEqual(outside.read_text(encoding="utf-8"), "keep")
+        self.assertFalse((self.out / "f.txt").is_symlink())
+        self.assertEqual((self.out / "f.txt").read_bytes(), b"new")
+
+    def test_unsafe_member_mid_stream_fails_with_existing_detail(self) -> None:
+        with tarfile.open(self.arch, "w:gz") as tf:
+            _add_bytes(tf, "ok.txt", b"1")
+            _add_special(tf, "dev/fifo", tarfile.FIFOTYPE)
+            _add_bytes(tf, "later.txt", b"2")
+        ok, key, err = self._restore()
+        self.assertFalse(ok)
+        self.assertEqual(key, K_RESTORE_FILES_FAILED)
+        self.assertIn("unsupported archive member", str(err))
+        self.assertFalse((self.out / "later.txt").exists())
+
+    def test_hardlink_target_is_confined_to_restore_root(self) -> None:
+        with tarfile.open(self.arch, "w:gz") as tf:
+            _add_special(tf, "pw", tarfile.LNKTYPE, "../../etc/passwd")
+        ok, _key, err = self._restore()
+        self.assertFalse(ok)
+        self.assertIn("hardlink target missing", str(err))
+        self.assertFalse((self.out / "pw").exists())
+
+    def test_duplicate_member_last_in_archive_wins(self) -> None:
+        old = b"o" * 200_000
+        with tarfile.open(self.arch, "w:gz") as tf:
+            _add_bytes(tf, "./data.bin", old)  # großer, langsamer Schreibauftrag
+            _add_bytes(tf, "./other.txt", b"x")
+            _add_bytes(tf, "./data.bin", b"new")  # angehängte neuere Version
+        real_write = str_mod._write_from_queue
+
+        def _slow_write(*args: object) -> None:
+            time.sleep(0.2)
+            real_write(*args)
+
+        with patch.object(str_mod, "SMALL_FILE_MAX", 64 * 1024), patch.object(str_mod, "_write_from_queue", _slow_write):
+            ok, _key, err = self._restore(writers=3)
+        self.assertTrue(ok, err)
+        self.assertEqual((self.out / "data.bin").read_bytes(), b"new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+"""Used-Blocks-Abbild: Bitmap-Parser (ext4/FAT), Container-Roundtrip, Restore-Gates."""
+
+from __future__ import annotations
+
+import shutil
+import struct
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from modules import used_blocks_image as ubi
+from modules.backup_engine import create_image_backup
+from modules.restore_engine import restore_used_blocks_image
+
+
+_FAT_SECTORS = 64
+_DATA_START = 1 + 2 * _FAT_SECTORS + 32
+
+
+def _make_fat16(path: Path, *, used_clusters: tuple[int, ...]) -> None:
+    """Minimales FAT16-Volume (512 B Sektoren, 4 Sektoren/Cluster, 32 MiB)."""
+    total = 65536
+    bs = bytearray(512)
+    bs[0:3] = b"\xeb\x3c\x90"
+    struct.pack_into("<HBHBHHBHHHII", bs, 11, 512, 4, 1, 2, 512, 0, 0xF8, _FAT_SECTORS, 32, 2, 0, total)
+    bs[54:62] = b"FAT16   "
+    bs[510:512] = b"\x55\xaa"
+    fat = bytearray(_FAT_SECTORS * 512)
+    struct.pack_into("<HH", fat, 0, 0xFFF8, 0xFFFF)
+    for c in used_clusters:
+        struct.pack_into("<H", fat, c * 2, 0xFFFF)
+    with path.open("wb") as f:
+        f.truncate(total * 512)
+        f.write(bs)
+        f.write(fat)
+        f.write(fat)
+        data_start = _DATA_START
+        for c in used_clusters:
+            f.seek((data_start + (c - 2) * 4) * 512)
+            f.write(bytes([c & 0xFF]) * 2048)
+        # Daten in freiem Cluster dürfen nicht gesichert werden.
+        f.seek((data_start + 100 * 4) * 512)
+        f.write(b"\xee" * 2048)
+
+
+_P1_LBA = 2048
+_FAT_TOTAL = 65536
+
+
+def _mbr_entry(ptype: int, lba: int, count: int) -> bytes:
+    entry = bytearray(16)
+    entry[4] = ptype
+    struct.pack_into("<II", entry, 8, lba, count)
+    return bytes(entry)
+
+
+def _make_disk(path: Path, tmp: Path, *, gpt: bool) -> int:
+    """Datenträger: Bootloader in der Lücke, P1 = FAT16, P2 = unbekannt (2 MiB), Müll im freien Rest."""
+    fat = tmp / "p1.img"
+    _make_fat16(fat, used_clusters=(2, 3))
+    p2_lba = _P1_LBA + _FAT_TOTAL
+    disk_sectors = p2_lba + 4096 + 4096
+    with path.open("wb") as f:
+        f.truncate(disk_sectors * 512)
+        f.seek(100 * 512)
+        f.write(b"BOOTLOADER")
+        f.seek(_P1_LBA * 512)
+        f.write(fat.read_bytes())
+        f.seek(p2_lba * 512 + 700_000)
+        f.write(b"raw partition data")
+        f.seek((p2_lba + 4096 + 100) * 512)
+        f.write(b"\xaa" * 512)  # außerhalb jeder Partition
+        mbr = bytearray(512)
+        mbr[510:512] = b"\x55\xaa"
+        if gpt:
+            mbr[446:462] = _mbr_entry(0xEE, 1, disk_sectors - 1)
+            hdr = bytearray(512)
+            hdr[:8] = b"EFI PART"
+            struct.pack_into("<QQQ", hdr, 32, disk_sectors - 1, 34, disk_sectors - 34)
+            struct.pack_into("<QII", hdr, 72, 2, 128, 128)
+            entries = bytearray(128 * 128)
+            for i, (first, count) in enumerate(((_P1_LBA, _FAT_TOTAL), (p2_lba, 4096))):
+                entries[i * 128 : i * 128 + 16] = b"\x11" * 16
+                struct.pack_into("<QQ", entries, i * 128 + 32, first, first + count - 1)
+            f.seek(512)
+            f.write(hdr)
+            f.write(entries)
+            f.seek((disk_sectors - 33) * 512)
+            f.write(entries)
+            f.write(hdr)
+        else:
+            mbr[446:462] = _mbr_entry(0x0E, _P1_LBA, _FAT_TOTAL)
+            mbr[462:478] = _mbr_entry(0x83, p2_lba, 4096)
+        f.seek(0)
+        f.write(mbr)
+    return p2_lba
+
+
+class TestUsedBlocksMapV1(unittest.TestCase):
+    def test_bitmap_runs_lsb_first(self) -> None:
+        runs = list(ubi._bitmap_runs(bytes([0b00000110, 0xFF, 0x01, 0x00]), 10, 32))
+        self.assertEqual(runs, [(11, 2), (18, 9)])
+
+    def test_fat16_only_allocated_clusters(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            img = Path(tmp) / "fat.img"
+            _make_fat16(img, used_clusters=(2, 3, 10))
+            bmap = ubi.build_block_map(img)
+            self.assertEqual(bmap.filesystem, "vfat")
+            self.assertEqual(bmap.block_size, 512)
+            self.assertEqual(bmap.extents, [(0, 169), (193, 4), (65533, 3)])
+
+    def test_unknown_filesystem_falls_back_to_nonzero_blocks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            img = Path(tmp) / "raw.img"
+            with img.open("wb") as f:
+                f.truncate(1024 * 1024)
+                f.seek(300 * 1024)
+                f.write(b"x")
+            bmap = ubi.build_block_map(img)
+            self.assertEqual(bmap.filesystem, "unknown")
+            self.assertTrue(bmap.zero_fill_gaps)
+            self.assertEqual(bmap.extents, [(4, 1)])
+
+    def test_whole_disk_maps_partitions_instead_of_scanning(self) -> None:
+        for gpt in (False, True):
+            with self.subTest(gpt=gpt), tempfile.TemporaryDirectory() as tmp:
+                base = Path(tmp)
+                disk = base / "disk.img"
+                p2_lba = _make_disk(disk, base, gpt=gpt)
+                with patch.object(ubi, "_map_nonzero", side_effect=AssertionError("full scan")):
+                    bmap = ubi.build_block_map(disk)
+                self.assertEqual(bmap.filesystem, "disk-gpt" if gpt else "disk-mbr")
+                self.assertEqual(bmap.block_size, 512)
+                self.assertFalse(bmap.zero_fill_gaps)
+                self.assertEqual([p["filesystem"] for p in bmap.partitions], ["vfat", "unknown (full)"])
+                self.assertEqual(bmap.extents[0], (0, _P1_LBA + _DATA_START + 2 * 4))
+                self.assertTrue(any(st <= p2_lba and st + n >= p2_lba + 4096 for st, n in bmap.extents))
+                self.assertLess(bmap.used_bytes, disk.stat().st_size // 8)
+
+                out = base / "disk.shimg"
+                header = ubi.write_used_blocks_image(disk, out)
+                self.assertEqual(len(header["partitions"]), 2)
+                dst = base / "restored.img"
+                ubi.restore_used_blocks_image(out, dst)
+                a, b = disk.read_bytes(), dst.read_bytes()
+                fat_end = (_P1_LBA + _DATA_START + 2 * 4) * 512
+                self.assertEqual(a[:fat_end], b[:fat_end])  # Tabelle, Bootloader, FAT-Metadaten, Cluster 2/3
+                self.assertEqual(a[p2_lba * 512 : (p2_lba + 4096) * 512], b[p2_lba * 512 : (p2_lba + 4096) * 512])
+                free_cluster = (_P1_LBA + _DATA_START + 98 * 4) * 512
+                self.assertEqual(b[free_cluster : free_cluster + 2048], bytes(2048))
+                outside = (p2_lba + 4096 + 100) * 512
+                self.assertEqual(b[outside : outside + 512], bytes(512))
+                if gpt:
+                    self.assertEqual(a[-512:], b[-512:])
+
+
+class TestUsedBlocksContainerV1(unittest.TestCase):
+    def test_fat16_roundtrip_keeps_used_and_drops_free_clusters(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            src = base / "fat.img"
+            _make_fat16(src, used_clusters=(2, 5))
+            out = base / ("fat" + ubi.IMAGE_SUFFIX)
+            header = ubi.write_used_blocks_image(src, out, manifest={"partition_layout_sfdisk_d": "label: gpt\n"})
+            self.assertLess(out.stat().st_size, src.stat().st_size // 10)
+            self.assertEqual(header["manifest"]["partition_layout_sfdisk_d"], "label: gpt\n")
+            self.assertEqual(ubi.verify_used_blocks_image(out), (True, None))
+
+            dst = base / "restored.img"
+            ubi.restore_used_blocks_image(out, dst)
+            a, b = src.read_bytes(), dst.read_bytes()
+            self.assertEqual(len(a), len(b))
+            data_start = _DATA_START * 512
+            self.assertEqual(a[:data_start], b[:data_start])
+            c5 = data_start + 3 * 2048
+            self.assertEqual(b[c5 : c5 + 2048], b"\x05" * 2048)
+            free = data_start + 98 * 2048
+            self.assertEqual(b[free : free + 2048], bytes(2048))
+
+    def test_truncated_container_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            src = base / "fat.img"
+            _make_fat16(src, used_clusters=(2,))
+            out = base / "fat.shimg"
+            ubi.write_used_blocks_image(src, out)
+            raw = out.read_bytes()
+            out.write_bytes(raw[:-20])
+            ok, err = ubi.verify_used_blocks_image(out)
+            self.assertFalse(ok)
+            self.assertIn("truncated", err or "")
+
+    @unittest.skipUnless(shutil.which("mkfs.ext4") and shutil.which("debugfs"), "e2fsprogs missing")
+    def test_ext4_roundtrip_with_real_mkfs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            tree = base / "tree"
+            tree.mkdir()
+            (tree / "hello.txt").write_text("used blocks only\n", encoding="utf-8")
+            (tree / "big.bin").write_bytes(b"\xab" * (3 * 1024 * 1024))
+            src = base / "ext4.img"
+            r = subprocess.run(
+                ["mkfs.ext4", "-q", "-F", "-d", str(tree), str(src), "64M"],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if r.returncode != 0:
+                self.skipTest(f"mkfs.ext4 -d unsupported: {r.stderr}")
+            bmap = ubi.build_block_map(src)
+            self.assertEqual(bmap.filesystem, "ext")
+            self.assertLess(bmap.used_bytes, src.stat().st_size // 2)
+
+            out = base / "ext4.shimg"
+            ubi.write_used_blocks_image(src, out)
+            dst = base / "restored.img"
+            ubi.restore_used_blocks_image(out, dst)
+            fsck = subprocess.run(["e2fsck", "-fn", str(dst)], capture_output=True, text=True, check=False)
+            self.assertEqual(fsck.returncode, 0, fsck.stdout + fsck.stderr)
+            cat = subprocess.run(
+                ["debugfs", "-R", "cat /hello.txt", str(dst)], capture_output=True, text=True, check=False
+            )
+            self.assertEqual(cat.stdout, "used blocks only\n")
+
+
+class TestUsedBlocksEngineGatesV1(unittest.TestCase):
+    def test_create_image_backup_used_blocks_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            src = base / "fat.img"
+            _make_fat16(src, used_clusters=(2,))
+            out = base / "part.shimg"
+            with patch("modules.backup_engine.validate_write_target", lambda *_a, **_k: None):
+                res = create_image_backup(
+                    src, out, allowed_output_prefixes=(base,), used_blocks_only=True
+                )
+            self.assertTrue(res.ok, res.detail)
+            header, _extents, _off = ubi.read_image_header(out)
+            self.assertEqual(header["manifest"]["source_device"], str(src))
+            self.assertEqual(header["manifest"]["partition_layout_sfdisk_d"], "")
+
+    def test_restore_blocked_by_write_target_gate(self) -> None:
+        ok, key, detail = restore_used_blocks_image("/nonexistent.shimg", "/dev/sda")
+        self.assertFalse(ok)
+        self.assertEqual(key, "backup_recovery.error.restore_image_failed")
+        self.assertTrue(detail)
+
+    def test_restore_rejects_corrupt_container_before_writing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            bad = base / "bad.shimg"
+            bad.write_bytes(b"not an image")
+            dst = base / "target.img"
+            with patch("modules.restore_engine.validate_write_target", lambda *_a, **_k: None):
+                ok, _key, detail = restore_used_blocks_image(bad, dst)
+            self.assertFalse(ok)
+            self.assertIn("not a used-blocks image", detail or "")
+            self.assertFalse(dst.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,7 @@ from core.backup_archive_options import (
 )
 from core.backup_progress import merge_progress_optional, quick_target_preflight
 from core.backup_tar_warning_classification import (
+    TarStderrClassifier,
     classification_to_job_status_fields,
     classify_tar_run,
     decide_tar_nonzero_job_outcome,
@@ -148,16 +149,6 @@ def _stderr_indicates_target_write_io_error(head_text: str, tail_text: str) -> b
     return False
 
 
-def _read_full_tar_stderr(head_text: str, tail_text: str, stderr_log_path: Path | None) -> str:
-    chunks = [head_text or "", tail_text or ""]
-    if stderr_log_path and stderr_log_path.is_file():
-        try:
-            chunks.append(stderr_log_path.read_text(encoding="utf-8", errors="replace"))
-        except OSError:
-            pass
-    return "\n".join(chunks)
-
-
 def _runner_verify_deep(archive_path: str | Path) -> tuple[bool, str | None]:
     import tempfile
 
@@ -573,6 +564,8 @@ def _run_tar_pipeline_from_preflight(
         "hlen": 0,
         "tail": deque(maxlen=STDERR_TAIL_MAX_LINES),
     }
+    # Volles stderr nur im Log; Klassifikation läuft zeilenweise mit (begrenzter Speicher).
+    stderr_classifier = TarStderrClassifier()
     stderr_log_fh: Any | None = None
     stderr_log_path: Path | None = None
     jid = str(status.get("job_id") or "").strip() or "unknown"
@@ -613,6 +606,7 @@ def _run_tar_pipeline_from_preflight(
                         stderr_log_fh.flush()
                     except OSError:
                         pass
+                stderr_classifier.feed(chunk)
                 hlen: int = drain_collect["hlen"]
                 if hlen < STDERR_HEAD_MAX_BYTES:
                     take = chunk[: STDERR_HEAD_MAX_BYTES - hlen]
@@ -624,6 +618,7 @@ def _run_tar_pipeline_from_preflight(
                     drain_collect["tail"].append(line)
             if lbuf:
                 drain_collect["tail"].append(lbuf)
+            stderr_classifier.close()
         finally:
             if stderr_log_fh:
                 try:
@@ -756,7 +751,7 @@ def _run_tar_pipeline_from_preflight(
                 throughput_state=pc["throughput_state"],
             )
             po["running_for_s"] = int(time.monotonic() - start_monotonic)
-            _update_status(status_file, status, progress_optional=po)
+            _update_status(status_file, status, progress_optional=po, tar_stderr_live=stderr_classifier.snapshot())
         else:
             _update_status(
                 status_file,
@@ -765,6 +760,7 @@ def _run_tar_pipeline_from_preflight(
                     "bytes_current": size,
                     "running_for_s": int(time.monotonic() - start_monotonic),
                 },
+                tar_stderr_live=stderr_classifier.snapshot(),
             )
         time.sleep(0.5)
 
@@ -793,8 +789,7 @@ def _run_tar_pipeline_from_preflight(
         )
         return 0
 
-    stderr_blob = _read_full_tar_stderr(head_text, tail_text, stderr_log_path)
-    tar_cls = classify_tar_run(tar_exit_code=rc, stderr_text=stderr_blob)
+    tar_cls = classify_tar_run(tar_exit_code=rc, stream=stderr_classifier)
     tar_class_fields = classification_to_job_status_fields(tar_cls)
     volatile_tar_finalize = False
 
@@ -855,7 +850,7 @@ def _run_tar_pipeline_from_preflight(
         else:
             _outcome = decide_tar_nonzero_job_outcome(
                 tar_exit_code=rc,
-                stderr_text=stderr_blob,
+                stream=stderr_classifier,
                 partial_exists=_partial_exists,
                 partial_bytes=_partial_bytes,
                 final_archive_exists=False,
@@ -947,7 +942,7 @@ def _run_tar_pipeline_from_preflight(
             if volatile_tar_finalize:
                 _outcome = decide_tar_nonzero_job_outcome(
                     tar_exit_code=rc,
-                    stderr_text=stderr_blob,
+                    stream=stderr_classifier,
                     partial_exists=True,
                     partial_bytes=current_size,
                     final_archive_exists=False,
@@ -1017,7 +1012,7 @@ def _run_tar_pipeline_from_preflight(
                 vd_ok, vd_key = _runner_verify_deep(archive_path)
                 _outcome = decide_tar_nonzero_job_outcome(
                     tar_exit_code=rc,
-                    stderr_text=stderr_blob,
+                    stream=stderr_classifier,
                     partial_exists=True,
                     partial_bytes=current_size,
                     final_archive_exists=True,
@@ -1133,7 +1128,7 @@ def _run_tar_pipeline_from_preflight(
         if volatile_tar_finalize:
             _outcome = decide_tar_nonzero_job_outcome(
                 tar_exit_code=rc,
-                stderr_text=stderr_blob,
+                stream=stderr_classifier,
                 partial_exists=True,
                 partial_bytes=current_size,
                 final_archive_exists=False,
@@ -1173,7 +1168,7 @@ def _run_tar_pipeline_from_preflight(
 
     _outcome = decide_tar_nonzero_job_outcome(
         tar_exit_code=rc,
-        stderr_text=stderr_blob,
+        stream=stderr_classifier,
         partial_exists=False,
         partial_bytes=0,
         final_archive_exists=False,
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""CLI: Spool-Drain des Dev-Agents messen – Einzel-Uploads gegen gzip-Batches über Keep-Alive."""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from devserver.config import DevServerConfig  # noqa: E402
+from devserver.ingest import ingest_report, ingest_reports_bulk  # noqa: E402
+from devserver.storage import DevServerStorage  # noqa: E402
+from devserver_agent.client import (  # noqa: E402
+    BATCH_INGEST_PATH,
+    INGEST_PATH,
+    DevServerConnection,
+    post_report,
+    post_reports_batch,
+)
+from devserver_agent.spool import DEFAULT_RETRY_BATCH_SIZE, AgentSpool  # noqa: E402
+
+DEFAULT_ENTRIES = 10000
+
+
+def _make_handler(
+    config: DevServerConfig, storage: DevServerStorage | None, counters: dict[str, int]
+) -> type[BaseHTTPRequestHandler]:
+    """Lokaler Ingest-Endpunkt; mit ``storage`` läuft die echte Ingest-Logik, sonst nur das Protokoll.
+
+    ``counters`` zählt TCP-Verbindungen und Requests (deterministisch, anders als die Laufzeit).
+    """
+    lock = threading.Lock()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Header und Body in einem Segment senden (Keep-Alive: sonst Nagle/Delayed-ACK-Pausen)
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def log_message(self, *_args: Any) -> None:
+            pass
+
+        def setup(self) -> None:
+            super().setup()
+            with lock:
+                counters["connections"] += 1
+
+        def do_POST(self) -> None:  # noqa: N802
+            with lock:
+                counters["requests"] += 1
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            body = json.loads(raw or b"{}")
+            if self.path == INGEST_PATH:
+                if storage is None:
+                    out: dict[str, Any] = {"code": "DEV_SERVER_REPORT_ACCEPTED"}
+                else:
+                    with lock:
+                        out = ingest_report(config=config, storage=storage, node_data=body["node"], report_data=body["report"])
+            elif self.path == BATCH_INGEST_PATH:
+                items = [(i["node"], i["report"]) for i in body.get("items") or []]
+                if storage is None:
+                    acks = [{"index": n, "ok": True, "code": "DEV_SERVER_REPORT_ACCEPTED"} for n in range(len(items))]
+                    out = {"code": "DEV_SERVER_BATCH_ACCEPTED", "items": acks}
+                else:
+                    with lock:
+                        out = ingest_reports_bulk(config=config, storage=storage, items=items)
+            else:
+                self.send_error(404)
+                return
+            data = json.dumps(out).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return _Handler
+
+
+def _fill_spool(spool: AgentSpool, entries: int) -> None:
+    node = {"node_id": "bench-node", "hostname": "bench", "lab_mode": "local_lab"}
+    for i in range(entries):
+        report = {
+            "report_id": f"bench-report-{i:06d}",
+            "node_id": "bench-node",
+            "report_type": "diagnostics",
+            "lab_mode": "local_lab",
+            "summary": {"diagnosis_codes": ["NET-001", "DISK-003"], "severity": "info"},
+            "findings": [{"code": "NET-001", "detail": "link up", "value": i}],
+        }
+        spool.save_spooled_report(node, report, reason="server_unreachable")
+
+
+def _drain(server_url: str, spool_dir: Path, entries: int, *, batched: bool, batch_size: int) -> dict[str, Any]:
+    spool = AgentSpool(spool_dir)
+    _fill_spool(spool, entries)
+    t0 = time.perf_counter()
+    if batched:
+        with DevServerConnection(server_url, timeout=30.0) as conn:
+            out = spool.retry_spooled_reports_batched(
+                upload_batch_fn=lambda items: post_reports_batch(server_url, items, connection=conn),
+                batch_size=batch_size,
+            )
+    else:
+        out = spool.retry_spooled_reports(upload_fn=lambda node, report: post_report(server_url, node, report, timeout=30.0))
+    seconds = time.perf_counter() - t0
+    acked = sum(1 for r in out["results"] if r.get("ok"))
+    left = sum(1 for _ in spool_dir.glob("*.json"))
+    return {
+        "mode": "batched" if batched else "sequential",
+        "entries": entries,
+        "acked": acked,
+        "left_in_spool": left,
+        "seconds": round(seconds, 3),
+        "entries_per_second": round(entries / seconds, 1) if seconds else 0.0,
+    }
+
+
+def measure(
+    entries: int = DEFAULT_ENTRIES,
+    *,
+    batch_size: int = DEFAULT_RETRY_BATCH_SIZE,
+    with_storage: bool = False,
+) -> dict[str, Any]:
+    """Denselben Spool einmal je Eintrag (urllib, neue Verbindung) und einmal gebündelt leeren.
+
+    ``ratio`` = Laufzeit sequenziell / Laufzeit gebündelt (nur Richtwert, maschinenabhängig; als
+    Gate über ``--min-ratio``). ``requests``/``connections`` je Lauf sind deterministisch. Ohne ``with_storage`` misst der lokale
+    Endpunkt nur Protokoll- und Spool-Kosten; mit ``with_storage`` zusätzlich den Server-Ingest.
+    """
+    rows: list[dict[str, Any]] = []
+    ok = True
+    for batched in (False, True):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            storage = DevServerStorage(root / "devserver") if with_storage else None
+            config = DevServerConfig(
+                enabled=True,
+                mode="local_lab",
+                storage_root=root / "devserver",
+                allow_remote_ssh=False,
+                bind_hint="127.0.0.1",
+                accept_public_uploads=False,
+                require_token=False,
+                token_env="",
+                repo_root=_backend.parent,
+                auth_token_value=None,
+            )
+            counters = {"connections": 0, "requests": 0}
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(config, storage, counters))
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                url = f"http://127.0.0.1:{server.server_address[1]}"
+                row = _drain(url, root / "spool", entries, batched=batched, batch_size=batch_size)
+            finally:
+                server.shutdown()
+                server.server_close()
+            row.update(counters)
+            ok = ok and row["acked"] == entries and row["left_in_spool"] == 0
+            rows.append(row)
+    ratio = rows[0]["seconds"] / rows[1]["seconds"] if rows[1]["seconds"] else 0.0
+    return {"ok": ok, "batch_size": batch_size, "with_storage": with_storage, "results": rows, "ratio": round(ratio, 2)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dev-agent spool drain: per-report vs batched upload.")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_RETRY_BATCH_SIZE)
+    parser.add_argument("--with-storage", action="store_true", help="Run the real ingest + storage on the server side")
+    parser.add_argument("--min-ratio", type=float, default=0.0, help="Fail if sequential/batched is below this")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = measure(args.entries, batch_size=args.batch_size, with_storage=args.with_storage)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"spool-drain: entries={args.entries} batch_size={report['batch_size']} ratio={report['ratio']}")
+        for row in report["results"]:
+            print(
+                f"  {row['mode']}: {row['seconds']}s ({row['entries_per_second']}/s)"
+                f" acked={row['acked']} left={row['left_in_spool']}"
+                f" requests={row['requests']} connections={row['connections']}"
+            )
+    if not report["ok"] or (args.min_ratio and report["ratio"] < args.min_ratio):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
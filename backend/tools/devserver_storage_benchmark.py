@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""CLI: Save-Latenz des DevServerStorage bei wachsendem Bestand (10 … 10.000 Entities) messen."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from devserver.models import default_dev_node, default_dev_report, new_id  # noqa: E402
+from devserver.storage import DevServerStorage  # noqa: E402
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+def _prefill(storage: DevServerStorage, count: int) -> None:
+    """Bestand direkt als Dateien anlegen; der Index entsteht beim ersten Zugriff per Rebuild."""
+    storage.ensure_layout()
+    nodes = max(1, count // 10)
+    for i in range(nodes):
+        node = default_dev_node(node_id=f"bench-node-{i:05d}")
+        (storage.nodes_dir / f"{node['node_id']}.json").write_text(json.dumps(node), encoding="utf-8")
+    for i in range(count - nodes):
+        report = default_dev_report(report_id=new_id("report"), node_id=f"bench-node-{i % nodes:05d}")
+        (storage.reports_dir / f"{report['report_id']}.json").write_text(json.dumps(report), encoding="utf-8")
+    storage.rebuild_index()
+
+
+def _timed(fn: Any, samples: int) -> list[float]:
+    out: list[float] = []
+    for _ in range(max(1, samples)):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {"median_ms": round(statistics.median(ordered), 3), "p95_ms": round(p95, 3)}
+
+
+def measure(sizes: tuple[int, ...] = DEFAULT_SIZES, *, samples: int = 50) -> dict[str, Any]:
+    """Median/p95 je Save; ``ratio`` = Median(größter Bestand) / Median(kleinster Bestand) für Reports.
+
+    Node-Saves schreiben die Node-Summary höchstens alle paar Sekunden – deren p95 zeigt daher
+    vereinzelt den vollen Summary-Lauf, der Median den einzelnen Save.
+    """
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as td:
+            storage = DevServerStorage(Path(td))
+            _prefill(storage, size)
+            report_ms = _timed(
+                lambda: storage.save_report(default_dev_report(report_id=new_id("report"), node_id="bench-node-00000")),
+                samples,
+            )
+            node_ms = _timed(lambda: storage.save_node(default_dev_node(node_id="bench-node-00000")), samples)
+            rows.append(
+                {
+                    "entities": size,
+                    "save_report": _stats(report_ms),
+                    "save_node": _stats(node_ms),
+                }
+            )
+    first = rows[0]["save_report"]["median_ms"] if rows else 0.0
+    ratio = rows[-1]["save_report"]["median_ms"] / first if first else 0.0
+    return {"ok": True, "samples": max(1, samples), "results": rows, "ratio": round(ratio, 3)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DevServerStorage save latency against entity count.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Entity counts")
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--max-ratio", type=float, default=0.0, help="Fail if largest/smallest median exceeds this")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    sizes = tuple(int(s) for s in args.sizes.split(",") if s.strip())
+    report = measure(sizes, samples=args.samples)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"devserver-storage: samples={report['samples']} ratio={report['ratio']}")
+        for row in report["results"]:
+            r, n = row["save_report"], row["save_node"]
+            print(
+                f"  n={row['entities']}: save_report median={r['median_ms']}ms p95={r['p95_ms']}ms"
+                f" | save_node median={n['median_ms']}ms p95={n['p95_ms']}ms"
+            )
+    if args.max_ratio and report["ratio"] > args.max_ratio:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""CLI: Kosten je Ereignis der kompilierten Diagnose-Regeln bei wachsendem Katalog messen."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from core.diagnostics.matcher import DIAGNOSTIC_RULES  # noqa: E402
+from core.diagnostics.rule_engine import Rule, all_of, asks, compile_rules, eq, has, rule  # noqa: E402
+
+DEFAULT_SCALES = (1, 10, 100)
+
+
+def synthetic_rules(count: int, *, seed: int = 1) -> list[Rule]:
+    """Zusätzliche Regeln im Stil des Katalogs (eigene Signale, Log-Texte, Frage-Muster)."""
+    rnd = random.Random(seed)
+    out: list[Rule] = []
+    for i in range(count):
+        diag_id = f"SYNTH-{i:05d}"
+        kind = rnd.randrange(3)
+        if kind == 0:
+            out.append(rule(diag_id, eq(f"synth_flag_{i % 500}", value=f"state-{i}")))
+        elif kind == 1:
+            out.append(rule(diag_id, eq("code", value=f"synth.code_{i}"), has("stderr", any_of=(f"synth failure {i}",))))
+        else:
+            out.append(rule(diag_id, all_of(asks(f"synthwort{i}"), asks("fehler", "error"))))
+    return out
+
+
+def sample_events(count: int, *, seed: int = 2) -> list[tuple[dict[str, str], str]]:
+    """Realistische, bereits normalisierte Ereignisse (Backup-/Rescue-Logs mit einigen Signalen)."""
+    rnd = random.Random(seed)
+    stderr_pool = (
+        "tar: write error: no space left on device",
+        "sudo: a terminal is required to read the password",
+        "e: unable to locate package foo; rsvg-convert fehlt",
+        "chroot: failed to run command '/usr/bin/env': no such file or directory",
+        "rsync: send_files failed to open: permission denied (13)",
+        "everything ok " * 20,
+    )
+    out: list[tuple[dict[str, str], str]] = []
+    for _ in range(count):
+        signals = {
+            "code": rnd.choice(("backup.restore_failed", "backup.verify_integrity_failed", "ok", "blocked_build_tools_missing")),
+            "stderr": rnd.choice(stderr_pool),
+            "summary": rnd.choice(("", "job failed", "isohybrid: not found")),
+            "storage_full": rnd.choice(("true", "false")),
+            "dns_ok": rnd.choice(("true", "false")),
+            "unreadable_sources": rnd.choice(("[]", "['/etc/shadow']")),
+        }
+        question = rnd.choice(("", "backup bricht ab, platte voll?", "rescue stick sudo fehler"))
+        out.append((signals, question))
+    return out
+
+
+def measure(scales: tuple[int, ...] = DEFAULT_SCALES, *, events: int = 2000, runs: int = 3) -> dict[str, Any]:
+    """µs je Ereignis (bester Lauf) für Katalog × Faktor; ``ratio`` = größte / kleinste Skala."""
+    base = list(DIAGNOSTIC_RULES)
+    batch = sample_events(events)
+    rows: list[dict[str, Any]] = []
+    for scale in scales:
+        rules = base + synthetic_rules(len(base) * (scale - 1))
+        t0 = time.perf_counter()
+        compiled = compile_rules(rules)
+        compile_ms = (time.perf_counter() - t0) * 1000
+        best = float("inf")
+        for _ in range(max(1, runs)):
+            t0 = time.perf_counter()
+            for signals, question in batch:
+                compiled.match(signals, question)
+            best = min(best, time.perf_counter() - t0)
+        rows.append(
+            {
+                "scale": scale,
+                "rules": len(rules),
+                "atoms": compiled.atom_count,
+                "compile_ms": round(compile_ms, 3),
+                "us_per_event": round(best / len(batch) * 1e6, 3),
+            }
+        )
+    ratio = rows[-1]["us_per_event"] / rows[0]["us_per_event"] if rows and rows[0]["us_per_event"] else 0.0
+    return {"ok": True, "events": len(batch), "runs": max(1, runs), "results": rows, "ratio": round(ratio, 3)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compiled diagnostics rules against catalog size.")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES), help="Catalog multipliers")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-ratio", type=float, default=0.0, help="Fail if largest/smallest cost exceeds this")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    scales = tuple(int(s) for s in args.scales.split(",") if s.strip())
+    report = measure(scales, events=args.events, runs=args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"diagnostics-rules: events={report['events']} ratio={report['ratio']}")
+        for row in report["results"]:
+            print(f"  x{row['scale']}: rules={row['rules']} us/event={row['us_per_event']} compile_ms={row['compile_ms']}")
+    if args.max_ratio and report["ratio"] > args.max_ratio:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
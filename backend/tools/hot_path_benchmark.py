@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""CLI: Benchmark-Suite für Backend-Hot-Paths mit JSON-Ergebnis und Regressions-Gate gegen eine Baseline.
+
+Jeder Fall läuft auf synthetischen, lokal erzeugten Fixtures (Dateibaum, Archive, Remote-DB,
+Fake-WebSockets, leeres Repo für das Dashboard); nichts berührt System, Netz oder echte Datenträger.
+Mount-/Schreibziel-Prüfungen von Backup und Restore werden dafür wie in den Engine-Tests
+ausgeschaltet – die Fixtures liegen unter ``/tmp`` auf der Systemplatte.
+
+Typischer Ablauf::
+
+    python tools/hot_path_benchmark.py --output bench.json             # messen
+    python tools/hot_path_benchmark.py --save-baseline baseline.json   # Baseline ablegen
+    python tools/hot_path_benchmark.py --baseline baseline.json --threshold 0.25
+
+Mit ``--baseline`` endet der Lauf mit Exit-Code 1, wenn ein Fall im Median um mehr als
+``threshold`` (relativ) langsamer ist; ``--case-threshold name=0.5`` überschreibt die Schranke je Fall.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from unittest.mock import patch
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+RESULT_SCHEMA = "setuphelfer.hot_path_benchmark.v1"
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.25
+# Regressionen unter dieser absoluten Differenz gelten als Messrauschen
+DEFAULT_MIN_DELTA_MS = 0.5
+
+
+@dataclass(frozen=True)
+class Scale:
+    files: int
+    sessions: int
+    connections: int
+    events: int
+
+
+FULL = Scale(files=400, sessions=50000, connections=200, events=500)
+QUICK = Scale(files=30, sessions=1000, connections=20, events=50)
+
+
+@dataclass
+class Workload:
+    """Gemessene Operation; ``prepare`` läuft vor jeder Wiederholung außerhalb der Zeitmessung."""
+
+    run: Callable[[], Any]
+    prepare: Callable[[], None] | None = None
+    params: dict[str, Any] | None = None
+
+
+CaseFactory = Callable[[Path, Scale], "contextlib.AbstractContextManager[Workload]"]
+
+
+# --- Fixtures -------------------------------------------------------------------------------
+
+
+def make_file_tree(root: Path, files: int) -> Path:
+    """Dateibaum mit gemischten Größen (1 KiB … 256 KiB), Unterordnern und einem Symlink je Ordner."""
+    src = root / "src"
+    sizes = (1024, 4096, 16384, 65536, 262144)
+    for i in range(files):
+        d = src / f"dir{i % 10:02d}" / f"sub{i % 3}"
+        d.mkdir(parents=True, exist_ok=True)
+        size = sizes[i % len(sizes)]
+        chunk = (f"file-{i:05d}-".encode("ascii") * (size // 11 + 1))[:size]
+        (d / f"f{i:05d}.dat").write_bytes(chunk)
+    for d in sorted(src.glob("dir*")):
+        (d / "latest").symlink_to("sub0")
+    return src
+
+
+@contextlib.contextmanager
+def _local_fixture_gates() -> Iterator[None]:
+    """Mount-/Schreibziel-Prüfungen aus (Fixtures liegen unter /tmp auf der Systemplatte)."""
+    with patch("modules.backup_engine.validate_backup_target"), patch(
+        "modules.restore_engine.validate_write_target", lambda *_a, **_k: None
+    ):
+        yield
+
+
+def _file_backup(src: Path, archive: Path) -> Path:
+    from modules.backup_engine import create_file_backup
+
+    res = create_file_backup(
+        [src],
+        archive_path=archive,
+        allowed_source_prefixes=(src.parent,),
+        allowed_output_prefixes=(archive.parent,),
+    )
+    if not res.ok:
+        raise RuntimeError(f"fixture backup failed: {res.message_key} {res.detail}")
+    return archive
+
+
+def _check(result: tuple[Any, ...]) -> None:
+    if not result[0]:
+        raise RuntimeError(f"benchmark operation failed: {result[1:]}")
+
+
+# --- Fälle ----------------------------------------------------------------------------------
+
+
+@contextlib.contextmanager
+def case_backup_create(root: Path, scale: Scale) -> Iterator[Workload]:
+    from modules.backup_engine import create_file_backup
+
+    src = make_file_tree(root, scale.files)
+    archive = root / "out" / "backup.tar.gz"
+    archive.parent.mkdir()
+
+    def _run() -> None:
+        res = create_file_backup(
+            [src],
+            archive_path=archive,
+            allowed_source_prefixes=(root,),
+            allowed_output_prefixes=(archive.parent,),
+        )
+        if not res.ok:
+            raise RuntimeError(f"backup failed: {res.message_key} {res.detail}")
+
+    with _local_fixture_gates():
+        yield Workload(run=_run, prepare=lambda: archive.unlink(missing_ok=True), params={"files": scale.files})
+
+
+@contextlib.contextmanager
+def case_backup_finalize(root: Path, scale: Scale) -> Iterator[Workload]:
+    """Manifest in ein klassisches ``tar -czf``-Archiv einbetten (Abschluss eines Voll-Backups)."""
+    import tarfile
+
+    from modules.backup_engine import embed_manifest_in_tar_gz
+
+    src = make_file_tree(root, scale.files)
+    plain = root / "plain.tar.gz"
+    with tarfile.open(plain, "w:gz") as tf:
+        tf.add(src, arcname="src")
+    work = root / "out" / "backup.tar.gz"
+    work.parent.mkdir()
+
+    def _run() -> None:
+        _check(embed_manifest_in_tar_gz(work))
+
+    yield Workload(run=_run, prepare=lambda: shutil.copyfile(plain, work), params={"files": scale.files})
+
+
+@contextlib.contextmanager
+def case_backup_verify_basic(root: Path, scale: Scale) -> Iterator[Workload]:
+    from modules.backup_verify import verify_basic
+
+    with _local_fixture_gates():
+        archive = _file_backup(make_file_tree(root, scale.files), root / "backup.tar.gz")
+    yield Workload(run=lambda: _check(verify_basic(archive)), params={"files": scale.files})
+
+
+@contextlib.contextmanager
+def case_backup_verify_deep(root: Path, scale: Scale) -> Iterator[Workload]:
+    from modules.backup_verify import verify_deep
+
+    with _local_fixture_gates():
+        archive = _file_backup(make_file_tree(root, scale.files), root / "backup.tar.gz")
+    extract_root = root / "verify"
+
+    def _run() -> None:
+        _check(verify_deep(archive, extract_root=extract_root, try_loop_mount_image=False))
+
+    yield Workload(
+        run=_run,
+        prepare=lambda: shutil.rmtree(extract_root, ignore_errors=True),
+        params={"files": scale.files},
+    )
+
+
+@contextlib.contextmanager
+def case_restore_files(root: Path, scale: Scale) -> Iterator[Workload]:
+    from modules.restore_engine import restore_files
+
+    with _local_fixture_gates():
+        archive = _file_backup(make_file_tree(root, scale.files), root / "backup.tar.gz")
+        target = root / "restore"
+
+        def _run() -> None:
+            _check(restore_files(archive, target, allowed_target_prefixes=(root,)))
+
+        yield Workload(
+            run=_run,
+            prepare=lambda: shutil.rmtree(target, ignore_errors=True),
+            params={"files": scale.files},
+        )
+
+
+class _NullWebSocket:
+    def __init__(self) -> None:
+        self.sent = 0
+
+    async def send_text(self, _body: str) -> None:
+        self.sent += 1
+
+
+@contextlib.contextmanager
+def case_eventbus_fanout(_root: Path, scale: Scale) -> Iterator[Workload]:
+    """``events`` Publishes an ``connections`` Verbindungen, davon die Hälfte auf dem Topic."""
+    from core.eventbus import ConnectionManager
+
+    manager = ConnectionManager()
+    for i in range(scale.connections):
+        topics = {"job.progress", "log.line"} if i % 2 == 0 else {"log.line"}
+        manager.add(_NullWebSocket(), f"session-{i}", topics)
+    loop = asyncio.new_event_loop()
+
+    async def _burst() -> None:
+        for n in range(scale.events):
+            await manager.publish("job.progress", {"n": n, "percent": n % 100})
+
+    try:
+        yield Workload(
+            run=lambda: loop.run_until_complete(_burst()),
+            params={"connections": scale.connections, "events": scale.events},
+        )
+    finally:
+        loop.close()
+
+
+@contextlib.contextmanager
+def _remote_db(root: Path, sessions: int) -> Iterator[list[str]]:
+    import storage.db as storage_db
+    from core.auth import invalidate_session_cache
+
+    previous = storage_db._remote_db_path
+    storage_db._remote_db_path = root / "remote.db"
+    try:
+        storage_db.init_remote_db(None)
+        now = datetime.now(timezone.utc)
+        created, expires = now.isoformat(), (now + timedelta(hours=1)).isoformat()
+        conn = storage_db.get_connection()
+        try:
+            conn.executemany(
+                "INSERT INTO sessions (id, session_token_hash, device_id, created_at, expires_at, refreshed_at)"
+                " VALUES (?,?,?,?,?,NULL)",
+                ((f"s-{i}", storage_db.hash_token(f"tok-{i}"), "bench", created, expires) for i in range(sessions)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        step = max(1, sessions // 200)
+        yield [f"tok-{i}" for i in range(0, sessions, step)]
+    finally:
+        invalidate_session_cache()
+        storage_db.close_connection_pools()
+        storage_db._remote_db_path = previous
+
+
+def _validate_all(tokens: list[str], *, clear_cache: bool) -> None:
+    from core.auth import invalidate_session_cache, validate_session_token
+
+    for token in tokens:
+        if clear_cache:
+            invalidate_session_cache()
+        if validate_session_token(token) is None:
+            raise RuntimeError(f"session not found: {token}")
+
+
+@contextlib.contextmanager
+def case_session_validate(root: Path, scale: Scale) -> Iterator[Workload]:
+    """DB-Lookup je Token (Cache vor jedem Aufruf geleert)."""
+    with _remote_db(root, scale.sessions) as tokens:
+        yield Workload(
+            run=lambda: _validate_all(tokens, clear_cache=True),
+            params={"sessions": scale.sessions, "lookups": len(tokens)},
+        )
+
+
+@contextlib.contextmanager
+def case_session_validate_cached(root: Path, scale: Scale) -> Iterator[Workload]:
+    with _remote_db(root, scale.sessions) as tokens:
+        _validate_all(tokens, clear_cache=False)
+        yield Workload(
+            run=lambda: _validate_all(tokens, clear_cache=False),
+            params={"sessions": scale.sessions, "lookups": len(tokens)},
+        )
+
+
+@contextlib.contextmanager
+def case_diagnostics_match(_root: Path, scale: Scale) -> Iterator[Workload]:
+    from core.diagnostics.matcher import match_diagnoses
+    from core.diagnostics.models import DiagnosticsAnalyzeRequest
+    from tools.diagnostics_rules_benchmark import sample_events
+
+    requests = [
+        DiagnosticsAnalyzeRequest(question=question, signals=dict(signals))
+        for signals, question in sample_events(scale.events * 4)
+    ]
+
+    def _run() -> None:
+        for req in requests:
+            match_diagnoses(req)
+
+    yield Workload(run=_run, params={"requests": len(requests)})
+
+
+@contextlib.contextmanager
+def case_dashboard_snapshot(root: Path, _scale: Scale) -> Iterator[Workload]:
+    """Dashboard-Status für ein leeres Repo; Snapshot-Cache vor jedem Lauf geleert (kalter Aufbau)."""
+    from core import dev_dashboard
+    from core.dev_dashboard_snapshot import reset_snapshot_cache
+
+    repo = root / "repo"
+    repo.mkdir()
+
+    def _run() -> None:
+        dev_dashboard.build_dashboard_status(repo_root=repo, running_jobs=[], package_activity=[])
+
+    yield Workload(run=_run, prepare=reset_snapshot_cache, params={"repo": "empty"})
+
+
+CASES: dict[str, CaseFactory] = {
+    "backup_create": case_backup_create,
+    "backup_finalize": case_backup_finalize,
+    "backup_verify_basic": case_backup_verify_basic,
+    "backup_verify_deep": case_backup_verify_deep,
+    "restore_files": case_restore_files,
+    "eventbus_fanout": case_eventbus_fanout,
+    "session_validate": case_session_validate,
+    "session_validate_cached": case_session_validate_cached,
+    "diagnostics_match": case_diagnostics_match,
+    "dashboard_snapshot": case_dashboard_snapshot,
+}
+
+
+# --- Messung und Vergleich ------------------------------------------------------------------
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "median_ms": round(statistics.median(ordered), 3),
+        "min_ms": round(ordered[0], 3),
+        "p95_ms": round(p95, 3),
+    }
+
+
+def run_case(name: str, *, scale: Scale = FULL, repeats: int = DEFAULT_REPEATS, warmup: int = 1) -> dict[str, Any]:
+    factory = CASES[name]
+    samples: list[float] = []
+    with tempfile.TemporaryDirectory(prefix=f"setuphelfer_bench_{name}_") as td:
+        with factory(Path(td), scale) as work:
+            for i in range(max(0, warmup) + max(1, repeats)):
+                if work.prepare is not None:
+                    work.prepare()
+                t0 = time.perf_counter()
+                work.run()
+                elapsed = (time.perf_counter() - t0) * 1000
+                if i >= warmup:
+                    samples.append(elapsed)
+            params = dict(work.params or {})
+    return {"repeats": len(samples), "params": params, **_stats(samples)}
+
+
+def run_suite(
+    names: list[str] | None = None,
+    *,
+    quick: bool = False,
+    repeats: int = DEFAULT_REPEATS,
+) -> dict[str, Any]:
+    """Fälle messen; Ergebnis ist JSON-serialisierbar und direkt als Baseline verwendbar."""
+    selected = list(names or CASES)
+    unknown = [n for n in selected if n not in CASES]
+    if unknown:
+        raise ValueError(f"unknown benchmark case(s): {', '.join(unknown)}")
+    scale = QUICK if quick else FULL
+    results = {name: run_case(name, scale=scale, repeats=repeats) for name in selected}
+    return {
+        "schema": RESULT_SCHEMA,
+        "created_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "quick": quick,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    case_thresholds: dict[str, float] | None = None,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> dict[str, Any]:
+    """Mediane gegen die Baseline; Regression = langsamer um > ``threshold`` und > ``min_delta_ms``."""
+    rows: list[dict[str, Any]] = []
+    regressions: list[str] = []
+    base_results = baseline.get("results") or {}
+    for name, cur in (current.get("results") or {}).items():
+        base = base_results.get(name)
+        if not base:
+            rows.append({"case": name, "status": "new", "median_ms": cur["median_ms"]})
+            continue
+        limit = (case_thresholds or {}).get(name, threshold)
+        base_ms = float(base["median_ms"])
+        cur_ms = float(cur["median_ms"])
+        change = (cur_ms - base_ms) / base_ms if base_ms else 0.0
+        regressed = change > limit and (cur_ms - base_ms) > min_delta_ms
+        if regressed:
+            regressions.append(name)
+        rows.append(
+            {
+                "case": name,
+                "status": "regressed" if regressed else "ok",
+                "baseline_ms": base_ms,
+                "median_ms": cur_ms,
+                "change": round(change, 3),
+                "threshold": limit,
+            }
+        )
+    warnings: list[str] = []
+    if bool(baseline.get("quick")) != bool(current.get("quick")):
+        warnings.append("baseline_scale_differs")
+    return {"ok": not regressions, "regressions": regressions, "rows": rows, "warnings": warnings}
+
+
+def _parse_case_thresholds(values: list[str]) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for raw in values:
+        name, _, value = raw.partition("=")
+        if not value:
+            raise ValueError(f"--case-threshold expects name=value, got {raw!r}")
+        out[name.strip()] = float(value)
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path benchmark suite with baseline regression gate.")
+    parser.add_argument("--cases", default="", help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--quick", action="store_true", help="Small fixtures (smoke run)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--save-baseline", help="Write results JSON as baseline to this path")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative slowdown")
+    parser.add_argument("--case-threshold", action="append", default=[], help="Per-case override: name=value")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.cases.split(",") if n.strip()] or None
+    report = run_suite(names, quick=args.quick, repeats=args.repeats)
+    for target in (args.output, args.save_baseline):
+        if target:
+            Path(target).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    comparison = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        comparison = compare(
+            report,
+            baseline,
+            threshold=args.threshold,
+            case_thresholds=_parse_case_thresholds(args.case_threshold),
+            min_delta_ms=args.min_delta_ms,
+        )
+
+    if args.json:
+        print(json.dumps({**report, "comparison": comparison}, indent=2, ensure_ascii=False))
+    else:
+        print(f"hot-path benchmarks: quick={report['quick']} repeats={args.repeats}")
+        for name, row in report["results"].items():
+            print(f"  {name}: median={row['median_ms']}ms min={row['min_ms']}ms p95={row['p95_ms']}ms {row['params']}")
+        if comparison is not None:
+            for row in comparison["rows"]:
+                if row["status"] == "new":
+                    print(f"  [new] {row['case']}")
+                else:
+                    print(
+                        f"  [{row['status']}] {row['case']}: {row['baseline_ms']}ms -> {row['median_ms']}ms"
+                        f" ({row['change']:+.1%}, limit {row['threshold']:.0%})"
+                    )
+            for warning in comparison["warnings"]:
+                print(f"  warning: {warning}")
+    if comparison is not None and not comparison["ok"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
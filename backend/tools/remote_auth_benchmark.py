@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""CLI: Latenz der Session-Validierung bei wachsender sessions-Tabelle (Index, Pool, Cache) messen."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+import storage.db as storage_db  # noqa: E402
+from core.auth import invalidate_session_cache, validate_session_token  # noqa: E402
+
+DEFAULT_SIZES = (1000, 100000, 300000)
+
+
+def _prefill(count: int) -> list[str]:
+    """``count`` Sessions anlegen; liefert einige Klartext-Tokens über die Tabelle verteilt."""
+    now = datetime.now(timezone.utc)
+    created = now.isoformat()
+    expires = (now + timedelta(hours=1)).isoformat()
+    conn = storage_db.get_connection()
+    try:
+        conn.execute(
+            "INSERT INTO remote_device_profiles (id, device_id, name, role, created_at, updated_at) VALUES (?,?,?,?,?,?)",
+            ("bench-profile", "bench-device", "bench", "viewer", created, created),
+        )
+        conn.executemany(
+            "INSERT INTO sessions (id, session_token_hash, device_id, created_at, expires_at, refreshed_at)"
+            " VALUES (?,?,?,?,?,NULL)",
+            (
+                (f"s-{i}", storage_db.hash_token(f"bench-token-{i}"), "bench-device", created, expires)
+                for i in range(count)
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    step = max(1, count // 50)
+    return [f"bench-token-{i}" for i in range(0, count, step)]
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {"median_us": round(statistics.median(ordered), 1), "p95_us": round(p95, 1)}
+
+
+def _timed(tokens: list[str], samples: int, *, cached: bool) -> list[float]:
+    out: list[float] = []
+    for n in range(max(1, samples)):
+        token = tokens[n % len(tokens)]
+        if not cached:
+            invalidate_session_cache()
+        t0 = time.perf_counter()
+        ctx = validate_session_token(token)
+        out.append((time.perf_counter() - t0) * 1e6)
+        if ctx is None:
+            raise RuntimeError(f"session not found: {token}")
+    return out
+
+
+def measure(sizes: tuple[int, ...] = DEFAULT_SIZES, *, samples: int = 500) -> dict[str, Any]:
+    """Median/p95 je Validierung, ohne Cache (DB-Lookup) und mit Cache.
+
+    ``ratio`` = Median(größte Tabelle) / Median(kleinste Tabelle) ohne Cache.
+    """
+    rows: list[dict[str, Any]] = []
+    previous = storage_db._remote_db_path
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as td:
+                storage_db._remote_db_path = Path(td) / "remote.db"
+                storage_db.init_remote_db(None)
+                tokens = _prefill(size)
+                uncached = _timed(tokens, samples, cached=False)
+                _timed(tokens, len(tokens), cached=True)  # Cache füllen
+                cached = _timed(tokens, samples, cached=True)
+                rows.append({"sessions": size, "uncached": _stats(uncached), "cached": _stats(cached)})
+                invalidate_session_cache()
+                storage_db.close_connection_pools()
+    finally:
+        storage_db._remote_db_path = previous
+    first = rows[0]["uncached"]["median_us"] if rows else 0.0
+    ratio = rows[-1]["uncached"]["median_us"] / first if first else 0.0
+    return {"ok": True, "samples": max(1, samples), "results": rows, "ratio": round(ratio, 3)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark remote session validation against sessions table size.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Session counts")
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--max-ratio", type=float, default=0.0, help="Fail if largest/smallest median exceeds this")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    sizes = tuple(int(s) for s in args.sizes.split(",") if s.strip())
+    report = measure(sizes, samples=args.samples)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"remote-auth: samples={report['samples']} ratio={report['ratio']}")
+        for row in report["results"]:
+            u, c = row["uncached"], row["cached"]
+            print(
+                f"  n={row['sessions']}: uncached median={u['median_us']}us p95={u['p95_us']}us"
+                f" | cached median={c['median_us']}us p95={c['p95_us']}us"
+            )
+    if args.max_ratio and report["ratio"] > args.max_ratio:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""CLI: Kaltstart-Importzeit des Backends je Subsystem messen (``python -X importtime``)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+_backend = Path(__file__).resolve().parent.parent
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+DEFAULT_TARGET = "app"
+
+
+def parse_importtime(stderr_text: str) -> dict[str, Any]:
+    """
+    Wertet ``-X importtime``-Ausgabe aus: Self-Time je Top-Level-Paket (ms)
+    sowie Kumulativzeit der Projekt-Subsysteme ``deploy``/``rescue``/``core``/``modules``.
+    """
+    self_us: dict[str, int] = {}
+    cumulative_us: dict[str, int] = {}
+    modules: dict[str, int] = {}
+    total_us = 0
+    for line in (stderr_text or "").splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        self_t, cum_t, name = int(m.group(1)), int(m.group(2)), m.group(4)
+        top = name.split(".", 1)[0]
+        total_us += self_t
+        modules[name] = self_t
+        self_us[top] = self_us.get(top, 0) + self_t
+        if "." not in name:
+            cumulative_us[top] = max(cumulative_us.get(top, 0), cum_t)
+    subsystems = {k: round(v / 1000, 3) for k, v in sorted(self_us.items(), key=lambda kv: -kv[1])}
+    return {
+        "total_ms": round(total_us / 1000, 3),
+        "module_count": len(modules),
+        "subsystems_self_ms": subsystems,
+        "subsystems_cumulative_ms": {
+            k: round(cumulative_us[k] / 1000, 3) for k in ("deploy", "rescue", "core", "modules") if k in cumulative_us
+        },
+        "slowest_modules_ms": [
+            {"module": k, "self_ms": round(v / 1000, 3)}
+            for k, v in sorted(modules.items(), key=lambda kv: -kv[1])[:15]
+        ],
+    }
+
+
+def measure(target: str = DEFAULT_TARGET, *, python: str = sys.executable, runs: int = 1) -> dict[str, Any]:
+    """Startet je Lauf einen frischen Interpreter und liefert den Lauf mit minimaler Gesamtzeit."""
+    best: dict[str, Any] | None = None
+    for _ in range(max(1, runs)):
+        proc = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {target}"],
+            cwd=str(_backend),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if proc.returncode != 0:
+            tail = (proc.stderr or "").strip().splitlines()[-1:] or [""]
+            return {"ok": False, "target": target, "error": tail[0]}
+        result = parse_importtime(proc.stderr)
+        if best is None or result["total_ms"] < best["total_ms"]:
+            best = result
+    assert best is not None
+    return {"ok": True, "target": target, "runs": max(1, runs), **best}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure backend cold-start import time per subsystem.")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="Module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON report to this file")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = measure(args.target, runs=args.runs)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    elif report.get("ok"):
+        print(f"startup-importtime: target={report['target']} total_ms={report['total_ms']}")
+        for name, ms in list(report["subsystems_self_ms"].items())[:12]:
+            print(f"  {name}: {ms} ms")
+    else:
+        print(f"startup-importtime: error={report.get('error')}")
+    return 0 if report.get("ok") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())